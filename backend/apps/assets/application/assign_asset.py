@@ -13,6 +13,7 @@ from apps.assets.domain.services.asset_authority import (
     assert_can_assign,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -63,15 +64,18 @@ class AssignAsset:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('assets.assign')
     def execute(
         self,
         command,
+        idempotency_key: Optional[str] = None,
     ) -> AssignAssetResult:
         """
         Execute asset assignment use case.
 
         Args:
             command: AssetAssignmentCommand containing actor, asset_id, and assignee_id
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignAssetResult with assignment confirmation or error
@@ -158,10 +162,12 @@ class UnassignAsset:
         AssignAssetResult with unassignment confirmation or error
     """
 
+    @idempotent('assets.unassign')
     def execute(
         self,
         user: Any,
         asset_id: str,
+        idempotency_key: Optional[str] = None,
     ) -> AssignAssetResult:
         """
         Execute asset unassignment use case.
@@ -169,6 +175,7 @@ class UnassignAsset:
         Args:
             user: User performing the unassignment
             asset_id: UUID string of asset to unassign
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignAssetResult with unassignment confirmation or error
@@ -14,6 +14,7 @@ from apps.assets.domain.services.asset_authority import (
     assert_can_self_assign,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -64,15 +65,18 @@ class AssignAssetToSelf:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('assets.assign_to_self')
     def execute(
         self,
         command,
+        idempotency_key: Optional[str] = None,
     ) -> AssignAssetToSelfResult:
         """
         Execute asset self-assignment use case.
 
         Args:
             command: AssetAssignmentCommand containing actor, asset_id, and assignee_id=None
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignAssetToSelfResult with assignment confirmation or error
@@ -146,11 +150,13 @@ class ReassignAsset:
         AssignAssetToSelfResult with reassignment confirmation or error
     """
 
+    @idempotent('assets.reassign')
     def execute(
         self,
         user: Any,
         asset_id: str,
         new_assignee_id: int,
+        idempotency_key: Optional[str] = None,
     ) -> AssignAssetToSelfResult:
         """
         Execute asset reassignment use case.
@@ -159,6 +165,7 @@ class ReassignAsset:
             user: User performing the reassignment
             asset_id: UUID string of asset to reassign
             new_assignee_id: User ID of new assignee
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignAssetToSelfResult with reassignment confirmation or error
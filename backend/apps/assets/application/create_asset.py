@@ -15,6 +15,7 @@ from apps.assets.domain.services.asset_authority import (
     assert_can_create_asset,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -75,6 +76,7 @@ class CreateAsset:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('assets.create')
     @transaction.atomic
     def execute(
         self,
@@ -89,6 +91,7 @@ class CreateAsset:
         purchase_price: str = '',
         warranty_expiry: str = '',
         assigned_to_id: Optional[int] = None,
+        idempotency_key: Optional[str] = None,
     ) -> CreateAssetResult:
         """
         Execute asset creation use case.
@@ -105,6 +108,7 @@ class CreateAsset:
             purchase_price: Optional purchase price
             warranty_expiry: Optional warranty expiry (YYYY-MM-DD)
             assigned_to_id: Optional assigned user ID
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             CreateAssetResult with creation confirmation or error
@@ -15,6 +15,7 @@ from apps.assets.domain.services.asset_authority import (
     assert_can_delete,
     can_delete,
 )
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -64,6 +65,7 @@ class DeleteAsset:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('assets.delete')
     @transaction.atomic
     def execute(
         self,
@@ -17,6 +17,7 @@ from apps.assets.domain.services.asset_authority import (
     can_edit,
 )
 from apps.core.services.change_detection import get_changed_fields, format_field_value, get_display_field_name
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -67,6 +68,7 @@ class UpdateAsset:
             print(f"Error: {result.error}")
     """
     
+    @idempotent('assets.update')
     @transaction.atomic
     def execute(
         self,
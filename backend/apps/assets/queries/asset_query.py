@@ -123,4 +123,4 @@ class AssetQuery:
         return Asset.objects.filter(
             Q(assigned_to__isnull=True) |
             Q(assigned_to=user)
-        )
\ No newline at end of file
+        ).select_related('assigned_to', 'category', 'created_by')
\ No newline at end of file
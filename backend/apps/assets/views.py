@@ -6,7 +6,8 @@ All permission checks are enforced server-side using domain authority services.
 
 from django.db.models import Count, Q, Sum, Avg
 from django.utils import timezone
-from django.core.cache import cache
+from apps.core.cache import get_tiered_cache
+from apps.core.idempotency import IdempotentAPIMixin
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -55,7 +56,7 @@ class AssetCategoryViewSet(viewsets.ModelViewSet):
         return queryset.order_by('name')
 
 
-class AssetViewSet(viewsets.ModelViewSet):
+class AssetViewSet(IdempotentAPIMixin, viewsets.ModelViewSet):
     """
     Asset management viewset with comprehensive filtering and actions.
     All permission checks use domain authority services for strict RBAC.
@@ -500,13 +501,14 @@ class AssetViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get asset statistics."""
-        # Cache statistics for 5 minutes
-        cache_key = f'asset_statistics_{request.user.id}'
-        cached_stats = cache.get(cache_key)
-        
-        if cached_stats:
-            return Response(cached_stats)
-        
+        # Cache statistics for 5 minutes; computed once for all workers
+        stats = get_tiered_cache('asset_statistics', timeout=300).get_or_set(
+            str(request.user.id), lambda: self._compute_statistics(request)
+        )
+        return Response(stats)
+    
+    def _compute_statistics(self, request):
+        """Compute the payload of the statistics action."""
         total_assets = Asset.objects.count()
         hardware_assets = Asset.objects.filter(asset_type='HARDWARE').count()
         software_assets = Asset.objects.filter(asset_type='SOFTWARE').count()
@@ -553,8 +555,7 @@ class AssetViewSet(viewsets.ModelViewSet):
             'upcoming_maintenance': AssetMaintenanceSerializer(upcoming_maintenance, many=True).data
         }
         
-        cache.set(cache_key, stats, 300)  # Cache for 5 minutes
-        return Response(stats)
+        return stats
 
 
 class HardwareAssetViewSet(viewsets.ModelViewSet):
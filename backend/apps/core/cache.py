@@ -0,0 +1,409 @@
+"""
+Two-tier cache for IT Management Platform.
+
+Each process keeps a small LRU of recently read entries in front of the
+shared cache (``SHARED_CACHE_ALIAS``, Redis in production), so hot entries
+such as dashboard metrics and statistics are computed once for all workers
+and then served from process memory. The shared backend must implement
+``add`` and ``incr`` atomically across processes; locks and counters are
+built on them.
+
+    statistics_cache = get_tiered_cache('ticket_statistics', timeout=300)
+    stats = statistics_cache.get_or_set(key, compute_statistics)
+
+- The local tier holds entries for at most ``TIERED_CACHE_LOCAL_TTL``
+  seconds, which bounds how long another worker's ``delete`` can go
+  unnoticed. Namespaces created with ``local=False`` skip it entirely and
+  always read the shared tier (counters, the security event hash chain).
+- ``get_or_set`` is single-flight: concurrent misses for the same key, in
+  this process or in other workers, wait for one computation instead of
+  all recomputing it.
+- Hits and misses are counted per namespace (``cache_metrics``).
+
+``InMemorySharedCache`` is a dependency-free stand-in for the shared tier
+in tests; two ``TieredCache`` instances on one of them behave like two
+workers sharing Redis.
+"""
+
+import pickle
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+_MISSING = object()
+
+
+class LockTimeout(Exception):
+    """Raised when a shared cache lock could not be acquired in time."""
+
+
+class CacheMetrics:
+    """Process-wide hit/miss counters per cache namespace."""
+
+    FIELDS = ('local_hits', 'shared_hits', 'misses', 'computes', 'waits')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def increment(self, namespace: str, name: str):
+        with self._lock:
+            counts = self._counts.setdefault(namespace, dict.fromkeys(self.FIELDS, 0))
+            counts[name] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counts: Dict[str, Dict[str, int]] = {}
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            counts = {namespace: dict(values) for namespace, values in self._counts.items()}
+        for values in counts.values():
+            lookups = values['local_hits'] + values['shared_hits'] + values['misses']
+            hits = values['local_hits'] + values['shared_hits']
+            values['hit_ratio'] = round(hits / lookups, 4) if lookups else 0.0
+        return counts
+
+
+cache_metrics = CacheMetrics()
+
+
+class LocalLRU:
+    """Bounded in-process LRU with a per-entry TTL; values are stored pickled."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, data = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return _MISSING
+            self._entries.move_to_end(key)
+        return pickle.loads(data)
+
+    def set(self, key: str, value, timeout: Optional[float] = None):
+        ttl = self.ttl if timeout is None else min(self.ttl, timeout)
+        if self.max_entries <= 0 or ttl <= 0:
+            return
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class _Flight:
+    """One in-progress computation that other threads can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = _MISSING
+
+
+class TieredCache:
+    """
+    A cache namespace backed by an in-process LRU and the shared cache.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        timeout: Optional[int] = 300,
+        local: bool = True,
+        shared=None,
+        local_size: int = None,
+        local_ttl: float = None,
+        lock_timeout: float = None,
+    ):
+        self.namespace = namespace
+        self.timeout = timeout
+        self._shared = shared
+        local_size = local_size if local_size is not None else getattr(
+            settings, 'TIERED_CACHE_LOCAL_SIZE', 1024
+        )
+        local_ttl = local_ttl if local_ttl is not None else getattr(
+            settings, 'TIERED_CACHE_LOCAL_TTL', 5
+        )
+        self.local = LocalLRU(local_size if local else 0, local_ttl)
+        self.lock_timeout = lock_timeout if lock_timeout is not None else getattr(
+            settings, 'TIERED_CACHE_LOCK_TIMEOUT', 30
+        )
+        self._flights: Dict[str, _Flight] = {}
+        self._flights_lock = threading.Lock()
+
+    @property
+    def shared(self):
+        if self._shared is not None:
+            return self._shared
+        return caches[getattr(settings, 'SHARED_CACHE_ALIAS', 'default')]
+
+    def make_key(self, key: str) -> str:
+        return f'{self.namespace}:{key}'
+
+    # ------------------------------------------------------------------
+    # Basic operations
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default=None):
+        full_key = self.make_key(key)
+        value = self.local.get(full_key)
+        if value is not _MISSING:
+            cache_metrics.increment(self.namespace, 'local_hits')
+            return value
+
+        value = self.shared.get(full_key, _MISSING)
+        if value is _MISSING:
+            cache_metrics.increment(self.namespace, 'misses')
+            return default
+        cache_metrics.increment(self.namespace, 'shared_hits')
+        self.local.set(full_key, value, self.timeout)
+        return value
+
+    def set(self, key: str, value, timeout=_MISSING):
+        timeout = self.timeout if timeout is _MISSING else timeout
+        full_key = self.make_key(key)
+        self.shared.set(full_key, value, timeout)
+        self.local.set(full_key, value, timeout)
+
+    def add(self, key: str, value, timeout=_MISSING) -> bool:
+        """Store ``value`` only if ``key`` is absent; atomic in the shared tier."""
+        timeout = self.timeout if timeout is _MISSING else timeout
+        full_key = self.make_key(key)
+        added = self.shared.add(full_key, value, timeout)
+        if added:
+            self.local.set(full_key, value, timeout)
+        return added
+
+    def delete(self, key: str):
+        """Delete everywhere; other workers' local copies expire within the local TTL."""
+        full_key = self.make_key(key)
+        self.local.delete(full_key)
+        self.shared.delete(full_key)
+
+    def incr(self, key: str, delta: int = 1, timeout=_MISSING) -> int:
+        """
+        Atomically increment a shared counter, creating it if needed.
+
+        Counters bypass the local tier. The expiry is set when the counter
+        is created and not extended by later increments, so a counter is a
+        fixed window.
+        """
+        timeout = self.timeout if timeout is _MISSING else timeout
+        full_key = self.make_key(key)
+        try:
+            value = self.shared.incr(full_key, delta)
+        except ValueError:
+            if self.shared.add(full_key, delta, timeout):
+                return delta
+            value = self.shared.incr(full_key, delta)
+        return value
+
+    # ------------------------------------------------------------------
+    # Single-flight
+    # ------------------------------------------------------------------
+
+    def get_or_set(self, key: str, compute: Callable[[], Any], timeout=_MISSING):
+        """
+        Return the cached value, computing and storing it on a miss.
+
+        Only one caller computes a missing value: other threads of this
+        process wait for it in memory, other processes wait on a lock in the
+        shared cache and then read the stored value. Callers that waited
+        longer than ``lock_timeout`` compute the value themselves.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        full_key = self.make_key(key)
+        with self._flights_lock:
+            flight = self._flights.get(full_key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[full_key] = _Flight()
+
+        if not leader:
+            flight.done.wait(self.lock_timeout)
+            if flight.value is not _MISSING:
+                cache_metrics.increment(self.namespace, 'waits')
+                return flight.value
+            return self._compute(key, compute, timeout)
+
+        try:
+            flight.value = self._lead(key, compute, timeout)
+            return flight.value
+        finally:
+            with self._flights_lock:
+                self._flights.pop(full_key, None)
+            flight.done.set()
+
+    def _lead(self, key, compute, timeout):
+        try:
+            with self.lock(key):
+                # Another worker may have stored it while we waited
+                value = self.shared.get(self.make_key(key), _MISSING)
+                if value is not _MISSING:
+                    cache_metrics.increment(self.namespace, 'waits')
+                    self.local.set(self.make_key(key), value, self.timeout)
+                    return value
+                return self._compute(key, compute, timeout)
+        except LockTimeout:
+            return self._compute(key, compute, timeout)
+
+    def _compute(self, key, compute, timeout):
+        cache_metrics.increment(self.namespace, 'computes')
+        value = compute()
+        self.set(key, value, timeout)
+        return value
+
+    @contextmanager
+    def lock(self, key: str, wait: float = None, ttl: float = None):
+        """
+        Cross-process mutex held in the shared cache.
+
+        Waits up to ``wait`` seconds (default ``lock_timeout``) and raises
+        ``LockTimeout`` if the lock could not be taken. The lock expires
+        after ``ttl`` seconds in case its holder dies.
+        """
+        wait = self.lock_timeout if wait is None else wait
+        ttl = self.lock_timeout if ttl is None else ttl
+        lock_key = self.make_key(f'{key}:lock')
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait
+        delay = 0.005
+        while not self.shared.add(lock_key, token, ttl):
+            if time.monotonic() >= deadline:
+                raise LockTimeout(f'Could not lock {lock_key}')
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        try:
+            yield
+        finally:
+            if self.shared.get(lock_key) == token:
+                self.shared.delete(lock_key)
+
+
+_caches: Dict[str, TieredCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_tiered_cache(namespace: str, timeout: Optional[int] = 300, local: bool = True) -> TieredCache:
+    """Return the process-wide TieredCache for ``namespace``."""
+    tiered = _caches.get(namespace)
+    if tiered is None:
+        with _caches_lock:
+            tiered = _caches.get(namespace)
+            if tiered is None:
+                tiered = _caches[namespace] = TieredCache(namespace, timeout=timeout, local=local)
+    return tiered
+
+
+def clear_local_caches():
+    """Drop every local tier of this process (tests, deploy hooks)."""
+    for tiered in list(_caches.values()):
+        tiered.local.clear()
+
+
+# =============================================================================
+# Test double
+# =============================================================================
+
+class InMemorySharedCache:
+    """
+    Minimal in-memory implementation of the shared cache API used by
+    TieredCache, counting the operations it receives.
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, Optional[float]] = {}
+        self._lock = threading.RLock()
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, name):
+        self.calls[name] = self.calls.get(name, 0) + 1
+
+    def _alive(self, key) -> bool:
+        expires_at = self._expires.get(key)
+        if key in self._data and expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            del self._expires[key]
+        return key in self._data
+
+    @staticmethod
+    def _expiry(timeout):
+        return None if timeout is None else time.monotonic() + timeout
+
+    def get(self, key, default=None):
+        with self._lock:
+            self._count('get')
+            return pickle.loads(self._data[key]) if self._alive(key) else default
+
+    def set(self, key, value, timeout=None):
+        with self._lock:
+            self._count('set')
+            self._data[key] = pickle.dumps(value)
+            self._expires[key] = self._expiry(timeout)
+
+    def add(self, key, value, timeout=None):
+        with self._lock:
+            self._count('add')
+            if self._alive(key):
+                return False
+            self._data[key] = pickle.dumps(value)
+            self._expires[key] = self._expiry(timeout)
+            return True
+
+    def delete(self, key):
+        with self._lock:
+            self._count('delete')
+            self._expires.pop(key, None)
+            return self._data.pop(key, None) is not None
+
+    def incr(self, key, delta=1):
+        with self._lock:
+            self._count('incr')
+            if not self._alive(key):
+                raise ValueError(f"Key '{key}' not found")
+            value = pickle.loads(self._data[key]) + delta
+            self._data[key] = pickle.dumps(value)
+            return value
+
+    def touch(self, key, timeout=None):
+        with self._lock:
+            self._count('touch')
+            if not self._alive(key):
+                return False
+            self._expires[key] = self._expiry(timeout)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
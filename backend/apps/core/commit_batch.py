@@ -0,0 +1,108 @@
+"""
+Per-transaction batching for IT Management Platform.
+
+Side writes produced while a transaction is open (audit records, security
+chain events, search index refreshes) are collected in a CommitBatch and
+written together once the transaction commits:
+
+    class AuditBatch(CommitBatch):
+        def add(self, *records): ...
+        def write(self): ...
+
+    AuditBatch.queue(event, audit_log, using='default')
+
+Batches are kept per subclass, thread, database alias and savepoint
+level, so items queued inside a savepoint that is rolled back are
+discarded together with the rows they describe. Items queued outside a
+transaction are written immediately.
+"""
+
+import threading
+from typing import Dict
+
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+_local = threading.local()
+
+
+def _pending(batch_class) -> Dict:
+    """Return the per-thread mapping of pending batches of ``batch_class``."""
+    pending = getattr(_local, 'pending', None)
+    if pending is None:
+        pending = _local.pending = {}
+    return pending.setdefault(batch_class, {})
+
+
+class CommitBatch:
+    """
+    Items to write once a transaction (or savepoint) commits on one database.
+
+    Subclasses implement ``add`` and ``write``.
+    """
+
+    def __init__(self, using: str, key=None):
+        self.using = using
+        self.key = key
+        self.flushed = False
+
+    def add(self, *items):
+        raise NotImplementedError
+
+    def write(self):
+        raise NotImplementedError
+
+    def is_queued(self) -> bool:
+        """Check whether this batch's on_commit callback is still pending."""
+        if self.flushed:
+            return False
+        # Django drops the callbacks of a rolled back transaction without
+        # notice; the pending list is the only place that tells.
+        return any(entry[1] == self.flush for entry in connections[self.using].run_on_commit)
+
+    def flush(self):
+        if self.flushed:
+            return
+        self.flushed = True
+        pending = _pending(type(self))
+        if self.key is not None and pending.get(self.key) is self:
+            del pending[self.key]
+        self.write()
+
+    @classmethod
+    def flush_current(cls, using: str = DEFAULT_DB_ALIAS):
+        """
+        Write the pending batches of the current savepoint (and of the nested
+        ones already released into it) now instead of on commit; items queued
+        afterwards start a new batch.
+        """
+        level = tuple(connections[using].savepoint_ids)
+        for (alias, savepoint_ids), batch in list(_pending(cls).items()):
+            if alias == using and savepoint_ids[:len(level)] == level and batch.is_queued():
+                batch.flush()
+
+    @classmethod
+    def queue(cls, *items, using: str = DEFAULT_DB_ALIAS) -> 'CommitBatch':
+        """
+        Add items to the batch of the current transaction and savepoint.
+
+        Outside a transaction the items are written immediately.
+        """
+        connection = connections[using]
+        if not connection.in_atomic_block:
+            batch = cls(using)
+            batch.add(*items)
+            batch.flush()
+            return batch
+
+        key = (using, tuple(connection.savepoint_ids))
+        pending = _pending(cls)
+        batch = pending.get(key)
+        if batch is None or not batch.is_queued():
+            # Drop batches whose transaction was rolled back
+            for stale_key, stale in list(pending.items()):
+                if not stale.is_queued():
+                    del pending[stale_key]
+            batch = pending[key] = cls(using, key=key)
+            transaction.on_commit(batch.flush, using=using)
+        batch.add(*items)
+        return batch
@@ -4,15 +4,22 @@
 # Supports both synchronous and asynchronous event handlers.
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections import OrderedDict
+from concurrent.futures import Future, wait as wait_futures
+from dataclasses import dataclass, field, fields
 from datetime import datetime
 from typing import Any, Dict, List, Callable, Optional, Union
 from enum import Enum
+import asyncio
 import threading
 import json
+import logging
+import time
 import uuid
 import inspect
 
+logger = logging.getLogger(__name__)
+
 
 class EventType(str, Enum):
     """Enumeration of domain event types."""
@@ -63,7 +70,43 @@ class DomainEvent(ABC):
     def __str__(self) -> str:
         """Human-readable event representation."""
         actor_name = self.actor.username if self.actor and hasattr(self.actor, 'username') else "system"
-        return f"[{self.event_type.value}] {self.entity_type}#{self.entity_id} by {actor_name} at {self.timestamp}"
+        event_type = self.event_type.value if isinstance(self.event_type, EventType) else self.event_type
+        return f"[{event_type}] {self.entity_type}#{self.entity_id} by {actor_name} at {self.timestamp}"
+
+
+def serialize_event(event: DomainEvent) -> Dict:
+    """
+    JSON-safe representation of an event that deserialize_event() turns
+    back into an instance of the same class (used for Celery batches).
+    """
+    values = {}
+    for item in fields(event):
+        if item.name in ('actor', 'metadata'):
+            continue
+        value = getattr(event, item.name)
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        values[item.name] = value
+    return {
+        'class': f"{type(event).__module__}.{type(event).__qualname__}",
+        'actor_id': getattr(event.actor, 'id', None),
+        'fields': json.loads(json.dumps(values, default=str)),
+    }
+
+
+def deserialize_event(data: Dict, actor: Any = None) -> DomainEvent:
+    """Rebuild an event serialized by serialize_event()."""
+    event_class = import_by_name(data['class'])
+    values = dict(data['fields'])
+    if isinstance(values.get('timestamp'), str):
+        values['timestamp'] = datetime.fromisoformat(values['timestamp'])
+    init_fields = {item.name: item for item in fields(event_class) if item.init}
+    if isinstance(init_fields['event_type'].default, EventType):
+        values['event_type'] = EventType(values['event_type'])
+    known = set(init_fields)
+    return event_class(actor=actor, **{k: v for k, v in values.items() if k in known})
 
 
 # =============================================================================
@@ -132,6 +175,147 @@ class ProjectDeleted(DomainEvent):
 # Async Handler Executor (Pluggable Interface)
 # =============================================================================
 
+OVERFLOW_POLICIES = ['block', 'drop_newest', 'drop_oldest', 'caller_runs']
+
+
+def handler_name(handler: Callable) -> str:
+    """Dotted name identifying a handler in metrics and Celery tasks."""
+    qualname = getattr(handler, '__qualname__', None) or type(handler).__qualname__
+    return f"{handler.__module__}.{qualname}"
+
+
+def import_by_name(name: str) -> Callable:
+    """Import a handler or class from its dotted ``module.QualName`` path."""
+    import importlib
+    
+    parts = name.split('.')
+    for split in range(len(parts) - 1, 0, -1):
+        try:
+            target = importlib.import_module('.'.join(parts[:split]))
+        except ImportError:
+            continue
+        for attribute in parts[split:]:
+            target = getattr(target, attribute)
+        return target
+    raise ImportError(f"Cannot import {name}")
+
+
+class HandlerMetrics:
+    """
+    Process-wide latency and error counters per event handler.
+    
+    ``dropped`` counts handler runs rejected by a full executor queue.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def record(self, name: str, elapsed: float, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, self._empty())
+            stats['calls'] += 1
+            stats['errors'] += 1 if error else 0
+            stats['total_ms'] += elapsed * 1000
+            stats['max_ms'] = max(stats['max_ms'], elapsed * 1000)
+    
+    def record_dropped(self, name: str) -> None:
+        with self._lock:
+            self._stats.setdefault(name, self._empty())['dropped'] += 1
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._stats: Dict[str, Dict[str, float]] = {}
+    
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            stats = {name: dict(values) for name, values in self._stats.items()}
+        for values in stats.values():
+            values['avg_ms'] = round(values['total_ms'] / values['calls'], 3) if values['calls'] else 0.0
+            values['total_ms'] = round(values['total_ms'], 3)
+            values['max_ms'] = round(values['max_ms'], 3)
+        return stats
+    
+    @staticmethod
+    def _empty() -> Dict[str, float]:
+        return {'calls': 0, 'errors': 0, 'dropped': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+
+
+handler_metrics = HandlerMetrics()
+
+
+def run_handler(handler: Callable, event: 'DomainEvent') -> None:
+    """
+    Run a handler in the current thread, recording its metrics.
+    
+    Coroutine handlers run on the shared event loop thread; the caller
+    waits for them. Errors are logged, never raised.
+    """
+    start = time.perf_counter()
+    error = False
+    try:
+        if inspect.iscoroutinefunction(handler):
+            get_event_loop_thread().submit(handler(event)).result()
+        else:
+            handler(event)
+    except Exception:
+        error = True
+        logger.exception(f"Event handler {handler_name(handler)} failed for {event}")
+    finally:
+        handler_metrics.record(handler_name(handler), time.perf_counter() - start, error)
+
+
+class EventLoopThread:
+    """
+    A single long-lived asyncio event loop running in a daemon thread.
+    
+    Coroutine handlers are scheduled on it instead of creating a new event
+    loop per call.
+    """
+    
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._thread is None or not self._thread.is_alive():
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                
+                def run():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(started.set)
+                    loop.run_forever()
+                
+                self._thread = threading.Thread(target=run, name='event-loop', daemon=True)
+                self._thread.start()
+                started.wait()
+                self._loop = loop
+            return self._loop
+    
+    def submit(self, coroutine) -> Future:
+        """Schedule a coroutine; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._ensure_started())
+    
+    def stop(self) -> None:
+        with self._lock:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=5)
+            self._loop = None
+            self._thread = None
+
+
+_event_loop_thread = EventLoopThread()
+
+
+def get_event_loop_thread() -> EventLoopThread:
+    """Return the process-wide event loop thread."""
+    return _event_loop_thread
+
+
 class AsyncExecutor(ABC):
     """Abstract base class for async handler execution."""
     
@@ -147,62 +331,152 @@ class AsyncExecutor(ABC):
         pass
     
     @abstractmethod
-    def flush(self) -> None:
-        """Wait for all pending async handlers to complete."""
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for all pending async handlers to complete.
+        
+        Returns:
+            bool: True if nothing is pending any more, False on timeout
+        """
         pass
+    
+    def stats(self) -> Dict[str, Any]:
+        """Executor state for health checks."""
+        return {}
 
 
 class ThreadPoolExecutor(AsyncExecutor):
     """
-    Simple thread pool based async executor.
+    Thread pool based async executor with a bounded queue.
     
-    Uses a bounded thread pool to execute handlers in background threads.
-    Suitable for development and small-scale deployments.
+    At most ``max_queue_size`` handler runs are queued or running at once.
+    When the queue is full, ``overflow_policy`` decides what happens:
+    
+    - 'block':       wait up to ``block_timeout`` seconds for a free slot,
+                     then drop the new run
+    - 'drop_newest': drop the new run
+    - 'drop_oldest': cancel the oldest run that has not started yet
+    - 'caller_runs': run the handler in the dispatching thread
+    
+    Coroutine handlers are scheduled on the shared event loop thread rather
+    than occupying a worker thread. Every run is tracked by a future that is
+    forgotten once it completes, so ``flush(timeout)`` waits for exactly the
+    outstanding work.
     """
     
-    def __init__(self, max_workers: int = 5, timeout: float = 30.0):
+    def __init__(
+        self,
+        max_workers: int = 5,
+        timeout: float = 30.0,
+        max_queue_size: int = 1000,
+        overflow_policy: str = 'block',
+        block_timeout: float = 1.0,
+    ):
         """
         Initialize thread pool executor.
         
         Args:
             max_workers: Maximum number of worker threads
-            timeout: Timeout for worker threads in seconds
+            timeout: Default timeout for flush() and shutdown() in seconds
+            max_queue_size: Maximum number of queued or running handlers
+            overflow_policy: One of OVERFLOW_POLICIES
+            block_timeout: Seconds the 'block' policy waits for a free slot
         """
         from concurrent.futures import ThreadPoolExecutor as TPE
-        self._executor = TPE(max_workers=max_workers)
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow_policy}")
+        self._executor = TPE(max_workers=max_workers, thread_name_prefix='event-handler')
         self._timeout = timeout
+        self._max_queue_size = max_queue_size
+        self._overflow_policy = overflow_policy
+        self._block_timeout = block_timeout
+        self._slots = threading.BoundedSemaphore(max_queue_size)
         self._lock = threading.Lock()
-        self._pending = []
+        self._pending: 'OrderedDict[Future, str]' = OrderedDict()
     
     def submit(self, handler: Callable, event: DomainEvent) -> None:
-        """Submit handler for async execution."""
-        with self._lock:
-            self._pending.append((handler, event))
+        """Submit handler for async execution, applying the overflow policy."""
+        name = handler_name(handler)
+        if not self._acquire_slot():
+            if self._overflow_policy == 'caller_runs':
+                run_handler(handler, event)
+                return
+            handler_metrics.record_dropped(name)
+            logger.warning(f"Event queue full, dropped {name} for {event}")
+            return
         
-        # Run in background thread
-        self._executor.submit(self._run_handler, handler, event)
-    
-    def _run_handler(self, handler: Callable, event: DomainEvent) -> None:
-        """Execute handler and handle errors."""
         try:
             if inspect.iscoroutinefunction(handler):
-                # For async handlers, run in new event loop
-                import asyncio
-                asyncio.run(handler(event))
+                future = get_event_loop_thread().submit(self._run_coroutine(handler, event))
             else:
-                handler(event)
+                future = self._executor.submit(run_handler, handler, event)
         except Exception:
-            import traceback
-            traceback.print_exc()
+            self._slots.release()
+            raise
+        
+        with self._lock:
+            self._pending[future] = name
+        future.add_done_callback(self._forget)
     
-    def flush(self) -> None:
-        """Wait for pending handlers to complete."""
-        # Note: In a real implementation, we'd track futures and wait
-        import time
-        time.sleep(0.1)  # Brief wait for threads to complete
+    @staticmethod
+    async def _run_coroutine(handler: Callable, event: DomainEvent) -> None:
+        start = time.perf_counter()
+        error = False
+        try:
+            await handler(event)
+        except Exception:
+            error = True
+            logger.exception(f"Event handler {handler_name(handler)} failed for {event}")
+        finally:
+            handler_metrics.record(handler_name(handler), time.perf_counter() - start, error)
+    
+    def _acquire_slot(self) -> bool:
+        if self._slots.acquire(blocking=False):
+            return True
+        if self._overflow_policy == 'block':
+            return self._slots.acquire(timeout=self._block_timeout)
+        if self._overflow_policy == 'drop_oldest':
+            with self._lock:
+                queued = list(self._pending.items())
+            for future, name in queued:
+                if future.cancel():
+                    handler_metrics.record_dropped(name)
+                    # The cancelled run releases its slot in _forget()
+                    return self._slots.acquire(blocking=False)
+        return False
+    
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._pending.pop(future, None)
+        self._slots.release()
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every submitted handler has finished or ``timeout`` passes."""
+        timeout = self._timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                pending = list(self._pending)
+            if not pending:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            # Handlers may dispatch further events, so re-check afterwards
+            wait_futures(pending, timeout=remaining)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {
+            'pending': pending,
+            'max_queue_size': self._max_queue_size,
+            'overflow_policy': self._overflow_policy,
+        }
     
     def shutdown(self) -> None:
-        """Shutdown the executor."""
+        """Wait for pending handlers, then shut the worker threads down."""
+        self.flush()
         self._executor.shutdown(wait=True)
 
 
@@ -215,64 +489,108 @@ class ImmediateAsyncExecutor(AsyncExecutor):
     
     def submit(self, handler: Callable, event: DomainEvent) -> None:
         """Execute handler immediately in the current thread."""
-        try:
-            if inspect.iscoroutinefunction(handler):
-                import asyncio
-                asyncio.run(handler(event))
-            else:
-                handler(event)
-        except Exception:
-            import traceback
-            traceback.print_exc()
+        run_handler(handler, event)
     
-    def flush(self) -> None:
-        """No-op for immediate executor."""
-        pass
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Nothing is ever pending."""
+        return True
 
 
 class CeleryExecutor(AsyncExecutor):
     """
     Celery-based async executor for production deployments.
     
-    Requires Celery to be configured. Tasks are submitted to Celery
-    for execution in worker processes.
+    Handler runs are buffered and sent as micro-batches: one Celery task per
+    ``batch_size`` runs, or per ``max_delay`` seconds for the runs buffered
+    so far, instead of one task per handler per event.
     """
     
-    def __init__(self, task_name: str = 'apps.core.events.handle_event_async'):
+    def __init__(
+        self,
+        task_name: str = 'apps.core.tasks.handle_event_batch',
+        batch_size: int = 50,
+        max_delay: float = 0.5,
+    ):
         """
         Initialize Celery executor.
         
         Args:
             task_name: Name of the Celery task for event handling
+            batch_size: Runs per task; a full batch is sent immediately
+            max_delay: Seconds a partial batch waits before it is sent
         """
         self._task_name = task_name
+        self._batch_size = batch_size
+        self._max_delay = max_delay
+        self._lock = threading.Lock()
+        self._buffer: List[Dict] = []
+        self._timer: Optional[threading.Timer] = None
+        self._sent_batches = 0
     
     def submit(self, handler: Callable, event: DomainEvent) -> None:
-        """Submit handler as a Celery task."""
+        """Buffer a handler run for the next batch."""
+        item = {'handler': handler_name(handler), 'event': serialize_event(event)}
+        with self._lock:
+            self._buffer.append(item)
+            if len(self._buffer) >= self._batch_size:
+                batch = self._take_batch()
+            else:
+                batch = None
+                if self._timer is None:
+                    self._timer = threading.Timer(self._max_delay, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+        if batch:
+            self._send(batch)
+    
+    def _take_batch(self) -> List[Dict]:
+        batch, self._buffer = self._buffer, []
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        return batch
+    
+    def _send(self, batch: List[Dict]) -> None:
         try:
             from celery import current_app
-            
-            # Serialize event to dict
-            event_data = event.to_dict()
-            
-            # Get handler module and function name
-            handler_module = handler.__module__
-            handler_name = handler.__name__
-            
-            # Submit task to Celery
-            current_app.send_task(
-                self._task_name,
-                args=[handler_module, handler_name, event_data],
-                kwargs={},
-            )
-        except ImportError:
-            # Celery not configured, fall back to immediate
-            import traceback
-            traceback.print_exc()
+            current_app.send_task(self._task_name, args=[batch], kwargs={})
+            with self._lock:
+                self._sent_batches += 1
+        except Exception:
+            for item in batch:
+                handler_metrics.record_dropped(item['handler'])
+            logger.exception(f"Could not send {len(batch)} event handler runs to Celery")
     
-    def flush(self) -> None:
-        """No-op for Celery executor (tasks are async)."""
-        pass
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send the buffered runs now."""
+        with self._lock:
+            batch = self._take_batch()
+        if batch:
+            self._send(batch)
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'buffered': len(self._buffer), 'sent_batches': self._sent_batches}
+
+
+def build_async_executor() -> AsyncExecutor:
+    """Create the async executor configured by the ``EVENT_DISPATCHER_*`` settings."""
+    from django.conf import settings
+    
+    backend = getattr(settings, 'EVENT_DISPATCHER_EXECUTOR', 'thread')
+    if backend == 'immediate':
+        return ImmediateAsyncExecutor()
+    if backend == 'celery':
+        return CeleryExecutor(
+            batch_size=getattr(settings, 'EVENT_DISPATCHER_CELERY_BATCH_SIZE', 50),
+            max_delay=getattr(settings, 'EVENT_DISPATCHER_CELERY_BATCH_DELAY', 0.5),
+        )
+    return ThreadPoolExecutor(
+        max_workers=getattr(settings, 'EVENT_DISPATCHER_MAX_WORKERS', 5),
+        max_queue_size=getattr(settings, 'EVENT_DISPATCHER_QUEUE_SIZE', 1000),
+        overflow_policy=getattr(settings, 'EVENT_DISPATCHER_OVERFLOW_POLICY', 'block'),
+    )
 
 
 # =============================================================================
@@ -294,12 +612,8 @@ class EventHandler:
         self.is_async = is_async or inspect.iscoroutinefunction(handler)
     
     def __call__(self, event: DomainEvent) -> None:
-        """Execute the handler."""
-        if self.is_async:
-            import asyncio
-            asyncio.run(self.handler(event))
-        else:
-            self.handler(event)
+        """Execute the handler in the current thread."""
+        run_handler(self.handler, event)
     
     def __eq__(self, other) -> bool:
         """Compare handlers by their underlying callable."""
@@ -323,7 +637,8 @@ class EventDispatcher:
     Features:
     - Transaction-safe event dispatch using Django's transaction.on_commit()
     - Support for both synchronous and asynchronous handlers
-    - Pluggable async executor for different backends
+    - Pluggable async executor for different backends (EVENT_DISPATCHER_EXECUTOR)
+    - Per-handler latency and error metrics
     - Wildcard handlers that receive all events
     - Thread-safe handler registration
     - Events are only dispatched AFTER successful transaction commit
@@ -354,7 +669,7 @@ class EventDispatcher:
         
         self._handlers: Dict[str, List[EventHandler]] = {}
         self._wildcard_handlers: List[EventHandler] = []
-        self._async_executor: AsyncExecutor = ThreadPoolExecutor()
+        self._async_executor: AsyncExecutor = build_async_executor()
         self._async_enabled: bool = True
         self._initialized = True
     
@@ -511,8 +826,7 @@ class EventDispatcher:
                     # Execute immediately
                     handler(event)
             except Exception:
-                import traceback
-                traceback.print_exc()
+                logger.exception(f"Could not run event handler {handler_name(handler.handler)}")
     
     def dispatch_now(self, event: DomainEvent) -> None:
         """
@@ -541,9 +855,22 @@ class EventDispatcher:
         type_key = event_type.value if isinstance(event_type, EventType) else str(event_type)
         return [h.handler for h in self._handlers.get(type_key, [])]
     
-    def flush(self) -> None:
-        """Flush all pending async handlers."""
-        self._async_executor.flush()
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for pending async handlers.
+        
+        Returns:
+            bool: True if all of them completed within ``timeout`` seconds
+        """
+        return self._async_executor.flush(timeout)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Per-handler latency/error counters and async executor state."""
+        return {
+            'executor': type(self._async_executor).__name__,
+            'queue': self._async_executor.stats(),
+            'handlers': handler_metrics.snapshot(),
+        }
 
 
 # =============================================================================
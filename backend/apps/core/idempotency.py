@@ -0,0 +1,340 @@
+"""
+Idempotency keys for application commands and the REST API.
+
+Clients and HTMX forms that retry a write after a timeout send the same
+idempotency key again. The first request with a key claims it; its result
+is stored for ``IDEMPOTENCY_TTL`` seconds and replayed to every retry
+instead of running the command again, so a retried "create ticket" does
+not create a second ticket, log twice or queue a second notification.
+
+- Claims are atomic ``add`` operations on the shared cache, so retries
+  landing on different workers cannot both run the command. A retry that
+  arrives while the first attempt is still running waits up to
+  ``IDEMPOTENCY_WAIT`` seconds for its result, then gets
+  IdempotencyInProgress (HTTP 409).
+- Keys are scoped per operation and actor and bound to a fingerprint of
+  the arguments: reusing a key with a different payload raises
+  IdempotencyKeyReused (HTTP 422).
+- Results are stored once the surrounding transaction commits. A command
+  that raises releases its claim so the retry runs it again; a claim whose
+  transaction rolled back expires after ``IDEMPOTENCY_LOCK_TTL`` seconds.
+
+Application commands opt in with the ``idempotent`` decorator, placed
+outside ``transaction.atomic``:
+
+    class CreateTicket:
+        @idempotent('tickets.create')
+        @transaction.atomic
+        def execute(self, actor, ticket_data, idempotency_key=None):
+            ...
+
+DRF views mix in IdempotentAPIMixin, which honours the ``Idempotency-Key``
+request header on unsafe methods and replays the stored response.
+"""
+
+import dataclasses
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+from django.conf import settings
+from django.db import models, transaction
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from apps.core.cache import get_tiered_cache
+from apps.core.exception_mapper import ExceptionMapper
+from apps.core.exceptions import (
+    BusinessRuleError, ConflictError, DomainException, ValidationError,
+)
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+MAX_KEY_LENGTH = 255
+
+_PENDING = 'pending'
+_DONE = 'done'
+
+# Arguments that identify the caller rather than the request
+_UNFINGERPRINTED = frozenset({'self', 'actor', 'user', 'idempotency_key'})
+
+
+class IdempotencyInProgress(ConflictError):
+    """Raised when the request holding an idempotency key has not finished yet."""
+
+    def __init__(self):
+        super().__init__(
+            message='A request with this idempotency key is still being processed',
+            conflict_type='IDEMPOTENCY_IN_PROGRESS',
+        )
+
+
+class IdempotencyKeyReused(BusinessRuleError):
+    """Raised when an idempotency key is sent again with different parameters."""
+
+    def __init__(self):
+        super().__init__(
+            message='This idempotency key was already used with different parameters',
+            rule_name='idempotency_key_reused',
+        )
+
+
+def clean_idempotency_key(key: Optional[str]) -> Optional[str]:
+    """Return the stripped key, None when absent; reject oversized keys."""
+    key = (key or '').strip()
+    if not key:
+        return None
+    if len(key) > MAX_KEY_LENGTH:
+        raise ValidationError(
+            f'Idempotency key must be at most {MAX_KEY_LENGTH} characters',
+            field='idempotency_key',
+        )
+    return key
+
+
+def request_idempotency_key(request) -> Optional[str]:
+    """Idempotency key sent with a request, as a header or a form field."""
+    return clean_idempotency_key(
+        request.headers.get(IDEMPOTENCY_HEADER) or request.POST.get('idempotency_key')
+    )
+
+
+def _encode(value):
+    if isinstance(value, models.Model):
+        return f'{value._meta.label}:{value.pk}'
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: getattr(value, f.name) for f in dataclasses.fields(value)}
+    if hasattr(value, 'lists'):  # QueryDict
+        return dict(value.lists())
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def fingerprint(*parts) -> str:
+    """Stable hash of the request parameters an idempotency key is bound to."""
+    payload = json.dumps(parts, sort_keys=True, default=_encode)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class IdempotencyClaim:
+    """Outcome of claiming a key: either ownership or the stored result."""
+    key: str
+    fingerprint: str
+    token: str = ''
+    replayed: bool = False
+    value: Any = None
+
+
+class IdempotencyStore:
+    """
+    Keyed result store in the shared cache.
+
+    Records are ``{'state': 'pending'|'done', 'fingerprint', 'token'|'value'}``.
+    """
+
+    def __init__(self, cache=None):
+        self._cache = cache
+
+    @property
+    def cache(self):
+        if self._cache is not None:
+            return self._cache
+        return get_tiered_cache('idempotency', local=False)
+
+    @staticmethod
+    def record_key(scope: str, key: str) -> str:
+        return f'{scope}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+    def claim(self, scope: str, key: str, request_fingerprint: str) -> IdempotencyClaim:
+        """
+        Claim ``key`` for this request, or return the result stored for it.
+
+        Waits for a concurrent request holding the key to finish.
+        """
+        record_key = self.record_key(scope, key)
+        token = uuid.uuid4().hex
+        pending = {'state': _PENDING, 'fingerprint': request_fingerprint, 'token': token}
+        deadline = time.monotonic() + getattr(settings, 'IDEMPOTENCY_WAIT', 5)
+        delay = 0.01
+        while True:
+            if self.cache.add(record_key, pending, getattr(settings, 'IDEMPOTENCY_LOCK_TTL', 60)):
+                return IdempotencyClaim(record_key, request_fingerprint, token=token)
+            record = self.cache.get(record_key)
+            if record is not None:
+                if record['fingerprint'] != request_fingerprint:
+                    raise IdempotencyKeyReused()
+                if record['state'] == _DONE:
+                    return IdempotencyClaim(
+                        record_key, request_fingerprint, replayed=True, value=record['value']
+                    )
+            # Still pending, or released/expired in between: claim again after a pause
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress()
+            time.sleep(delay)
+            delay = min(delay * 2, 0.1)
+
+    def complete(self, claim: IdempotencyClaim, value):
+        """Store the result for replay once the current transaction commits."""
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(lambda: self._store(claim, value))
+        else:
+            self._store(claim, value)
+
+    def _store(self, claim, value):
+        if not self._owns(claim):
+            return  # the claim expired and another request took the key
+        record = {'state': _DONE, 'fingerprint': claim.fingerprint, 'value': value}
+        try:
+            self.cache.set(claim.key, record, getattr(settings, 'IDEMPOTENCY_TTL', 86400))
+        except Exception:
+            logger.warning('Could not store idempotent result for %s', claim.key, exc_info=True)
+            self.cache.delete(claim.key)
+
+    def release(self, claim: IdempotencyClaim):
+        """Give up the claim so a retry runs the request again."""
+        if self._owns(claim):
+            self.cache.delete(claim.key)
+
+    def _owns(self, claim) -> bool:
+        record = self.cache.get(claim.key)
+        return record is None or record.get('token') == claim.token
+
+    def run(self, scope: str, key: str, request_fingerprint: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``func`` once per key; returns ``(result, replayed)``."""
+        claim = self.claim(scope, key, request_fingerprint)
+        if claim.replayed:
+            return claim.value, True
+        try:
+            value = func()
+        except BaseException:
+            self.release(claim)
+            raise
+        self.complete(claim, value)
+        return value, False
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _actor(arguments):
+    actor = arguments.get('actor') or arguments.get('user')
+    if actor is None and 'command' in arguments:
+        actor = getattr(arguments['command'], 'actor', None)
+    return getattr(actor, 'pk', None)
+
+
+def idempotent(operation: str):
+    """
+    Make a use case ``execute`` method honour its ``idempotency_key`` argument.
+
+    The key is scoped to ``operation`` and the acting user (``actor``,
+    ``user`` or ``command.actor``); the remaining arguments form the
+    fingerprint. Calls without a key run unchanged.
+    """
+    def decorator(execute):
+        signature = inspect.signature(execute)
+
+        @functools.wraps(execute)
+        def wrapper(*args, **kwargs):
+            arguments = signature.bind(*args, **kwargs).arguments
+            key = clean_idempotency_key(arguments.get('idempotency_key'))
+            if key is None:
+                return execute(*args, **kwargs)
+            params = {
+                name: value for name, value in arguments.items() if name not in _UNFINGERPRINTED
+            }
+            result, _ = idempotency_store.run(
+                f'{operation}:{_actor(arguments)}', key, fingerprint(params),
+                lambda: execute(*args, **kwargs),
+            )
+            return result
+
+        wrapper.idempotent_operation = operation
+        return wrapper
+
+    return decorator
+
+
+# =============================================================================
+# REST API
+# =============================================================================
+
+class IdempotencyAPIError(APIException):
+    """DRF rendering of the idempotency domain errors."""
+
+    def __init__(self, exc: DomainException):
+        self.status_code = ExceptionMapper.get_status_code(exc)
+        super().__init__(detail=exc.message, code=exc.code)
+
+
+class _Replay(Exception):
+    def __init__(self, stored):
+        self.stored = stored
+
+
+class IdempotentAPIMixin:
+    """
+    Honour the ``Idempotency-Key`` header on unsafe methods of a DRF view.
+
+    Responses below 500 are stored per user, method and path and replayed
+    with an ``Idempotent-Replayed: true`` header. Place before the DRF base
+    class: ``class TicketViewSet(IdempotentAPIMixin, viewsets.ModelViewSet)``.
+    """
+
+    idempotent_methods = ('POST', 'PUT', 'PATCH', 'DELETE')
+    idempotency_claim = None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in self.idempotent_methods:
+            return
+        try:
+            key = clean_idempotency_key(request.headers.get(IDEMPOTENCY_HEADER))
+            if key is None:
+                return
+            scope = f'api:{request.user.pk}:{request.method}:{request.path}'
+            claim = idempotency_store.claim(scope, key, fingerprint(request.data))
+        except DomainException as exc:
+            raise IdempotencyAPIError(exc)
+        if claim.replayed:
+            raise _Replay(claim.value)
+        self.idempotency_claim = claim
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _Replay):
+            headers = dict(exc.stored['headers'], **{REPLAYED_HEADER: 'true'})
+            return Response(exc.stored['data'], status=exc.stored['status'], headers=headers)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        claim, self.idempotency_claim = self.idempotency_claim, None
+        if claim is not None:
+            if isinstance(response, Response) and response.status_code < 500:
+                idempotency_store.complete(claim, {
+                    'status': response.status_code,
+                    'data': response.data,
+                    'headers': {'Location': response['Location']} if response.has_header('Location') else {},
+                })
+            else:
+                idempotency_store.release(claim)
+        return response
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            # Unhandled exceptions skip finalize_response
+            claim, self.idempotency_claim = self.idempotency_claim, None
+            if claim is not None:
+                idempotency_store.release(claim)
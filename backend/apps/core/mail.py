@@ -0,0 +1,147 @@
+"""
+Notification transports for IT Management Platform.
+
+The notification pipeline hands each digest to the transport, which
+reuses pooled connections, so a digest run costs one SMTP session instead
+of one per message.
+``NOTIFICATION_TRANSPORT`` names the transport class:
+
+- ``apps.core.mail.EmailTransport`` (default) sends through Django's email
+  backends, ``NOTIFICATION_EMAIL_BACKEND`` or ``EMAIL_BACKEND``: SMTP in
+  production, the console or file backend locally, locmem in tests.
+  Connections are pooled: up to ``NOTIFICATION_SMTP_POOL_SIZE`` stay open
+  between flushes and are reopened after ``NOTIFICATION_SMTP_MAX_IDLE``
+  seconds unused, before the server drops them.
+
+Transports raise on delivery errors; the pipeline keeps the digest's
+notifications queued and retries them on the next flush.
+"""
+
+import logging
+import queue
+import smtplib
+import threading
+import time
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationTransport:
+    """Delivers a batch of email messages; returns how many were sent."""
+
+    def send_messages(self, messages: List[EmailMessage]) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release held connections."""
+
+
+class _PooledConnection:
+    def __init__(self, connection):
+        self.connection = connection
+        self.last_used = time.monotonic()
+
+
+class EmailTransport(NotificationTransport):
+    """
+    Django email backend connections kept open in a bounded pool.
+    """
+
+    def __init__(self, backend: Optional[str] = None, pool_size: int = None, max_idle: float = None):
+        self.backend = backend or getattr(settings, 'NOTIFICATION_EMAIL_BACKEND', None)
+        self.pool_size = pool_size if pool_size is not None else getattr(
+            settings, 'NOTIFICATION_SMTP_POOL_SIZE', 2
+        )
+        self.max_idle = max_idle if max_idle is not None else getattr(
+            settings, 'NOTIFICATION_SMTP_MAX_IDLE', 30
+        )
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def _acquire(self) -> _PooledConnection:
+        while True:
+            try:
+                pooled = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - pooled.last_used < self.max_idle:
+                return pooled
+            self._close(pooled)
+        connection = get_connection(self.backend, fail_silently=False)
+        # Opened here, so send_messages() leaves it open afterwards
+        connection.open()
+        with self._lock:
+            self.opened += 1
+        return _PooledConnection(connection)
+
+    def _release(self, pooled: _PooledConnection) -> None:
+        pooled.last_used = time.monotonic()
+        if self._idle.qsize() < self.pool_size:
+            self._idle.put(pooled)
+        else:
+            self._close(pooled)
+
+    @staticmethod
+    def _close(pooled: _PooledConnection) -> None:
+        try:
+            pooled.connection.close()
+        except Exception:
+            logger.debug('Error closing pooled email connection', exc_info=True)
+
+    def send_messages(self, messages: List[EmailMessage]) -> int:
+        if not messages:
+            return 0
+        pooled = self._acquire()
+        try:
+            sent = pooled.connection.send_messages(messages)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped an idle connection; retry once on a new one
+            self._close(pooled)
+            pooled = self._acquire()
+            try:
+                sent = pooled.connection.send_messages(messages)
+            except Exception:
+                self._close(pooled)
+                raise
+        except Exception:
+            self._close(pooled)
+            raise
+        self._release(pooled)
+        return sent or 0
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._close(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+_transport: Optional[NotificationTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_notification_transport() -> NotificationTransport:
+    """Return the process-wide transport configured by ``NOTIFICATION_TRANSPORT``."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                from apps.core.events import import_by_name
+                path = getattr(settings, 'NOTIFICATION_TRANSPORT', 'apps.core.mail.EmailTransport')
+                _transport = import_by_name(path)()
+    return _transport
+
+
+def reset_notification_transport() -> None:
+    """Close and forget the process-wide transport (tests, settings changes)."""
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = None
@@ -0,0 +1,53 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.core.domain.roles import VALID_ROLES
+from apps.core.services.permission_engine import bulk_permissions
+from apps.tickets.domain.services.ticket_authority import get_permissions
+from apps.tickets.models import Ticket
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark ticket permission flags computed per object by the authority '
+        'against the compiled permission tables. Uses unsaved objects only.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help='Number of tickets')
+        parser.add_argument('--role', default='TECHNICIAN', choices=sorted(VALID_ROLES))
+
+    def handle(self, *args, **options):
+        count = options['count']
+        actor = User(id=1, username='benchmark', role=options['role'])
+        rng = random.Random(0)
+        tickets = [
+            Ticket(id=i, assigned_to_id=rng.choice([None, actor.id, 2, 3]))
+            for i in range(1, count + 1)
+        ]
+
+        start = time.perf_counter()
+        per_object = {ticket.id: get_permissions(actor, ticket) for ticket in tickets}
+        authority_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compiled = bulk_permissions(actor, tickets, 'ticket')
+        table_elapsed = time.perf_counter() - start
+
+        mismatches = sum(
+            1 for ticket in tickets
+            if {key: compiled[ticket.id][key] for key in per_object[ticket.id]}
+            != per_object[ticket.id]
+        )
+
+        self.stdout.write(f'Tickets: {count} (actor role {actor.role})')
+        self.stdout.write(f'Per-object authority: {authority_elapsed * 1000:.1f} ms')
+        self.stdout.write(f'Compiled tables:      {table_elapsed * 1000:.1f} ms')
+        self.stdout.write(f'Speed-up: {authority_elapsed / table_elapsed:.1f}x')
+        if mismatches:
+            self.stdout.write(self.style.ERROR(f'Mismatching tickets: {mismatches}'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Compiled flags match the authority'))
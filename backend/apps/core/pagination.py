@@ -0,0 +1,147 @@
+"""
+Keyset (cursor) pagination for IT Management Platform.
+
+Pages are addressed by the sort key of their boundary rows instead of an
+OFFSET, so every page costs one indexed range query no matter how deep the
+user scrolls, and rows inserted meanwhile do not shift the pages.
+
+Usage:
+    page = keyset_paginate(
+        Ticket.objects.select_related('assigned_to'),
+        ordering=('-created_at', '-id'),
+        cursor=request.GET.get('cursor'),
+        page_size=50,
+    )
+    page.items          # rows of this page, in ``ordering`` order
+    page.next_cursor    # pass back as ``cursor`` for the following page
+    page.previous_cursor
+"""
+
+import base64
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence
+
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded for the given ordering."""
+
+
+@dataclass
+class KeysetPage:
+    """One page of a keyset-paginated queryset."""
+    items: List[Any] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    previous_cursor: Optional[str] = None
+    page_size: int = 0
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+
+def _parse_ordering(ordering: Sequence[str]):
+    fields = []
+    for term in ordering:
+        descending = term.startswith('-')
+        fields.append((term.lstrip('-'), descending))
+    return fields
+
+
+def _json_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def encode_cursor(values: Sequence[Any], direction: str = 'next') -> str:
+    """Encode boundary sort values into an opaque URL-safe cursor."""
+    payload = json.dumps({'d': direction, 'v': [_json_value(v) for v in values]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, model, fields):
+    """Decode a cursor into (direction, typed boundary values)."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        direction, raw_values = payload['d'], payload['v']
+        if direction not in ('next', 'previous') or len(raw_values) != len(fields):
+            raise ValueError('cursor does not match ordering')
+        values = [
+            model._meta.get_field(name).to_python(raw)
+            for (name, _), raw in zip(fields, raw_values)
+        ]
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {str(e)}") from e
+    return direction, values
+
+
+def _after(fields, values, reverse=False) -> Q:
+    """
+    Build the filter selecting rows strictly after ``values`` in the ordering
+    (or strictly before when ``reverse`` is True).
+    """
+    condition = Q()
+    for index, (name, descending) in enumerate(fields):
+        forward_is_lt = descending != reverse
+        lookup = f'{name}__lt' if forward_is_lt else f'{name}__gt'
+        term = Q(**{lookup: values[index]})
+        for prev_index in range(index):
+            term &= Q(**{fields[prev_index][0]: values[prev_index]})
+        condition |= term
+    return condition
+
+
+def _row_values(row, fields):
+    return [getattr(row, name) for name, _ in fields]
+
+
+def keyset_paginate(
+    queryset: QuerySet,
+    ordering: Sequence[str] = ('-created_at', '-id'),
+    cursor: Optional[str] = None,
+    page_size: int = 50,
+) -> KeysetPage:
+    """
+    Return one page of ``queryset`` using keyset pagination.
+
+    ``ordering`` must be a unique, non-null sort key (end it with the primary
+    key). Invalid cursors raise ``InvalidCursor``.
+    """
+    fields = _parse_ordering(ordering)
+    direction, values = 'next', None
+    if cursor:
+        direction, values = decode_cursor(cursor, queryset.model, fields)
+
+    if direction == 'previous':
+        reversed_ordering = [
+            name if descending else f'-{name}' for name, descending in fields
+        ]
+        qs = queryset.filter(_after(fields, values, reverse=True)).order_by(*reversed_ordering)
+        rows = list(qs[:page_size + 1])
+        has_more_before = len(rows) > page_size
+        items = list(reversed(rows[:page_size]))
+        has_more_after = True
+    else:
+        qs = queryset.order_by(*ordering)
+        if values is not None:
+            qs = qs.filter(_after(fields, values))
+        rows = list(qs[:page_size + 1])
+        has_more_after = len(rows) > page_size
+        items = rows[:page_size]
+        has_more_before = values is not None
+
+    page = KeysetPage(items=items, page_size=page_size)
+    if items and has_more_after:
+        page.next_cursor = encode_cursor(_row_values(items[-1], fields), 'next')
+    if items and has_more_before:
+        page.previous_cursor = encode_cursor(_row_values(items[0], fields), 'previous')
+    return page
@@ -0,0 +1,298 @@
+"""
+Per-request SQL instrumentation for IT Management Platform.
+
+QueryBudgetMiddleware records every query a request runs: the count, the
+total database time, and fingerprints (SQL with parameters and IN lists
+collapsed) so the same statement repeated per row shows up as an N+1
+together with the application line that issued it. Finding that line
+walks the stack, so it is only done once a statement has repeated
+``QUERY_BUDGET_DUPLICATE_THRESHOLD`` times.
+
+- In DEBUG the summary is returned as ``X-Query-*`` and ``Server-Timing``
+  response headers.
+- Requests over their budget or with N+1 patterns log one JSON line to
+  the ``it_management_platform.queries`` logger.
+- Budgets are declared per URL name in ``QUERY_BUDGETS`` (or registered
+  with ``query_budgets.register``). With ``QUERY_BUDGET_STRICT`` a request
+  over its budget raises QueryBudgetExceeded, which fails the test that
+  made it.
+
+Tests can also wrap any block directly:
+
+    with assert_query_budget(max_queries=5):
+        build_tickets_permissions_map(user, tickets)
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('it_management_platform.queries')
+
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*%s\s*,?)+\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+
+# Frames from these paths are never reported as the origin of a query
+_SKIPPED_PATHS = (
+    os.path.dirname(os.path.abspath(__file__)) + os.sep + 'query_budget.py',
+    os.sep + 'django' + os.sep,
+    os.sep + 'rest_framework' + os.sep,
+    os.sep + 'site-packages' + os.sep,
+)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request runs more queries than its budget."""
+
+
+def fingerprint(sql: str) -> str:
+    """Normalize SQL so statements differing only in parameters compare equal."""
+    sql = _IN_LIST.sub('IN (...)', sql)
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    return ' '.join(sql.split())
+
+
+def _call_site() -> str:
+    """
+    Return ``path:line in function`` of the innermost application frame.
+
+    Queries issued while rendering a template (lazy relations in
+    ``{{ asset.category.name }}``) report the template line instead.
+    """
+    frame = sys._getframe(2)
+    base_dir = str(getattr(settings, 'BASE_DIR', ''))
+    while frame is not None:
+        code = frame.f_code
+        if code.co_name == 'render_annotated':
+            node = frame.f_locals.get('self')
+            origin, token = getattr(node, 'origin', None), getattr(node, 'token', None)
+            if origin is not None and token is not None:
+                return f'{origin.template_name}:{token.lineno}'
+        filename = code.co_filename
+        if not any(part in filename for part in _SKIPPED_PATHS):
+            if base_dir and filename.startswith(base_dir):
+                filename = os.path.relpath(filename, base_dir)
+            return f'{filename}:{frame.f_lineno} in {code.co_name}'
+        frame = frame.f_back
+    return 'unknown'
+
+
+@dataclass
+class QueryBudget:
+    max_queries: Optional[int] = None
+    max_duplicates: Optional[int] = None
+
+
+@dataclass
+class FingerprintStats:
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    # Counted from the duplicate_threshold-th execution on
+    call_sites: Dict[str, int] = field(default_factory=dict)
+
+
+class QueryRecorder:
+    """
+    Record the queries run on every database connection of this thread.
+
+    Usable as a context manager; ``summary()`` and ``violations()`` can be
+    called afterwards.
+    """
+
+    def __init__(self, duplicate_threshold: int = None):
+        self.duplicate_threshold = duplicate_threshold if duplicate_threshold is not None else getattr(
+            settings, 'QUERY_BUDGET_DUPLICATE_THRESHOLD', 3
+        )
+        self.count = 0
+        self.total_ms = 0.0
+        self.fingerprints: Dict[str, FingerprintStats] = OrderedDict()
+        self._stack = None
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+        self._stack = None
+        return False
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            key = fingerprint(sql)
+            stats = self.fingerprints.get(key)
+            if stats is None:
+                stats = self.fingerprints[key] = FingerprintStats(sql=key)
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            if stats.count >= self.duplicate_threshold:
+                site = _call_site()
+                stats.call_sites[site] = stats.call_sites.get(site, 0) + 1
+            self.count += 1
+            self.total_ms += elapsed_ms
+
+    def duplicates(self) -> List[FingerprintStats]:
+        """Fingerprints repeated at least ``duplicate_threshold`` times, most frequent first."""
+        repeated = [s for s in self.fingerprints.values() if s.count >= self.duplicate_threshold]
+        return sorted(repeated, key=lambda s: s.count, reverse=True)
+
+    def violations(self, budget: Optional[QueryBudget]) -> List[str]:
+        if budget is None:
+            return []
+        problems = []
+        if budget.max_queries is not None and self.count > budget.max_queries:
+            problems.append(f'{self.count} queries (budget {budget.max_queries})')
+        if budget.max_duplicates is not None:
+            worst = max((s.count for s in self.fingerprints.values()), default=0)
+            if worst > budget.max_duplicates:
+                problems.append(f'a statement ran {worst} times (budget {budget.max_duplicates})')
+        return problems
+
+    def summary(self) -> dict:
+        return {
+            'queries': self.count,
+            'db_ms': round(self.total_ms, 2),
+            'duplicates': [
+                {
+                    'sql': stats.sql[:300],
+                    'count': stats.count,
+                    'db_ms': round(stats.total_ms, 2),
+                    'call_sites': sorted(stats.call_sites, key=stats.call_sites.get, reverse=True)[:3],
+                }
+                for stats in self.duplicates()
+            ],
+        }
+
+    def report(self) -> str:
+        lines = [f'{self.count} queries in {self.total_ms:.1f} ms']
+        for stats in self.duplicates():
+            lines.append(f'  {stats.count}x {stats.sql[:200]}')
+            for site, count in stats.call_sites.items():
+                lines.append(f'      {count}x from {site}')
+        return '\n'.join(lines)
+
+
+class QueryBudgetRegistry:
+    """
+    Query budgets per URL name (``namespace:name``).
+
+    Entries in the ``QUERY_BUDGETS`` setting take precedence over
+    budgets registered in code. Values are either the maximum number of
+    queries or a dict with ``max_queries`` and/or ``max_duplicates``.
+    """
+
+    def __init__(self):
+        self._budgets: Dict[str, QueryBudget] = {}
+        self._lock = threading.Lock()
+
+    def register(self, view_name: str, max_queries: int = None, max_duplicates: int = None):
+        with self._lock:
+            self._budgets[view_name] = QueryBudget(max_queries, max_duplicates)
+
+    def unregister(self, view_name: str):
+        with self._lock:
+            self._budgets.pop(view_name, None)
+
+    def get(self, view_name: Optional[str]) -> Optional[QueryBudget]:
+        if not view_name:
+            return None
+        configured = getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+        if configured is None:
+            return self._budgets.get(view_name)
+        if isinstance(configured, dict):
+            return QueryBudget(configured.get('max_queries'), configured.get('max_duplicates'))
+        return QueryBudget(max_queries=configured)
+
+
+query_budgets = QueryBudgetRegistry()
+
+
+@contextmanager
+def assert_query_budget(max_queries: int = None, max_duplicates: int = None, view_name: str = None):
+    """
+    Fail with a report of the repeated queries and their call sites when the
+    block exceeds the given budget, or the budget registered for ``view_name``.
+    """
+    budget = query_budgets.get(view_name) if view_name else QueryBudget(max_queries, max_duplicates)
+    with QueryRecorder() as recorder:
+        yield recorder
+    problems = recorder.violations(budget)
+    if problems:
+        raise AssertionError(f"Query budget exceeded: {'; '.join(problems)}\n{recorder.report()}")
+
+
+class QueryBudgetMiddleware:
+    """
+    Middleware recording the SQL run by each request.
+
+    Place it before SessionMiddleware so session and authentication
+    queries are counted too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not getattr(settings, 'QUERY_BUDGET_ENABLED', True):
+            return self.get_response(request)
+
+        with QueryRecorder() as recorder:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        view_name = match.view_name if match else None
+        budget = query_budgets.get(view_name)
+        problems = recorder.violations(budget)
+
+        if getattr(settings, 'QUERY_BUDGET_HEADERS', settings.DEBUG):
+            self.add_headers(response, recorder, budget)
+        self.log(request, response, view_name, recorder, budget, problems)
+
+        if problems and getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(
+                f"{request.method} {request.path} ({view_name}): {'; '.join(problems)}\n{recorder.report()}"
+            )
+        return response
+
+    def add_headers(self, response, recorder, budget):
+        response['X-Query-Count'] = str(recorder.count)
+        response['X-Query-Time-Ms'] = f'{recorder.total_ms:.1f}'
+        response['X-Query-Duplicates'] = str(len(recorder.duplicates()))
+        if budget is not None and budget.max_queries is not None:
+            response['X-Query-Budget'] = str(budget.max_queries)
+        response['Server-Timing'] = f'db;dur={recorder.total_ms:.1f};desc="{recorder.count} queries"'
+
+    def log(self, request, response, view_name, recorder, budget, problems):
+        level = logging.WARNING if problems or recorder.duplicates() else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        entry = {
+            'method': request.method,
+            'path': request.path,
+            'view': view_name,
+            'status': response.status_code,
+            'budget': budget.max_queries if budget else None,
+            'violations': problems,
+            **recorder.summary(),
+        }
+        logger.log(level, f'Query budget: {json.dumps(entry)}')
@@ -0,0 +1,320 @@
+"""
+Compiled permission tables for IT Management Platform.
+
+The authority modules decide object permissions from two inputs only: the
+actor's role and the relation between actor and object (who the object is
+assigned to, whether the actor is a project member, whether the target user
+is the actor or has a given role). None of them read the object status.
+
+Each authority is therefore evaluated once per (role, relation) against
+probe objects, and the resulting flags are stored in a decision table.
+Lists then classify every object (one attribute read, or one query for
+project membership) and look its flags up instead of re-running the role
+checks per object and per flag:
+
+    perms = bulk_permissions(request.user, tickets)
+    perms[ticket.id]['can_edit']
+
+The same table drives ``queryset_filter``, which turns the relations
+allowed for an action into a ``Q`` object:
+
+    Ticket.objects.filter(queryset_filter(request.user, 'can_edit', 'ticket'))
+
+In ``bulk_permissions``, actors or target users with a role outside
+``VALID_ROLES`` fall back to calling the authority functions, so the
+results always match the authority modules.
+"""
+
+from dataclasses import dataclass
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from django.db.models import Exists, OuterRef, Q
+
+from apps.core.domain.roles import VALID_ROLES
+
+# Id used by probe objects for "some other user"
+PROBE_OTHER_USER_ID = -1
+
+
+@dataclass(frozen=True)
+class ResourceSpec:
+    """How to evaluate and classify one kind of object."""
+    name: str
+    model_label: str
+    relations: Tuple[str, ...]
+    evaluate: Callable          # (user, obj) -> dict of permission flags
+    classify: Callable          # (user, obj, context) -> relation
+    probe: Callable             # (actor, relation) -> stand-in object
+    relation_q: Callable        # (user, relation) -> Q
+    prepare: Optional[Callable] = None  # (user, objects) -> classification context
+
+
+def _object_id(obj):
+    return obj['id'] if isinstance(obj, dict) else obj.id
+
+
+# -----------------------------------------------------------------------------
+# Assignment-based resources (tickets, assets)
+# -----------------------------------------------------------------------------
+
+def _assignment_relation(user, obj, context=None) -> str:
+    assigned_to_id = obj.get('assigned_to_id') if isinstance(obj, dict) else obj.assigned_to_id
+    if assigned_to_id is None:
+        return 'unassigned'
+    if assigned_to_id == user.id:
+        return 'mine'
+    return 'other'
+
+
+def _assignment_probe(actor, relation):
+    assigned_to_id = {
+        'mine': actor.id,
+        'unassigned': None,
+        'other': PROBE_OTHER_USER_ID,
+    }[relation]
+    return SimpleNamespace(id=None, pk=None, assigned_to_id=assigned_to_id)
+
+
+def _assignment_q(user, relation) -> Q:
+    if relation == 'mine':
+        return Q(assigned_to_id=user.id)
+    if relation == 'unassigned':
+        return Q(assigned_to__isnull=True)
+    return Q(assigned_to__isnull=False) & ~Q(assigned_to_id=user.id)
+
+
+def _ticket_permissions(user, ticket) -> dict:
+    from apps.tickets.domain.services import ticket_authority
+    permissions = ticket_authority.get_permissions(user, ticket)
+    permissions['can_assign_to_self'] = ticket_authority.can_assign_to_self(user, ticket)
+    return permissions
+
+
+def _asset_permissions(user, asset) -> dict:
+    from apps.assets.domain.services import asset_authority
+    permissions = asset_authority.get_permissions(user, asset)
+    permissions['can_assign_to_self'] = asset_authority.can_assign_to_self(user, asset)
+    return permissions
+
+
+# -----------------------------------------------------------------------------
+# Projects (membership-based)
+# -----------------------------------------------------------------------------
+
+def _project_permissions(user, project) -> dict:
+    from apps.projects.domain.services import project_authority
+    return project_authority.get_permissions(user, project)
+
+
+def _project_memberships(user, projects) -> set:
+    """Ids of the given projects the user is an active member of (one query)."""
+    from apps.projects.models import ProjectMember
+    project_ids = [_object_id(project) for project in projects]
+    if not project_ids:
+        return set()
+    return set(
+        ProjectMember.objects.filter(
+            user_id=user.id, is_active=True, project_id__in=project_ids,
+        ).values_list('project_id', flat=True)
+    )
+
+
+def _project_relation(user, project, member_project_ids) -> str:
+    return 'member' if _object_id(project) in member_project_ids else 'non_member'
+
+
+def _project_probe(actor, relation):
+    member_ids = {actor.id} if relation == 'member' else set()
+    return SimpleNamespace(id=None, pk=None, active_member_ids=member_ids)
+
+
+def _project_q(user, relation) -> Q:
+    from apps.projects.models import ProjectMember
+    membership = Exists(
+        ProjectMember.objects.filter(project=OuterRef('pk'), user_id=user.id, is_active=True)
+    )
+    return Q(membership) if relation == 'member' else ~Q(membership)
+
+
+# -----------------------------------------------------------------------------
+# Users (self / target role)
+# -----------------------------------------------------------------------------
+
+USER_RELATIONS = ('self',) + tuple(f'role:{role}' for role in sorted(VALID_ROLES))
+
+
+def _user_permissions(actor, target) -> dict:
+    from apps.users.domain.services import user_authority
+    return user_authority.get_permissions(actor, target)
+
+
+def _user_relation(actor, target, context=None) -> str:
+    if target.pk == actor.pk:
+        return 'self'
+    return f'role:{target.role}'
+
+
+def _user_probe(actor, relation):
+    if relation == 'self':
+        return actor
+    return SimpleNamespace(
+        id=PROBE_OTHER_USER_ID, pk=PROBE_OTHER_USER_ID,
+        role=relation.split(':', 1)[1], username='probe',
+    )
+
+
+def _user_q(actor, relation) -> Q:
+    if relation == 'self':
+        return Q(pk=actor.pk)
+    return Q(role=relation.split(':', 1)[1]) & ~Q(pk=actor.pk)
+
+
+RESOURCES: Dict[str, ResourceSpec] = {
+    'ticket': ResourceSpec(
+        name='ticket',
+        model_label='tickets.ticket',
+        relations=('mine', 'unassigned', 'other'),
+        evaluate=_ticket_permissions,
+        classify=_assignment_relation,
+        probe=_assignment_probe,
+        relation_q=_assignment_q,
+    ),
+    'asset': ResourceSpec(
+        name='asset',
+        model_label='assets.asset',
+        relations=('mine', 'unassigned', 'other'),
+        evaluate=_asset_permissions,
+        classify=_assignment_relation,
+        probe=_assignment_probe,
+        relation_q=_assignment_q,
+    ),
+    'project': ResourceSpec(
+        name='project',
+        model_label='projects.project',
+        relations=('member', 'non_member'),
+        evaluate=_project_permissions,
+        classify=_project_relation,
+        probe=_project_probe,
+        relation_q=_project_q,
+        prepare=_project_memberships,
+    ),
+    'user': ResourceSpec(
+        name='user',
+        model_label='users.user',
+        relations=USER_RELATIONS,
+        evaluate=_user_permissions,
+        classify=_user_relation,
+        probe=_user_probe,
+        relation_q=_user_q,
+    ),
+}
+
+
+class PermissionTable:
+    """Decision table for one resource, keyed by (actor role, relation)."""
+
+    def __init__(self, spec: ResourceSpec):
+        self.spec = spec
+        self._table: Optional[Dict[Tuple[str, str], dict]] = None
+
+    @property
+    def table(self) -> Dict[Tuple[str, str], dict]:
+        if self._table is None:
+            self._table = self.compile()
+        return self._table
+
+    def compile(self) -> Dict[Tuple[str, str], dict]:
+        """Evaluate the authority once for every role and relation."""
+        table = {}
+        for role in sorted(VALID_ROLES):
+            actor = SimpleNamespace(id=0, pk=0, role=role, username='probe')
+            for relation in self.spec.relations:
+                flags = self.spec.evaluate(actor, self.spec.probe(actor, relation))
+                table[(role, relation)] = flags
+        return table
+
+    def lookup(self, user, relation: str) -> Optional[dict]:
+        return self.table.get((user.role, relation))
+
+    def bulk_permissions(self, user, objects: Iterable) -> Dict[object, dict]:
+        """
+        Return ``{object id: permission flags}`` for ``objects``.
+
+        Objects of the same relation share one (read-only) flags dict.
+        """
+        objects = list(objects)
+        context = self.spec.prepare(user, objects) if self.spec.prepare else None
+        permissions = {}
+        for obj in objects:
+            flags = self.lookup(user, self.spec.classify(user, obj, context))
+            if flags is None:
+                flags = self.spec.evaluate(user, obj)
+            permissions[_object_id(obj)] = flags
+        return permissions
+
+    def allowed_relations(self, user, action: str) -> Optional[Tuple[str, ...]]:
+        """Relations for which ``action`` is allowed, or None for unknown roles."""
+        if user.role not in VALID_ROLES:
+            return None
+        return tuple(
+            relation for relation in self.spec.relations
+            if self.table[(user.role, relation)].get(action, False)
+        )
+
+    def queryset_filter(self, user, action: str) -> Q:
+        """
+        Return a ``Q`` selecting the objects on which ``user`` may perform
+        ``action``, equivalent to filtering the authority per object.
+
+        Actors with an unknown role match nothing.
+        """
+        if action not in self.table[next(iter(self.table))]:
+            raise ValueError(f"Unknown {self.spec.name} action: {action}")
+        relations = self.allowed_relations(user, action)
+        if not relations:
+            return Q(pk__in=[])
+        if len(relations) == len(self.spec.relations):
+            return Q()
+        condition = Q()
+        for relation in relations:
+            condition |= self.spec.relation_q(user, relation)
+        return condition
+
+
+permission_tables: Dict[str, PermissionTable] = {
+    name: PermissionTable(spec) for name, spec in RESOURCES.items()
+}
+
+_tables_by_model = {table.spec.model_label: table for table in permission_tables.values()}
+
+
+def get_permission_table(resource) -> PermissionTable:
+    """Return the table for a resource name ('ticket') or model instance/class."""
+    if isinstance(resource, str):
+        try:
+            return permission_tables[resource]
+        except KeyError:
+            raise ValueError(f"Unknown permission resource: {resource}")
+    label = resource._meta.label_lower
+    try:
+        return _tables_by_model[label]
+    except KeyError:
+        raise ValueError(f"No permission table for model: {label}")
+
+
+def bulk_permissions(user, objects: Iterable, resource=None) -> Dict[object, dict]:
+    """
+    Permission flags for many objects of one resource.
+
+    ``resource`` defaults to the model of the first object.
+    """
+    objects = list(objects)
+    if not objects:
+        return {}
+    return get_permission_table(resource or objects[0]).bulk_permissions(user, objects)
+
+
+def queryset_filter(user, action: str, resource) -> Q:
+    """``Q`` object restricting a queryset of ``resource`` to allowed objects."""
+    return get_permission_table(resource).queryset_filter(user, action)
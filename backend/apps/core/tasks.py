@@ -0,0 +1,27 @@
+import logging
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def handle_event_batch(batch):
+    """Run a micro-batch of event handler runs sent by CeleryExecutor."""
+    from apps.core.events import deserialize_event, import_by_name, run_handler
+
+    User = get_user_model()
+    actor_ids = {item['event']['actor_id'] for item in batch if item['event'].get('actor_id')}
+    actors = User.objects.in_bulk(actor_ids) if actor_ids else {}
+
+    for item in batch:
+        try:
+            handler = import_by_name(item['handler'])
+            event = deserialize_event(item['event'], actors.get(item['event'].get('actor_id')))
+        except Exception:
+            logger.exception(f"[Celery] Skipping event handler run {item.get('handler')}")
+            continue
+        run_handler(handler, event)
+
+    logger.info(f'[Celery] Handled {len(batch)} event handler runs')
+    return len(batch)
@@ -0,0 +1,190 @@
+"""
+Tests for the two-tier cache.
+"""
+
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from apps.core.cache import (
+    InMemorySharedCache, LockTimeout, TieredCache, cache_metrics, get_tiered_cache,
+)
+from apps.security.utils import get_security_counters
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    cache_metrics.reset()
+    yield
+    cache_metrics.reset()
+
+
+@pytest.fixture
+def shared():
+    return InMemorySharedCache()
+
+
+def worker(shared, namespace='stats', **kwargs):
+    """A TieredCache as seen by one worker process sharing ``shared``."""
+    return TieredCache(namespace, shared=shared, **kwargs)
+
+
+# ----------------------------------------------------------------------
+# Tiers
+# ----------------------------------------------------------------------
+
+class TestTiers:
+    def test_local_tier_serves_repeated_reads(self, shared):
+        cache = worker(shared)
+        cache.set('a', {'count': 1})
+        shared.calls.clear()
+
+        assert [cache.get('a') for _ in range(5)] == [{'count': 1}] * 5
+        assert shared.calls == {}
+        assert cache_metrics.snapshot()['stats']['local_hits'] == 5
+
+    def test_workers_share_values(self, shared):
+        first, second = worker(shared), worker(shared)
+        first.set('a', 1)
+
+        assert second.get('a') == 1
+        assert second.get('missing', 'default') == 'default'
+        metrics = cache_metrics.snapshot()['stats']
+        assert (metrics['shared_hits'], metrics['misses']) == (1, 1)
+
+    def test_deletes_reach_other_workers_within_local_ttl(self, shared):
+        first, second = worker(shared, local_ttl=0.05), worker(shared, local_ttl=0.05)
+        first.set('a', 1)
+        second.get('a')
+
+        first.delete('a')
+        assert first.get('a') is None
+        time.sleep(0.06)
+        assert second.get('a') is None
+
+    def test_shared_only_namespace_skips_local_tier(self, shared):
+        cache = worker(shared, local=False)
+        cache.set('head', 'abc')
+        shared.calls.clear()
+
+        for _ in range(3):
+            assert cache.get('head') == 'abc'
+        assert shared.calls == {'get': 3}
+
+    def test_local_tier_is_bounded(self, shared):
+        cache = worker(shared, local_size=2)
+        for key in 'abc':
+            cache.set(key, key)
+
+        assert len(cache.local) == 2
+
+    def test_returned_values_are_copies(self, shared):
+        cache = worker(shared)
+        cache.set('a', {'count': 1})
+        cache.get('a')['count'] = 99
+
+        assert cache.get('a') == {'count': 1}
+
+
+# ----------------------------------------------------------------------
+# Single-flight
+# ----------------------------------------------------------------------
+
+class TestSingleFlight:
+    def test_threads_compute_once(self, shared):
+        cache = worker(shared)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'value'
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_set('k', compute)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ['value'] * 10
+        assert len(calls) == 1
+        assert cache_metrics.snapshot()['stats']['computes'] == 1
+
+    def test_workers_compute_once(self, shared):
+        first, second = worker(shared), worker(shared)
+        calls = []
+        started = threading.Event()
+
+        def slow():
+            started.set()
+            calls.append('first')
+            time.sleep(0.1)
+            return 'value'
+
+        thread = threading.Thread(target=first.get_or_set, args=('k', slow))
+        thread.start()
+        started.wait(1)
+
+        assert second.get_or_set('k', lambda: calls.append('second')) == 'value'
+        thread.join()
+        assert calls == ['first']
+
+    def test_compute_errors_propagate(self, shared):
+        cache = worker(shared)
+
+        with pytest.raises(RuntimeError):
+            cache.get_or_set('k', lambda: (_ for _ in ()).throw(RuntimeError('boom')))
+        assert cache.get_or_set('k', lambda: 'ok') == 'ok'
+
+    def test_lock_times_out(self, shared):
+        first, second = worker(shared), worker(shared)
+
+        with first.lock('k'):
+            with pytest.raises(LockTimeout):
+                with second.lock('k', wait=0.02):
+                    pass
+
+
+# ----------------------------------------------------------------------
+# Counters and hash chain
+# ----------------------------------------------------------------------
+
+class TestSharedState:
+    def test_incr_is_atomic(self, shared):
+        counters = worker(shared, namespace='counters', local=False)
+
+        threads = [
+            threading.Thread(target=lambda: [counters.incr('hits') for _ in range(50)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert counters.get('hits') == 200
+
+    def test_incr_keeps_the_window_set_at_creation(self, shared):
+        counters = worker(shared, namespace='counters', local=False)
+
+        with mock.patch('apps.core.cache.time.monotonic', return_value=1000.0):
+            counters.incr('failures', timeout=60)
+        with mock.patch('apps.core.cache.time.monotonic', return_value=1050.0):
+            assert counters.incr('failures', timeout=60) == 2
+        with mock.patch('apps.core.cache.time.monotonic', return_value=1061.0):
+            assert counters.get('failures') is None
+            assert counters.incr('failures', timeout=60) == 1
+
+    def test_failed_login_counters_use_shared_tier(self):
+        counters = get_security_counters()
+        counters.delete('failed_login_10.0.0.1')
+
+        assert counters.incr('failed_login_10.0.0.1') == 1
+        assert counters.incr('failed_login_10.0.0.1') == 2
+        assert len(counters.local) == 0
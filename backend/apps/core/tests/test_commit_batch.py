@@ -0,0 +1,77 @@
+"""
+Tests for per-transaction batching.
+"""
+
+import pytest
+from django.db import transaction
+
+from apps.core.commit_batch import CommitBatch
+
+
+class RecordingBatch(CommitBatch):
+    written = []
+
+    def __init__(self, using, key=None):
+        super().__init__(using, key=key)
+        self.items = []
+
+    def add(self, *items):
+        self.items.extend(items)
+
+    def write(self):
+        RecordingBatch.written.append(list(self.items))
+
+
+@pytest.fixture(autouse=True)
+def written():
+    RecordingBatch.written = []
+    return RecordingBatch.written
+
+
+@pytest.mark.django_db(transaction=True)
+class TestCommitBatch:
+    def test_outside_a_transaction_items_are_written_immediately(self, written):
+        RecordingBatch.queue('a')
+        RecordingBatch.queue('b')
+
+        assert written == [['a'], ['b']]
+
+    def test_one_write_per_transaction_on_commit(self, written):
+        with transaction.atomic():
+            RecordingBatch.queue('a')
+            RecordingBatch.queue('b', 'c')
+            assert written == []
+
+        assert written == [['a', 'b', 'c']]
+
+    def test_rolled_back_savepoint_discards_its_items(self, written):
+        with transaction.atomic():
+            RecordingBatch.queue('kept')
+            try:
+                with transaction.atomic():
+                    RecordingBatch.queue('discarded')
+                    raise ValueError
+            except ValueError:
+                pass
+
+        assert written == [['kept']]
+
+    def test_rolled_back_transaction_does_not_swallow_the_next_one(self, written):
+        with pytest.raises(ValueError), transaction.atomic():
+            RecordingBatch.queue('lost')
+            raise ValueError
+        with transaction.atomic():
+            RecordingBatch.queue('next')
+
+        assert written == [['next']]
+
+    def test_flush_current_writes_before_commit(self, written):
+        with transaction.atomic():
+            RecordingBatch.queue('a')
+            with transaction.atomic(savepoint=False):
+                RecordingBatch.queue('nested')
+            RecordingBatch.flush_current()
+            assert sorted(written) == [['a'], ['nested']]
+            RecordingBatch.queue('b')
+
+        assert written[2:] == [['b']]
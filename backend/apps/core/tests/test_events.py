@@ -0,0 +1,224 @@
+"""
+Tests for the async event handler executors.
+"""
+
+import threading
+
+import pytest
+
+from apps.core import events
+from apps.core.events import (
+    CeleryExecutor, ThreadPoolExecutor, DomainEvent, deserialize_event,
+    handler_metrics, handler_name, serialize_event,
+)
+from apps.core.tasks import handle_event_batch
+from apps.tickets.domain.events import TicketAssigned, TicketEventHandlers
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    handler_metrics.reset()
+    yield
+    handler_metrics.reset()
+
+
+class Gate:
+    """Handler that blocks until released and records what it handled."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.handled = []
+        self.threads = set()
+
+    def __call__(self, event):
+        self.started.set()
+        self.release.wait(5)
+        self.handled.append(event.entity_id)
+        self.threads.add(threading.get_ident())
+
+
+def make_event(entity_id):
+    return DomainEvent(entity_id=entity_id)
+
+
+# ----------------------------------------------------------------------
+# ThreadPoolExecutor
+# ----------------------------------------------------------------------
+
+class TestThreadPoolExecutor:
+    def test_flush_waits_and_forgets_completed_runs(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        handled = []
+        for i in range(20):
+            executor.submit(lambda event: handled.append(event.entity_id), make_event(i))
+
+        assert executor.flush(timeout=5)
+        assert sorted(handled) == list(range(20))
+        assert executor.stats()['pending'] == 0
+        executor.shutdown()
+
+    def test_flush_times_out(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        gate = Gate()
+        executor.submit(gate, make_event(1))
+
+        assert not executor.flush(timeout=0.05)
+        gate.release.set()
+        assert executor.flush(timeout=5)
+        executor.shutdown()
+
+    def test_drop_newest(self):
+        executor = ThreadPoolExecutor(max_workers=1, max_queue_size=2, overflow_policy='drop_newest')
+        gate = Gate()
+        for i in range(3):
+            executor.submit(gate, make_event(i))
+        gate.release.set()
+        executor.flush(timeout=5)
+
+        assert gate.handled == [0, 1]
+        assert handler_metrics.snapshot()[handler_name(gate)]['dropped'] == 1
+        executor.shutdown()
+
+    def test_drop_oldest_cancels_queued_run(self):
+        executor = ThreadPoolExecutor(max_workers=1, max_queue_size=2, overflow_policy='drop_oldest')
+        gate = Gate()
+        executor.submit(gate, make_event(0))
+        gate.started.wait(5)
+        executor.submit(gate, make_event(1))
+        executor.submit(gate, make_event(2))
+        gate.release.set()
+        executor.flush(timeout=5)
+
+        # 0 was already running, 1 was still queued
+        assert gate.handled == [0, 2]
+        executor.shutdown()
+
+    def test_caller_runs(self):
+        executor = ThreadPoolExecutor(max_workers=1, max_queue_size=1, overflow_policy='caller_runs')
+        gate = Gate()
+        threads = []
+        executor.submit(gate, make_event(0))
+        executor.submit(lambda event: threads.append(threading.get_ident()), make_event(1))
+
+        assert threads == [threading.get_ident()]
+        gate.release.set()
+        executor.flush(timeout=5)
+        executor.shutdown()
+
+    def test_block_gives_up_after_timeout(self):
+        executor = ThreadPoolExecutor(
+            max_workers=1, max_queue_size=1, overflow_policy='block', block_timeout=0.05,
+        )
+        gate = Gate()
+        executor.submit(gate, make_event(0))
+        executor.submit(gate, make_event(1))
+        gate.release.set()
+        executor.flush(timeout=5)
+
+        assert gate.handled == [0]
+        executor.shutdown()
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            ThreadPoolExecutor(overflow_policy='spill')
+
+    def test_coroutines_share_one_event_loop_thread(self):
+        executor = ThreadPoolExecutor()
+        threads = set()
+
+        async def handler(event):
+            threads.add(threading.get_ident())
+
+        for i in range(5):
+            executor.submit(handler, make_event(i))
+
+        assert executor.flush(timeout=5)
+        assert len(threads) == 1
+        assert threading.get_ident() not in threads
+        executor.shutdown()
+
+    def test_handler_errors_are_counted(self):
+        executor = ThreadPoolExecutor()
+
+        def failing(event):
+            raise RuntimeError('boom')
+
+        executor.submit(failing, make_event(1))
+        executor.flush(timeout=5)
+
+        stats = handler_metrics.snapshot()[handler_name(failing)]
+        assert (stats['calls'], stats['errors']) == (1, 1)
+        executor.shutdown()
+
+
+# ----------------------------------------------------------------------
+# CeleryExecutor
+# ----------------------------------------------------------------------
+
+class TestCeleryExecutor:
+    @pytest.fixture
+    def sent(self, monkeypatch):
+        from celery import current_app
+        sent = []
+        monkeypatch.setattr(
+            current_app, 'send_task', lambda name, args, kwargs: sent.append((name, args[0]))
+        )
+        return sent
+
+    def test_runs_are_sent_in_batches(self, sent):
+        executor = CeleryExecutor(batch_size=3, max_delay=60)
+        for i in range(7):
+            executor.submit(TicketEventHandlers.handle_ticket_assigned, make_event(i))
+
+        assert [len(batch) for _, batch in sent] == [3, 3]
+        executor.flush()
+        assert [len(batch) for _, batch in sent] == [3, 3, 1]
+        assert sent[0][0] == 'apps.core.tasks.handle_event_batch'
+
+    def test_partial_batch_is_sent_after_delay(self, sent):
+        executor = CeleryExecutor(batch_size=100, max_delay=0.01)
+        executor.submit(TicketEventHandlers.handle_ticket_assigned, make_event(1))
+
+        for _ in range(100):
+            if sent:
+                break
+            threading.Event().wait(0.01)
+        assert [len(batch) for _, batch in sent] == [1]
+
+
+@pytest.mark.django_db
+def test_batch_task_rebuilds_events_and_runs_handlers(technician, monkeypatch):
+    logged = []
+    monkeypatch.setattr(
+        'apps.core.services.activity_logger.log_activity', lambda **kwargs: logged.append(kwargs)
+    )
+    event = TicketAssigned(ticket_id=7, ticket_title='Printer', actor=technician, assignee_id=3)
+    item = {
+        'handler': handler_name(TicketEventHandlers.handle_ticket_assigned),
+        'event': serialize_event(event),
+    }
+
+    assert handle_event_batch([item, dict(item, handler='apps.missing.handler')]) == 2
+
+    assert len(logged) == 1
+    assert logged[0]['actor'] == technician
+    assert logged[0]['target_id'] == 7
+
+
+def test_serialized_event_round_trip():
+    event = TicketAssigned(ticket_id=5, ticket_title='VPN', assignee_id=2)
+
+    rebuilt = deserialize_event(serialize_event(event))
+
+    assert type(rebuilt) is TicketAssigned
+    assert (rebuilt.ticket_id, rebuilt.entity_id, rebuilt.assignee_id) == (5, 5, 2)
+    assert rebuilt.timestamp == event.timestamp
+    assert rebuilt.event_type == event.event_type
+
+
+def test_dispatcher_reports_metrics():
+    metrics = events.EventDispatcher().metrics()
+
+    assert metrics['executor'] == 'ThreadPoolExecutor'
+    assert 'pending' in metrics['queue']
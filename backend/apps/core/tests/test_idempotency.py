@@ -0,0 +1,176 @@
+"""
+Tests for the idempotency key store and its use in commands and the API.
+"""
+
+import threading
+import time
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.core.cache import InMemorySharedCache, TieredCache
+from apps.core.idempotency import (
+    IdempotencyInProgress, IdempotencyKeyReused, IdempotencyStore, idempotency_store,
+)
+from apps.tickets.application import CreateTicket
+from apps.tickets.models import Ticket
+from apps.users.application import UserUseCases
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch):
+    cache = TieredCache('idempotency', local=False, shared=InMemorySharedCache())
+    monkeypatch.setattr(idempotency_store, '_cache', cache)
+    return idempotency_store
+
+
+class TestIdempotencyStore:
+    def test_replays_the_stored_result(self, store):
+        calls = []
+
+        def create():
+            calls.append(1)
+            return {'ticket_id': 'TKT-1'}
+
+        assert store.run('tickets.create:1', 'key-1', 'fp', create) == ({'ticket_id': 'TKT-1'}, False)
+        assert store.run('tickets.create:1', 'key-1', 'fp', create) == ({'ticket_id': 'TKT-1'}, True)
+        assert store.run('tickets.create:2', 'key-1', 'fp', create) == ({'ticket_id': 'TKT-1'}, False)
+        assert len(calls) == 2
+
+    def test_key_reused_with_other_parameters(self, store):
+        store.run('tickets.create:1', 'key-1', 'fp', dict)
+
+        with pytest.raises(IdempotencyKeyReused):
+            store.run('tickets.create:1', 'key-1', 'other', dict)
+
+    def test_failure_releases_the_claim(self, store):
+        def fail():
+            raise RuntimeError('database unavailable')
+
+        with pytest.raises(RuntimeError):
+            store.run('tickets.create:1', 'key-1', 'fp', fail)
+
+        assert store.run('tickets.create:1', 'key-1', 'fp', lambda: 'created') == ('created', False)
+
+    def test_concurrent_retries_run_once(self, store):
+        calls = []
+        results = []
+
+        def slow_create():
+            calls.append(1)
+            time.sleep(0.05)
+            return 'created'
+
+        threads = [
+            threading.Thread(target=lambda: results.append(store.run('op:1', 'key-1', 'fp', slow_create)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert sorted(replayed for _, replayed in results) == [False, True, True, True]
+
+    def test_in_progress_after_waiting(self, store, settings):
+        settings.IDEMPOTENCY_WAIT = 0
+        other_worker = IdempotencyStore(cache=store.cache)
+        other_worker.claim('op:1', 'key-1', 'fp')
+
+        with pytest.raises(IdempotencyInProgress):
+            store.run('op:1', 'key-1', 'fp', lambda: 'created')
+
+    def test_unclaimable_key_backs_off_until_the_deadline(self, settings):
+        class Flapping(InMemorySharedCache):
+            """``add`` keeps failing while the record reads back as missing."""
+            def add(self, key, value, timeout=None):
+                return False
+
+        settings.IDEMPOTENCY_WAIT = 0.05
+        store = IdempotencyStore(cache=TieredCache('idempotency', local=False, shared=Flapping()))
+
+        with pytest.raises(IdempotencyInProgress):
+            store.claim('op:1', 'key-1', 'fp')
+
+
+@pytest.mark.django_db
+class TestCommands:
+    @pytest.fixture
+    def ticket_data(self, ticket_category, ticket_type):
+        return {
+            'title': 'VPN down', 'description': 'Cannot connect',
+            'category_id': ticket_category.id, 'ticket_type_id': ticket_type.id,
+        }
+
+    def test_create_ticket_retry_returns_the_first_ticket(
+        self, manager, ticket_data, django_capture_on_commit_callbacks
+    ):
+        with django_capture_on_commit_callbacks(execute=True):
+            first = CreateTicket().execute(actor=manager, ticket_data=ticket_data, idempotency_key='form-1')
+
+        retry = CreateTicket().execute(actor=manager, ticket_data=ticket_data, idempotency_key='form-1')
+
+        assert retry == first
+        assert Ticket.objects.count() == 1
+
+    def test_without_key_every_call_runs(self, manager, ticket_data):
+        CreateTicket().execute(actor=manager, ticket_data=ticket_data)
+        CreateTicket().execute(actor=manager, ticket_data=ticket_data)
+
+        assert Ticket.objects.count() == 2
+
+    def test_idempotent_use_case_base(self, superadmin, technician, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            first = UserUseCases.change_user_role(
+                actor=superadmin, target_user=technician, new_role='MANAGER', idempotency_key='role-1'
+            )
+        technician.role = 'TECHNICIAN'
+        technician.save(update_fields=['role'])
+
+        retry = UserUseCases.change_user_role(
+            actor=superadmin, target_user=technician, new_role='MANAGER', idempotency_key='role-1'
+        )
+
+        assert retry == first
+        technician.refresh_from_db()
+        assert technician.role == 'TECHNICIAN'
+
+
+@pytest.mark.django_db
+class TestIdempotencyKeyHeader:
+    @pytest.fixture
+    def client(self, manager):
+        client = APIClient()
+        client.force_authenticate(user=manager)
+        return client
+
+    @pytest.fixture
+    def payload(self, ticket_category, ticket_type):
+        return {
+            'title': 'Laptop broken', 'description': 'Screen flickers',
+            'category': ticket_category.id, 'ticket_type': ticket_type.id, 'priority': 'HIGH',
+        }
+
+    def test_retried_post_is_replayed(self, client, payload, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            first = client.post('/api/tickets/tickets/', payload, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+        assert first.status_code == 201, first.data
+
+        retry = client.post('/api/tickets/tickets/', payload, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        assert retry.status_code == 201
+        assert retry['Idempotent-Replayed'] == 'true'
+        assert retry.data == first.data
+        assert Ticket.objects.count() == 1
+
+    def test_key_reused_for_another_payload(self, client, payload, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            client.post('/api/tickets/tickets/', payload, format='json', HTTP_IDEMPOTENCY_KEY='abc')
+
+        response = client.post(
+            '/api/tickets/tickets/', dict(payload, title='Other'), format='json', HTTP_IDEMPOTENCY_KEY='abc'
+        )
+
+        assert response.status_code == 422
+        assert Ticket.objects.count() == 1
@@ -0,0 +1,66 @@
+"""
+Tests for keyset pagination.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.core.pagination import InvalidCursor, encode_cursor, keyset_paginate
+from apps.tickets.models import Ticket
+
+
+@pytest.fixture
+def tickets(ticket_category, ticket_type):
+    created = Ticket.objects.bulk_create([
+        Ticket(
+            title=f'Ticket {i}',
+            description='Paging test',
+            category=ticket_category,
+            ticket_type=ticket_type,
+        )
+        for i in range(7)
+    ])
+    # Two tickets share a timestamp so the id tie-breaker matters
+    base = timezone.now()
+    for i, ticket in enumerate(created):
+        Ticket.objects.filter(pk=ticket.pk).update(created_at=base - timedelta(minutes=i // 2))
+    return list(Ticket.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+
+@pytest.mark.django_db
+class TestKeysetPaginate:
+    def test_walks_forward_without_gaps_or_duplicates(self, tickets):
+        seen, cursor = [], None
+        while True:
+            page = keyset_paginate(Ticket.objects.all(), cursor=cursor, page_size=3)
+            seen.extend(t.id for t in page.items)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        assert seen == tickets
+
+    def test_previous_returns_the_page_before(self, tickets):
+        first = keyset_paginate(Ticket.objects.all(), page_size=3)
+        second = keyset_paginate(Ticket.objects.all(), cursor=first.next_cursor, page_size=3)
+        back = keyset_paginate(Ticket.objects.all(), cursor=second.previous_cursor, page_size=3)
+
+        assert not first.has_previous
+        assert second.has_previous
+        assert [t.id for t in back.items] == [t.id for t in first.items]
+        assert not back.has_previous
+        assert back.has_next
+
+    def test_one_query_per_page(self, tickets, django_assert_num_queries):
+        first = keyset_paginate(Ticket.objects.all(), page_size=3)
+
+        with django_assert_num_queries(1):
+            keyset_paginate(Ticket.objects.all(), cursor=first.next_cursor, page_size=3)
+
+    def test_invalid_cursor(self, tickets):
+        with pytest.raises(InvalidCursor):
+            keyset_paginate(Ticket.objects.all(), cursor='not-a-cursor')
+        with pytest.raises(InvalidCursor):
+            keyset_paginate(Ticket.objects.all(), cursor=encode_cursor([1]))
@@ -0,0 +1,148 @@
+"""
+Equivalence tests for the compiled permission tables.
+
+Every table entry must match what the authority modules return for real
+objects, both through bulk_permissions and through queryset_filter.
+"""
+
+import pytest
+
+from apps.assets.domain.services import asset_authority
+from apps.assets.models import Asset
+from apps.core.services.permission_engine import (
+    bulk_permissions, permission_tables, queryset_filter,
+)
+from apps.projects.domain.services import project_authority
+from apps.projects.models import Project, ProjectMember
+from apps.tickets.domain.services import ticket_authority
+from apps.tickets.models import Ticket
+from apps.users.domain.services import user_authority
+from apps.users.models import User
+
+
+@pytest.fixture
+def tickets(ticket_category, ticket_type, technician, manager):
+    return Ticket.objects.bulk_create([
+        Ticket(
+            title=f'Ticket {i}', description='Permission table test',
+            category=ticket_category, ticket_type=ticket_type, assigned_to=assignee,
+        )
+        for i, assignee in enumerate([None, technician, manager])
+    ])
+
+
+@pytest.fixture
+def assets(asset_category, manager, technician, it_admin):
+    return Asset.objects.bulk_create([
+        Asset(
+            name=f'Asset {i}', serial_number=f'SN-{i}', asset_type='HARDWARE',
+            status='ACTIVE', category=asset_category, created_by=manager,
+            assigned_to=assignee,
+        )
+        for i, assignee in enumerate([None, technician, it_admin])
+    ])
+
+
+@pytest.fixture
+def projects(project_category, manager, it_admin):
+    projects = Project.objects.bulk_create([
+        Project(
+            name=f'Project {i}', description='Permission table test',
+            category=project_category, status='PLANNING', priority='MEDIUM',
+            project_manager=manager, created_by=manager, budget=0,
+        )
+        for i in range(3)
+    ])
+    ProjectMember.objects.bulk_create([
+        ProjectMember(project=projects[0], user=it_admin),
+        ProjectMember(project=projects[1], user=it_admin, is_active=False),
+    ])
+    return projects
+
+
+def assert_equivalent(actor, objects, authority_permissions, resource):
+    bulk = bulk_permissions(actor, objects, resource)
+    for obj in objects:
+        expected = authority_permissions(actor, obj)
+        actual = {key: bulk[obj.id][key] for key in expected}
+        assert actual == expected, (actor.role, resource, obj.id)
+
+
+def assert_filter_equivalent(actor, objects, authority_permissions, resource):
+    model = type(objects[0])
+    ids = [obj.pk for obj in objects]
+    for action in authority_permissions(actor, objects[0]):
+        expected = {obj.pk for obj in objects if authority_permissions(actor, obj)[action]}
+        filtered = set(
+            model.objects.filter(pk__in=ids)
+            .filter(queryset_filter(actor, action, resource))
+            .values_list('pk', flat=True)
+        )
+        assert filtered == expected, (actor.role, resource, action)
+
+
+@pytest.mark.django_db
+class TestBulkPermissions:
+    def test_tickets(self, all_roles, tickets):
+        for actor in all_roles.values():
+            assert_equivalent(actor, tickets, ticket_authority.get_permissions, 'ticket')
+
+    def test_assets(self, all_roles, assets):
+        for actor in all_roles.values():
+            assert_equivalent(actor, assets, asset_authority.get_permissions, 'asset')
+
+    def test_projects(self, all_roles, projects):
+        for actor in all_roles.values():
+            assert_equivalent(actor, projects, project_authority.get_permissions, 'project')
+
+    def test_users(self, all_roles):
+        targets = list(User.objects.all())
+        for actor in all_roles.values():
+            assert_equivalent(actor, targets, user_authority.get_permissions, 'user')
+
+    def test_resource_inferred_from_model(self, technician, tickets):
+        assert bulk_permissions(technician, tickets).keys() == {t.id for t in tickets}
+        assert bulk_permissions(technician, []) == {}
+
+    def test_projects_need_one_query(self, it_admin, projects, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            permissions = bulk_permissions(it_admin, projects, 'project')
+
+        assert [permissions[p.id]['can_view'] for p in projects] == [True, False, False]
+
+    def test_unknown_role_falls_back_to_authority(self, technician, tickets):
+        technician.role = 'CONTRACTOR'
+        assert_equivalent(technician, tickets, ticket_authority.get_permissions, 'ticket')
+
+
+@pytest.mark.django_db
+class TestQuerysetFilter:
+    def test_tickets(self, all_roles, tickets):
+        for actor in all_roles.values():
+            assert_filter_equivalent(actor, tickets, ticket_authority.get_permissions, 'ticket')
+
+    def test_assets(self, all_roles, assets):
+        for actor in all_roles.values():
+            assert_filter_equivalent(actor, assets, asset_authority.get_permissions, 'asset')
+
+    def test_projects(self, all_roles, projects):
+        for actor in all_roles.values():
+            assert_filter_equivalent(actor, projects, project_authority.get_permissions, 'project')
+
+    def test_users(self, all_roles):
+        targets = list(User.objects.all())
+        for actor in all_roles.values():
+            assert_filter_equivalent(actor, targets, user_authority.get_permissions, 'user')
+
+    def test_unknown_action_rejected(self, technician):
+        with pytest.raises(ValueError):
+            queryset_filter(technician, 'can_teleport', 'ticket')
+
+    def test_unknown_resource_rejected(self, technician):
+        with pytest.raises(ValueError):
+            queryset_filter(technician, 'can_view', 'invoice')
+
+
+def test_tables_cover_every_role_and_relation():
+    for table in permission_tables.values():
+        assert len(table.table) == 5 * len(table.spec.relations)
@@ -0,0 +1,139 @@
+"""
+Tests for the request query budget middleware and N+1 detector.
+"""
+
+import json
+import logging
+from unittest import mock
+
+import pytest
+from django.test import Client
+
+from apps.assets.models import Asset
+from apps.core.query_budget import (
+    QueryBudgetExceeded, QueryRecorder, assert_query_budget, fingerprint,
+)
+from apps.logs.models import ActivityLog
+from apps.users.models import User
+
+
+def test_fingerprint_collapses_parameters():
+    assert fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 21') == (
+        fingerprint('SELECT * FROM t WHERE id IN (%s) LIMIT 5')
+    )
+    assert fingerprint("SELECT 'a', 1") == 'SELECT ?, ?'
+
+
+@pytest.mark.django_db
+class TestQueryRecorder:
+    def test_reports_repeated_statements_and_their_call_site(self, all_roles):
+        with QueryRecorder() as recorder:
+            for user in all_roles.values():
+                User.objects.get(pk=user.pk)
+
+        assert recorder.count == 5
+        [duplicate] = recorder.duplicates()
+        assert duplicate.count == 5
+        [site] = duplicate.call_sites
+        assert site.startswith('apps/core/tests/test_query_budget.py:')
+        assert duplicate.call_sites[site] == 3
+
+    def test_statements_below_threshold_skip_the_stack_walk(self, viewer, manager):
+        with mock.patch('apps.core.query_budget._call_site') as call_site:
+            with QueryRecorder(duplicate_threshold=3) as recorder:
+                User.objects.get(pk=viewer.pk)
+                User.objects.get(pk=manager.pk)
+
+        assert recorder.count == 2
+        call_site.assert_not_called()
+
+    def test_assert_query_budget_fails_with_report(self, all_roles):
+        with pytest.raises(AssertionError, match='test_query_budget.py'):
+            with assert_query_budget(max_queries=2):
+                for user in all_roles.values():
+                    User.objects.get(pk=user.pk)
+
+        with assert_query_budget(max_queries=1):
+            User.objects.count()
+
+
+@pytest.mark.django_db
+class TestQueryBudgetMiddleware:
+    @pytest.fixture
+    def client(self, manager):
+        client = Client()
+        client.force_login(manager)
+        return client
+
+    def test_debug_headers(self, client, settings):
+        settings.DEBUG = True
+
+        response = client.get('/tickets/', HTTP_HX_REQUEST='true')
+
+        assert int(response['X-Query-Count']) > 0
+        assert response['X-Query-Budget'] == '10'
+        assert response['Server-Timing'].startswith('db;dur=')
+
+    def test_no_headers_outside_debug(self, client, settings):
+        settings.DEBUG = False
+
+        response = client.get('/tickets/', HTTP_HX_REQUEST='true')
+
+        assert 'X-Query-Count' not in response
+
+    def test_strict_mode_fails_requests_over_budget(self, client, settings):
+        settings.QUERY_BUDGETS = {'frontend:tickets': 1}
+
+        with pytest.raises(QueryBudgetExceeded, match='frontend:tickets'):
+            client.get('/tickets/', HTTP_HX_REQUEST='true')
+
+    def test_overruns_are_logged_as_json(self, client, settings, caplog):
+        settings.QUERY_BUDGETS = {'frontend:tickets': 1}
+        settings.QUERY_BUDGET_STRICT = False
+        query_logger = logging.getLogger('it_management_platform.queries')
+        query_logger.addHandler(caplog.handler)  # the logger does not propagate
+        try:
+            client.get('/tickets/', HTTP_HX_REQUEST='true')
+        finally:
+            query_logger.removeHandler(caplog.handler)
+
+        [record] = caplog.records
+        entry = json.loads(record.getMessage().split(': ', 1)[1])
+        assert entry['view'] == 'frontend:tickets'
+        assert entry['budget'] == 1 and entry['violations']
+
+
+@pytest.mark.django_db
+class TestPageBudgets:
+    """Pages that used to load a relation per row stay within their budgets."""
+
+    def test_technician_asset_list(self, technician, manager, asset_category):
+        Asset.objects.bulk_create([
+            Asset(
+                name=f'Laptop {i}', serial_number=f'SN-{i}', asset_type='HARDWARE',
+                status='ACTIVE', category=asset_category, created_by=manager,
+                assigned_to=technician if i % 2 else None,
+            )
+            for i in range(15)
+        ])
+        client = Client()
+        client.force_login(technician)
+
+        with assert_query_budget(view_name='frontend:assets'):
+            response = client.get('/assets/')
+        assert len(response.context['assets']) == 15
+
+    def test_activity_log_list(self, it_admin, manager):
+        ActivityLog.objects.bulk_create([
+            ActivityLog(
+                action='UPDATE', user=manager, entity_type='ticket', entity_id=i,
+                title='Ticket updated', description='Status changed',
+            )
+            for i in range(15)
+        ])
+        client = Client()
+        client.force_login(it_admin)
+
+        with assert_query_budget(view_name='frontend:logs'):
+            response = client.get('/logs/')
+        assert len(response.context['log_entries']) >= 15
@@ -0,0 +1,182 @@
+"""
+Tests for the shared time-series query helpers and the dashboards using them.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core.services.timeseries import (
+    bucket_range, bucket_start, bucketed_counts, count_metrics,
+)
+from apps.security.models import SecurityEvent
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def make_event(created_at, severity='MEDIUM', status='OPEN'):
+    event = SecurityEvent.objects.create(
+        event_type='LOGIN_FAILURE',
+        severity=severity,
+        status=status,
+        title='Failed login',
+        description='Test event',
+    )
+    SecurityEvent.objects.filter(pk=event.pk).update(created_at=created_at)
+    return event
+
+
+# ----------------------------------------------------------------------
+# Bucket arithmetic
+# ----------------------------------------------------------------------
+
+class TestBuckets:
+    def test_day_bucket_starts_at_local_midnight(self):
+        now = timezone.now()
+        start = bucket_start(now, 'day')
+        local = timezone.localtime(start)
+        assert (local.hour, local.minute) == (0, 0)
+        assert local.date() == timezone.localtime(now).date()
+
+    def test_week_bucket_starts_on_monday(self):
+        assert timezone.localtime(bucket_start(timezone.now(), 'week')).weekday() == 0
+
+    def test_range_is_contiguous_and_ends_with_current_bucket(self):
+        now = timezone.now()
+        starts = bucket_range(now, 'hour', 24)
+        assert len(starts) == 24
+        assert starts[-1] == bucket_start(now, 'hour')
+        assert all(b - a == timedelta(hours=1) for a, b in zip(starts, starts[1:]))
+
+    def test_unknown_interval_rejected(self):
+        with pytest.raises(ValueError):
+            bucket_start(timezone.now(), 'minute')
+
+
+# ----------------------------------------------------------------------
+# Queries
+# ----------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestBucketedCounts:
+    def test_counts_per_day_with_zero_filled_gaps(self, django_assert_num_queries):
+        now = timezone.now()
+        make_event(now)
+        make_event(now)
+        make_event(now - timedelta(days=2), severity='CRITICAL')
+        make_event(now - timedelta(days=30))
+
+        with django_assert_num_queries(1):
+            rows = bucketed_counts(
+                SecurityEvent.objects.all(), 'created_at', interval='day', periods=7,
+                metrics={'critical': Q(severity='CRITICAL')}, end=now,
+            )
+
+        assert [row['count'] for row in rows] == [0, 0, 0, 0, 1, 0, 2]
+        assert [row['critical'] for row in rows] == [0, 0, 0, 0, 1, 0, 0]
+        assert rows[-1]['bucket'] == bucket_start(now, 'day')
+
+    def test_closed_buckets_are_served_from_cache(self, django_assert_num_queries):
+        now = timezone.now()
+        make_event(now - timedelta(days=1))
+        make_event(now)
+
+        first = bucketed_counts(
+            SecurityEvent.objects.all(), 'created_at', periods=3, end=now,
+            cache_namespace='test_events',
+        )
+        # Rows written into a closed bucket afterwards are not recounted
+        make_event(now - timedelta(days=1))
+        make_event(now)
+
+        with django_assert_num_queries(1) as ctx:
+            second = bucketed_counts(
+                SecurityEvent.objects.all(), 'created_at', periods=3, end=now,
+                cache_namespace='test_events',
+            )
+
+        assert [row['count'] for row in first] == [0, 1, 1]
+        assert [row['count'] for row in second] == [0, 1, 2]
+        # Only the open bucket is queried again
+        assert 'GROUP BY' in ctx.captured_queries[0]['sql']
+
+    def test_without_namespace_everything_is_recomputed(self):
+        now = timezone.now()
+        make_event(now - timedelta(days=1))
+        bucketed_counts(SecurityEvent.objects.all(), 'created_at', periods=3, end=now)
+        make_event(now - timedelta(days=1))
+
+        rows = bucketed_counts(SecurityEvent.objects.all(), 'created_at', periods=3, end=now)
+
+        assert rows[1]['count'] == 2
+
+    def test_count_metrics_single_query(self, django_assert_num_queries):
+        now = timezone.now()
+        make_event(now, severity='CRITICAL')
+        make_event(now, status='RESOLVED')
+
+        with django_assert_num_queries(1):
+            result = count_metrics(SecurityEvent.objects.all(), {
+                'total': None,
+                'critical': Q(severity='CRITICAL'),
+                'resolved': Q(status='RESOLVED'),
+                'high': Q(severity='HIGH'),
+            })
+
+        assert result == {'total': 2, 'critical': 1, 'resolved': 1, 'high': 0}
+
+
+# ----------------------------------------------------------------------
+# Dashboards
+# ----------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestSecurityDashboards:
+    @pytest.fixture
+    def api_client(self, superadmin):
+        client = APIClient()
+        client.force_authenticate(user=superadmin)
+        return client
+
+    def test_statistics_counts(self, api_client):
+        now = timezone.now()
+        make_event(now, severity='CRITICAL')
+        make_event(now - timedelta(days=40), severity='HIGH', status='RESOLVED')
+
+        response = api_client.get('/api/security/security-events/statistics/')
+
+        assert response.status_code == 200
+        assert response.data['total_events'] == 2
+        assert response.data['events_today'] == 1
+        assert response.data['critical_events'] == 1
+        assert response.data['high_severity_events'] == 1
+        assert response.data['open_events'] == 1
+        assert response.data['resolved_events'] == 1
+
+    def test_dashboard_data_trend(self, api_client):
+        now = timezone.now()
+        make_event(now, severity='CRITICAL')
+        make_event(now - timedelta(days=3))
+
+        response = api_client.get('/api/security/security-events/dashboard_data/')
+
+        assert response.status_code == 200
+        trends = response.data['daily_trends']
+        assert len(trends) == 7
+        assert trends[-1] == {
+            'date': timezone.localtime(now).strftime('%Y-%m-%d'),
+            'count': 1,
+        }
+        assert sum(day['count'] for day in trends) == 2
+        assert response.data['summary'] == {
+            'total_24h': 1, 'critical_24h': 1, 'open_issues': 2,
+        }
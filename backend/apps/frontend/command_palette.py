@@ -7,7 +7,8 @@ Following Clean Architecture principles:
 - Interface Adapters: API endpoint and template tag for frontend
 
 Commands:
-- Navigate to entity by ID (tickets, assets, projects, users)
+- Navigate to entity by ID, or by title/name through the search index
+  (tickets, assets, projects, users)
 - Create Ticket / Asset
 - View Logs
 - Export Reports
@@ -45,6 +46,7 @@ class Command:
         input_type: Type of input required (None, "number", "text")
         input_placeholder: Placeholder for input field
         input_validation: Optional validation function name
+        search_type: Search index entity type resolving non-numeric input
     """
     key: str
     label: str
@@ -58,6 +60,7 @@ class Command:
     input_type: Optional[str] = None
     input_placeholder: str = ""
     input_validation: Optional[str] = None
+    search_type: Optional[str] = None
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -84,54 +87,58 @@ COMMAND_REGISTRY: Dict[str, Command] = {
     'navigate_ticket': Command(
         key='navigate_ticket',
         label='Go to Ticket',
-        description='Navigate to a ticket by ID',
+        description='Navigate to a ticket by ID or title',
         category=CommandCategory.NAVIGATION,
         url='/tickets/{ticket_id}/',
         url_params={'ticket_id': None},
         required_roles=['SUPERADMIN', 'IT_ADMIN', 'MANAGER', 'TECHNICIAN', 'VIEWER'],
         icon='fa-ticket-alt',
-        input_type='number',
-        input_placeholder='Enter ticket ID',
-        input_validation='positive_integer'
+        input_type='text',
+        input_validation='positive_integer',
+        input_placeholder='Enter ticket ID or title',
+        search_type='ticket'
     ),
     'navigate_asset': Command(
         key='navigate_asset',
         label='Go to Asset',
-        description='Navigate to an asset by ID',
+        description='Navigate to an asset by ID or name',
         category=CommandCategory.NAVIGATION,
         url='/assets/{asset_id}/',
         url_params={'asset_id': None},
         required_roles=['SUPERADMIN', 'IT_ADMIN', 'MANAGER', 'TECHNICIAN', 'VIEWER'],
         icon='fa-desktop',
-        input_type='number',
-        input_placeholder='Enter asset ID',
-        input_validation='positive_integer'
+        input_type='text',
+        input_validation='positive_integer',
+        input_placeholder='Enter asset ID or name',
+        search_type='asset'
     ),
     'navigate_project': Command(
         key='navigate_project',
         label='Go to Project',
-        description='Navigate to a project by ID',
+        description='Navigate to a project by ID or name',
         category=CommandCategory.NAVIGATION,
         url='/projects/{project_id}/',
         url_params={'project_id': None},
         required_roles=['SUPERADMIN', 'IT_ADMIN', 'MANAGER', 'TECHNICIAN', 'VIEWER'],
         icon='fa-project-diagram',
-        input_type='number',
-        input_placeholder='Enter project ID',
-        input_validation='positive_integer'
+        input_type='text',
+        input_validation='positive_integer',
+        input_placeholder='Enter project ID or name',
+        search_type='project'
     ),
     'navigate_user': Command(
         key='navigate_user',
         label='Go to User',
-        description='Navigate to a user profile by ID',
+        description='Navigate to a user profile by ID or username',
         category=CommandCategory.NAVIGATION,
         url='/users/{user_id}/',
         url_params={'user_id': None},
         required_roles=['SUPERADMIN', 'IT_ADMIN', 'MANAGER'],
         icon='fa-user',
-        input_type='number',
-        input_placeholder='Enter user ID',
-        input_validation='positive_integer'
+        input_type='text',
+        input_validation='positive_integer',
+        input_placeholder='Enter user ID or username',
+        search_type='user'
     ),
     'navigate_dashboard': Command(
         key='navigate_dashboard',
@@ -359,13 +366,15 @@ class CommandResolver:
         return categorized
     
     @classmethod
-    def resolve_navigation(cls, command_key: str, input_value: Any) -> Optional[str]:
+    def resolve_navigation(cls, command_key: str, input_value: Any, user=None) -> Optional[str]:
         """
         Resolve a navigation command with input value.
         
         Args:
             command_key: The command key (e.g., 'navigate_ticket')
-            input_value: The user input (e.g., ticket ID)
+            input_value: The user input (e.g., ticket ID, or a title when
+                the command has a search_type and the user is given)
+            user: Requesting user, for searching the index
             
         Returns:
             Resolved URL or None if invalid
@@ -374,18 +383,28 @@ class CommandResolver:
         if not command or command.category != CommandCategory.NAVIGATION:
             return None
         
+        # JSON clients may send the ID as a number
+        text = '' if input_value is None else str(input_value).strip()
+        if not text:
+            return None
+        
+        if command.search_type and not text.isdigit():
+            if user is None:
+                return None
+            from apps.search.query import search
+            results = search(user, text, entity_types=[command.search_type], limit=1)
+            return results[0].url if results else None
+        
         # Validate input based on command type
-        if command.input_type == 'number':
+        if command.input_type == 'number' or command.input_validation == 'positive_integer':
             try:
-                value = int(input_value)
+                value = int(text)
                 if value <= 0:
                     return None
-            except (ValueError, TypeError):
+            except ValueError:
                 return None
         elif command.input_type == 'text':
-            if not input_value or not input_value.strip():
-                return None
-            value = input_value.strip()
+            value = text
         else:
             return None
         
@@ -402,7 +421,7 @@ class CommandResolver:
 # CONVENIENCE FUNCTIONS
 # =============================================================================
 
-def get_command_palette_data(user) -> Dict[str, Any]:
+def get_command_palette_data(user, query: str = '') -> Dict[str, Any]:
     """
     Get all data needed for the command palette.
     
@@ -410,14 +429,22 @@ def get_command_palette_data(user) -> Dict[str, Any]:
     
     Args:
         user: The current user object
+        query: Typed text; entities matching it are returned as results
         
     Returns:
         Dictionary with:
         - commands: List of available commands
         - categories: Commands organized by category
         - keyboard_shortcut: Default keyboard shortcut
+        - results: Search index matches for the query, best first
     """
+    results = []
+    if query.strip():
+        from apps.search.query import search
+        results = [result.as_dict() for result in search(user, query, limit=8)]
+    
     return {
+        'results': results,
         'commands': CommandResolver.get_available_commands(user),
         'categories': CommandResolver.get_commands_by_category(user),
         'keyboard_shortcut': 'Ctrl+K',
@@ -431,13 +458,14 @@ def get_command_palette_data(user) -> Dict[str, Any]:
     }
 
 
-def resolve_command(command_key: str, input_value: Any = None) -> Dict[str, Any]:
+def resolve_command(command_key: str, input_value: Any = None, user=None) -> Dict[str, Any]:
     """
     Resolve a command to its action.
     
     Args:
         command_key: The command key
         input_value: Optional input for commands requiring it
+        user: Requesting user, for navigation by title or name
         
     Returns:
         Dictionary with:
@@ -459,7 +487,7 @@ def resolve_command(command_key: str, input_value: Any = None) -> Dict[str, Any]
                 'message': f'Input required for: {command.label}'
             }
         
-        url = CommandResolver.resolve_navigation(command_key, input_value)
+        url = CommandResolver.resolve_navigation(command_key, input_value, user=user)
         if not url:
             return {
                 'type': 'error',
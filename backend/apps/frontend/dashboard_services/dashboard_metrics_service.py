@@ -16,12 +16,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List
 from django.utils import timezone
-from django.core.cache import cache
 
+from apps.core.cache import get_tiered_cache
 from apps.logs.services.log_query_service import LogQueryService
 from apps.logs.enums import EventCategory
 
 
+def _metrics_cache():
+    """Dashboard metrics cache: per-process LRU in front of the shared cache."""
+    return get_tiered_cache('dashboard_metrics')
+
+
 # =============================================================================
 # Metric Result DTOs
 # =============================================================================
@@ -215,7 +220,7 @@ class DashboardMetricsService:
         
         # Check cache first
         cache_key = self._get_cache_key('all')
-        cached = cache.get(cache_key)
+        cached = _metrics_cache().get(cache_key)
         if cached and self._should_use_cache():
             cached['performance']['cache_hit'] = True
             return self._dict_to_metrics(cached)
@@ -531,7 +536,7 @@ class DashboardMetricsService:
     def _cache_metrics(self, key: str, metrics: DashboardMetrics):
         """Cache metrics with role-specific TTL."""
         ttl = self._scope_config.get('cache_ttl_seconds', self.CACHE_TIMEOUT_DEFAULT)
-        cache.set(key, metrics.to_dict(), ttl)
+        _metrics_cache().set(key, metrics.to_dict(), ttl)
     
     def _dict_to_metrics(self, data: Dict[str, Any]) -> DashboardMetrics:
         """Convert cached dict back to DashboardMetrics."""
@@ -564,7 +569,7 @@ class DashboardMetricsService:
     
     def clear_cache(self):
         """Clear cached metrics for this user."""
-        cache.delete(self._get_cache_key('all'))
+        _metrics_cache().delete(self._get_cache_key('all'))
 
 
 # =============================================================================
@@ -1,10 +1,40 @@
+import uuid
+
 from django import forms
+from django.template.loader import render_to_string
 from crispy_forms.helper import FormHelper
 from crispy_forms.layout import Layout, Fieldset, Row, Column, Submit, Div, HTML
 
 from apps.tickets.models import Ticket, TicketCategory, TicketType
 from apps.users.models import User
 
+class UserAutocompleteWidget(forms.Widget):
+    """
+    User picker searching the user autocomplete API as the user types,
+    instead of rendering every user of the field's queryset as an option.
+    The field still validates the submitted id against its queryset.
+    """
+    template_name = 'frontend/partials/_user_autocomplete.html'
+
+    def __init__(self, scope='active', placeholder='', attrs=None):
+        super().__init__(attrs)
+        self.scope = scope
+        self.placeholder = placeholder
+
+    def render(self, name, value, attrs=None, renderer=None):
+        display = ''
+        if value:
+            display = User.objects.filter(pk=value).values_list('username', flat=True).first() or ''
+        return render_to_string(self.template_name, {
+            'name': name,
+            'scope': self.scope,
+            'value': value,
+            'display': display,
+            'input_id': (attrs or {}).get('id'),
+            'placeholder': self.placeholder,
+        })
+
+
 class TicketForm(forms.Form):
     title = forms.CharField(max_length=255, required=True, label="Ticket Title")
     category = forms.ModelChoiceField(
@@ -26,7 +56,8 @@ class TicketForm(forms.Form):
     assigned_to = forms.ModelChoiceField(
         queryset=User.objects.none(), 
         required=False,
-        empty_label="Unassigned"
+        empty_label="Unassigned",
+        widget=UserAutocompleteWidget(scope='active', placeholder='Unassigned'),
     )
     due_date = forms.DateField(widget=forms.DateInput(attrs={'type': 'date'}), required=False)
     
@@ -34,11 +65,14 @@ class TicketForm(forms.Form):
     contact_email = forms.EmailField(required=False)
     contact_phone = forms.CharField(max_length=50, required=False)
     location = forms.CharField(max_length=255, required=False)
+    # One key per rendered form: resubmitting it replays the first result
+    idempotency_key = forms.CharField(widget=forms.HiddenInput, required=False)
 
     def __init__(self, *args, **kwargs):
         available_users = kwargs.pop('available_users', None)
         is_edit = kwargs.pop('is_edit', False)
         super().__init__(*args, **kwargs)
+        self.fields['idempotency_key'].initial = uuid.uuid4().hex
         
         if available_users is not None:
             self.fields['assigned_to'].queryset = available_users
@@ -88,6 +122,7 @@ class TicketForm(forms.Form):
                     css_class='grid grid-cols-1 md:grid-cols-2 gap-4'
                 )
             ),
+            'idempotency_key',
             Div(
                 HTML('<a href="{% url \'frontend:tickets\' %}" class="inline-flex items-center px-4 py-2 border border-gray-300 rounded-lg shadow-sm text-sm font-medium text-gray-700 bg-white hover:bg-gray-50 transition duration-150"><i class="fas fa-arrow-left mr-2"></i>Cancel</a>'),
                 Submit('submit', 'Update Ticket' if is_edit else 'Create Ticket', css_class='inline-flex items-center px-6 py-2 border border-transparent rounded-lg shadow-sm text-sm font-medium text-white bg-blue-600 hover:bg-blue-700 focus:ring-2 focus:ring-offset-2 focus:ring-blue-500 transition duration-150'),
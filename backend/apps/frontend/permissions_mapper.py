@@ -47,6 +47,49 @@ from apps.users.domain.services.user_authority import (
     can_change_role as user_can_change_role,
     can_deactivate as user_can_deactivate,
 )
+from apps.core.services.permission_engine import bulk_permissions
+
+
+def _ui_permissions_map(user, objects, resource) -> dict:
+    """
+    Build the UI flags of many objects from the compiled permission tables.
+    
+    The authority is evaluated once per role and ownership relation instead
+    of once per object and flag (see apps.core.services.permission_engine).
+    """
+    objects = list(objects)
+    domain_permissions = bulk_permissions(user, objects, resource)
+    permissions = {}
+    for obj in objects:
+        object_id = obj['id'] if isinstance(obj, dict) else obj.id
+        flags = domain_permissions[object_id]
+        ui_flags = {
+            'can_view': flags['can_view'],
+            'can_update': flags['can_edit'],
+            'can_delete': flags['can_delete'],
+        }
+        if resource == 'user':
+            ui_flags.update({
+                'can_change_role': flags['can_change_role'],
+                'can_deactivate': flags['can_deactivate'],
+                'can_assign': False,
+                'can_unassign': False,
+                'can_self_assign': False,
+                'assigned_to_me': user.id == object_id,
+            })
+        else:
+            if isinstance(obj, dict):
+                assigned_to_id = obj.get('assigned_to_id')
+            else:
+                assigned_to_id = getattr(obj, 'assigned_to_id', None)
+            ui_flags.update({
+                'can_assign': flags['can_assign'],
+                'can_unassign': flags['can_unassign'],
+                'can_self_assign': flags['can_assign_to_self'],
+                'assigned_to_me': assigned_to_id == user.id if assigned_to_id else False,
+            })
+        permissions[object_id] = ui_flags
+    return permissions
 
 
 # =============================================================================
@@ -88,10 +131,7 @@ def build_tickets_permissions_map(user, tickets) -> dict:
     Returns:
         dict: Mapping of ticket.id -> permission flags
     """
-    return {
-        ticket.id: build_ticket_ui_permissions(user, ticket)
-        for ticket in tickets
-    }
+    return _ui_permissions_map(user, tickets, 'ticket')
 
 
 # =============================================================================
@@ -133,10 +173,7 @@ def build_assets_permissions_map(user, assets) -> dict:
     Returns:
         dict: Mapping of asset.id -> permission flags
     """
-    return {
-        asset.id: build_asset_ui_permissions(user, asset)
-        for asset in assets
-    }
+    return _ui_permissions_map(user, assets, 'asset')
 
 
 # =============================================================================
@@ -186,11 +223,7 @@ def build_projects_permissions_map(user, projects) -> dict:
     Returns:
         dict: Mapping of project.id -> permission flags
     """
-    return {
-        project.id if hasattr(project, 'id') else project['id']: 
-            build_project_ui_permissions(user, project)
-        for project in projects
-    }
+    return _ui_permissions_map(user, projects, 'project')
 
 
 # =============================================================================
@@ -234,10 +267,7 @@ def build_users_permissions_map(actor, users) -> dict:
     Returns:
         dict: Mapping of user.id -> permission flags
     """
-    return {
-        user.id: build_user_ui_permissions(actor, user)
-        for user in users
-    }
+    return _ui_permissions_map(actor, users, 'user')
 
 
 # =============================================================================
@@ -142,12 +142,15 @@ class TicketService(EventPublisher):
     
     @classmethod
     def _log_ticket_created(cls, ticket, user):
-        """Log ticket creation activity."""
+        """Log ticket creation activity and emit the creation event."""
         try:
             from apps.logs.services.activity_service import ActivityService
             ActivityService().log_ticket_created(ticket, user, None)
         except Exception:
             pass  # Logging must never break the command
+        
+        from apps.tickets.domain.events import emit_ticket_created
+        emit_ticket_created(ticket, user)
     
     @classmethod
     def update_ticket(
@@ -0,0 +1,111 @@
+"""
+Tests for the paginated ticket list and bulk ticket permission flags.
+"""
+
+import pytest
+from django.test import Client
+
+from apps.frontend.permissions_mapper import (
+    build_ticket_ui_permissions,
+    build_tickets_permissions_map,
+)
+from apps.tickets.models import Ticket
+
+
+def make_tickets(category, ticket_type, count, **kwargs):
+    return Ticket.objects.bulk_create([
+        Ticket(
+            title=f'Printer jam {i}',
+            description='List view test',
+            category=category,
+            ticket_type=ticket_type,
+            **kwargs,
+        )
+        for i in range(count)
+    ])
+
+
+# ---------------------------------------------------------------------------
+# Bulk permission flags
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestTicketsPermissionsMap:
+    def test_matches_per_ticket_authority_for_every_role(
+        self, all_roles, technician, ticket_category, ticket_type
+    ):
+        tickets = (
+            make_tickets(ticket_category, ticket_type, 2)
+            + make_tickets(ticket_category, ticket_type, 2, assigned_to=technician)
+            + make_tickets(ticket_category, ticket_type, 2, assigned_to=all_roles['MANAGER'])
+        )
+
+        for user in all_roles.values():
+            bulk = build_tickets_permissions_map(user, tickets)
+            for ticket in tickets:
+                assert bulk[ticket.id] == build_ticket_ui_permissions(user, ticket), (
+                    user.role, ticket.assigned_to_id
+                )
+
+
+# ---------------------------------------------------------------------------
+# TicketsView
+# ---------------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestTicketsView:
+    @pytest.fixture
+    def client(self, it_admin):
+        client = Client()
+        client.force_login(it_admin)
+        return client
+
+    def test_lists_one_page_and_links_the_next(self, client, ticket_category, ticket_type, settings):
+        settings.TICKETS_PAGE_SIZE = 5
+        make_tickets(ticket_category, ticket_type, 12)
+
+        response = client.get('/tickets/', HTTP_HX_REQUEST='true')
+
+        assert response.status_code == 200
+        assert len(response.context['tickets']) == 5
+        page = response.context['page']
+        assert page.has_next and not page.has_previous
+
+        response = client.get(f'/tickets/?cursor={page.next_cursor}', HTTP_HX_REQUEST='true')
+        assert len(response.context['tickets']) == 5
+        assert response.context['page'].has_previous
+
+    def test_queries_do_not_grow_with_page_size(
+        self, client, ticket_category, ticket_type, technician, django_assert_max_num_queries
+    ):
+        make_tickets(ticket_category, ticket_type, 5, assigned_to=technician)
+        client.get('/tickets/?page_size=5', HTTP_HX_REQUEST='true')  # warm up
+        with django_assert_max_num_queries(10) as small:
+            client.get('/tickets/?page_size=5', HTTP_HX_REQUEST='true')
+
+        make_tickets(ticket_category, ticket_type, 45, assigned_to=technician)
+        with django_assert_max_num_queries(len(small.captured_queries)):
+            client.get('/tickets/?page_size=50', HTTP_HX_REQUEST='true')
+
+    def test_search_by_ticket_number_uses_exact_id(
+        self, client, ticket_category, ticket_type, django_assert_max_num_queries
+    ):
+        tickets = make_tickets(ticket_category, ticket_type, 12)
+        target = tickets[0]
+
+        with django_assert_max_num_queries(20) as ctx:
+            response = client.get(f'/tickets/?search=%23{target.id}', HTTP_HX_REQUEST='true')
+
+        assert [t.id for t in response.context['tickets']] == [target.id]
+        # The id is matched exactly, never cast to text
+        ticket_queries = [q['sql'] for q in ctx.captured_queries if 'FROM "tickets"' in q['sql']]
+        assert ticket_queries
+        assert not any('CAST' in sql or '"tickets"."id" LIKE' in sql for sql in ticket_queries)
+
+    def test_invalid_cursor_falls_back_to_first_page(self, client, ticket_category, ticket_type):
+        make_tickets(ticket_category, ticket_type, 3)
+
+        response = client.get('/tickets/?cursor=garbage', HTTP_HX_REQUEST='true')
+
+        assert response.status_code == 200
+        assert len(response.context['tickets']) == 3
@@ -38,6 +38,7 @@ from apps.frontend.views import (
     edit_user,
     create_user,
     change_user_role,
+    user_autocomplete_api,
     logs,
     projects,
     project_detail,
@@ -98,6 +99,7 @@ urlpatterns = [
     path('edit-user/<int:user_id>/', edit_user, name='edit-user'),
     path('create-user/', create_user, name='create-user'),
     path('change-user-role/<int:user_id>/', change_user_role, name='change-user-role'),
+    path('api/users/autocomplete/', user_autocomplete_api, name='user-autocomplete-api'),
     
     # Logs
     path('logs/', logs, name='logs'),
@@ -82,6 +82,7 @@ from .users import (
     edit_user,
     create_user,
     change_user_role,
+    user_autocomplete_api,
 )
 
 # Profile views
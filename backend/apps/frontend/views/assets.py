@@ -204,41 +204,10 @@ class AssetDetailView(LoginRequiredMixin, TemplateView):
         else:
             assignable_users = User.objects.none()
         
-        # Get activity logs for this asset with field-level changes
-        from apps.logs.models import ActivityLog
-        from django.db.models import Q
-        
-        # Query activity logs for this asset
-        activities = ActivityLog.objects.filter(
-            Q(entity_type__iexact='asset', entity_id=asset.id) |
-            Q(model_name__iexact='asset', object_id=asset.id)
-        ).select_related('user').order_by('-timestamp')[:50]
-        
-        # Format activities to show field-level changes
-        formatted_activities = []
-        for activity in activities:
-            # Get field change info from extra_data if available
-            metadata = activity.extra_data or {}
-            field_name = metadata.get('field_name', '')
-            old_value = metadata.get('old_display', '-')
-            new_value = metadata.get('new_display', '-')
-            field_display = metadata.get('field_display', field_name)
-            
-            formatted_activities.append({
-                'id': activity.id,
-                'actor_username': activity.user.username if activity.user else 'System',
-                'actor_role': activity.user.role if activity.user else 'SYSTEM',
-                'action': activity.action,
-                'action_label': activity.action.replace('_', ' ').title(),
-                'description': activity.description,
-                'created_at': activity.timestamp,
-                # Field change details
-                'field_name': field_name,
-                'field_display': field_display,
-                'old_value': old_value,
-                'new_value': new_value,
-                'is_field_change': bool(field_name),
-            })
+        # Activity timeline for this asset, one page at a time (newest first)
+        from apps.logs.services.timeline import entity_timeline
+        activity_page = entity_timeline('asset', asset.id, cursor=self.request.GET.get('activity_cursor'))
+        formatted_activities = activity_page.items
         
         context.update({
             'asset': asset,
@@ -246,6 +215,7 @@ class AssetDetailView(LoginRequiredMixin, TemplateView):
             'assignable_users': assignable_users,
             'activities': formatted_activities,
             'activities_count': len(formatted_activities),
+            'activity_page': activity_page,
         })
         return context
     
@@ -19,7 +19,7 @@ from django.views.decorators.http import require_http_methods
 from django.views.generic import TemplateView
 from django.contrib.auth import authenticate, login, logout
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta, datetime, date
 import json
@@ -31,6 +31,7 @@ try:
     from apps.assets.models import Asset
     from apps.projects.models import Project
     from apps.tickets.models import Ticket, TicketComment
+    from apps.tickets.services.sla import risk_level as sla_risk_level
     from apps.logs.models import ActivityLog, SecurityEvent, SystemLog
     from apps.logs.services.activity_service import ActivityService
 except ImportError:
@@ -38,6 +39,7 @@ except ImportError:
     Asset = None
     Project = None
     Ticket = None
+    sla_risk_level = None
     ActivityLog = None
     SecurityEvent = None
     SystemLog = None
@@ -90,14 +92,6 @@ def safe_getattr(obj, name, default=None):
     return getattr(obj, name, default)
 
 
-# SLA thresholds in hours
-SLA_THRESHOLDS = {
-    'CRITICAL': 4,    # 4 hours for critical
-    'HIGH': 8,        # 8 hours for high
-    'MEDIUM': 24,     # 24 hours for medium
-    'LOW': 72,        # 72 hours for low
-}
-
 # Stalled ticket threshold (hours without update)
 STALLED_THRESHOLD_HOURS = 24
 
@@ -230,13 +224,12 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         priority_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
         my_tickets.sort(key=lambda t: (priority_order.get(t.priority, 4), t.created_at))
         
-        # Count overdue based on SLA
-        overdue_count = 0
-        for ticket in my_tickets:
-            hours_since_created = (now - ticket.created_at).total_seconds() / 3600
-            sla_threshold = SLA_THRESHOLDS.get(ticket.priority, 72)
-            if hours_since_created > sla_threshold:
-                overdue_count += 1
+        # Count overdue based on the stored SLA deadline
+        overdue_count = Ticket.objects.filter(
+            Q(assigned_to=user) | Q(created_by=user),
+            status__in=['NEW', 'OPEN', 'IN_PROGRESS'],
+            sla_due_at__lt=now,
+        ).count() if Ticket and user else 0
         
         # Get projects for IT_ADMIN users
         my_projects = []
@@ -266,11 +259,12 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         Admin sees all; regular users see only their responsible tickets.
         """
         now = timezone.now()
-        risky_tickets = []
-        critical_count = 0
         
+        # Stored thresholds: half the SLA window elapsed (warning),
+        # three quarters (critical), deadline passed (breached)
         base_query = Ticket.objects.filter(
-            status__in=['NEW', 'OPEN', 'IN_PROGRESS']
+            status__in=['NEW', 'OPEN', 'IN_PROGRESS'],
+            sla_warning_at__lte=now,
         )
         
         # Non-admins only see their responsible tickets
@@ -280,49 +274,34 @@ class DashboardView(LoginRequiredMixin, TemplateView):
                 Q(assigned_to=user) | Q(created_by=user)
             )
         
-        tickets = base_query.select_related('assigned_to', 'created_by', 'category')
+        counts = base_query.aggregate(
+            risk_count=Count('id'),
+            critical_count=Count('id', filter=Q(sla_critical_at__lte=now)),
+        )
+        tickets = base_query.select_related('assigned_to', 'category').order_by('sla_due_at')[:10]
         
+        risky_tickets = []
         for ticket in tickets:
-            hours_since_created = (now - ticket.created_at).total_seconds() / 3600
-            sla_threshold = SLA_THRESHOLDS.get(ticket.priority, 72)
-            remaining_hours = sla_threshold - hours_since_created
-            
-            # Flag as risky if less than 25% time remaining or already breached
-            if remaining_hours <= 0:
-                risk_level = 'breached'
-            elif remaining_hours <= sla_threshold * 0.25:
-                risk_level = 'critical'
-            elif remaining_hours <= sla_threshold * 0.5:
-                risk_level = 'warning'
-            else:
-                risk_level = 'safe'
-            
-            if risk_level in ['breached', 'critical', 'warning']:
-                risky_tickets.append({
-                    'id': ticket.id,
-                    'title': ticket.title,
-                    'priority': ticket.priority,
-                    'status': ticket.status,
-                    'created_at': ticket.created_at,
-                    'hours_elapsed': round(hours_since_created, 1),
-                    'sla_hours': sla_threshold,
-                    'remaining_hours': round(remaining_hours, 1),
-                    'risk_level': risk_level,
-                    'assigned_to': ticket.assigned_to.username if ticket.assigned_to else None,
-                    'category': ticket.category.name if ticket.category else None,
-                })
-                
-                if risk_level in ['breached', 'critical']:
-                    critical_count += 1
-        
-        # Sort by risk level (breached first, then critical, then warning)
-        risk_order = {'breached': 0, 'critical': 1, 'warning': 2}
-        risky_tickets.sort(key=lambda t: (risk_order.get(t['risk_level'], 3), t['hours_elapsed']))
+            hours_elapsed = (now - ticket.created_at).total_seconds() / 3600
+            sla_hours = (ticket.sla_due_at - ticket.created_at).total_seconds() / 3600
+            risky_tickets.append({
+                'id': ticket.id,
+                'title': ticket.title,
+                'priority': ticket.priority,
+                'status': ticket.status,
+                'created_at': ticket.created_at,
+                'hours_elapsed': round(hours_elapsed, 1),
+                'sla_hours': round(sla_hours, 1),
+                'remaining_hours': round(sla_hours - hours_elapsed, 1),
+                'risk_level': sla_risk_level(ticket, now),
+                'assigned_to': ticket.assigned_to.username if ticket.assigned_to else None,
+                'category': ticket.category.name if ticket.category else None,
+            })
         
         return {
-            'risky_tickets': risky_tickets[:10],  # Limit to 10
-            'risk_count': len(risky_tickets),
-            'critical_count': critical_count,
+            'risky_tickets': risky_tickets,
+            'risk_count': counts['risk_count'],
+            'critical_count': counts['critical_count'],
         }
     
     def _get_unassigned_stalled_tickets(self, user_role):
@@ -623,48 +602,23 @@ def dashboard_api(request):
 def search_api(request):
     """
     Global search API with role-based filtering.
+
+    Answered from the unified search index (apps.search) with one query;
+    results are grouped by entity type, best match first.
     """
+    from apps.search.query import search
+
     query = request.GET.get('q', '')
     search_type = request.GET.get('type', 'all')
-    user = request.user
-    user_role = getattr(user, 'role', 'VIEWER')
-    
+    entity_types = None
+    if search_type != 'all':
+        # 'tickets,users' -> ['ticket', 'user']
+        entity_types = [name.strip().rstrip('s') for name in search_type.split(',')]
+
     results = {}
-    
-    # Determine what the user can access
-    can_access_assets = is_admin_role(user_role)
-    can_access_projects = is_superadmin_or_manager(user_role)
-    can_access_users = is_admin_role(user_role)
-    can_access_tickets = True  # All roles can access tickets
-    
-    if ('all' in search_type or 'users' in search_type) and can_access_users:
-        try:
-            users = User.objects.filter(username__icontains=query)[:10].values('id', 'username', 'email', 'role')
-            results['users'] = list(users)
-        except:
-            results['users'] = []
-    
-    if ('all' in search_type or 'assets' in search_type) and can_access_assets:
-        try:
-            assets = Asset.objects.filter(name__icontains=query)[:10].values('id', 'name', 'asset_tag', 'category__name', 'status')
-            results['assets'] = list(assets)
-        except:
-            results['assets'] = []
-    
-    if ('all' in search_type or 'projects' in search_type) and can_access_projects:
-        try:
-            projects = Project.objects.filter(name__icontains=query)[:10].values('id', 'name', 'status', 'priority')
-            results['projects'] = list(projects)
-        except:
-            results['projects'] = []
-    
-    if ('all' in search_type or 'tickets' in search_type) and can_access_tickets:
-        try:
-            tickets = Ticket.objects.filter(title__icontains=query)[:10].values('id', 'title', 'status', 'priority', 'ticket_id')
-            results['tickets'] = list(tickets)
-        except:
-            results['tickets'] = []
-    
+    for result in search(request.user, query, entity_types=entity_types):
+        results.setdefault(f'{result.entity_type}s', []).append(result.as_dict())
+
     return JsonResponse({
         'query': query,
         'results': results,
@@ -837,14 +791,15 @@ def command_palette_api(request):
     """
     Command Palette API for Ctrl+K functionality.
     
-    Returns available commands based on user role.
+    Returns available commands based on user role, and search index
+    matches for the typed text (``q``).
     All permission filtering done in backend - template receives safe data.
     """
     from apps.frontend.command_palette import get_command_palette_data, resolve_command
     
     if request.method == 'GET':
         # Return available commands for the user
-        data = get_command_palette_data(request.user)
+        data = get_command_palette_data(request.user, request.GET.get('q', ''))
         return JsonResponse(data)
     
     elif request.method == 'POST':
@@ -855,7 +810,7 @@ def command_palette_api(request):
             command_key = body.get('command_key')
             input_value = body.get('input_value')
             
-            result = resolve_command(command_key, input_value)
+            result = resolve_command(command_key, input_value, user=request.user)
             return JsonResponse(result)
         except json.JSONDecodeError:
             return JsonResponse({
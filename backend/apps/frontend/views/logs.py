@@ -77,14 +77,10 @@ class LogsView(TemplateView):
         # Get security events
         security_events = self._get_security_events()
         
-        # Get all active users for the filter dropdown
-        from apps.users.models import User
-        all_users = User.objects.filter(is_active=True).order_by('username')
-        
+        # The user filter looks users up through the autocomplete API
         context.update({
             'log_entries': log_entries,
             'security_events': security_events,
-            'all_users': all_users,
             'page_obj': page_obj,
             'paginator': paginator,
             'filters': self._get_filters(),
@@ -414,15 +410,11 @@ class ActivityTimelineView(TemplateView):
             entry.performed_by_username = getattr(entry, 'actor_username', None) or getattr(entry, 'actor_name', 'System')
             entry.performed_by_role = getattr(entry, 'actor_role', '')
         
-        # Get all active users for filter dropdown
-        from apps.users.models import User
-        all_users = User.objects.filter(is_active=True).order_by('username')[:100]
-        
+        # The user filter looks users up through the autocomplete API
         context.update({
             'log_entries': log_entries,
             'page_obj': page_obj,
             'paginator': paginator,
-            'all_users': all_users,
         })
         
         return context
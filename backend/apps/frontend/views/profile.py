@@ -244,12 +244,10 @@ class LogsView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         try:
-            from django.contrib.auth import get_user_model
             from apps.logs.services.activity_service import ActivityService
             from apps.logs.services.log_adapter import LogAdapter
             from datetime import datetime
             
-            User = get_user_model()
             service = ActivityService()
             adapter = LogAdapter()
             request = self.request
@@ -304,20 +302,17 @@ class LogsView(LoginRequiredMixin, TemplateView):
             log_entries = adapter.to_template_dicts(activity_logs)
             
             security_events = SecurityEvent.objects.select_related('affected_user').order_by('-detected_at')[:50]
-            all_users = User.objects.all().order_by('username')
         except Exception as e:
             import traceback
             print(f"[LOGS_VIEW] Error: {e}")
             traceback.print_exc()
             log_entries = []
             security_events = []
-            all_users = []
         
         # Pass ONLY log_entries to template - no ActivityLog objects, no user FKs
         context.update({
             'log_entries': log_entries,
             'security_events': security_events,
-            'all_users': all_users
         })
         return context
 
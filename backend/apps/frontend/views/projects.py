@@ -5,6 +5,8 @@ Uses CQRS pattern: Commands handle business logic and authorization.
 Views are thin - they only parse requests and call commands.
 """
 
+import uuid
+
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -18,6 +20,7 @@ from apps.projects.queries import ProjectQuery
 from apps.core.exceptions import NotFoundError, PermissionDeniedError
 from apps.core.exception_mapper import SafeTemplateView
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import request_idempotency_key
 from apps.projects.domain.services.project_authority import (
     can_create_project,
 )
@@ -129,6 +132,7 @@ class CreateProjectView(LoginRequiredMixin, CanManageProjectsMixin, SafeTemplate
             'available_users': available_users,
             'form': {},
             'permissions': list_permissions,
+            'idempotency_key': uuid.uuid4().hex,
         })
         return context
     
@@ -148,6 +152,7 @@ class CreateProjectView(LoginRequiredMixin, CanManageProjectsMixin, SafeTemplate
                 budget=request.POST.get('budget', '0'),
                 owner_id=request.POST.get('project_manager', '') or None,
                 team_members=request.POST.getlist('team_members', []),
+                idempotency_key=request_idempotency_key(request),
             )
             
             if result.success:
@@ -251,6 +256,10 @@ class EditProjectView(SafeTemplateView):
         # Build UI permission flags using permission_mapper
         permissions = build_project_ui_permissions(self.request.user, project_dict)
         
+        # Activity timeline for this project, one page at a time (newest first)
+        from apps.logs.services.timeline import entity_timeline
+        activity_page = entity_timeline('project', project_id, cursor=self.request.GET.get('activity_cursor'))
+        
         context.update({
             'project': project_dto,
             'project_dict': project_dict,
@@ -261,6 +270,8 @@ class EditProjectView(SafeTemplateView):
             'it_admin_assignments': it_admin_assignments,
             'form': {},
             'permissions': permissions,
+            'activities': activity_page.items,
+            'activity_page': activity_page,
         })
         return context
     
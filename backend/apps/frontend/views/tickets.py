@@ -17,6 +17,8 @@ from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_http_methods
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
+from django.conf import settings
+from django.db.models import Q
 
 from apps.tickets.models import Ticket
 from apps.tickets.domain.services.ticket_authority import (
@@ -34,6 +36,7 @@ from apps.tickets.domain.services.ticket_authority import (
     can_resolve as can_resolve_ticket,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.pagination import InvalidCursor, keyset_paginate
 from apps.core.domain.roles import is_admin_role
 from apps.tickets.application.update_ticket import UpdateTicket
 from apps.tickets.application.delete_ticket import DeleteTicket
@@ -62,9 +65,23 @@ class TicketsView(LoginRequiredMixin, View):
         "can_self_assign": bool,
         "assigned_to_me": bool,
     }
+    
+    Tickets are listed one keyset page at a time (``cursor`` query
+    parameter); HTMX requests render only the table partial for that page.
     """
+    ordering = ('-created_at', '-id')
+    max_page_size = 200
+    
+    def get_page_size(self, request):
+        default = getattr(settings, 'TICKETS_PAGE_SIZE', 50)
+        try:
+            page_size = int(request.GET.get('page_size', default))
+        except (TypeError, ValueError):
+            page_size = default
+        return max(1, min(page_size, self.max_page_size))
+    
     def get(self, request):
-        qs = Ticket.objects.prefetch_related('category', 'ticket_type', 'assigned_to', 'created_by').all().order_by('-created_at')
+        qs = Ticket.objects.select_related('category', 'ticket_type', 'assigned_to', 'created_by')
         
         # HTMX API Filtering
         search = request.GET.get('search', '').strip()
@@ -73,17 +90,29 @@ class TicketsView(LoginRequiredMixin, View):
         category = request.GET.get('category', '').strip()
         
         if search:
-            from django.db.models import Q
-            clean_search = search.replace('#', '')
-            qs = qs.filter(Q(title__icontains=search) | Q(id__icontains=clean_search))
+            clean_search = search.lstrip('#')
+            search_filter = Q(title__icontains=search)
+            if clean_search.isdigit():
+                # Match the ticket number exactly instead of casting ids to text
+                search_filter |= Q(pk=int(clean_search))
+            qs = qs.filter(search_filter)
         if status:
             qs = qs.filter(status=status)
         if priority:
             qs = qs.filter(priority=priority)
         if category:
             qs = qs.filter(category__name__iexact=category)
-            
-        tickets = qs
+        
+        # One page at a time, newest first (keyset on created_at, id)
+        page_size = self.get_page_size(request)
+        try:
+            page = keyset_paginate(
+                qs, ordering=self.ordering, cursor=request.GET.get('cursor'), page_size=page_size
+            )
+        except InvalidCursor:
+            # Stale or tampered cursor: start over from the first page
+            page = keyset_paginate(qs, ordering=self.ordering, page_size=page_size)
+        tickets = page.items
         
         # Build permissions map using authority via permissions_mapper
         permissions_by_ticket = build_tickets_permissions_map(request.user, tickets)
@@ -106,8 +135,14 @@ class TicketsView(LoginRequiredMixin, View):
         
         allowed_actions = get_page_actions(page_key, request.user)
         
+        # Current filters, carried over by the paging links
+        filter_query = request.GET.copy()
+        filter_query.pop('cursor', None)
+        
         context = {
             "tickets": tickets,
+            "page": page,
+            "filter_query": filter_query.urlencode(),
             "permissions_by_ticket": permissions_by_ticket,
             "permissions": list_permissions,
             "allowed_actions": allowed_actions,
@@ -166,41 +201,10 @@ class TicketDetailView(LoginRequiredMixin, View):
         else:
             assignable_users = User.objects.none()
         
-        # Get activity logs for this ticket with field-level changes
-        from apps.logs.models import ActivityLog
-        from django.db.models import Q
-        
-        # Query activity logs for this ticket
-        activities = ActivityLog.objects.filter(
-            Q(entity_type__iexact='ticket', entity_id=ticket.id) |
-            Q(model_name__iexact='ticket', object_id=ticket.id)
-        ).select_related('user').order_by('-timestamp')[:50]
-        
-        # Format activities to show field-level changes
-        formatted_activities = []
-        for activity in activities:
-            # Get field change info from extra_data if available
-            metadata = activity.extra_data or {}
-            field_name = metadata.get('field_name', '')
-            old_value = metadata.get('old_display', '-')
-            new_value = metadata.get('new_display', '-')
-            field_display = metadata.get('field_display', field_name)
-            
-            formatted_activities.append({
-                'id': activity.id,
-                'actor_username': activity.user.username if activity.user else 'System',
-                'actor_role': activity.user.role if activity.user else 'SYSTEM',
-                'action': activity.action,
-                'action_label': activity.action.replace('_', ' ').title(),
-                'description': activity.description,
-                'created_at': activity.timestamp,
-                # Field change details
-                'field_name': field_name,
-                'field_display': field_display,
-                'old_value': old_value,
-                'new_value': new_value,
-                'is_field_change': bool(field_name),
-            })
+        # Activity timeline for this ticket, one page at a time (newest first)
+        from apps.logs.services.timeline import entity_timeline
+        activity_page = entity_timeline('ticket', ticket.id, cursor=request.GET.get('activity_cursor'))
+        formatted_activities = activity_page.items
         
         return render(request, "frontend/ticket_detail.html", {
             "ticket": ticket,
@@ -208,6 +212,7 @@ class TicketDetailView(LoginRequiredMixin, View):
             "assignable_users": assignable_users,
             "activities": formatted_activities,
             "activities_count": len(formatted_activities),
+            "activity_page": activity_page,
             # Display context variables for template
             "ticket_status_display": ticket_status_display,
             "ticket_priority_display": ticket_priority_display,
@@ -241,6 +246,7 @@ class CreateTicketView(LoginRequiredMixin, View):
 
     def post(self, request):
         from apps.tickets.application.create_ticket import CreateTicket
+        from apps.core.idempotency import request_idempotency_key
         from apps.users.models import User
         from apps.frontend.forms import TicketForm
         
@@ -273,7 +279,8 @@ class CreateTicketView(LoginRequiredMixin, View):
                         'contact_type': data.get('contact_type'),
                         'contact_email': data.get('contact_email'),
                         'contact_phone': data.get('contact_phone'),
-                    }
+                    },
+                    idempotency_key=request_idempotency_key(request),
                 )
                 
                 if result.success:
@@ -298,7 +305,6 @@ class EditTicketView(LoginRequiredMixin, View):
     """
     def get(self, request, pk):
         from apps.tickets.models import TicketCategory, TicketType
-        from apps.users.models import User
         
         ticket = get_object_or_404(Ticket, pk=pk)
         
@@ -311,17 +317,8 @@ class EditTicketView(LoginRequiredMixin, View):
         categories = TicketCategory.objects.filter(is_active=True).order_by('name')
         ticket_types = TicketType.objects.filter(is_active=True).order_by('name')
         
-        # Get list of assignable users based on role
-        user = request.user
-        if is_admin_role(user.role):
-            # Show all technicians for assignment
-            available_users = User.objects.filter(role='TECHNICIAN', is_active=True).order_by('username')
-        elif user.role == 'TECHNICIAN':
-            # Technician can only see themselves for self-assignment
-            available_users = User.objects.filter(id=user.id)
-        else:
-            available_users = User.objects.none()
-        
+        # Assignable technicians are looked up through the autocomplete API
+        # (scope "assignee", restricted by the requesting user's role)
         # Build UI permission flags for template consistency
         # This already contains: can_assign, can_unassign, can_self_assign, assigned_to_me
         permissions = build_ticket_ui_permissions(request.user, ticket)
@@ -331,7 +328,6 @@ class EditTicketView(LoginRequiredMixin, View):
             "permissions": permissions,
             "categories": categories,
             "ticket_types": ticket_types,
-            "available_users": available_users,
             "assign_config": {
                 "visible": True,
                 "readonly": False,
@@ -383,14 +379,6 @@ class EditTicketView(LoginRequiredMixin, View):
             categories = TicketCategory.objects.filter(is_active=True).order_by('name')
             ticket_types = TicketType.objects.filter(is_active=True).order_by('name')
             
-            user = request.user
-            if is_admin_role(user.role):
-                available_users = User.objects.filter(role='TECHNICIAN', is_active=True).order_by('username')
-            elif user.role == 'TECHNICIAN':
-                available_users = User.objects.filter(id=user.id)
-            else:
-                available_users = User.objects.none()
-            
             permissions = build_ticket_ui_permissions(request.user, ticket)
             
             return render(request, "frontend/edit-ticket.html", {
@@ -398,7 +386,6 @@ class EditTicketView(LoginRequiredMixin, View):
                 "permissions": permissions,
                 "categories": categories,
                 "ticket_types": ticket_types,
-                "available_users": available_users,
                 "assign_config": {
                     "visible": True,
                     "readonly": False,
@@ -13,6 +13,7 @@ from django.views.decorators.http import require_http_methods
 from django.views.generic import TemplateView
 
 from apps.frontend.mixins import CanManageUsersMixin, FrontendAdminReadMixin
+from apps.users.lookup import AUTOCOMPLETE_SCOPES, DEFAULT_LIMIT, user_autocomplete
 from apps.users.models import User
 from apps.users.domain.services.user_authority import (
     get_user_permissions, 
@@ -401,3 +402,23 @@ def change_user_role(request, user_id):
     
     return redirect('frontend:edit-user', user_id=user_id)
 
+
+@login_required
+def user_autocomplete_api(request):
+    """
+    Users matching a typed prefix, for user picker fields.
+
+    Query params: ``q`` (prefix of username, name or email), ``scope``
+    (one of AUTOCOMPLETE_SCOPES, which also applies the caller's role
+    restrictions) and ``limit``.
+    """
+    scope = request.GET.get('scope', 'active')
+    if scope not in AUTOCOMPLETE_SCOPES:
+        return JsonResponse({'error': f'Unknown scope: {scope}'}, status=400)
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    entries = user_autocomplete(request.user, request.GET.get('q', ''), scope=scope, limit=limit)
+    return JsonResponse({'results': [entry.as_dict() for entry in entries]})
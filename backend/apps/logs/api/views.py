@@ -13,7 +13,7 @@ from django.db.models import Q, Count
 from django.utils import timezone
 from datetime import datetime, timedelta
 
-from apps.logs.models import ActivityLog
+from apps.logs.models import ActivityLog, canonical_entity_type
 from apps.logs.api.serializers import (
     ActivityLogSerializer,
     ActivityTimelineRequestSerializer,
@@ -113,7 +113,7 @@ class ActivityTimelineAPIView(APIView):
         # Entity type filter
         entity_type = params.get('entity_type')
         if entity_type:
-            qs = qs.filter(entity_type__iexact=entity_type)
+            qs = qs.filter(entity_type=canonical_entity_type(entity_type))
         
         # User filters
         user_id = params.get('user_id')
@@ -276,7 +276,7 @@ class EntityActivityAPIView(APIView):
         
         # Get logs for entity
         logs = ActivityLog.objects.filter(
-            entity_type__iexact=entity_type,
+            entity_type=canonical_entity_type(entity_type),
             entity_id=entity_id,
         ).select_related('user').order_by('-timestamp')[:limit]
         
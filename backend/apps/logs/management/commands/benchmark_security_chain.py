@@ -0,0 +1,44 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.logs.models import ActivityLog
+from apps.logs.services.hash_chain import append_events
+from apps.logs.services.security_event_service import SecurityEvent, verify_log_integrity
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark appending security events to the hash chain in batches. '
+        'Runs inside a transaction that is rolled back, so no data is kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--events', type=int, default=20000, help='Number of events to append')
+        parser.add_argument('--batch-size', type=int, default=100, help='Events per append (one lock each)')
+
+    def handle(self, *args, **options):
+        count, batch_size = options['events'], options['batch_size']
+        events = [
+            SecurityEvent(event_type='LOGIN_FAILURE', severity='MEDIUM', details={'attempt': i})
+            for i in range(count)
+        ]
+
+        with transaction.atomic():
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                for offset in range(0, count, batch_size):
+                    append_events(events[offset:offset + batch_size])
+            elapsed = time.perf_counter() - start
+
+            stored = ActivityLog.objects.filter(hash_chain__in=[events[0].hash_chain, events[-1].hash_chain])
+            self.stdout.write(f'Appended {count} events in batches of {batch_size}')
+            self.stdout.write(f'Elapsed: {elapsed:.2f}s ({count / elapsed:.0f} events/s)')
+            self.stdout.write(f'Total queries: {len(queries.captured_queries)}')
+            self.stdout.write(f'Chain valid: {verify_log_integrity(events)["is_valid"]}, rows found: {stored.count()}')
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, changes rolled back'))
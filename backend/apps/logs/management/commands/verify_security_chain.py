@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.logs.services.chain_verification import verify_security_chain
+
+
+class Command(BaseCommand):
+    help = (
+        'Verify the security event hash chain from the last checkpoint to the current head '
+        'and record a new checkpoint.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Ignore checkpoints and verify the whole chain')
+        parser.add_argument('--workers', type=int, default=None, help='Worker processes verifying disjoint ranges')
+        parser.add_argument('--chunk-size', type=int, default=None, help='Rows fetched per round trip')
+        parser.add_argument('--no-checkpoint', action='store_true', help='Do not record a checkpoint')
+
+    def handle(self, *args, **options):
+        result = verify_security_chain(
+            full=options['full'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            checkpoint=not options['no_checkpoint'],
+        )
+
+        if result.end <= result.start_after:
+            self.stdout.write(f'No new events since checkpoint {result.start_after}')
+            return
+        self.stdout.write(f'Verified events {result.start_after + 1}-{result.last_sequence} of {result.end}')
+        self.stdout.write(
+            f'Elapsed: {result.elapsed:.2f}s ({result.verified} events, {result.events_per_second:.0f} events/s)'
+        )
+        if not result.is_valid:
+            raise CommandError(f'Hash chain broken at event {result.broken_at}: {result.reason}')
+        self.stdout.write(self.style.SUCCESS('Security event chain intact'))
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.11 on 2026-10-18 23:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+def create_chain_head(apps, schema_editor):
+    SecurityChainHead = apps.get_model('logs', 'SecurityChainHead')
+    SecurityChainHead.objects.using(schema_editor.connection.alias).get_or_create(name='security_events')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecurityChainHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('sequence', models.PositiveBigIntegerField(default=0)),
+                ('last_hash', models.CharField(blank=True, max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Security Chain Head',
+                'verbose_name_plural': 'Security Chain Heads',
+                'db_table': 'security_chain_heads',
+            },
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='chain_sequence',
+            field=models.PositiveBigIntegerField(blank=True, help_text='Position in the security event hash chain', null=True, unique=True),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='hash_chain',
+            field=models.CharField(blank=True, help_text="SHA256 of this event's data and previous_hash", max_length=64),
+        ),
+        migrations.AddField(
+            model_name='activitylog',
+            name='previous_hash',
+            field=models.CharField(blank=True, help_text='Hash of the previous security event in the chain', max_length=64),
+        ),
+        migrations.AlterField(
+            model_name='activitylog',
+            name='timestamp',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now, editable=False, help_text='Primary timestamp for activity logging. Used for dashboard ordering, display, and all temporal queries.'),
+        ),
+        migrations.RunPython(create_chain_head, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0002_security_event_hash_chain'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SecurityChainCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50)),
+                ('sequence', models.PositiveBigIntegerField()),
+                ('hash_chain', models.CharField(max_length=64)),
+                ('signature', models.CharField(max_length=64)),
+                ('events_verified', models.PositiveBigIntegerField(default=0)),
+                ('duration', models.FloatField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Security Chain Checkpoint',
+                'verbose_name_plural': 'Security Chain Checkpoints',
+                'db_table': 'security_chain_checkpoints',
+                'ordering': ['-sequence'],
+                'indexes': [models.Index(fields=['name', 'sequence'], name='security_ch_name_02f691_idx')],
+            },
+        ),
+    ]
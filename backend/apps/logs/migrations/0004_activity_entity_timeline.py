@@ -0,0 +1,47 @@
+# Generated by Django 4.2.11 on 2026-10-18 23:34
+
+from django.db import migrations, models
+from django.db.models import F, Max, Min
+from django.db.models.functions import Lower, Trim
+
+BATCH_SIZE = 10000
+
+
+def canonicalize_entity_types(apps, schema_editor):
+    """
+    Store entity types lower-case, filling them from model_name/object_id
+    where only those were set. Updates run in primary key ranges so each
+    statement touches a bounded number of rows.
+
+    Security events are skipped: their stored entity type is covered by the
+    hash chain.
+    """
+    ActivityLog = apps.get_model('logs', 'ActivityLog')
+    logs = ActivityLog.objects.using(schema_editor.connection.alias)
+    bounds = logs.aggregate(first=Min('id'), last=Max('id'))
+    if bounds['first'] is None:
+        return
+
+    for start in range(bounds['first'], bounds['last'] + 1, BATCH_SIZE):
+        batch = logs.filter(id__gte=start, id__lt=start + BATCH_SIZE, chain_sequence__isnull=True)
+        batch.filter(entity_type='', object_id__isnull=False).exclude(model_name='').update(
+            entity_type=Lower(Trim('model_name')), entity_id=F('object_id'),
+        )
+        batch.exclude(entity_type=Lower(Trim('entity_type'))).update(
+            entity_type=Lower(Trim('entity_type')),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logs', '0003_security_chain_checkpoints'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='activitylog',
+            index=models.Index(fields=['entity_type', 'entity_id', 'timestamp'], name='activity_lo_entity__833779_idx'),
+        ),
+        migrations.RunPython(canonicalize_entity_types, migrations.RunPython.noop),
+    ]
@@ -12,6 +12,17 @@ from datetime import datetime, timedelta
 
 User = get_user_model()
 
+
+def canonical_entity_type(entity_type):
+    """
+    Canonical form of an ActivityLog entity type ('Ticket', 'TICKET' -> 'ticket').
+
+    Entity types are stored in this form so timelines can filter them with an
+    exact, indexed lookup instead of ``iexact``.
+    """
+    return (entity_type or '').strip().lower()
+
+
 class LogCategory(models.Model):
     """
     Categories for organizing different types of logs.
@@ -221,9 +232,31 @@ class ActivityLog(models.Model):
     extra_data = models.JSONField(default=dict, blank=True)
     tags = models.JSONField(default=list, blank=True)
     
+    # ==========================================================================
+    # Security Event Hash Chain - set only on security events, by
+    # apps.logs.services.hash_chain; chain_sequence orders the chain
+    # ==========================================================================
+    chain_sequence = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        unique=True,
+        help_text="Position in the security event hash chain"
+    )
+    previous_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Hash of the previous security event in the chain"
+    )
+    hash_chain = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="SHA256 of this event's data and previous_hash"
+    )
+    
     # Timestamps
     timestamp = models.DateTimeField(
-    auto_now_add=True,
+    default=timezone.now,
+    editable=False,
     db_index=True,
     help_text=(
         "Primary timestamp for activity logging. "
@@ -244,12 +277,69 @@ class ActivityLog(models.Model):
             models.Index(fields=['level', 'timestamp']),
             models.Index(fields=['category', 'timestamp']),
             models.Index(fields=['ip_address', 'timestamp']),
+            # Per-entity timelines (see apps.logs.services.timeline)
+            models.Index(fields=['entity_type', 'entity_id', 'timestamp']),
         ]
     
     def __str__(self):
         user_info = self.user.username if self.user else 'Anonymous'
         return f"{self.timestamp} - {user_info} - {self.title}"
 
+    def save(self, *args, **kwargs):
+        """Store the entity in canonical form, filling it from model_name/object_id if unset."""
+        if not self.entity_type and self.model_name and self.object_id is not None:
+            self.entity_type, self.entity_id = self.model_name, self.object_id
+        self.entity_type = canonical_entity_type(self.entity_type)
+        super().save(*args, **kwargs)
+
+class SecurityChainHead(models.Model):
+    """
+    Head of a security event hash chain.
+
+    Appends lock this row (SELECT ... FOR UPDATE), so exactly one writer
+    extends the chain at a time and the chain cannot fork.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    sequence = models.PositiveBigIntegerField(default=0)  # chain_sequence of the last event
+    last_hash = models.CharField(max_length=64, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'security_chain_heads'
+        verbose_name = 'Security Chain Head'
+        verbose_name_plural = 'Security Chain Heads'
+    
+    def __str__(self):
+        return f"{self.name} @ {self.sequence}"
+
+class SecurityChainCheckpoint(models.Model):
+    """
+    A verified prefix of a security event hash chain.
+
+    Written by apps.logs.services.chain_verification after the events up to
+    ``sequence`` were verified; later runs resume from the newest checkpoint
+    whose HMAC ``signature`` is valid.
+    """
+    name = models.CharField(max_length=50)
+    sequence = models.PositiveBigIntegerField()  # chain_sequence of the last verified event
+    hash_chain = models.CharField(max_length=64)
+    signature = models.CharField(max_length=64)
+    events_verified = models.PositiveBigIntegerField(default=0)  # in the run that wrote it
+    duration = models.FloatField(default=0)  # seconds
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'security_chain_checkpoints'
+        verbose_name = 'Security Chain Checkpoint'
+        verbose_name_plural = 'Security Chain Checkpoints'
+        ordering = ['-sequence']
+        indexes = [
+            models.Index(fields=['name', 'sequence']),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} verified to {self.sequence}"
+
 class AuditLog(models.Model):
     """
     Audit log for sensitive operations and data changes.
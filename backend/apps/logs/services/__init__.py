@@ -4,6 +4,9 @@ Services package for Activity Logging.
 Modules:
     - activity_service: Activity logging (tickets, assets, projects)
     - security_event_service: SecurityEventService — hash-chained security event logging
+    - hash_chain: Serialized, batched appends to the security event hash chain
+    - chain_verification: Incremental, checkpointed verification of the stored chain
+    - timeline: Indexed, keyset-paginated per-entity activity timelines
     - access_policy: Role-based log access control
     - log_query_service: Query-first log filtering
 
@@ -33,6 +36,7 @@ from apps.logs.services.security_event_service import (
     HashChainManager,
     IntegrityVerifier,
 )
+from apps.logs.services.chain_verification import verify_security_chain
 from apps.logs.services.access_policy import (
     LogAccessPolicyService,
     LogImmutabilityService,
@@ -57,6 +61,7 @@ __all__ = [
     'detect_tampering',
     'HashChainManager',
     'IntegrityVerifier',
+    'verify_security_chain',
     'LogAccessPolicyService',
     'LogImmutabilityService',
     'ReadOnlyAdminMixin',
@@ -0,0 +1,230 @@
+"""
+Incremental verification of the stored security event hash chain.
+
+``verify_security_chain`` checks the ActivityLog rows written by
+apps.logs.services.hash_chain without loading the history into memory:
+
+- Rows are streamed in ``chain_sequence`` order with ``iterator()``, a
+  server-side cursor on PostgreSQL, and checked one at a time: the sequence
+  has no gap, ``previous_hash`` links to the previous row and ``hash_chain``
+  matches the recomputed hash.
+- A run covers the chain up to the head as of its start and records a
+  SecurityChainCheckpoint (last verified sequence and hash, HMAC signed
+  with the SECRET_KEY). The next run resumes after the newest checkpoint
+  with a valid signature; ``full=True`` ignores checkpoints.
+- With ``workers`` > 1 the range is split into disjoint parts verified in
+  a process pool. Each part is seeded with the stored hash of the row
+  before it, whose own hash is checked by the preceding part.
+
+A broken chain is logged as critical. The checkpoint then stops at the
+last event verified before the break, so every later run reports it again.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from apps.logs.models import ActivityLog, SecurityChainCheckpoint
+from apps.logs.services.hash_chain import CHAIN_COLUMNS, CHAIN_NAME, chain_head, hash_payload, row_payload
+
+logger = logging.getLogger(__name__)
+
+_SIGNATURE_SALT = 'apps.logs.chain_verification.checkpoint'
+
+
+@dataclass
+class ChainVerification:
+    """Outcome of verifying the events after ``start_after`` up to ``end``."""
+    start_after: int
+    end: int
+    last_sequence: int  # last event verified to be intact
+    last_hash: str
+    verified: int = 0
+    broken_at: Optional[int] = None
+    reason: str = ''
+    elapsed: float = 0.0
+
+    @property
+    def is_valid(self) -> bool:
+        return self.broken_at is None
+
+    @property
+    def events_per_second(self) -> float:
+        return self.verified / self.elapsed if self.elapsed else 0.0
+
+
+# =============================================================================
+# Checkpoints
+# =============================================================================
+
+def sign_checkpoint(sequence: int, hash_value: str) -> str:
+    return salted_hmac(_SIGNATURE_SALT, f'{CHAIN_NAME}:{sequence}:{hash_value}', algorithm='sha256').hexdigest()
+
+
+def latest_checkpoint(using: str = DEFAULT_DB_ALIAS) -> Optional[SecurityChainCheckpoint]:
+    """The newest checkpoint whose signature is valid."""
+    checkpoints = SecurityChainCheckpoint.objects.using(using).filter(name=CHAIN_NAME).order_by('-sequence')
+    for checkpoint in checkpoints.iterator(chunk_size=20):
+        expected = sign_checkpoint(checkpoint.sequence, checkpoint.hash_chain)
+        if constant_time_compare(checkpoint.signature, expected):
+            return checkpoint
+        logger.warning(f"Ignoring security chain checkpoint {checkpoint.pk} with an invalid signature")
+    return None
+
+
+def _save_checkpoint(result: ChainVerification, using: str):
+    if result.last_sequence <= result.start_after:
+        return
+    SecurityChainCheckpoint.objects.using(using).create(
+        name=CHAIN_NAME,
+        sequence=result.last_sequence,
+        hash_chain=result.last_hash,
+        signature=sign_checkpoint(result.last_sequence, result.last_hash),
+        events_verified=result.verified,
+        duration=result.elapsed,
+    )
+
+
+# =============================================================================
+# Verification
+# =============================================================================
+
+def verify_range(start_after: int, end: int, previous_hash: Optional[str],
+                 chunk_size: int = None, using: str = DEFAULT_DB_ALIAS) -> ChainVerification:
+    """
+    Verify the events with ``start_after`` < chain_sequence <= ``end``.
+
+    ``previous_hash`` is the hash of event ``start_after`` ('' at the start of
+    the chain); ``None`` accepts the first event's stored previous_hash.
+    """
+    chunk_size = chunk_size or getattr(settings, 'SECURITY_CHAIN_VERIFY_CHUNK_SIZE', 2000)
+    result = ChainVerification(start_after, end, start_after, previous_hash or '')
+    started = time.perf_counter()
+
+    rows = (
+        ActivityLog.objects.using(using)
+        .filter(chain_sequence__gt=start_after, chain_sequence__lte=end)
+        .order_by('chain_sequence')
+        .values_list(*CHAIN_COLUMNS, named=True)
+    )
+    expected_sequence = start_after + 1
+    for row in rows.iterator(chunk_size=chunk_size):
+        if row.chain_sequence != expected_sequence:
+            result.broken_at, result.reason = expected_sequence, 'missing event'
+            break
+        if previous_hash is not None and row.previous_hash != previous_hash:
+            result.broken_at, result.reason = row.chain_sequence, 'previous hash mismatch'
+            break
+        if hash_payload(row_payload(row), row.previous_hash) != row.hash_chain:
+            result.broken_at, result.reason = row.chain_sequence, 'event hash mismatch'
+            break
+        previous_hash = row.hash_chain
+        result.last_sequence, result.last_hash = row.chain_sequence, row.hash_chain
+        result.verified += 1
+        expected_sequence += 1
+    else:
+        if expected_sequence <= end:
+            result.broken_at, result.reason = expected_sequence, 'missing event'
+
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _verify_range_in_worker(args: Tuple) -> ChainVerification:
+    import django
+    django.setup()
+    return verify_range(*args)
+
+
+def split_range(start_after: int, end: int, parts: int) -> List[Tuple[int, int]]:
+    """Split (start_after, end] into at most ``parts`` disjoint (start_after, end) ranges."""
+    size = max(1, -(-(end - start_after) // max(1, parts)))
+    return [(start, min(start + size, end)) for start in range(start_after, end, size)]
+
+
+def verify_ranges(ranges: List[Tuple[int, int]], first_hash: str, workers: int = 1,
+                  chunk_size: int = None, using: str = DEFAULT_DB_ALIAS) -> ChainVerification:
+    """
+    Verify contiguous ranges from ``split_range`` and merge the results.
+
+    The first range is seeded with ``first_hash``, the others with the stored
+    hash of the event before them.
+    """
+    boundaries = [start for start, _ in ranges[1:]]
+    stored = dict(
+        ActivityLog.objects.using(using)
+        .filter(chain_sequence__in=boundaries)
+        .values_list('chain_sequence', 'hash_chain')
+    )
+    jobs = [
+        (start, end, first_hash if index == 0 else stored.get(start), chunk_size, using)
+        for index, (start, end) in enumerate(ranges)
+    ]
+
+    started = time.perf_counter()
+    if workers <= 1 or len(jobs) == 1:
+        parts = [verify_range(*job) for job in jobs]
+    else:
+        # Forked workers must open their own connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parts = list(executor.map(_verify_range_in_worker, jobs))
+
+    merged = ChainVerification(ranges[0][0], ranges[-1][1], ranges[0][0], first_hash)
+    for part in parts:
+        merged.verified += part.verified
+        if merged.is_valid:
+            merged.last_sequence, merged.last_hash = part.last_sequence, part.last_hash
+            merged.broken_at, merged.reason = part.broken_at, part.reason
+    merged.elapsed = time.perf_counter() - started
+    return merged
+
+
+def verify_security_chain(full: bool = False, workers: int = None, chunk_size: int = None,
+                          checkpoint: bool = True, using: str = DEFAULT_DB_ALIAS) -> ChainVerification:
+    """
+    Verify the chain from the last checkpoint (or the start) to the current head.
+
+    Args:
+        full: Ignore checkpoints and verify from the first event
+        workers: Worker processes (default: SECURITY_CHAIN_VERIFY_WORKERS)
+        chunk_size: Rows fetched per round trip
+        checkpoint: Record a checkpoint for the verified events
+    """
+    if workers is None:
+        workers = getattr(settings, 'SECURITY_CHAIN_VERIFY_WORKERS', 1) or os.cpu_count() or 1
+
+    start_after, previous_hash = 0, ''
+    if not full:
+        last = latest_checkpoint(using)
+        if last is not None:
+            start_after, previous_hash = last.sequence, last.hash_chain
+    end = chain_head(using).sequence
+
+    if end <= start_after:
+        return ChainVerification(start_after, end, start_after, previous_hash)
+
+    result = verify_ranges(
+        split_range(start_after, end, workers), previous_hash,
+        workers=workers, chunk_size=chunk_size, using=using,
+    )
+    if result.is_valid:
+        logger.info(
+            f"Security event chain verified: events {start_after + 1}-{end}, "
+            f"{result.events_per_second:.0f} events/s"
+        )
+    else:
+        logger.critical(
+            f"Security event chain broken at event {result.broken_at} ({result.reason}); "
+            f"intact up to {result.last_sequence}"
+        )
+    if checkpoint:
+        _save_checkpoint(result, using)
+    return result
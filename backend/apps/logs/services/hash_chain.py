@@ -0,0 +1,178 @@
+"""
+Hash chain writer for security events.
+
+Security events are chained (each event's hash covers the previous one) and
+stored as ActivityLog rows with real ``chain_sequence``, ``previous_hash``
+and ``hash_chain`` columns. Appends are serialized by a row lock on the
+chain's SecurityChainHead, so concurrent writers queue behind each other
+instead of forking the chain:
+
+- ``append_events`` chains a list of events under one lock acquisition and
+  inserts them with one ``bulk_create``.
+- ``queue_event`` buffers events per thread, database alias and savepoint
+  level (apps.core.commit_batch) and appends each buffer with ``append_events`` once its transaction
+  commits, so a request logging several events takes the lock once, after
+  its own work is committed. Events queued outside a transaction are
+  appended immediately.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Dict, List, Sequence
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+
+from apps.core.commit_batch import CommitBatch
+from apps.logs.models import ActivityLog, SecurityChainHead, canonical_entity_type
+
+logger = logging.getLogger(__name__)
+
+CHAIN_NAME = 'security_events'
+
+
+def event_payload(event) -> Dict:
+    """The event fields covered by its hash, as they are stored (see ``row_payload``)."""
+    return {
+        'event_type': event.event_type,
+        'severity': event.severity,
+        'timestamp': event.timestamp.isoformat(),
+        'actor_id': event.actor_id,
+        'actor_username': event.actor_username or '',
+        'details': event.details,
+        'target_type': canonical_entity_type(event.target_type),
+        'target_id': event.target_id,
+    }
+
+
+# ActivityLog columns ``row_payload`` reads
+CHAIN_COLUMNS = (
+    'chain_sequence', 'previous_hash', 'hash_chain', 'event_type', 'level', 'timestamp',
+    'actor_id', 'actor_name', 'extra_data', 'entity_type', 'entity_id',
+)
+
+
+def row_payload(row) -> Dict:
+    """``event_payload`` of a stored event, from its CHAIN_COLUMNS."""
+    return {
+        'event_type': row.event_type,
+        'severity': row.level,
+        'timestamp': row.timestamp.isoformat(),
+        'actor_id': int(row.actor_id) if row.actor_id else None,
+        'actor_username': row.actor_name,
+        'details': (row.extra_data or {}).get('details', {}),
+        'target_type': row.entity_type,
+        'target_id': row.entity_id,
+    }
+
+
+def hash_payload(payload: Dict, previous_hash: str) -> str:
+    """SHA256(previous_hash + event data)."""
+    hash_input = previous_hash + json.dumps(payload, sort_keys=True)
+    return hashlib.sha256(hash_input.encode()).hexdigest()
+
+
+def compute_event_hash(event, previous_hash: str) -> str:
+    """Hash of an event chained after ``previous_hash``."""
+    return hash_payload(event_payload(event), previous_hash)
+
+
+def _to_activity_log(event, sequence: int) -> ActivityLog:
+    return ActivityLog(
+        action=event.event_type,
+        event_type=event.event_type,
+        level=event.severity,
+        severity='SECURITY',
+        intent='security',
+        title=event.event_type,
+        actor_id=event.actor_id,
+        actor_name=event.actor_username or '',
+        actor_role=event.actor_role or 'VIEWER',
+        ip_address=event.ip_address or None,
+        user_agent=event.user_agent or '',
+        description=json.dumps(event.details),
+        entity_type=canonical_entity_type(event.target_type),
+        entity_id=event.target_id,
+        extra_data={'security_event': True, 'details': event.details},
+        timestamp=event.timestamp,
+        chain_sequence=sequence,
+        previous_hash=event.previous_hash,
+        hash_chain=event.hash_chain,
+    )
+
+
+def lock_chain_head(using: str = DEFAULT_DB_ALIAS) -> SecurityChainHead:
+    """Lock and return the chain head; call inside a transaction."""
+    heads = SecurityChainHead.objects.using(using).select_for_update()
+    head = heads.filter(name=CHAIN_NAME).first()
+    if head is None:
+        try:
+            with transaction.atomic(using=using):
+                SecurityChainHead.objects.using(using).create(name=CHAIN_NAME)
+        except IntegrityError:
+            # Created by a concurrent writer
+            pass
+        head = heads.get(name=CHAIN_NAME)
+    return head
+
+
+def append_events(events: Sequence, using: str = DEFAULT_DB_ALIAS) -> List:
+    """
+    Chain events after the current head and store them.
+
+    Takes the head lock once and inserts all events with one bulk_create;
+    ``previous_hash`` and ``hash_chain`` are set on the given events.
+    """
+    events = list(events)
+    if not events:
+        return events
+    with transaction.atomic(using=using):
+        head = lock_chain_head(using)
+        rows = []
+        for event in events:
+            event.previous_hash = head.last_hash
+            event.hash_chain = compute_event_hash(event, head.last_hash)
+            head.last_hash = event.hash_chain
+            head.sequence += 1
+            rows.append(_to_activity_log(event, head.sequence))
+        ActivityLog.objects.using(using).bulk_create(
+            rows, batch_size=getattr(settings, 'SECURITY_CHAIN_BATCH_SIZE', 500)
+        )
+        head.save(using=using, update_fields=['sequence', 'last_hash', 'updated_at'])
+    return events
+
+
+def chain_head(using: str = DEFAULT_DB_ALIAS) -> SecurityChainHead:
+    """The chain head as last committed, without locking it."""
+    return (
+        SecurityChainHead.objects.using(using).filter(name=CHAIN_NAME).first()
+        or SecurityChainHead(name=CHAIN_NAME)
+    )
+
+
+# =============================================================================
+# Per-transaction batching
+# =============================================================================
+
+class ChainBatch(CommitBatch):
+    """Security events to append once a transaction (or savepoint) commits."""
+
+    def __init__(self, using: str, key=None):
+        super().__init__(using, key=key)
+        self.events = []
+
+    def add(self, *events):
+        self.events.extend(events)
+
+    def write(self):
+        try:
+            append_events(self.events, using=self.using)
+        except Exception as e:
+            logger.error(f"Failed to append {len(self.events)} security events to the hash chain: {str(e)}")
+        self.events = []
+
+
+def queue_event(event, using: str = DEFAULT_DB_ALIAS):
+    """Append a security event to the chain once the current transaction commits."""
+    ChainBatch.queue(event, using=using)
@@ -15,7 +15,7 @@ from typing import Optional, List, Dict, Any, Union
 from django.db.models import QuerySet, Q
 from django.utils import timezone
 
-from apps.logs.models import ActivityLog
+from apps.logs.models import ActivityLog, canonical_entity_type
 from apps.logs.enums import EventCategory
 
 
@@ -34,7 +34,7 @@ class LogQueryService:
         Args:
             user: Optional user for RBAC filtering
         """
-        self._queryset = ActivityLog.objects.all()
+        self._queryset = ActivityLog.objects.select_related('user', 'category')
         self._user = user
         self._filters_applied: List[str] = []
     
@@ -139,7 +139,7 @@ class LogQueryService:
         Returns:
             Self for method chaining
         """
-        self._queryset = self._queryset.filter(entity_type__iexact=entity_type)
+        self._queryset = self._queryset.filter(entity_type=canonical_entity_type(entity_type))
         
         if entity_id:
             self._queryset = self._queryset.filter(entity_id=entity_id)
@@ -332,7 +332,7 @@ class LogQueryService:
     
     def clear_filters(self) -> 'LogQueryService':
         """Clear all filters and reset to base queryset."""
-        self._queryset = ActivityLog.objects.all()
+        self._queryset = ActivityLog.objects.select_related('user', 'category')
         self._filters_applied = []
         return self
     
@@ -21,8 +21,6 @@ Usage:
     )
 """
 
-import hashlib
-import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -32,6 +30,8 @@ from django.utils import timezone
 from django.contrib.auth import get_user_model
 from django.db import transaction
 
+from apps.logs.services import hash_chain
+
 logger = logging.getLogger(__name__)
 
 User = get_user_model()
@@ -134,34 +134,17 @@ class HashChainManager:
     
     Each log entry contains:
     - previous_hash: Hash of the previous entry
-    - current_hash: Hash of this entry + previous hash
+    - hash_chain: Hash of this entry + previous hash
     
     This creates a chain where any modification breaks the hash chain.
+    The chain head lives in the database (SecurityChainHead) and appends
+    lock it, so concurrent writers cannot fork the chain; see
+    apps.logs.services.hash_chain.
     """
     
-    CACHE_KEY_LAST_HASH = 'security_event_last_hash'
-    
-    def __init__(self):
-        self._last_hash = None
-    
     def get_last_hash(self) -> str:
-        """
-        Get the hash of the last logged event.
-        Uses cache for performance.
-        """
-        from django.core.cache import cache
-        
-        cached = cache.get(self.CACHE_KEY_LAST_HASH)
-        if cached:
-            return cached
-        return ''
-    
-    def set_last_hash(self, hash_value: str):
-        """Store the hash of the most recent event."""
-        from django.core.cache import cache
-        
-        cache.set(self.CACHE_KEY_LAST_HASH, hash_value, timeout=None)
-        self._last_hash = hash_value
+        """Get the hash of the last committed event."""
+        return hash_chain.chain_head().last_hash
     
     def compute_hash(self, event: SecurityEvent, previous_hash: str) -> str:
         """
@@ -169,38 +152,21 @@ class HashChainManager:
         
         Creates: SHA256(previous_hash + event_data)
         """
-        # Serialize event data
-        event_data = {
-            'event_type': event.event_type,
-            'severity': event.severity,
-            'timestamp': event.timestamp.isoformat(),
-            'actor_id': event.actor_id,
-            'actor_username': event.actor_username,
-            'details': event.details,
-            'target_type': event.target_type,
-            'target_id': event.target_id,
-        }
-        
-        # Create hash input
-        hash_input = previous_hash + json.dumps(event_data, sort_keys=True)
-        
-        # Compute SHA256 hash
-        return hashlib.sha256(hash_input.encode()).hexdigest()
+        return hash_chain.compute_event_hash(event, previous_hash)
     
     def create_event_with_chain(self, event: SecurityEvent) -> SecurityEvent:
         """
-        Add hash chain information to an event.
+        Append an event to the chain now, setting its hash chain information.
         """
-        previous_hash = self.get_last_hash()
-        current_hash = self.compute_hash(event, previous_hash)
-        
-        event.previous_hash = previous_hash
-        event.hash_chain = current_hash
-        
-        # Update last hash
-        self.set_last_hash(current_hash)
-        
-        return event
+        return hash_chain.append_events([event])[0]
+    
+    def append_events(self, events: List[SecurityEvent]) -> List[SecurityEvent]:
+        """Append several events under one lock with one INSERT."""
+        return hash_chain.append_events(events)
+    
+    def queue_event(self, event: SecurityEvent):
+        """Append an event once the current transaction commits."""
+        hash_chain.queue_event(event)
 
 
 # =============================================================================
@@ -215,6 +181,9 @@ class IntegrityVerifier:
     - Individual log integrity
     - Chain integrity (hash chain)
     - Complete audit trail
+    
+    Works on in-memory events; the stored chain is verified incrementally
+    by apps.logs.services.chain_verification.
     """
     
     @staticmethod
@@ -222,22 +191,7 @@ class IntegrityVerifier:
         """
         Verify that an event's hash is correct.
         """
-        # Recreate hash input
-        event_data = {
-            'event_type': event.event_type,
-            'severity': event.severity,
-            'timestamp': event.timestamp.isoformat(),
-            'actor_id': event.actor_id,
-            'actor_username': event.actor_username,
-            'details': event.details,
-            'target_type': event.target_type,
-            'target_id': event.target_id,
-        }
-        
-        hash_input = previous_hash + json.dumps(event_data, sort_keys=True)
-        expected_hash = hashlib.sha256(hash_input.encode()).hexdigest()
-        
-        return event.hash_chain == expected_hash
+        return event.hash_chain == hash_chain.compute_event_hash(event, previous_hash)
     
     @staticmethod
     def verify_chain(events: List[SecurityEvent]) -> Dict[str, Any]:
@@ -367,9 +321,6 @@ class SecurityEventService:
             target_id=target_id,
         )
         
-        # Add hash chain
-        event = cls._hash_chain_manager.create_event_with_chain(event)
-        
         # Log to Django logger
         log_level = cls._get_log_level(severity)
         logger.log(
@@ -381,8 +332,9 @@ class SecurityEventService:
             }
         )
         
-        # Optionally save to database
-        cls._save_event(event)
+        # Chain and save once the current transaction commits; the event's
+        # previous_hash and hash_chain are set at that point
+        cls._hash_chain_manager.queue_event(event)
         
         return event
     
@@ -581,35 +533,6 @@ class SecurityEventService:
             SecuritySeverity.CRITICAL.value: logging.CRITICAL,
         }
         return level_map.get(severity, logging.INFO)
-    
-    @staticmethod
-    def _save_event(event: SecurityEvent):
-        """
-        Save event to database if ActivityLog model supports it.
-        
-        This is optional - events are always logged to Django logger.
-        """
-        try:
-            from apps.logs.models import ActivityLog
-            
-            # Create ActivityLog entry
-            ActivityLog.objects.create(
-                action=event.event_type,
-                level=event.severity,
-                actor_id=event.actor_id,
-                actor_name=event.actor_username,
-                actor_role=event.actor_role,
-                ip_address=event.ip_address,
-                description=json.dumps(event.details),
-                extra_data={
-                    **event.details,
-                    'security_event': True,
-                    'hash_chain': event.hash_chain,
-                },
-            )
-        except Exception as e:
-            # Don't fail if database save fails
-            logger.error(f"Failed to save security event to database: {e}")
 
 
 # =============================================================================
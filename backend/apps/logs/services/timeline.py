@@ -0,0 +1,65 @@
+"""
+Per-entity activity timelines for detail pages.
+
+Ticket, asset and project detail views read their history through
+``entity_timeline``: one query on the (entity_type, entity_id, timestamp)
+index of ActivityLog, newest first, keyset-paginated on (timestamp, id) so
+older pages cost the same as the first one.
+
+Entity types are stored canonical (see ``canonical_entity_type``), so the
+lookup is an exact match rather than ``iexact``.
+"""
+
+from typing import Dict
+
+from django.conf import settings
+
+from apps.core.pagination import InvalidCursor, KeysetPage, keyset_paginate
+from apps.logs.models import ActivityLog, canonical_entity_type
+
+TIMELINE_ORDERING = ('-timestamp', '-id')
+
+
+def timeline_queryset(entity_type: str, entity_id: int):
+    """ActivityLog rows of one entity, served by the entity timeline index."""
+    return ActivityLog.objects.filter(
+        entity_type=canonical_entity_type(entity_type), entity_id=entity_id,
+    )
+
+
+def format_timeline_entry(activity: ActivityLog) -> Dict:
+    """Template data for one timeline entry, including field-level changes."""
+    metadata = activity.extra_data or {}
+    field_name = metadata.get('field_name', '')
+    return {
+        'id': activity.id,
+        'actor_username': activity.user.username if activity.user else 'System',
+        'actor_role': activity.user.role if activity.user else 'SYSTEM',
+        'action': activity.action,
+        'action_label': activity.action.replace('_', ' ').title(),
+        'description': activity.description,
+        'created_at': activity.timestamp,
+        # Field change details
+        'field_name': field_name,
+        'field_display': metadata.get('field_display', field_name),
+        'old_value': metadata.get('old_display', '-'),
+        'new_value': metadata.get('new_display', '-'),
+        'is_field_change': bool(field_name),
+    }
+
+
+def entity_timeline(entity_type: str, entity_id: int, cursor: str = None,
+                    page_size: int = None) -> KeysetPage:
+    """
+    One page of an entity's timeline, newest first, with formatted items.
+
+    A stale or tampered cursor falls back to the first page.
+    """
+    page_size = page_size or getattr(settings, 'ACTIVITY_TIMELINE_PAGE_SIZE', 50)
+    queryset = timeline_queryset(entity_type, entity_id).select_related('user')
+    try:
+        page = keyset_paginate(queryset, ordering=TIMELINE_ORDERING, cursor=cursor, page_size=page_size)
+    except InvalidCursor:
+        page = keyset_paginate(queryset, ordering=TIMELINE_ORDERING, page_size=page_size)
+    page.items = [format_timeline_entry(activity) for activity in page.items]
+    return page
@@ -14,6 +14,8 @@ Signal Design Rules:
 4. Logs are ONLY created when fields actually change
 """
 
+from types import SimpleNamespace
+
 from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
@@ -37,9 +39,14 @@ LOG_MODELS = {
     'LogReport',
     'LogRetention',
     'LogStatistics',
+    'TicketStatisticsDelta',  # Derived bookkeeping rows, folded away by reconcile
 }
 
 
+# User fields whose changes are written to the audit log
+LOGGED_USER_FIELDS = {'is_active', 'role', 'is_superuser'}
+
+
 # =============================================================================
 # USER MODEL SIGNALS
 # =============================================================================
@@ -50,9 +57,18 @@ def cache_old_user(sender, instance, **kwargs):
     Cache the old user instance before save.
     
     This allows us to compare old vs new values in post_save
-    to detect actual changes.
+    to detect actual changes. Users loaded from the database reuse the
+    values captured at load time, and saves whose update_fields cannot
+    change a logged field (e.g. login bookkeeping) skip the comparison.
     """
-    if instance.pk:
+    update_fields = kwargs.get('update_fields')
+    loaded = getattr(instance, '_loaded_values', {})
+    if update_fields is not None and not set(update_fields) & LOGGED_USER_FIELDS:
+        instance._old_instance = None
+    elif LOGGED_USER_FIELDS <= loaded.keys():
+        # Values captured when the user was loaded (User.from_db)
+        instance._old_instance = SimpleNamespace(**loaded)
+    elif instance.pk:
         try:
             instance._old_instance = sender.objects.get(pk=instance.pk)
         except sender.DoesNotExist:
@@ -0,0 +1,22 @@
+import logging
+from celery import shared_task
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def verify_security_chain():
+    """Verify the security event hash chain since the last checkpoint."""
+    from apps.logs.services.chain_verification import verify_security_chain as verify
+
+    result = verify()
+    logger.info(
+        f'[Celery] Security chain verification: {result.verified} events, '
+        f'{"intact" if result.is_valid else f"broken at {result.broken_at}"}'
+    )
+    return {
+        'verified': result.verified,
+        'last_sequence': result.last_sequence,
+        'broken_at': result.broken_at,
+        'events_per_second': round(result.events_per_second),
+    }
@@ -0,0 +1,148 @@
+"""
+Tests for incremental verification of the stored security event chain.
+"""
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.logs.models import ActivityLog, SecurityChainCheckpoint
+from apps.logs.services.chain_verification import (
+    latest_checkpoint, split_range, verify_ranges, verify_security_chain,
+)
+from apps.logs.services.hash_chain import append_events
+from apps.logs.services.security_event_service import SecurityEvent, SecurityEventService
+
+
+def append(n, start=0):
+    return append_events([
+        SecurityEvent(event_type='LOGIN_FAILURE', severity='MEDIUM', details={'attempt': start + i})
+        for i in range(n)
+    ])
+
+
+def tamper(sequence, **fields):
+    ActivityLog.objects.filter(chain_sequence=sequence).update(**fields)
+
+
+@pytest.mark.django_db
+class TestVerifySecurityChain:
+    def test_verifies_stored_events(self, technician):
+        append(10)
+        SecurityEventService._hash_chain_manager.create_event_with_chain(
+            SecurityEvent(event_type='LOGIN_SUCCESS', severity='LOW', actor_id=technician.id,
+                          actor_username=technician.username, target_type='user', target_id=technician.id)
+        )
+
+        result = verify_security_chain(chunk_size=4)
+
+        assert result.is_valid
+        assert (result.verified, result.last_sequence) == (11, 11)
+
+    def test_resumes_from_the_last_checkpoint(self):
+        append(10)
+        verify_security_chain()
+        append(5, start=10)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = verify_security_chain()
+
+        assert (result.start_after, result.verified, result.end) == (10, 5, 15)
+        assert latest_checkpoint().sequence == 15
+        streamed = [q['sql'] for q in queries.captured_queries if 'FROM "activity_logs"' in q['sql']]
+        assert len(streamed) == 1
+
+    def test_nothing_to_do_without_new_events(self):
+        append(3)
+        verify_security_chain()
+
+        result = verify_security_chain()
+
+        assert result.is_valid and result.verified == 0
+        assert SecurityChainCheckpoint.objects.count() == 1
+
+    def test_detects_modified_events(self):
+        append(10)
+        tamper(6, extra_data={'security_event': True, 'details': {'attempt': 99}})
+
+        result = verify_security_chain()
+
+        assert (result.broken_at, result.reason) == (6, 'event hash mismatch')
+        assert latest_checkpoint().sequence == 5
+        assert verify_security_chain().broken_at == 6
+
+    def test_detects_deleted_events(self):
+        append(10)
+        ActivityLog.objects.filter(chain_sequence=4).delete()
+
+        result = verify_security_chain()
+
+        assert (result.broken_at, result.reason) == (4, 'missing event')
+
+    def test_detects_truncation(self):
+        append(10)
+        ActivityLog.objects.filter(chain_sequence__gt=8).delete()
+
+        result = verify_security_chain()
+
+        assert (result.broken_at, result.reason) == (9, 'missing event')
+
+    def test_forged_checkpoints_are_ignored(self):
+        events = append(10)
+        SecurityChainCheckpoint.objects.create(
+            name='security_events', sequence=10, hash_chain=events[-1].hash_chain, signature='0' * 64,
+        )
+
+        result = verify_security_chain()
+
+        assert (result.start_after, result.verified) == (0, 10)
+
+    def test_full_run_ignores_checkpoints(self):
+        append(10)
+        verify_security_chain()
+        tamper(2, level='LOW')
+
+        assert verify_security_chain().is_valid
+        assert verify_security_chain(full=True).broken_at == 2
+
+
+@pytest.mark.django_db
+class TestRanges:
+    def test_split_range_covers_the_range_disjointly(self):
+        assert split_range(0, 10, 3) == [(0, 4), (4, 8), (8, 10)]
+        assert split_range(5, 6, 4) == [(5, 6)]
+
+    def test_seeded_ranges_verify_the_whole_chain(self):
+        append(12)
+
+        result = verify_ranges(split_range(0, 12, 4), '')
+
+        assert result.is_valid
+        assert (result.verified, result.last_sequence) == (12, 12)
+
+    def test_break_in_a_later_range_stops_the_merge(self):
+        append(12)
+        tamper(8, level='LOW')
+
+        result = verify_ranges(split_range(0, 12, 3), '')
+
+        assert (result.broken_at, result.last_sequence) == (8, 7)
+
+
+@pytest.mark.django_db
+class TestCommand:
+    def test_reports_intact_chain(self, capsys):
+        append(5)
+
+        call_command('verify_security_chain')
+
+        assert 'Security event chain intact' in capsys.readouterr().out
+
+    def test_fails_on_broken_chain(self):
+        append(5)
+        tamper(3, level='LOW')
+
+        with pytest.raises(CommandError, match='broken at event 3'):
+            call_command('verify_security_chain')
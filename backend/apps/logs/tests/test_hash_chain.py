@@ -0,0 +1,110 @@
+"""
+Tests for the security event hash chain writer.
+"""
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.logs.models import ActivityLog, SecurityChainHead
+from apps.logs.services.hash_chain import append_events, chain_head, compute_event_hash
+from apps.logs.services.security_event_service import (
+    SecurityEvent, SecurityEventService, verify_log_integrity,
+)
+
+
+def make_events(n, event_type='LOGIN_FAILURE'):
+    return [
+        SecurityEvent(event_type=event_type, severity='MEDIUM', details={'attempt': i})
+        for i in range(n)
+    ]
+
+
+def stored_chain():
+    return list(ActivityLog.objects.filter(chain_sequence__isnull=False).order_by('chain_sequence'))
+
+
+@pytest.mark.django_db
+class TestAppendEvents:
+    def test_chains_events_with_one_lock_and_one_insert(self):
+        events = make_events(20)
+
+        with CaptureQueriesContext(connection) as queries:
+            append_events(events)
+
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        assert len(inserts) == 1
+        assert verify_log_integrity(events)['is_valid']
+        assert [row.chain_sequence for row in stored_chain()] == list(range(1, 21))
+        assert chain_head().last_hash == events[-1].hash_chain
+
+    def test_stored_columns_match_the_events(self):
+        events = append_events(make_events(2))
+
+        rows = stored_chain()
+        assert [row.hash_chain for row in rows] == [event.hash_chain for event in events]
+        assert rows[0].previous_hash == ''
+        assert rows[1].previous_hash == rows[0].hash_chain
+        assert rows[1].timestamp == events[1].timestamp
+        assert rows[1].extra_data == {'security_event': True, 'details': {'attempt': 1}}
+
+    def test_batches_extend_the_same_chain(self):
+        first = append_events(make_events(3))
+        second = append_events(make_events(3, 'LOGOUT'))
+
+        assert second[0].previous_hash == first[-1].hash_chain
+        assert verify_log_integrity(first + second)['is_valid']
+        assert SecurityChainHead.objects.get().sequence == 6
+
+    def test_tampering_breaks_the_chain(self):
+        events = append_events(make_events(3))
+        events[1].details = {'attempt': 99}
+
+        result = verify_log_integrity(events)
+
+        assert not result['is_valid']
+        assert result['broken_at'] == 1
+        assert events[2].hash_chain == compute_event_hash(events[2], events[1].hash_chain)
+
+
+@pytest.mark.django_db
+class TestSecurityEventService:
+    def test_events_are_appended_once_after_commit(self, technician, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+            for _ in range(5):
+                SecurityEventService.log_login_success(technician)
+            assert not stored_chain()
+
+        rows = stored_chain()
+        assert len(rows) == 5
+        assert {row.actor_name for row in rows} == {technician.username}
+        assert SecurityChainHead.objects.get().sequence == 5
+
+    def test_batched_flush_takes_the_lock_once(self, technician, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks, transaction.atomic():
+            for _ in range(20):
+                SecurityEventService.log_permission_denied(technician, 'tickets', 'delete')
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+
+        head_reads = [q for q in queries.captured_queries if 'FROM "security_chain_heads"' in q['sql']]
+        inserts = [q for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "activity_logs"')]
+        assert len(head_reads) == 1
+        assert len(inserts) == 1
+
+    def test_rolled_back_events_are_discarded(self, technician, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+            with pytest.raises(RuntimeError), transaction.atomic():
+                SecurityEventService.log_login_success(technician)
+                raise RuntimeError
+
+        assert not stored_chain()
+
+    @pytest.mark.django_db(transaction=True)
+    def test_events_outside_transactions_are_appended_immediately(self, technician):
+        event = SecurityEventService.log_login_success(technician)
+
+        assert event.hash_chain
+        assert stored_chain()[0].hash_chain == event.hash_chain
@@ -0,0 +1,121 @@
+"""
+Tests for canonical entity types and per-entity activity timelines.
+"""
+
+import importlib
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from django.apps import apps
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.logs.models import ActivityLog
+from apps.logs.services.timeline import entity_timeline
+from apps.tickets.models import Ticket
+
+backfill = importlib.import_module('apps.logs.migrations.0004_activity_entity_timeline')
+
+
+def log(entity_type='ticket', entity_id=1, minutes_ago=0, **kwargs):
+    return ActivityLog.objects.create(
+        action='UPDATE', title='Updated', description='Updated',
+        entity_type=entity_type, entity_id=entity_id,
+        timestamp=timezone.now() - timedelta(minutes=minutes_ago),
+        **kwargs,
+    )
+
+
+@pytest.mark.django_db
+class TestCanonicalEntityType:
+    def test_entity_type_is_stored_lower_case(self):
+        entry = log(entity_type=' Ticket ')
+
+        entry.refresh_from_db()
+        assert entry.entity_type == 'ticket'
+
+    def test_entity_is_filled_from_model_name(self):
+        entry = log(entity_type='', entity_id=None, model_name='Asset', object_id=7)
+
+        entry.refresh_from_db()
+        assert (entry.entity_type, entry.entity_id) == ('asset', 7)
+
+    def test_backfill_canonicalizes_existing_rows(self):
+        mixed, legacy, chained = log(), log(entity_id=2), log(entity_id=3, chain_sequence=1)
+        ActivityLog.objects.filter(pk=mixed.pk).update(entity_type='TICKET')
+        ActivityLog.objects.filter(pk=legacy.pk).update(entity_type='', entity_id=None, model_name='Ticket', object_id=2)
+        ActivityLog.objects.filter(pk=chained.pk).update(entity_type='User')
+
+        backfill.canonicalize_entity_types(apps, SimpleNamespace(connection=connection))
+
+        stored = dict(ActivityLog.objects.values_list('pk', 'entity_type'))
+        assert stored == {mixed.pk: 'ticket', legacy.pk: 'ticket', chained.pk: 'User'}
+        assert ActivityLog.objects.get(pk=legacy.pk).entity_id == 2
+
+
+@pytest.mark.django_db
+class TestEntityTimeline:
+    def test_pages_newest_first_without_overlap(self):
+        entries = [log(minutes_ago=i) for i in range(7)]
+        log(entity_type='asset')
+        log(entity_id=2)
+
+        first = entity_timeline('Ticket', 1, page_size=3)
+        second = entity_timeline('ticket', 1, cursor=first.next_cursor, page_size=3)
+        last = entity_timeline('ticket', 1, cursor=second.next_cursor, page_size=3)
+
+        pages = [[item['id'] for item in page.items] for page in (first, second, last)]
+        assert sum(pages, []) == [entry.id for entry in entries]
+        assert not last.has_next and last.has_previous
+        back = entity_timeline('ticket', 1, cursor=second.previous_cursor, page_size=3)
+        assert [item['id'] for item in back.items] == pages[0]
+
+    def test_uses_an_exact_entity_lookup(self):
+        log()
+
+        with CaptureQueriesContext(connection) as queries:
+            entity_timeline('ticket', 1)
+
+        sql = queries.captured_queries[0]['sql']
+        assert '"activity_logs"."entity_type" = \'ticket\'' in sql
+        assert 'LIKE' not in sql and len(queries.captured_queries) == 1
+
+    def test_invalid_cursor_starts_over(self):
+        entry = log()
+
+        page = entity_timeline('ticket', 1, cursor='not-a-cursor')
+
+        assert [item['id'] for item in page.items] == [entry.id]
+
+    def test_formats_field_changes(self, technician):
+        log(user=technician, extra_data={'field_name': 'status', 'old_display': 'New', 'new_display': 'Closed'})
+
+        item = entity_timeline('ticket', 1).items[0]
+
+        assert item['actor_username'] == technician.username
+        assert item['is_field_change'] and (item['old_value'], item['new_value']) == ('New', 'Closed')
+
+
+@pytest.mark.django_db
+def test_ticket_detail_pages_its_timeline(it_admin, ticket_category, ticket_type, settings):
+    settings.ACTIVITY_TIMELINE_PAGE_SIZE = 2
+    ticket = Ticket.objects.create(
+        title='Printer jam', description='Timeline test', category=ticket_category,
+        ticket_type=ticket_type, created_by=it_admin,
+    )
+    for i in range(3):
+        log(entity_type='Ticket', entity_id=ticket.id, minutes_ago=i)
+    client = Client()
+    client.force_login(it_admin)
+
+    response = client.get(f'/tickets/{ticket.id}/')
+    page = response.context['activity_page']
+    older = client.get(f'/tickets/{ticket.id}/', {'activity_cursor': page.next_cursor})
+
+    assert response.status_code == 200
+    assert len(response.context['activities']) == 2
+    assert f'activity_cursor={page.next_cursor}' in response.content.decode()
+    assert len(older.context['activities']) == 1
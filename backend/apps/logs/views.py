@@ -18,6 +18,8 @@ from django.core.paginator import Paginator
 import csv
 import io
 
+from apps.core.services.timeseries import bucketed_counts, count_metrics
+
 from apps.logs.models import (
     LogCategory, ActivityLog, AuditLog, SystemLog, SecurityEvent,
     LogAlert, LogAlertTrigger, LogReport, LogRetention, LogStatistics
@@ -260,8 +262,26 @@ class LogDashboardView(APIView):
         now = timezone.now()
         last_24h = now - timedelta(hours=24)
 
+        # Hourly activity for the last 24 hours; closed hours are cached
+        activity_trend = bucketed_counts(
+            ActivityLog.objects.all(), 'timestamp', interval='hour', periods=24,
+            end=now, cache_namespace='activity_logs',
+        )
+
+        # Summary counts, one aggregate per table
+        activity = count_metrics(ActivityLog.objects.all(), {
+            'activity_24h': Q(timestamp__gte=last_24h),
+        })
+        security = count_metrics(SecurityEvent.objects.all(), {
+            'security_open': Q(status__in=['OPEN', 'INVESTIGATING']),
+        })
+
         return Response({
-            'activity_24h': ActivityLog.objects.filter(timestamp__gte=last_24h).count(),
-            'security_open': SecurityEvent.objects.filter(status__in=['OPEN', 'INVESTIGATING']).count(),
+            **activity,
+            'activity_trend': [
+                {'hour': row['bucket'].isoformat(), 'count': row['count']}
+                for row in activity_trend
+            ],
+            **security,
             'generated_at': now.isoformat()
         })
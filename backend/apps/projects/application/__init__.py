@@ -8,6 +8,8 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 from abc import ABC, abstractmethod
 
+from apps.core.idempotency import idempotent
+
 
 # =============================================================================
 # Result Types
@@ -61,9 +63,21 @@ class IdempotentUseCase(ApplicationUseCase):
     """
     Base class for use cases that support idempotency.
     
-    Adds idempotency_key handling to use cases.
+    Adds idempotency_key handling to use cases: each subclass's execute
+    is wrapped with apps.core.idempotency.idempotent, so a repeated key
+    replays the stored result instead of executing again.
     """
     
+    # Scope of the idempotency keys; defaults to the subclass path
+    idempotency_operation: Optional[str] = None
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        execute = cls.__dict__.get('execute')
+        if execute is not None and not getattr(execute, '__isabstractmethod__', False):
+            operation = cls.idempotency_operation or f'{cls.__module__}.{cls.__qualname__}'
+            cls.execute = idempotent(operation)(execute)
+    
     @abstractmethod
     def execute(
         self,
@@ -113,6 +127,7 @@ class ProjectUseCases:
         return DeleteProject().execute(
             user=user,
             project_id=project_id,
+            idempotency_key=idempotency_key,
         )
     
     @staticmethod
@@ -144,6 +159,7 @@ class ProjectUseCases:
             budget=budget,
             owner_id=owner_id,
             team_members=team_members or [],
+            idempotency_key=idempotency_key,
         )
     
     @staticmethod
@@ -177,6 +193,7 @@ class ProjectUseCases:
             budget=budget,
             owner_id=owner_id,
             team_members=team_members or [],
+            idempotency_key=idempotency_key,
         )
 
 
@@ -15,6 +15,7 @@ from apps.projects.domain.services.project_authority import (
     assert_can_edit,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -50,11 +51,13 @@ class ChangeProjectStatus:
         ChangeProjectStatusResult with confirmation or error
     """
 
+    @idempotent('projects.change_status')
     def execute(
         self,
         user: Any,
         project_id: int,
         new_status: str,
+        idempotency_key: Optional[str] = None,
     ) -> ChangeProjectStatusResult:
         """
         Execute project status change use case.
@@ -63,6 +66,7 @@ class ChangeProjectStatus:
             user: User performing the action
             project_id: Project ID
             new_status: New status value
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             ChangeProjectStatusResult with confirmation or error
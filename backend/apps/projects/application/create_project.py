@@ -16,6 +16,7 @@ from apps.projects.domain.services.project_authority import (
 )
 from apps.core.domain.authorization import AuthorizationError
 from apps.core.domain.roles import is_superadmin_or_manager
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -59,6 +60,7 @@ class CreateProject:
         CreateProjectResult with creation confirmation or error
     """
 
+    @idempotent('projects.create')
     @transaction.atomic
     def execute(
         self,
@@ -73,6 +75,7 @@ class CreateProject:
         budget: float = 0.0,
         owner_id: Optional[int] = None,
         team_members: Optional[List[int]] = None,
+        idempotency_key: Optional[str] = None,
     ) -> CreateProjectResult:
         """
         Execute project creation use case.
@@ -89,6 +92,7 @@ class CreateProject:
             budget: Budget amount
             owner_id: Owner user ID
             team_members: List of team member IDs
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             CreateProjectResult with creation confirmation or error
@@ -15,6 +15,7 @@ from apps.projects.domain.services.project_authority import (
     assert_can_delete,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -48,11 +49,13 @@ class DeleteProject:
         DeleteProjectResult with deletion confirmation or error
     """
 
+    @idempotent('projects.delete')
     @transaction.atomic
     def execute(
         self,
         user: Any,
         project_id: int,
+        idempotency_key: Optional[str] = None,
     ) -> DeleteProjectResult:
         """
         Execute project deletion use case.
@@ -60,6 +63,7 @@ class DeleteProject:
         Args:
             user: User performing the deletion
             project_id: Project ID to delete
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             DeleteProjectResult with deletion confirmation or error
@@ -15,6 +15,7 @@ from apps.projects.domain.services.project_authority import (
     assert_can_assign,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -51,12 +52,14 @@ class AddProjectMember:
         AddProjectMemberResult with confirmation or error
     """
 
+    @idempotent('projects.add_member')
     def execute(
         self,
         user: Any,
         project_id: int,
         member_id: int,
         role: str = 'MEMBER',
+        idempotency_key: Optional[str] = None,
     ) -> AddProjectMemberResult:
         """
         Execute add project member use case.
@@ -66,6 +69,7 @@ class AddProjectMember:
             project_id: Project ID
             member_id: User ID to add
             role: Member role
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AddProjectMemberResult with confirmation or error
@@ -171,11 +175,13 @@ class RemoveProjectMember:
         RemoveProjectMemberResult with confirmation or error
     """
 
+    @idempotent('projects.remove_member')
     def execute(
         self,
         user: Any,
         project_id: int,
         member_id: int,
+        idempotency_key: Optional[str] = None,
     ) -> RemoveProjectMemberResult:
         """
         Execute remove project member use case.
@@ -184,6 +190,7 @@ class RemoveProjectMember:
             user: User performing the action
             project_id: Project ID
             member_id: User ID to remove
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             RemoveProjectMemberResult with confirmation or error
@@ -15,6 +15,7 @@ from apps.projects.domain.services.project_authority import (
     assert_can_edit,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -59,6 +60,7 @@ class UpdateProject:
         UpdateProjectResult with update confirmation or error
     """
 
+    @idempotent('projects.update')
     @transaction.atomic
     def execute(
         self,
@@ -74,6 +76,7 @@ class UpdateProject:
         budget: Optional[float] = None,
         owner_id: Optional[int] = None,
         team_members: Optional[List[int]] = None,
+        idempotency_key: Optional[str] = None,
     ) -> UpdateProjectResult:
         """
         Execute project update use case.
@@ -91,6 +94,7 @@ class UpdateProject:
             budget: Budget amount
             owner_id: Owner user ID
             team_members: List of team member IDs
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             UpdateProjectResult with update confirmation or error
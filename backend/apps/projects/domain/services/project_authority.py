@@ -52,6 +52,10 @@ def can_view(user, project) -> bool:
     
     # IT_ADMIN can only view if self-assigned via ProjectMember
     if user.role == 'IT_ADMIN':
+        # Lists prefetch the active member ids to avoid one query per project
+        member_ids = getattr(project, 'active_member_ids', None)
+        if member_ids is not None:
+            return user.id in member_ids
         try:
             from apps.projects.models import ProjectMember
             return ProjectMember.objects.filter(
@@ -5,7 +5,7 @@ API endpoints for project and task management with role-based access control.
 
 from django.db.models import Count, Q, Sum, Avg
 from django.utils import timezone
-from django.core.cache import cache
+from apps.core.cache import get_tiered_cache
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -38,6 +38,7 @@ from apps.projects.domain.services.project_authority import (
 )
 from apps.core.exceptions import PermissionDeniedError
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import IdempotentAPIMixin
 from apps.users.models import User
 
 class ProjectCategoryViewSet(viewsets.ModelViewSet):
@@ -58,7 +59,7 @@ class ProjectCategoryViewSet(viewsets.ModelViewSet):
         
         return queryset.order_by('name')
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(IdempotentAPIMixin, viewsets.ModelViewSet):
     """
     Project management viewset with comprehensive filtering and actions.
     """
@@ -360,13 +361,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get project statistics."""
-        # Cache statistics for 5 minutes
-        cache_key = f'project_statistics_{request.user.id}'
-        cached_stats = cache.get(cache_key)
-        
-        if cached_stats:
-            return Response(cached_stats)
-        
+        # Cache statistics for 5 minutes; computed once for all workers
+        stats = get_tiered_cache('project_statistics', timeout=300).get_or_set(
+            str(request.user.id), lambda: self._compute_statistics(request)
+        )
+        return Response(stats)
+    
+    def _compute_statistics(self, request):
+        """Compute the payload of the statistics action."""
         total_projects = Project.objects.count()
         active_projects = Project.objects.filter(status='ACTIVE').count()
         completed_projects = Project.objects.filter(status='COMPLETED').count()
@@ -430,8 +432,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
             'upcoming_deadlines': TaskListSerializer(upcoming_deadlines, many=True).data
         }
         
-        cache.set(cache_key, stats, 300)  # Cache for 5 minutes
-        return Response(stats)
+        return stats
 
 class TaskViewSet(viewsets.ModelViewSet):
     """
@@ -0,0 +1,4 @@
+"""
+Search app for IT Management Platform.
+Unified search index over tickets, assets, projects and users.
+"""
@@ -0,0 +1,130 @@
+"""
+Search document sources for IT Management Platform.
+
+Each SearchSource turns one model instance into the content of its
+SearchDocument: what the result displays and which fields are searchable,
+with a weight per field. Title and identifier fields weigh 3, secondary
+identifiers 2 and free text 1. Saves whose ``update_fields`` miss the
+source's ``indexed_fields`` leave the document alone.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.urls import reverse
+
+from apps.search.terms import skeleton, tokenize
+
+
+@dataclass
+class DocumentContent:
+    """What is indexed for one entity."""
+    title: str
+    subtitle: str
+    url: str
+    fields: List[Tuple[str, int]] = field(default_factory=list)  # (text, weight)
+
+    def terms(self) -> List[Tuple[str, str, int]]:
+        """(term, skeleton, weight) of each distinct word, heaviest fields first."""
+        limit = getattr(settings, 'SEARCH_MAX_TERMS_PER_DOCUMENT', 64)
+        weights: Dict[str, int] = {}
+        for text, weight in sorted(self.fields, key=lambda item: -item[1]):
+            for word in tokenize(text):
+                if word not in weights:
+                    if len(weights) >= limit:
+                        break
+                    weights[word] = weight
+        return [(word, skeleton(word), weight) for word, weight in weights.items()]
+
+    def checksum(self) -> str:
+        content = repr((self.title, self.subtitle, self.url, sorted(self.terms())))
+        return hashlib.md5(content.encode()).hexdigest()
+
+
+def _free_text(text: str) -> str:
+    return (text or '')[:getattr(settings, 'SEARCH_FREE_TEXT_CHARS', 500)]
+
+
+def _ticket_content(ticket) -> DocumentContent:
+    return DocumentContent(
+        title=ticket.title,
+        subtitle=f"#{ticket.pk} · {ticket.get_status_display()} · {ticket.get_priority_display()}",
+        url=reverse('frontend:ticket-detail', args=[ticket.pk]),
+        fields=[(str(ticket.pk), 3), (ticket.title, 3), (_free_text(ticket.description), 1)],
+    )
+
+
+def _asset_content(asset) -> DocumentContent:
+    return DocumentContent(
+        title=asset.name,
+        subtitle=f"{asset.get_asset_type_display()} · {asset.get_status_display()}",
+        url=reverse('frontend:asset-detail', args=[asset.pk]),
+        fields=[
+            (str(asset.pk), 3), (asset.name, 3), (asset.serial_number, 2),
+            (f"{asset.manufacturer} {asset.model} {asset.location}", 1),
+        ],
+    )
+
+
+def _project_content(project) -> DocumentContent:
+    return DocumentContent(
+        title=project.name,
+        subtitle=f"{project.get_status_display()} · {project.get_priority_display()}",
+        url=reverse('frontend:project-detail', args=[project.pk]),
+        fields=[(str(project.pk), 3), (project.name, 3), (_free_text(project.description), 1)],
+    )
+
+
+def _user_content(user) -> DocumentContent:
+    full_name = f"{user.first_name} {user.last_name}".strip()
+    return DocumentContent(
+        title=full_name or user.username,
+        subtitle=f"{user.username} · {user.get_role_display()}",
+        url=reverse('frontend:edit-user', args=[user.pk]),
+        fields=[
+            (user.username, 3), (full_name, 3), (user.email, 2), (user.employee_id, 2),
+            (f"{user.department} {user.job_title}", 1),
+        ],
+    )
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """An indexed model."""
+    entity_type: str
+    model_label: str
+    build: Callable[[object], DocumentContent]
+    indexed_fields: FrozenSet[str]
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+
+SOURCES: Dict[str, SearchSource] = {
+    source.entity_type: source for source in (
+        SearchSource('ticket', 'tickets.Ticket', _ticket_content, frozenset({
+            'title', 'description', 'status', 'priority',
+        })),
+        SearchSource('asset', 'assets.Asset', _asset_content, frozenset({
+            'name', 'serial_number', 'manufacturer', 'model', 'location', 'asset_type', 'status',
+        })),
+        SearchSource('project', 'projects.Project', _project_content, frozenset({
+            'name', 'description', 'status', 'priority',
+        })),
+        SearchSource('user', 'users.User', _user_content, frozenset({
+            'username', 'first_name', 'last_name', 'email', 'employee_id', 'department', 'job_title', 'role',
+        })),
+    )
+}
+
+
+def source_for(instance) -> Optional[SearchSource]:
+    """The source indexing a model instance (subclasses included), if any."""
+    for source in SOURCES.values():
+        if isinstance(instance, source.model):
+            return source
+    return None
@@ -0,0 +1,192 @@
+"""
+Search index maintenance for IT Management Platform.
+
+Documents are refreshed after commit, from post_save/post_delete of the
+indexed models (apps.search.signals) and from domain events, which also
+cover changes that bypass model signals. Refreshes requested while a
+transaction is open are collected per thread, database alias and
+savepoint level and applied once on commit, so saving a ticket five times
+in one request reindexes it once.
+
+A refresh whose content checksum matches the stored document costs one
+SELECT and no writes, so status or SLA-only saves stay cheap.
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.core.commit_batch import CommitBatch
+from apps.search.documents import SOURCES, source_for
+from apps.search.models import SearchDocument, SearchTerm
+
+logger = logging.getLogger(__name__)
+
+# Maximum rows per INSERT statement
+BULK_BATCH_SIZE = 1000
+
+def _write(document: Optional[SearchDocument], entity_type: str, entity_id: int, content, using: str):
+    with transaction.atomic(using=using):
+        if document is None:
+            document = SearchDocument(entity_type=entity_type, entity_id=entity_id)
+        else:
+            SearchTerm.objects.using(using).filter(document=document).delete()
+        document.title = content.title[:255]
+        document.subtitle = content.subtitle[:255]
+        document.url = content.url
+        document.checksum = content.checksum()
+        document.save(using=using)
+        SearchTerm.objects.using(using).bulk_create([
+            SearchTerm(document=document, entity_type=entity_type, term=term, skeleton=skeleton, weight=weight)
+            for term, skeleton, weight in content.terms()
+        ])
+
+
+def refresh_document(entity_type: str, entity_id: int, instance=None, using: str = DEFAULT_DB_ALIAS) -> bool:
+    """
+    Bring one entity's document up to date; returns whether anything was written.
+
+    ``instance`` is loaded when not given; a missing entity removes its document.
+    """
+    source = SOURCES[entity_type]
+    if instance is None:
+        instance = source.model._default_manager.using(using).filter(pk=entity_id).first()
+        if instance is None:
+            return remove_document(entity_type, entity_id, using=using)
+
+    content = source.build(instance)
+    document = (
+        SearchDocument.objects.using(using)
+        .filter(entity_type=entity_type, entity_id=entity_id)
+        .only('id', 'checksum')
+        .first()
+    )
+    if document is not None and document.checksum == content.checksum():
+        return False
+    _write(document, entity_type, entity_id, content, using)
+    return True
+
+
+def remove_document(entity_type: str, entity_id: int, using: str = DEFAULT_DB_ALIAS) -> bool:
+    """Drop an entity's document and terms; returns whether one existed."""
+    deleted, _ = SearchDocument.objects.using(using).filter(entity_type=entity_type, entity_id=entity_id).delete()
+    return bool(deleted)
+
+
+# Marks an entity whose document is removed on commit
+_DELETED = object()
+
+
+class RefreshBatch(CommitBatch):
+    """Entities to refresh once a transaction (or savepoint) commits."""
+
+    def __init__(self, using: str, key=None):
+        super().__init__(using, key=key)
+        # (entity_type, entity_id) -> latest saved instance, None to load it, or _DELETED
+        self.entities: Dict[Tuple[str, int], object] = {}
+
+    def add(self, entity_type: str, entity_id: int, instance):
+        self.entities[(entity_type, entity_id)] = instance
+
+    def write(self):
+        for (entity_type, entity_id), instance in self.entities.items():
+            try:
+                if instance is _DELETED:
+                    remove_document(entity_type, entity_id, using=self.using)
+                else:
+                    refresh_document(entity_type, entity_id, instance=instance, using=self.using)
+            except Exception as e:
+                # The index is derived data; a failed refresh must not break the request
+                logger.error(f"Error indexing {entity_type}#{entity_id}: {str(e)}")
+        self.entities.clear()
+
+
+def schedule_refresh(entity_type: str, entity_id: int, instance=None, deleted: bool = False,
+                     using: str = DEFAULT_DB_ALIAS):
+    """
+    Refresh (or remove) an entity's document once the current transaction commits.
+
+    Without ``instance`` the entity is loaded at that point. Outside a
+    transaction the document is refreshed immediately.
+    """
+    RefreshBatch.queue(entity_type, entity_id, _DELETED if deleted else instance, using=using)
+
+
+def index_instance(instance, update_fields=None, using: str = DEFAULT_DB_ALIAS):
+    """post_save receiver: refresh the document of an indexed model instance."""
+    source = source_for(instance)
+    if source is None:
+        return
+    if update_fields is None or source.indexed_fields.intersection(update_fields):
+        schedule_refresh(source.entity_type, instance.pk, instance=instance, using=using)
+
+
+def unindex_instance(instance, using: str = DEFAULT_DB_ALIAS):
+    """post_delete receiver: remove the document of an indexed model instance."""
+    source = source_for(instance)
+    if source is not None:
+        schedule_refresh(source.entity_type, instance.pk, deleted=True, using=using)
+
+
+def handle_domain_event(event):
+    """Domain event handler refreshing the document of the event's entity."""
+    entity_type = str(event.entity_type or '').lower()
+    if entity_type not in SOURCES or event.entity_id is None:
+        return
+    try:
+        entity_id = int(event.entity_id)
+    except (TypeError, ValueError):
+        return
+    event_type = getattr(event.event_type, 'value', event.event_type)
+    schedule_refresh(entity_type, entity_id, deleted=str(event_type).endswith('.deleted'))
+
+
+# =============================================================================
+# Rebuilding
+# =============================================================================
+
+def rebuild_index(entity_types: Iterable[str] = None, batch_size: int = 1000,
+                  using: str = DEFAULT_DB_ALIAS) -> Dict[str, int]:
+    """
+    Rebuild the documents of the given entity types (default: all) in bulk.
+
+    Returns the number of documents written per entity type.
+    """
+    counts = {}
+    for entity_type in entity_types or SOURCES:
+        source = SOURCES[entity_type]
+        SearchDocument.objects.using(using).filter(entity_type=entity_type).delete()
+        queryset = source.model._default_manager.using(using).order_by('pk')
+        counts[entity_type] = 0
+        last_pk = 0
+        while True:
+            instances = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not instances:
+                break
+            last_pk = instances[-1].pk
+            _bulk_index(entity_type, instances, source, using)
+            counts[entity_type] += len(instances)
+            logger.info(f"Indexed {counts[entity_type]} {entity_type} documents")
+    return counts
+
+
+def _bulk_index(entity_type, instances, source, using):
+    contents = [source.build(instance) for instance in instances]
+    with transaction.atomic(using=using):
+        documents = SearchDocument.objects.using(using).bulk_create([
+            SearchDocument(
+                entity_type=entity_type,
+                entity_id=instance.pk,
+                title=content.title[:255],
+                subtitle=content.subtitle[:255],
+                url=content.url,
+                checksum=content.checksum(),
+            )
+            for instance, content in zip(instances, contents)
+        ])
+        SearchTerm.objects.using(using).bulk_create([
+            SearchTerm(document=document, entity_type=entity_type, term=term, skeleton=skeleton, weight=weight)
+            for document, content in zip(documents, contents)
+            for term, skeleton, weight in content.terms()
+        ], batch_size=BULK_BATCH_SIZE)
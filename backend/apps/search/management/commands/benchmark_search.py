@@ -0,0 +1,71 @@
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.search.indexer import rebuild_index
+from apps.search.query import search
+from apps.tickets.models import Ticket, TicketCategory, TicketType
+from apps.users.models import User
+
+WORDS = (
+    'printer jam network outage laptop battery vpn access password reset email '
+    'monitor flicker keyboard license renewal server disk backup failure wifi '
+    'projector meeting room phone headset onboarding offboarding account locked'
+).split()
+
+QUERIES = ['pri', 'printer', 'printr jam', 'pritner', 'vpn acc', 'backup fail', 'onboard', 'xyzzy']
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark search-as-you-type latency on generated tickets. '
+        'Runs inside a transaction that is rolled back, so no data is kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tickets', type=int, default=20000, help='Number of tickets to generate')
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per query')
+
+    def handle(self, *args, **options):
+        count, repeat = options['tickets'], options['repeat']
+        prefix = uuid.uuid4().hex[:6]
+
+        with transaction.atomic():
+            user = User.objects.create_user(username=f'bench-{prefix}', role='IT_ADMIN')
+            category = TicketCategory.objects.create(name=f'Bench {prefix}')
+            ticket_type = TicketType.objects.create(name=f'Bench {prefix}', category=category)
+            for start in range(0, count, 5000):
+                Ticket.objects.bulk_create([
+                    Ticket(
+                        title=' '.join(WORDS[(i * k) % len(WORDS)] for k in (1, 3, 7)),
+                        description=' '.join(WORDS[(i + k) % len(WORDS)] for k in range(12)),
+                        category=category,
+                        ticket_type=ticket_type,
+                        created_by=user,
+                    )
+                    for i in range(start, min(start + 5000, count))
+                ])
+            started = time.perf_counter()
+            rebuild_index(['ticket'])
+            self.stdout.write(f'Indexed {count} tickets in {time.perf_counter() - started:.1f}s')
+
+            for query in QUERIES:
+                timings = []
+                for _ in range(repeat):
+                    with CaptureQueriesContext(connection) as queries:
+                        started = time.perf_counter()
+                        results = search(user, query)
+                        timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                self.stdout.write(
+                    f'{query!r:16} {len(results):3} results  {len(queries.captured_queries)} query  '
+                    f'p50 {statistics.median(timings):6.1f}ms  p95 {timings[int(len(timings) * 0.95) - 1]:6.1f}ms'
+                )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, changes rolled back'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.search.documents import SOURCES
+from apps.search.indexer import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the search index, e.g. after deploying it or changing what is indexed'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--type', dest='entity_types', action='append', choices=sorted(SOURCES),
+            help='Only rebuild this entity type (repeatable)',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        counts = rebuild_index(options['entity_types'], batch_size=options['batch_size'])
+        summary = ', '.join(f'{count} {entity_type}s' for entity_type, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f'Indexed {summary}'))
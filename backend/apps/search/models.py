@@ -0,0 +1,66 @@
+"""
+Search index models for IT Management Platform.
+
+One SearchDocument per indexed ticket, asset, project and user holds what
+a search result displays. Its SearchTerms are the normalized words of the
+searchable fields, each with a weight and a consonant skeleton for typo
+tolerant matching (see apps.search.terms).
+"""
+
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    Denormalized search result for one entity.
+    """
+    ENTITY_TYPE_CHOICES = [
+        ('ticket', 'Ticket'),
+        ('asset', 'Asset'),
+        ('project', 'Project'),
+        ('user', 'User'),
+    ]
+
+    entity_type = models.CharField(max_length=20, choices=ENTITY_TYPE_CHOICES)
+    entity_id = models.PositiveIntegerField()
+    title = models.CharField(max_length=255)
+    subtitle = models.CharField(max_length=255, blank=True)
+    url = models.CharField(max_length=255)
+    checksum = models.CharField(max_length=32)  # of the indexed content, to skip no-op refreshes
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'search_documents'
+        verbose_name = 'Search Document'
+        verbose_name_plural = 'Search Documents'
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'entity_id'], name='search_document_entity_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity_type}#{self.entity_id}: {self.title}"
+
+
+class SearchTerm(models.Model):
+    """
+    One normalized word of a document, looked up by prefix.
+    """
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, related_name='terms')
+    # Copy of the document's entity type, so matching never reads search_documents
+    entity_type = models.CharField(max_length=20, choices=SearchDocument.ENTITY_TYPE_CHOICES)
+    term = models.CharField(max_length=32)
+    skeleton = models.CharField(max_length=32)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta:
+        db_table = 'search_terms'
+        verbose_name = 'Search Term'
+        verbose_name_plural = 'Search Terms'
+        indexes = [
+            # Prefix and skeleton lookups are range scans on these
+            models.Index(fields=['term', 'document'], name='search_term_prefix_idx'),
+            models.Index(fields=['skeleton', 'document'], name='search_term_skeleton_idx'),
+        ]
+
+    def __str__(self):
+        return self.term
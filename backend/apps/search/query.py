@@ -0,0 +1,133 @@
+"""
+Search queries for IT Management Platform.
+
+``search`` answers a search-as-you-type query over every entity type the
+user may see with one SQL query on the index:
+
+- every query word must match a term of the document, by prefix (range
+  scan on ``search_term_prefix_idx``) or, for words of MIN_FUZZY_LENGTH
+  or more, by typo: an exact term one deletion or transposition away, or
+  a term with the same consonant skeleton prefix;
+- a word scores its term's weight times 3 for an exact term, 2 for a
+  prefix and 1 for a typo match; documents rank by the summed scores of
+  the words, then by recency;
+- SEARCH_POLICIES restrict the entity types by the user's role, mirroring
+  the list permissions of each module.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from django.db.models import Case, IntegerField, Max, Q, Value, When
+from django.db.models import F
+
+from apps.core.domain.roles import is_admin_role, is_superadmin_or_manager
+from apps.search.models import SearchTerm
+from apps.search.terms import MIN_FUZZY_LENGTH, prefix_upper_bound, skeleton, tokenize, typo_variants
+from apps.tickets.domain.services.ticket_authority import can_view_list as can_view_ticket_list
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 50
+
+# At most this many query words are matched; the rest are ignored
+MAX_QUERY_WORDS = 5
+
+# Entity types a user may find, by role
+SEARCH_POLICIES = {
+    'ticket': can_view_ticket_list,
+    'asset': lambda user: is_admin_role(user.role),
+    'project': lambda user: is_superadmin_or_manager(user.role),
+    'user': lambda user: is_admin_role(user.role),
+}
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    entity_type: str
+    entity_id: int
+    title: str
+    subtitle: str
+    url: str
+    score: int
+
+    def as_dict(self) -> Dict:
+        return {
+            'type': self.entity_type,
+            'id': self.entity_id,
+            'title': self.title,
+            'subtitle': self.subtitle,
+            'url': self.url,
+            'score': self.score,
+        }
+
+
+def searchable_types(user, entity_types: Iterable[str] = None) -> List[str]:
+    """The requested entity types (default: all) that the user may search."""
+    if not user or not getattr(user, 'is_authenticated', False):
+        return []
+    return [
+        entity_type for entity_type, allowed in SEARCH_POLICIES.items()
+        if (entity_types is None or entity_type in entity_types) and allowed(user)
+    ]
+
+
+def _word_conditions(word: str):
+    """(exact, prefix, typo) conditions on a term for one query word."""
+    exact = Q(term=word)
+    prefix = Q(term__gte=word, term__lt=prefix_upper_bound(word))
+    typo = None
+    if len(word) >= MIN_FUZZY_LENGTH:
+        word_skeleton = skeleton(word)
+        typo = Q(term__in=sorted(typo_variants(word))) | Q(
+            skeleton__gte=word_skeleton, skeleton__lt=prefix_upper_bound(word_skeleton),
+        )
+    return exact, prefix, typo
+
+
+def search(user, query: str, entity_types: Iterable[str] = None, limit: int = DEFAULT_LIMIT) -> List[SearchResult]:
+    """
+    Best matching documents the user may see, best first.
+
+    Args:
+        user: Requesting user, for SEARCH_POLICIES
+        query: Free text; each word is matched as a prefix
+        entity_types: Restrict to these entity types
+        limit: Maximum number of results (capped at MAX_LIMIT)
+    """
+    words = list(dict.fromkeys(tokenize(query)))[:MAX_QUERY_WORDS]
+    allowed = searchable_types(user, entity_types)
+    if not words or not allowed:
+        return []
+
+    matches = Q()
+    word_scores = {}
+    for index, word in enumerate(words):
+        exact, prefix, typo = _word_conditions(word)
+        cases = [
+            When(exact, then=F('weight') * 3),
+            When(prefix, then=F('weight') * 2),
+        ]
+        matches |= prefix
+        if typo is not None:
+            cases.append(When(typo, then=F('weight')))
+            matches |= typo
+        word_scores[f'word_{index}'] = Max(Case(*cases, default=Value(0), output_field=IntegerField()))
+
+    score = sum((F(name) for name in word_scores), Value(0))
+    # Matching terms drive the query (index range scans), grouped per document
+    rows = (
+        SearchTerm.objects
+        .filter(matches, entity_type__in=allowed)
+        .values('document_id', 'document__updated_at')
+        .annotate(**word_scores)
+        # Every word must match
+        .filter(**{f'{name}__gt': 0 for name in word_scores})
+        .annotate(score=score)
+        .order_by('-score', '-document__updated_at')
+        .values_list(
+            'document__entity_type', 'document__entity_id', 'document__title',
+            'document__subtitle', 'document__url', 'score',
+        )
+        [:max(1, min(limit, MAX_LIMIT))]
+    )
+    return [SearchResult(*row) for row in rows]
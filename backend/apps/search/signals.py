@@ -0,0 +1,31 @@
+"""
+Search signals for IT Management Platform.
+Keeps the search index current with the indexed models and domain events.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.events import EventType, register_handler
+from apps.search.indexer import handle_domain_event, index_instance, unindex_instance
+
+
+@receiver(post_save, dispatch_uid='search_index_instance')
+def index_saved_instance(sender, instance, raw=False, update_fields=None, using=None, **kwargs):
+    """
+    Refresh the search document of a saved ticket, asset, project or user.
+    Connected for every sender so that model subclasses (e.g. HardwareAsset) are covered.
+    """
+    if not raw:
+        index_instance(instance, update_fields=update_fields, using=using)
+
+
+@receiver(post_delete, dispatch_uid='search_unindex_instance')
+def unindex_deleted_instance(sender, instance, using=None, **kwargs):
+    """Remove the search document of a deleted ticket, asset, project or user."""
+    unindex_instance(instance, using=using)
+
+
+# Domain events also cover changes made without model saves (queryset updates)
+for event_type in EventType:
+    register_handler(event_type, handle_domain_event)
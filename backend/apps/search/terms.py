@@ -0,0 +1,62 @@
+"""
+Text normalization for the search index.
+
+Indexed text and queries are split into lowercase ASCII words. Every
+word is stored with its consonant skeleton: the first letter followed by
+the remaining consonants, with repeats collapsed (``printer`` ->
+``prntr``), which absorbs most vowel typos. Queries additionally try the
+single deletions and adjacent transpositions of each word
+(``pritner`` -> ``printer``).
+"""
+
+import re
+import unicodedata
+from typing import List, Set
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+VOWELS = frozenset('aeiou')
+
+# Longer words are indexed by their prefix
+MAX_TERM_LENGTH = 32
+
+# Query words shorter than this are matched by prefix only
+MIN_FUZZY_LENGTH = 4
+
+
+def normalize(text: str) -> str:
+    """Lowercase text with accents stripped."""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Words of a text, in order, truncated to MAX_TERM_LENGTH."""
+    if not text:
+        return []
+    return [word[:MAX_TERM_LENGTH] for word in WORD_RE.findall(normalize(text))]
+
+
+def skeleton(word: str) -> str:
+    """First letter plus the following consonants, repeats collapsed."""
+    if not word:
+        return ''
+    letters = [word[0]]
+    for char in word[1:]:
+        if char not in VOWELS and char != letters[-1]:
+            letters.append(char)
+    return ''.join(letters)
+
+
+def typo_variants(word: str) -> Set[str]:
+    """Words one deletion or one adjacent transposition away from ``word``."""
+    if len(word) < MIN_FUZZY_LENGTH:
+        return set()
+    variants = {word[:i] + word[i + 1:] for i in range(len(word))}
+    variants |= {word[:i] + word[i + 1] + word[i] + word[i + 2:] for i in range(len(word) - 1)}
+    variants.discard(word)
+    return variants
+
+
+def prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with ``prefix``."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
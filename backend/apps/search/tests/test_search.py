@@ -0,0 +1,182 @@
+"""
+Tests for the unified search index.
+"""
+
+from contextlib import contextmanager
+from unittest import mock
+
+import pytest
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.events import DomainEvent, EventType
+from apps.frontend.command_palette import resolve_command
+from apps.search import indexer
+from apps.search.indexer import handle_domain_event, rebuild_index
+from apps.search.models import SearchDocument
+from apps.search.query import search
+from apps.search.terms import skeleton, typo_variants
+from apps.tickets.models import Ticket
+
+
+@pytest.fixture
+def committed(django_capture_on_commit_callbacks):
+    """Run the block in its own transaction and its on_commit callbacks after it."""
+    @contextmanager
+    def block():
+        with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+            yield
+    return block
+
+
+@pytest.fixture
+def make_ticket(it_admin, ticket_category, ticket_type, committed):
+    def make(title, description='Reported by the help desk'):
+        with committed():
+            return Ticket.objects.create(
+                title=title, description=description, category=ticket_category,
+                ticket_type=ticket_type, created_by=it_admin,
+            )
+    return make
+
+
+def titles(results):
+    return [result.title for result in results]
+
+
+class TestTerms:
+    def test_skeleton_drops_vowels_and_repeats(self):
+        assert skeleton('printer') == 'prntr'
+        assert skeleton('office') == 'ofc'
+
+    def test_typo_variants_cover_deletions_and_transpositions(self):
+        variants = typo_variants('pritner')
+        assert 'printer' in variants
+        assert 'priter' in variants
+        assert typo_variants('vpn') == set()
+
+
+@pytest.mark.django_db
+class TestIndexing:
+    def test_saved_ticket_is_indexed_on_commit(self, make_ticket):
+        ticket = make_ticket('Printer jam on floor 3')
+
+        document = SearchDocument.objects.get(entity_type='ticket', entity_id=ticket.id)
+        assert document.title == 'Printer jam on floor 3'
+        assert document.url == f'/tickets/{ticket.id}/'
+        assert {'printer', 'jam', str(ticket.id)} <= set(document.terms.values_list('term', flat=True))
+
+    def test_saves_in_one_transaction_refresh_once(self, make_ticket, committed):
+        ticket = make_ticket('Printer jam')
+
+        with mock.patch.object(indexer, 'refresh_document', wraps=indexer.refresh_document) as refresh:
+            with committed():
+                ticket.title = 'Printer jam again'
+                ticket.save()
+                ticket.save()
+
+        assert refresh.call_count == 1
+        assert SearchDocument.objects.get(entity_id=ticket.id, entity_type='ticket').title == 'Printer jam again'
+
+    def test_unchanged_content_is_not_rewritten(self, make_ticket, committed):
+        ticket = make_ticket('Printer jam')
+
+        with CaptureQueriesContext(connection) as queries:
+            with committed():
+                Ticket.objects.get(pk=ticket.pk).save()
+
+        writes = [q['sql'] for q in queries.captured_queries if 'search_' in q['sql'] and not q['sql'].startswith('SELECT')]
+        assert writes == []
+
+    def test_deleted_ticket_is_removed(self, make_ticket, committed):
+        ticket = make_ticket('Printer jam')
+
+        with committed():
+            ticket.delete()
+
+        assert not SearchDocument.objects.filter(entity_type='ticket').exists()
+
+    def test_domain_events_refresh_documents(self, make_ticket, committed):
+        ticket = make_ticket('Printer jam')
+
+        with committed():
+            Ticket.objects.filter(pk=ticket.pk).update(title='Scanner jam')
+            handle_domain_event(DomainEvent(event_type=EventType.TICKET_UPDATED, entity_type='Ticket', entity_id=ticket.id))
+
+        assert SearchDocument.objects.get(entity_id=ticket.id, entity_type='ticket').title == 'Scanner jam'
+
+    def test_rebuild_indexes_existing_rows(self, it_admin, technician):
+        SearchDocument.objects.all().delete()
+
+        counts = rebuild_index(['user'])
+
+        assert counts == {'user': 2}
+        assert titles(search(it_admin, 'techn', ['user'])) == ['technician']
+
+
+@pytest.mark.django_db
+class TestSearch:
+    def test_prefix_typo_and_all_words(self, it_admin, make_ticket):
+        make_ticket('Printer jam on floor 3')
+        make_ticket('VPN access request')
+
+        assert titles(search(it_admin, 'prin')) == ['Printer jam on floor 3']
+        assert titles(search(it_admin, 'pritner')) == ['Printer jam on floor 3']
+        assert titles(search(it_admin, 'printr flo')) == ['Printer jam on floor 3']
+        assert search(it_admin, 'printer vpn') == []
+
+    def test_title_matches_rank_first(self, it_admin, make_ticket):
+        make_ticket('Monitor flickers', description='Next to the printer')
+        make_ticket('Printer offline')
+
+        assert titles(search(it_admin, 'printer')) == ['Printer offline', 'Monitor flickers']
+
+    def test_results_follow_role_policies(self, all_roles, make_ticket, committed):
+        make_ticket('Tech bench laptop')
+        rebuild_index(['user'])
+
+        assert titles(search(all_roles['VIEWER'], 'tech')) == []
+        assert {result.entity_type for result in search(all_roles['TECHNICIAN'], 'tech')} == {'ticket'}
+        assert {result.entity_type for result in search(all_roles['IT_ADMIN'], 'tech')} == {'ticket', 'user'}
+
+    def test_answers_in_one_query(self, it_admin, make_ticket):
+        make_ticket('Printer jam')
+
+        with CaptureQueriesContext(connection) as queries:
+            search(it_admin, 'printer jam')
+
+        assert len(queries.captured_queries) == 1
+
+
+@pytest.mark.django_db
+class TestSearchEndpoints:
+    @pytest.fixture
+    def client(self, it_admin):
+        client = Client()
+        client.force_login(it_admin)
+        return client
+
+    def test_search_api_groups_results(self, client, make_ticket):
+        ticket = make_ticket('Printer jam')
+
+        data = client.get(reverse('frontend:search-api'), {'q': 'printer'}).json()
+
+        assert data['count'] == 1
+        assert data['results']['tickets'][0]['url'] == f'/tickets/{ticket.id}/'
+
+    def test_command_palette_navigates_by_title(self, it_admin, make_ticket):
+        ticket = make_ticket('Printer jam')
+
+        result = resolve_command('navigate_ticket', 'printer', user=it_admin)
+
+        assert result['url'] == f'/tickets/{ticket.id}/'
+        assert resolve_command('navigate_ticket', str(ticket.id))['url'] == f'/tickets/{ticket.id}/'
+
+    def test_command_palette_accepts_numeric_ids(self, make_ticket):
+        ticket = make_ticket('Printer jam')
+
+        assert resolve_command('navigate_ticket', ticket.id)['url'] == f'/tickets/{ticket.id}/'
+        assert resolve_command('navigate_ticket', 0)['type'] == 'error'
+        assert resolve_command('navigate_ticket', '  ')['type'] == 'error'
@@ -0,0 +1,79 @@
+"""
+Batched audit writer for IT Management Platform.
+
+Security side records (SecurityEvent, AuditLog, ...) produced while a
+transaction is open are buffered and written with one bulk_create per model
+once the transaction commits. Records queued outside a transaction are
+written immediately.
+
+Buffers are apps.core.commit_batch batches, kept per thread, database alias
+and savepoint level, so records queued inside a savepoint that is rolled
+back are discarded together with the rows they describe.
+"""
+
+import logging
+from collections import defaultdict
+
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.core.commit_batch import CommitBatch
+
+# Configure logger
+logger = logging.getLogger('it_management_platform.security')
+
+# Maximum rows per INSERT statement
+BULK_BATCH_SIZE = 500
+
+
+class AuditBatch(CommitBatch):
+    """
+    Pending audit records for one transaction (or savepoint) on one database.
+    """
+
+    def __init__(self, using, key=None):
+        super().__init__(using, key=key)
+        self.records = defaultdict(list)
+
+    def add(self, *records):
+        """Queue unsaved model instances for insertion."""
+        for record in records:
+            if record is not None:
+                self.records[type(record)].append(record)
+
+    def __len__(self):
+        return sum(len(rows) for rows in self.records.values())
+
+    def write(self):
+        """Write all queued records, one bulk_create per model."""
+        for model, rows in self.records.items():
+            try:
+                model._default_manager.using(self.using).bulk_create(
+                    rows, batch_size=BULK_BATCH_SIZE
+                )
+            except Exception as e:
+                logger.error(f"Error writing {len(rows)} {model.__name__} audit records: {str(e)}")
+                continue
+
+            high_severity = [
+                row for row in rows
+                if getattr(row, 'severity', None) in ('HIGH', 'CRITICAL')
+            ]
+            if high_severity:
+                # bulk_create bypasses post_save, so surface high severity
+                # events here instead of in process_security_event_creation.
+                logger.warning(
+                    f"High/Critical Security Events: {len(high_severity)} x "
+                    f"{high_severity[0].event_type} - {high_severity[0].title}"
+                )
+        self.records.clear()
+
+
+def queue_audit_records(*records, using=DEFAULT_DB_ALIAS):
+    """
+    Queue audit records to be bulk inserted after the current transaction commits.
+
+    Args:
+        *records: Unsaved model instances (e.g. SecurityEvent, AuditLog)
+        using: Database alias the records belong to
+    """
+    AuditBatch.queue(*records, using=using)
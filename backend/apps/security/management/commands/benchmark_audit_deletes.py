@@ -0,0 +1,64 @@
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from apps.security.audit import AuditBatch
+from apps.tickets.models import Ticket, TicketCategory, TicketType
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark security audit logging for a bulk delete of tickets. '
+        'Runs inside a transaction that is rolled back, so no data is kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10000, help='Number of tickets to delete')
+
+    def handle(self, *args, **options):
+        count = options['count']
+
+        with transaction.atomic():
+            category = TicketCategory.objects.create(name=f'benchmark-{uuid.uuid4().hex[:8]}')
+            ticket_type = TicketType.objects.create(category=category, name='benchmark')
+            Ticket.objects.bulk_create(
+                [
+                    Ticket(
+                        title=f'Benchmark ticket {i}',
+                        description='Audit delete benchmark',
+                        category=category,
+                        ticket_type=ticket_type,
+                    )
+                    for i in range(count)
+                ],
+                batch_size=1000,
+            )
+            self.stdout.write(f'Created {count} tickets, deleting...')
+
+            # The transaction is rolled back, so write the audit batch that
+            # would be flushed on commit inside the measured block
+            start = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                deleted, _ = Ticket.objects.filter(category=category).delete()
+                AuditBatch.flush_current()
+            elapsed = time.perf_counter() - start
+
+            audit_inserts = [
+                q['sql'] for q in queries.captured_queries
+                if q['sql'].startswith('INSERT INTO "security_')
+            ]
+
+            self.stdout.write(f'Deleted rows (incl. cascades): {deleted}')
+            self.stdout.write(f'Elapsed: {elapsed:.2f}s ({count / elapsed:.0f} tickets/s)')
+            self.stdout.write(f'Total queries: {len(queries.captured_queries)}')
+            self.stdout.write(
+                f'Security audit INSERT statements: {len(audit_inserts)} '
+                f'(per-row receivers would issue {count * 2})'
+            )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, changes rolled back'))
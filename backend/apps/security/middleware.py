@@ -6,97 +6,75 @@ Provides rate limiting, input validation, and security hardening.
 import time
 import json
 from collections import defaultdict
-from django.core.cache import cache
 from django.conf import settings
 from django.http import JsonResponse
+from django.shortcuts import redirect
 from django.contrib.auth.models import AnonymousUser
 
+from .services.rate_limiter import get_rate_limiter
+from .services.session_activity import SessionActivityTracker
+from .utils import SecurityLogger, get_client_ip, get_security_counters
+
 
 class RateLimitingMiddleware:
     """
-    Middleware for rate limiting API requests.
+    Middleware for rate limiting requests.
+
+    Each request is checked against the most specific matching policy with
+    one atomic cache operation (see apps.security.services.rate_limiter).
+    Authenticated users are limited per user, anonymous clients per IP.
+    Place it after AuthenticationMiddleware so session users are known.
     """
     
     def __init__(self, get_response):
         self.get_response = get_response
-        # Rate limiting configuration
-        self.requests_per_minute = getattr(settings, 'RATE_LIMIT_REQUESTS_PER_MINUTE', 60)
-        self.requests_per_hour = getattr(settings, 'RATE_LIMIT_REQUESTS_PER_HOUR', 1000)
-        self.cache_timeout = 3600  # 1 hour
-        self.allowed_paths = [
+        self.enabled = getattr(settings, 'RATE_LIMIT_ENABLED', True)
+        self.exempt_prefixes = tuple(getattr(settings, 'RATE_LIMIT_EXEMPT_PATHS', [
+            '/static/',
+            '/media/',
             '/admin/login/',
             '/frontend/login/',
             '/api/auth/',
-        ]
+        ]))
+        self.limiter = get_rate_limiter()
     
     def __call__(self, request):
-        # Check rate limits before processing the request
-        response = self.process_request(request)
-        if response is not None:
-            return response
-        
-        response = self.get_response(request)
-        return response
-    
-    def process_request(self, request):
-        """
-        Check rate limits before processing the request.
-        """
-        # Skip rate limiting for certain paths
-        if any(path in request.path for path in self.allowed_paths):
-            return None
-        
-        # Skip rate limiting for static files
-        if request.path.startswith('/static/') or request.path.startswith('/media/'):
-            return None
-        
-        # Get client IP
-        client_ip = self.get_client_ip(request)
-        
-        # Check minute limit
-        if self.is_rate_limited(client_ip, 'minute', self.requests_per_minute, 60):
-            return JsonResponse({
+        result = self.check_rate_limit(request)
+        if result is not None and not result.allowed:
+            response = JsonResponse({
                 'error': 'Rate limit exceeded',
                 'message': 'Too many requests. Please try again later.',
-                'retry_after': 60
+                'retry_after': result.retry_after
             }, status=429)
-        
-        # Check hour limit
-        if self.is_rate_limited(client_ip, 'hour', self.requests_per_hour, 3600):
-            return JsonResponse({
-                'error': 'Rate limit exceeded',
-                'message': 'Too many requests. Please try again later.',
-                'retry_after': 3600
-            }, status=429)
-        
-        return None
-    
-    def get_client_ip(self, request):
-        """
-        Get client IP address from request.
-        """
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
         else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+            response = self.get_response(request)
+        
+        if result is not None:
+            for header, value in result.headers().items():
+                response[header] = value
+        return response
     
-    def is_rate_limited(self, ip, period, limit, timeout):
+    def check_rate_limit(self, request):
         """
-        Check if IP is rate limited for given period.
+        Consume one request from the client's budget; None if not limited.
         """
-        cache_key = f'rate_limit_{ip}_{period}'
+        if not self.enabled or request.path.startswith(self.exempt_prefixes):
+            return None
         
-        # Get current count
-        current_count = cache.get(cache_key, 0)
+        policy = self.limiter.resolve_policy(request.path, request.method)
+        if policy is None:
+            return None
         
-        if current_count >= limit:
-            return True
+        user = getattr(request, 'user', None)
+        user_id = user.pk if user is not None and user.is_authenticated else None
+        client_ip = get_client_ip(request)
         
-        # Increment counter
-        cache.set(cache_key, current_count + 1, timeout)
-        return False
+        result = self.limiter.check(
+            policy, self.limiter.identity(policy, user_id=user_id, ip_address=client_ip)
+        )
+        if not result.allowed:
+            SecurityLogger.log_rate_limit_exceeded(client_ip, policy.name)
+        return result
 
 
 class SecurityHeadersMiddleware:
@@ -230,7 +208,8 @@ class AuthenticationTrackingMiddleware:
         self.get_response = get_response
         self.max_failed_attempts = 5
         self.lockout_duration = 900  # 15 minutes
-        self.session_timeout = 3600  # 1 hour
+        self.activity_tracker = SessionActivityTracker()
+        self.session_timeout = self.activity_tracker.timeout
     
     def __call__(self, request):
         response = self.process_request(request)
@@ -252,23 +231,35 @@ class AuthenticationTrackingMiddleware:
         # Check session timeout
         if hasattr(request, 'user') and request.user.is_authenticated:
             if not self.is_session_valid(request):
-                return JsonResponse({
-                    'error': 'Session expired',
-                    'message': 'Your session has expired. Please login again.'
-                }, status=401)
+                return self.session_expired_response(request)
         
         return None
     
+    def session_expired_response(self, request):
+        """
+        JSON 401 for API and XHR requests; page navigations are sent to the
+        login page, which shows the message kept in the (flushed) session.
+        """
+        if (request.path.startswith('/api/')
+                or request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+                or request.headers.get('HX-Request') == 'true'):
+            return JsonResponse({
+                'error': 'Session expired',
+                'message': 'Your session has expired. Please login again.'
+            }, status=401)
+        request.session['logout_message'] = 'Your session has expired. Please login again.'
+        return redirect('frontend:login')
+    
     def track_failed_login(self, request):
         """
         Track failed login attempts and implement lockout.
         """
         ip = self.get_client_ip(request)
-        cache_key = f'failed_login_{ip}'
+        counters = get_security_counters()
         
-        failed_attempts = cache.get(cache_key, 0)
+        failed_attempts = counters.get(f'failed_login_{ip}', 0)
         if failed_attempts >= self.max_failed_attempts:
-            cache.set(f'locked_out_{ip}', True, self.lockout_duration)
+            counters.set(f'locked_out_{ip}', True, self.lockout_duration)
             return JsonResponse({
                 'error': 'Account locked',
                 'message': 'Too many failed login attempts. Account temporarily locked.'
@@ -291,19 +282,11 @@ class AuthenticationTrackingMiddleware:
     def is_session_valid(self, request):
         """
         Check if session is still valid.
-        """
-        last_activity = request.session.get('last_activity')
-        if not last_activity:
-            request.session['last_activity'] = time.time()
-            return True
-        
-        current_time = time.time()
-        if current_time - last_activity > self.session_timeout:
-            request.session.flush()
-            return False
         
-        request.session['last_activity'] = current_time
-        return True
+        Activity is only persisted once per SESSION_ACTIVITY_GRANULARITY
+        seconds, so most requests do not write the session.
+        """
+        return self.activity_tracker.touch(request)
 
 
 class APILoggingMiddleware:
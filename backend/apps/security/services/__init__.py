@@ -0,0 +1,15 @@
+# Security Services Package
+
+from .bulk_event_actions import apply_bulk_event_action
+from .rate_limiter import RateLimiter, RateLimitPolicy, RateLimitResult, get_rate_limiter
+from .session_activity import SessionActivityTracker, session_activity_metrics
+
+__all__ = [
+    'apply_bulk_event_action',
+    'RateLimiter',
+    'RateLimitPolicy',
+    'RateLimitResult',
+    'get_rate_limiter',
+    'SessionActivityTracker',
+    'session_activity_metrics',
+]
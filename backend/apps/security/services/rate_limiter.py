@@ -0,0 +1,360 @@
+"""
+Rate limiting service for IT Management Platform.
+
+Every request is checked against exactly one policy (the most specific
+active one for its path and method) with a single cache round trip:
+
+- Redis caches run a Lua script that reads and updates the counters
+  atomically (sliding window or token bucket).
+- Other cache backends use an atomic ``cache.incr`` on a fixed-window
+  counter and weight the previous window to approximate a sliding window.
+  The previous window is closed, so its count is fetched once per window
+  and kept in process memory. Token bucket policies need Redis and fall
+  back to the sliding window here.
+
+Policies come from the ``RATE_LIMIT_REQUESTS_PER_MINUTE`` setting (default
+policy) and from active ``SecurityThreshold`` rows of type
+``RATE_LIMIT_REQUESTS`` or ``API_REQUEST_FREQUENCY``:
+
+    value         -> number of requests allowed per window
+    unit          -> 'second', 'minute', 'hour' or 'day' (window length)
+    scope         -> 'USER' (per user, IP for anonymous), 'IP' or 'GLOBAL'
+    context_data  -> {'path_prefix': '/api/tickets/', 'methods': ['POST'],
+                      'algorithm': 'sliding_window' | 'token_bucket'}
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Configure logger
+logger = logging.getLogger('it_management_platform.security')
+
+RATE_LIMIT_THRESHOLD_TYPES = ['RATE_LIMIT_REQUESTS', 'API_REQUEST_FREQUENCY']
+
+ALGORITHMS = ['sliding_window', 'token_bucket']
+
+WINDOW_UNITS = {
+    'second': 1,
+    'seconds': 1,
+    'minute': 60,
+    'minutes': 60,
+    'hour': 3600,
+    'hours': 3600,
+    'day': 86400,
+    'days': 86400,
+}
+
+# Number of closed-window counts remembered per process
+PREVIOUS_WINDOW_MEMO_SIZE = 10000
+
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local estimate = math.floor(previous * tonumber(ARGV[3]) + current)
+if estimate >= limit then
+    return {0, estimate}
+end
+current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) * 2)
+end
+return {1, estimate + 1}
+"""
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, math.floor(tokens)}
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """A request budget applied to the requests matching a path prefix."""
+    name: str
+    limit: int
+    window: int
+    scope: str = 'USER'
+    path_prefix: str = '/'
+    methods: Tuple[str, ...] = ()
+    algorithm: str = 'sliding_window'
+    # The RATE_LIMIT_REQUESTS_PER_MINUTE fallback, not a SecurityThreshold
+    builtin: bool = False
+
+    def matches(self, path: str, method: str) -> bool:
+        if not path.startswith(self.path_prefix):
+            return False
+        return not self.methods or method in self.methods
+
+    @property
+    def specificity(self) -> Tuple[int, int, int]:
+        """
+        Longer prefixes and method-restricted policies win; on a tie a
+        configured threshold wins over the built-in default.
+        """
+        return (len(self.path_prefix), 1 if self.methods else 0, 0 if self.builtin else 1)
+
+
+@dataclass
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: int
+    policy: Optional[RateLimitPolicy] = None
+
+    @property
+    def retry_after(self) -> int:
+        return 0 if self.allowed else max(1, self.reset_after)
+
+    def headers(self) -> dict:
+        """Standard rate limit response headers."""
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(max(0, self.remaining)),
+            'X-RateLimit-Reset': str(self.reset_after),
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(self.retry_after)
+        return headers
+
+
+def policy_from_threshold(threshold) -> Optional[RateLimitPolicy]:
+    """Build a policy from a SecurityThreshold row, or None if it is unusable."""
+    context = threshold.context_data or {}
+    window = context.get('window_seconds') or WINDOW_UNITS.get((threshold.unit or 'minute').lower())
+    limit = int(threshold.value)
+    if not window or limit <= 0:
+        logger.warning(f"Ignoring rate limit threshold {threshold.name}: invalid value or unit")
+        return None
+
+    algorithm = context.get('algorithm', 'sliding_window')
+    if algorithm not in ALGORITHMS:
+        algorithm = 'sliding_window'
+
+    return RateLimitPolicy(
+        name=threshold.name,
+        limit=limit,
+        window=int(window),
+        scope=(threshold.scope or 'USER').upper(),
+        path_prefix=context.get('path_prefix', '/'),
+        methods=tuple(m.upper() for m in context.get('methods', [])),
+        algorithm=algorithm,
+    )
+
+
+def default_policy() -> RateLimitPolicy:
+    return RateLimitPolicy(
+        name='default',
+        limit=getattr(settings, 'RATE_LIMIT_REQUESTS_PER_MINUTE', 60),
+        window=60,
+        builtin=True,
+    )
+
+
+class RateLimiter:
+    """
+    Checks requests against rate limit policies using the shared cache.
+    """
+
+    def __init__(self, cache_alias: str = None, refresh_interval: int = None):
+        self.cache_alias = cache_alias or getattr(settings, 'RATE_LIMIT_CACHE_ALIAS', 'default')
+        self.refresh_interval = (
+            refresh_interval if refresh_interval is not None
+            else getattr(settings, 'RATE_LIMIT_POLICY_REFRESH', 60)
+        )
+        self._policies: Optional[List[RateLimitPolicy]] = None
+        self._loaded_at = 0.0
+        self._previous_counts = OrderedDict()
+        self._lock = threading.Lock()
+        self._scripts = {}
+
+    # ------------------------------------------------------------------
+    # Policies
+    # ------------------------------------------------------------------
+
+    def invalidate(self):
+        """Drop the cached policy list (e.g. after a threshold change)."""
+        self._policies = None
+
+    def get_policies(self) -> List[RateLimitPolicy]:
+        now = time.monotonic()
+        if self._policies is None or now - self._loaded_at > self.refresh_interval:
+            self._policies = self._load_policies()
+            self._loaded_at = now
+        return self._policies
+
+    def _load_policies(self) -> List[RateLimitPolicy]:
+        from apps.security.models import SecurityThreshold
+
+        policies = [default_policy()]
+        try:
+            thresholds = SecurityThreshold.objects.filter(
+                threshold_type__in=RATE_LIMIT_THRESHOLD_TYPES,
+                is_active=True,
+            )
+            policies.extend(
+                policy for policy in map(policy_from_threshold, thresholds) if policy
+            )
+        except Exception as e:
+            logger.error(f"Error loading rate limit policies: {str(e)}")
+        return policies
+
+    def resolve_policy(self, path: str, method: str) -> Optional[RateLimitPolicy]:
+        """Return the most specific policy matching the request."""
+        matching = [p for p in self.get_policies() if p.matches(path, method)]
+        if not matching:
+            return None
+        return max(matching, key=lambda p: p.specificity)
+
+    # ------------------------------------------------------------------
+    # Checks
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def identity(policy: RateLimitPolicy, user_id=None, ip_address=None) -> str:
+        if policy.scope == 'GLOBAL':
+            return 'global'
+        if policy.scope == 'USER' and user_id is not None:
+            return f'user:{user_id}'
+        return f'ip:{ip_address or "unknown"}'
+
+    def check(self, policy: RateLimitPolicy, identity: str, now: float = None) -> RateLimitResult:
+        """Consume one request from ``identity``'s budget under ``policy``."""
+        now = time.time() if now is None else now
+        cache = caches[self.cache_alias]
+        client = self._redis_client(cache)
+
+        try:
+            if client is not None:
+                if policy.algorithm == 'token_bucket':
+                    return self._redis_token_bucket(client, policy, identity, now)
+                return self._redis_sliding_window(client, policy, identity, now)
+            return self._cache_sliding_window(cache, policy, identity, now)
+        except Exception as e:
+            # Never turn a cache outage into an outage of the whole site
+            logger.error(f"Error checking rate limit {policy.name}: {str(e)}")
+            return RateLimitResult(True, policy.limit, policy.limit, policy.window, policy)
+
+    @staticmethod
+    def _redis_client(cache):
+        module = type(cache).__module__
+        if module.startswith('django_redis'):
+            return cache.client.get_client(write=True)
+        if module == 'django.core.cache.backends.redis':
+            return cache._cache.get_client(write=True)
+        return None
+
+    def _script(self, client, source):
+        script = self._scripts.get((id(client), source))
+        if script is None:
+            script = self._scripts[(id(client), source)] = client.register_script(source)
+        return script
+
+    @staticmethod
+    def _window_keys(policy, identity, now):
+        index = int(now // policy.window)
+        base = f"ratelimit:{policy.name.replace(' ', '_')}:{identity}"
+        elapsed = now - index * policy.window
+        return f'{base}:{index}', f'{base}:{index - 1}', elapsed
+
+    def _redis_sliding_window(self, client, policy, identity, now):
+        current_key, previous_key, elapsed = self._window_keys(policy, identity, now)
+        weight = 1 - elapsed / policy.window
+        allowed, estimate = self._script(client, SLIDING_WINDOW_SCRIPT)(
+            keys=[current_key, previous_key],
+            args=[policy.limit, policy.window, weight],
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=policy.limit,
+            remaining=policy.limit - int(estimate),
+            reset_after=math.ceil(policy.window - elapsed),
+            policy=policy,
+        )
+
+    def _redis_token_bucket(self, client, policy, identity, now):
+        rate = policy.limit / policy.window
+        allowed, tokens = self._script(client, TOKEN_BUCKET_SCRIPT)(
+            keys=[f"ratelimit:{policy.name.replace(' ', '_')}:{identity}:bucket"],
+            args=[policy.limit, rate, now],
+        )
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=policy.limit,
+            remaining=int(tokens),
+            reset_after=math.ceil((policy.limit - int(tokens) if allowed else 1) / rate),
+            policy=policy,
+        )
+
+    def _cache_sliding_window(self, cache, policy, identity, now):
+        current_key, previous_key, elapsed = self._window_keys(policy, identity, now)
+
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # First request of the window; the key expires with the window
+            if cache.add(current_key, 1, policy.window * 2):
+                current = 1
+            else:
+                current = cache.incr(current_key)
+
+        previous = self._previous_count(cache, previous_key)
+        estimate = math.floor(previous * (1 - elapsed / policy.window) + current)
+        return RateLimitResult(
+            allowed=estimate <= policy.limit,
+            limit=policy.limit,
+            remaining=policy.limit - estimate,
+            reset_after=math.ceil(policy.window - elapsed),
+            policy=policy,
+        )
+
+    def _previous_count(self, cache, key) -> int:
+        """Count of a closed window; fetched once, then served from memory."""
+        with self._lock:
+            if key in self._previous_counts:
+                self._previous_counts.move_to_end(key)
+                return self._previous_counts[key]
+
+        count = cache.get(key, 0)
+        with self._lock:
+            self._previous_counts[key] = count
+            while len(self._previous_counts) > PREVIOUS_WINDOW_MEMO_SIZE:
+                self._previous_counts.popitem(last=False)
+        return count
+
+
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
@@ -0,0 +1,112 @@
+"""
+Session activity tracking for IT Management Platform.
+
+AuthenticationTrackingMiddleware uses this to enforce the idle session
+timeout. The last-activity timestamp is only persisted when the stored one
+is older than ``SESSION_ACTIVITY_GRANULARITY`` seconds, so a busy user
+causes at most one session write per granularity period instead of one per
+request. The idle timeout is therefore accurate to within the granularity.
+
+``SESSION_ACTIVITY_STORE`` selects where the timestamp lives:
+
+- 'session': in the session itself (one session-store write when persisted)
+- 'cache':   in the cache, keyed by session key; the session is never
+             modified, which suits database-backed sessions
+"""
+
+import threading
+import time
+from typing import Dict
+
+from django.conf import settings
+from django.core.cache import caches
+
+SESSION_ACTIVITY_KEY = 'last_activity'
+
+ACTIVITY_STORES = ['session', 'cache']
+
+
+class SessionActivityMetrics:
+    """Process-wide counters for session activity tracking."""
+
+    FIELDS = ('checks', 'writes', 'skipped_writes', 'expired')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def increment(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def reset(self):
+        with self._lock:
+            self._counts = dict.fromkeys(self.FIELDS, 0)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            counts = dict(self._counts)
+        attempts = counts['writes'] + counts['skipped_writes']
+        counts['skip_ratio'] = round(counts['skipped_writes'] / attempts, 4) if attempts else 0.0
+        return counts
+
+
+session_activity_metrics = SessionActivityMetrics()
+
+
+class SessionActivityTracker:
+    """
+    Checks and refreshes the idle timeout of authenticated sessions.
+    """
+
+    def __init__(self, timeout: int = None, granularity: int = None, store: str = None):
+        self.timeout = timeout if timeout is not None else getattr(settings, 'SESSION_TIMEOUT', 3600)
+        self.granularity = (
+            granularity if granularity is not None
+            else getattr(settings, 'SESSION_ACTIVITY_GRANULARITY', 60)
+        )
+        self.store = store or getattr(settings, 'SESSION_ACTIVITY_STORE', 'session')
+        if self.store not in ACTIVITY_STORES:
+            raise ValueError(f"Unsupported session activity store: {self.store}")
+        self.cache_alias = getattr(settings, 'SESSION_ACTIVITY_CACHE_ALIAS', 'default')
+
+    def touch(self, request, now: float = None) -> bool:
+        """
+        Record activity for the request's session.
+
+        Returns:
+            False if the session had been idle for longer than the timeout
+            (the session is flushed), True otherwise.
+        """
+        now = time.time() if now is None else now
+        session = request.session
+        session_activity_metrics.increment('checks')
+
+        use_cache = self.store == 'cache' and session.session_key
+        if use_cache:
+            cache = caches[self.cache_alias]
+            cache_key = f'session_activity:{session.session_key}'
+            last_activity = cache.get(cache_key)
+            if last_activity is None:
+                # Sessions started before switching stores
+                last_activity = session.get(SESSION_ACTIVITY_KEY)
+        else:
+            last_activity = session.get(SESSION_ACTIVITY_KEY)
+
+        if last_activity is not None and now - last_activity > self.timeout:
+            session_activity_metrics.increment('expired')
+            if use_cache:
+                cache.delete(cache_key)
+            session.flush()
+            return False
+
+        if last_activity is not None and now - last_activity < self.granularity:
+            session_activity_metrics.increment('skipped_writes')
+            return True
+
+        if use_cache:
+            cache.set(cache_key, now, self.timeout)
+        else:
+            session[SESSION_ACTIVITY_KEY] = now
+        session_activity_metrics.increment('writes')
+        return True
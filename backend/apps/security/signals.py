@@ -3,36 +3,36 @@ Security signals for IT Management Platform.
 Handles automatic logging of security events and audit trails.
 """
 
+from django.apps import apps
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
 from django.db.models.signals import post_save, pre_save, pre_delete, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from django.contrib.auth.signals import user_logged_in, user_logged_out, user_login_failed
 from django.contrib.sessions.models import Session
 from django.utils import timezone
-from django.core.cache import cache
 from django.http import HttpRequest
 import json
 import logging
 
-from .models import SecurityEvent, AuditLog, SecurityIncident
-from .utils import SecurityLogger, SecurityValidator, get_client_ip
+from .audit import queue_audit_records
+from .models import SecurityEvent, AuditLog, SecurityIncident, SecurityThreshold
+from .services.rate_limiter import get_rate_limiter
+from .utils import SecurityLogger, SecurityValidator, get_client_ip, get_security_counters
 
 # Configure logger
 logger = logging.getLogger('it_management_platform.security')
 
 
 # Authentication Signals
-@receiver(user_logged_in)
-def log_successful_login(sender, request, user, **kwargs):
+def successful_login_records(user, request, ip_address=None, session_key=''):
     """
-    Log successful login attempts.
+    Build the unsaved SecurityEvent and AuditLog of a successful login.
     """
-    try:
-        # Get client IP address
-        ip_address = get_client_ip(request) if hasattr(request, 'META') else None
-        
-        # Create security event
-        SecurityEvent.objects.create(
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    return [
+        SecurityEvent(
             event_type='LOGIN_SUCCESS',
             severity='LOW',
             title=f'Successful login for user {user.username}',
@@ -40,19 +40,17 @@ def log_successful_login(sender, request, user, **kwargs):
             user=user,
             username=user.username,
             ip_address=ip_address,
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            user_agent=user_agent,
             referer=request.META.get('HTTP_REFERER', ''),
             request_method='POST',
             request_path=request.path,
-            session_id=request.session.session_key or '',
+            session_id=session_key or '',
             additional_data={
                 'login_time': timezone.now().isoformat(),
-                'session_key': request.session.session_key,
+                'session_key': session_key,
             }
-        )
-        
-        # Log to audit trail
-        AuditLog.objects.create(
+        ),
+        AuditLog(
             action='LOGIN',
             resource_type='user_session',
             resource_id=str(user.id),
@@ -60,18 +58,33 @@ def log_successful_login(sender, request, user, **kwargs):
             user=user,
             username=user.username,
             ip_address=ip_address,
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            session_id=request.session.session_key or '',
+            user_agent=user_agent,
+            session_id=session_key or '',
             description=f'User {user.username} logged in successfully',
             success=True
+        ),
+    ]
+
+
+@receiver(user_logged_in)
+def log_successful_login(sender, request, user, **kwargs):
+    """
+    Log successful login attempts.
+    """
+    try:
+        # Get client IP address
+        ip_address = get_client_ip(request) if hasattr(request, 'META') else None
+        
+        # Security event and audit trail, written after commit
+        queue_audit_records(
+            *successful_login_records(user, request, ip_address, request.session.session_key)
         )
         
         # Update last activity
         request.session['last_activity'] = timezone.now().timestamp()
         
         # Clear any failed login attempts
-        cache_key = f'failed_login_{ip_address}'
-        cache.delete(cache_key)
+        get_security_counters().delete(f'failed_login_{ip_address}')
         
         # Log with utility
         SecurityLogger.log_successful_login(user.username, ip_address)
@@ -89,8 +102,10 @@ def log_failed_login(sender, credentials, request, **kwargs):
         # Get client IP address
         ip_address = get_client_ip(request) if hasattr(request, 'META') else None
         
+        # Track failed login attempts for rate limiting (atomic across workers)
+        failed_attempts = get_security_counters().incr(f'failed_login_{ip_address}', timeout=900) - 1
+        
         # Determine severity based on number of failed attempts
-        failed_attempts = cache.get(f'failed_login_{ip_address}', 0)
         severity = 'MEDIUM' if failed_attempts >= 3 else 'LOW'
         
         # Create security event
@@ -127,10 +142,6 @@ def log_failed_login(sender, credentials, request, **kwargs):
             error_message='Invalid credentials'
         )
         
-        # Track failed login attempts for rate limiting
-        cache_key = f'failed_login_{ip_address}'
-        cache.set(cache_key, failed_attempts + 1, 900)  # 15 minutes
-        
         # Check for potential brute force attack
         if failed_attempts + 1 >= 5:
             # Create high severity event for potential brute force
@@ -353,102 +364,154 @@ def process_security_incident_creation(sender, instance, created, **kwargs):
         logger.error(f"Error processing security incident creation: {str(e)}")
 
 
+@receiver(post_save, sender=SecurityThreshold)
+@receiver(post_delete, sender=SecurityThreshold)
+def reload_rate_limit_policies(sender, instance, **kwargs):
+    """
+    Reload rate limit policies when a threshold changes.
+    """
+    get_rate_limiter().invalidate()
+
+
 # Data Access Signals
-@receiver(post_save)
-def log_data_changes(sender, instance, created, **kwargs):
+# These receivers are connected per model by connect_audit_receivers() so
+# saves and deletes of models that are not audited (sessions, log rows, M2M
+# through rows, ...) never enter the audit code path.
+
+# Models whose updates are written to the audit trail
+AUDITED_MODELS = getattr(settings, 'SECURITY_AUDITED_MODELS', [
+    'users.User', 'assets.Asset', 'tickets.Ticket', 'projects.Project',
+])
+
+# Models whose deletion raises a security event
+SENSITIVE_MODELS = getattr(settings, 'SECURITY_SENSITIVE_MODELS', AUDITED_MODELS + [
+    'security.SecurityEvent', 'security.SecurityIncident',
+])
+
+
+def log_data_changes(sender, instance, created, using=DEFAULT_DB_ALIAS, **kwargs):
     """
-    Generic signal to log data changes for audit purposes.
-    This could be extended to log changes to specific models.
+    Log updates of audited models to the audit trail.
     """
     try:
-        # Only log for specific models that need audit trails
-        audit_models = [
-            'user', 'asset', 'ticket', 'project'
-        ]  # Add your models here
+        if created:
+            return
         
-        model_name = sender._meta.model_name
+        # Get current user from context
+        current_user = getattr(instance, '_current_user', None)
+        if not current_user:
+            return
         
-        if model_name in audit_models and not created:
-            # Get current user from context
-            current_user = getattr(instance, '_current_user', None)
-            
-            if current_user:
-                # Log the change
-                AuditLog.objects.create(
-                    action='UPDATE',
-                    resource_type=model_name,
-                    resource_id=str(instance.id),
-                    resource_name=getattr(instance, 'name', str(instance)),
-                    user=current_user,
-                    username=current_user.username,
-                    description=f'Updated {model_name}: {getattr(instance, "name", instance)}',
-                    success=True,
-                    additional_data={
-                        'model_name': model_name,
-                        'instance_id': instance.id,
-                        'timestamp': timezone.now().isoformat(),
-                    }
-                )
+        model_name = sender._meta.model_name
+        queue_audit_records(
+            AuditLog(
+                action='UPDATE',
+                resource_type=model_name,
+                resource_id=str(instance.pk),
+                resource_name=getattr(instance, 'name', str(instance)),
+                user=current_user,
+                username=current_user.username,
+                description=f'Updated {model_name}: {getattr(instance, "name", instance)}',
+                success=True,
+                additional_data={
+                    'model_name': model_name,
+                    'instance_id': instance.pk,
+                    'timestamp': timezone.now().isoformat(),
+                }
+            ),
+            using=using,
+        )
     
     except Exception as e:
         logger.error(f"Error logging data changes: {str(e)}")
 
 
 # Security Monitoring Signals
-@receiver(post_delete)
-def log_data_deletion(sender, instance, **kwargs):
+def log_data_deletion(sender, instance, using=DEFAULT_DB_ALIAS, **kwargs):
     """
-    Log data deletion events.
+    Log deletion of sensitive models.
+    
+    A QuerySet.delete() sends post_delete once per row inside a single
+    transaction, so the records are queued and bulk inserted on commit.
     """
     try:
-        # Only log deletion for sensitive models
-        sensitive_models = [
-            'user', 'asset', 'ticket', 'project', 'securityevent', 'securityincident'
-        ]  # Add your models here
-        
         model_name = sender._meta.model_name
+        instance_name = getattr(instance, 'name', str(instance))
+        now = timezone.now().isoformat()
         
-        if model_name in sensitive_models:
-            # Get current user from context
-            current_user = getattr(instance, '_current_user', None)
-            
-            # Create high severity security event for sensitive data deletion
-            SecurityEvent.objects.create(
+        # Get current user from context
+        current_user = getattr(instance, '_current_user', None)
+        username = current_user.username if current_user else 'unknown'
+        
+        queue_audit_records(
+            # High severity security event for sensitive data deletion
+            SecurityEvent(
                 event_type='SECURITY_VIOLATION',
                 severity='HIGH',
                 title=f'Sensitive data deletion: {model_name}',
                 description=f'Deletion of {model_name} instance detected',
                 user=current_user,
-                username=current_user.username if current_user else 'unknown',
+                username=username,
                 additional_data={
                     'deleted_model': model_name,
-                    'deleted_instance_id': instance.id,
-                    'deleted_instance_name': getattr(instance, 'name', str(instance)),
-                    'timestamp': timezone.now().isoformat(),
+                    'deleted_instance_id': instance.pk,
+                    'deleted_instance_name': instance_name,
+                    'timestamp': now,
                 }
-            )
-            
-            # Log to audit trail
-            AuditLog.objects.create(
+            ),
+            AuditLog(
                 action='DELETE',
                 resource_type=model_name,
-                resource_id=str(instance.id),
-                resource_name=getattr(instance, 'name', str(instance)),
+                resource_id=str(instance.pk),
+                resource_name=instance_name,
                 user=current_user,
-                username=current_user.username if current_user else 'unknown',
-                description=f'Deleted {model_name}: {getattr(instance, "name", instance)}',
+                username=username,
+                description=f'Deleted {model_name}: {instance_name}',
                 success=True,
                 additional_data={
                     'model_name': model_name,
-                    'instance_id': instance.id,
-                    'timestamp': timezone.now().isoformat(),
+                    'instance_id': instance.pk,
+                    'timestamp': now,
                 }
-            )
+            ),
+            using=using,
+        )
     
     except Exception as e:
         logger.error(f"Error logging data deletion: {str(e)}")
 
 
+def _resolve_models(labels):
+    """Resolve 'app_label.ModelName' labels, skipping apps that are not installed."""
+    models = []
+    for label in labels:
+        try:
+            models.append(apps.get_model(label))
+        except (LookupError, ValueError):
+            logger.warning(f"Audit receiver skipped, unknown model: {label}")
+    return models
+
+
+def connect_audit_receivers():
+    """
+    Connect the data change/deletion receivers to the audited models only.
+    """
+    for model in _resolve_models(AUDITED_MODELS):
+        post_save.connect(
+            log_data_changes, sender=model,
+            dispatch_uid=f'security_log_data_changes_{model._meta.label_lower}',
+        )
+    
+    for model in _resolve_models(SENSITIVE_MODELS):
+        post_delete.connect(
+            log_data_deletion, sender=model,
+            dispatch_uid=f'security_log_data_deletion_{model._meta.label_lower}',
+        )
+
+
+connect_audit_receivers()
+
+
 # Utility functions that could be called by signals
 def get_current_user():
     """
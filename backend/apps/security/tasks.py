@@ -0,0 +1,19 @@
+import logging
+from celery import shared_task
+from django.contrib.auth import get_user_model
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def apply_bulk_event_action_task(actor_id, event_ids, action, notes='', assignee_id=None):
+    """Run a large SecurityEventViewSet.bulk_action selection in a worker."""
+    from apps.security.services import apply_bulk_event_action
+
+    User = get_user_model()
+    actor = User.objects.filter(pk=actor_id).first()
+    assignee = User.objects.filter(pk=assignee_id).first() if assignee_id else None
+
+    result = apply_bulk_event_action(actor, event_ids, action, notes=notes, assignee=assignee)
+    logger.info(f'[Celery] Bulk {action} on security events: {result}')
+    return result
@@ -0,0 +1,82 @@
+"""
+Integration tests for the security audit receivers.
+
+Audit records are bulk inserted after commit, so the tests run the
+on_commit callbacks explicitly via django_capture_on_commit_callbacks.
+"""
+
+import pytest
+from django.db.models.signals import post_delete, post_save
+
+from apps.security.models import AuditLog, SecurityEvent
+from apps.security.signals import log_data_changes, log_data_deletion
+from apps.tickets.models import Ticket, TicketCategory
+
+
+def make_tickets(n, requester, ticket_category, ticket_type):
+    return Ticket.objects.bulk_create([
+        Ticket(
+            title=f'Ticket {i}',
+            description='Test',
+            category=ticket_category,
+            ticket_type=ticket_type,
+            requester=requester,
+        )
+        for i in range(n)
+    ])
+
+
+def receivers_for(signal, sender):
+    return signal._live_receivers(sender)
+
+
+class TestReceiverRegistration:
+    def test_connected_to_audited_models(self):
+        assert log_data_changes in receivers_for(post_save, Ticket)
+        assert log_data_deletion in receivers_for(post_delete, Ticket)
+
+    def test_not_connected_to_other_models(self):
+        from django.contrib.sessions.models import Session
+        assert log_data_changes not in receivers_for(post_save, Session)
+        assert log_data_changes not in receivers_for(post_save, AuditLog)
+        assert log_data_deletion not in receivers_for(post_delete, TicketCategory)
+
+
+@pytest.mark.django_db
+class TestBulkDeleteAudit:
+    def test_bulk_delete_writes_one_insert_per_model(
+        self, manager, ticket_category, ticket_type, django_capture_on_commit_callbacks,
+    ):
+        make_tickets(25, manager, ticket_category, ticket_type)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Ticket.objects.all().delete()
+
+        assert SecurityEvent.objects.filter(title='Sensitive data deletion: ticket').count() == 25
+        assert AuditLog.objects.filter(action='DELETE', resource_type='ticket').count() == 25
+
+    def test_audit_rows_written_in_batched_inserts(
+        self, manager, ticket_category, ticket_type, django_capture_on_commit_callbacks,
+    ):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        make_tickets(25, manager, ticket_category, ticket_type)
+
+        with CaptureQueriesContext(connection) as queries:
+            with django_capture_on_commit_callbacks(execute=True):
+                Ticket.objects.all().delete()
+
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "security_')]
+        assert len(inserts) == 2
+
+    def test_no_audit_rows_before_commit(self, manager, ticket_category, ticket_type):
+        make_tickets(3, manager, ticket_category, ticket_type)
+        Ticket.objects.all().delete()
+        assert not AuditLog.objects.filter(action='DELETE').exists()
+
+    def test_unaudited_model_delete_is_ignored(self, django_capture_on_commit_callbacks):
+        category = TicketCategory.objects.create(name='Disposable')
+        with django_capture_on_commit_callbacks(execute=True):
+            category.delete()
+        assert not AuditLog.objects.filter(resource_type='ticketcategory').exists()
@@ -0,0 +1,106 @@
+"""
+Integration tests for set-based security event bulk actions.
+"""
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.security.models import AuditLog, SecurityEvent
+from apps.security.services import apply_bulk_event_action
+
+
+def make_events(n, status='OPEN'):
+    return SecurityEvent.objects.bulk_create([
+        SecurityEvent(
+            event_type='LOGIN_FAILURE',
+            severity='MEDIUM',
+            status=status,
+            title=f'Failed login {i}',
+            description='Brute force burst',
+        )
+        for i in range(n)
+    ])
+
+
+@pytest.fixture
+def api_client(superadmin):
+    client = APIClient()
+    client.force_authenticate(user=superadmin)
+    return client
+
+
+@pytest.mark.django_db
+class TestApplyBulkEventAction:
+    def test_resolve_skips_already_resolved(self, it_admin):
+        open_events = make_events(4)
+        resolved = make_events(2, status='RESOLVED')
+        ids = [e.id for e in open_events + resolved]
+
+        result = apply_bulk_event_action(it_admin, ids, 'RESOLVE', notes='triaged')
+
+        assert result == {'action': 'RESOLVE', 'requested': 6, 'updated': 4, 'skipped': 2}
+        assert SecurityEvent.objects.filter(status='RESOLVED', resolved_by=it_admin).count() == 4
+
+    def test_single_update_statement(self, it_admin, django_assert_num_queries):
+        ids = [e.id for e in make_events(50)]
+        # SAVEPOINT + UPDATE + RELEASE
+        with django_assert_num_queries(3):
+            apply_bulk_event_action(it_admin, ids, 'ESCALATE')
+        assert SecurityEvent.objects.filter(status='ESCALATED').count() == 50
+
+    def test_mark_false_positive_sets_notes(self, it_admin):
+        ids = [e.id for e in make_events(2)]
+        apply_bulk_event_action(it_admin, ids, 'MARK_FALSE_POSITIVE', notes='scanner')
+        event = SecurityEvent.objects.get(id=ids[0])
+        assert event.status == 'FALSE_POSITIVE'
+        assert event.resolution_notes == 'False positive - scanner'
+        assert event.resolved_at is not None
+
+    def test_assign_includes_resolved_events(self, it_admin, technician):
+        ids = [e.id for e in make_events(1) + make_events(1, status='RESOLVED')]
+        result = apply_bulk_event_action(it_admin, ids, 'ASSIGN', assignee=technician)
+        assert result['updated'] == 2
+
+    def test_writes_single_audit_entry(self, it_admin, django_capture_on_commit_callbacks):
+        ids = [e.id for e in make_events(10)]
+        with django_capture_on_commit_callbacks(execute=True):
+            apply_bulk_event_action(it_admin, ids, 'RESOLVE')
+        audit = AuditLog.objects.get(resource_type='securityevent')
+        assert audit.additional_data['updated'] == 10
+        assert audit.additional_data['event_ids'] == sorted(ids)
+
+
+@pytest.mark.django_db
+class TestBulkActionEndpoint:
+    url = '/api/security/security-events/bulk_action/'
+
+    def test_reports_counts(self, api_client):
+        ids = [e.id for e in make_events(3)]
+        response = api_client.post(self.url, {'event_ids': ids, 'action': 'RESOLVE'}, format='json')
+        assert response.status_code == 200
+        assert response.data['updated'] == 3
+        assert response.data['skipped'] == 0
+
+    def test_assign_requires_assignee(self, api_client):
+        ids = [e.id for e in make_events(1)]
+        response = api_client.post(self.url, {'event_ids': ids, 'action': 'ASSIGN'}, format='json')
+        assert response.status_code == 400
+
+    def test_large_selection_is_queued(self, api_client, settings, monkeypatch):
+        from types import SimpleNamespace
+        from apps.security import views
+
+        settings.SECURITY_BULK_ACTION_ASYNC_THRESHOLD = 2
+        queued = []
+        monkeypatch.setattr(
+            views.apply_bulk_event_action_task, 'delay',
+            lambda *args: queued.append(args) or SimpleNamespace(id='task-1'),
+        )
+        ids = [e.id for e in make_events(3)]
+
+        response = api_client.post(self.url, {'event_ids': ids, 'action': 'ESCALATE'}, format='json')
+
+        assert response.status_code == 202
+        assert response.data['task_id'] == 'task-1'
+        assert len(queued) == 1
+        assert not SecurityEvent.objects.filter(status='ESCALATED').exists()
@@ -0,0 +1,181 @@
+"""
+Tests for the cache-backed rate limiter and RateLimitingMiddleware.
+"""
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+
+from apps.security.models import SecurityThreshold
+from apps.security.services import rate_limiter
+from apps.security.services.rate_limiter import RateLimiter, RateLimitPolicy
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter(monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(rate_limiter, '_rate_limiter', None)
+    yield
+    cache.clear()
+
+
+class CountingCache:
+    """Wraps a cache and counts the operations sent to it."""
+
+    def __init__(self, wrapped):
+        self.wrapped = wrapped
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self.wrapped, name)
+        if name in ('get', 'set', 'add', 'incr', 'get_many'):
+            def counted(*args, **kwargs):
+                self.calls.append(name)
+                return attr(*args, **kwargs)
+            return counted
+        return attr
+
+
+# ----------------------------------------------------------------------
+# Sliding window on the plain cache backend
+# ----------------------------------------------------------------------
+
+class TestCacheSlidingWindow:
+    policy = RateLimitPolicy(name='test', limit=3, window=60)
+
+    def test_requests_over_the_limit_are_denied(self):
+        limiter = RateLimiter()
+        now = 6000.0  # start of a window
+
+        results = [limiter.check(self.policy, 'ip:1.2.3.4', now=now + i) for i in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert results[3].retry_after == 57
+
+    def test_keys_are_independent(self):
+        limiter = RateLimiter()
+        for _ in range(3):
+            limiter.check(self.policy, 'user:1', now=6000.0)
+
+        assert not limiter.check(self.policy, 'user:1', now=6001.0).allowed
+        assert limiter.check(self.policy, 'user:2', now=6001.0).allowed
+
+    def test_previous_window_is_weighted(self):
+        limiter = RateLimiter()
+        for _ in range(3):
+            limiter.check(self.policy, 'ip:1.2.3.4', now=6000.0)
+
+        # Half way into the next window half of the old requests still count
+        assert limiter.check(self.policy, 'ip:1.2.3.4', now=6090.0).allowed
+        assert limiter.check(self.policy, 'ip:1.2.3.4', now=6091.0).allowed
+        assert not limiter.check(self.policy, 'ip:1.2.3.4', now=6092.0).allowed
+        # After a quiet window the budget is fully restored
+        assert limiter.check(self.policy, 'ip:1.2.3.4', now=6180.0).remaining == 2
+
+    def test_steady_state_is_one_cache_operation(self, monkeypatch):
+        counting = CountingCache(cache)
+        monkeypatch.setattr(rate_limiter, 'caches', {'default': counting})
+        limiter = RateLimiter()
+        policy = RateLimitPolicy(name='test', limit=100, window=60)
+
+        limiter.check(policy, 'ip:1.2.3.4', now=6000.0)
+        counting.calls.clear()
+        for i in range(10):
+            limiter.check(policy, 'ip:1.2.3.4', now=6001.0 + i)
+
+        assert counting.calls == ['incr'] * 10
+
+
+# ----------------------------------------------------------------------
+# Policies
+# ----------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestPolicies:
+    def test_most_specific_threshold_wins(self, superadmin, settings):
+        settings.RATE_LIMIT_REQUESTS_PER_MINUTE = 100
+        SecurityThreshold.objects.create(
+            name='Ticket writes', threshold_type='RATE_LIMIT_REQUESTS',
+            operator='GREATER_THAN', value=10, unit='minute', scope='USER',
+            context_data={'path_prefix': '/api/tickets/', 'methods': ['POST']},
+            created_by=superadmin,
+        )
+        SecurityThreshold.objects.create(
+            name='API reads', threshold_type='API_REQUEST_FREQUENCY',
+            operator='GREATER_THAN', value=1000, unit='hour', scope='IP',
+            context_data={'path_prefix': '/api/'},
+            created_by=superadmin,
+        )
+        limiter = RateLimiter()
+
+        write = limiter.resolve_policy('/api/tickets/', 'POST')
+        read = limiter.resolve_policy('/api/tickets/', 'GET')
+        page = limiter.resolve_policy('/frontend/tickets/', 'GET')
+
+        assert (write.name, write.limit, write.window) == ('Ticket writes', 10, 60)
+        assert (read.name, read.window, read.scope) == ('API reads', 3600, 'IP')
+        assert (page.name, page.limit) == ('default', 100)
+
+    def test_site_wide_threshold_replaces_the_default(self, superadmin):
+        SecurityThreshold.objects.create(
+            name='Site wide', threshold_type='RATE_LIMIT_REQUESTS', operator='GREATER_THAN',
+            value=300, unit='minute', scope='IP', created_by=superadmin,
+        )
+
+        policy = RateLimiter().resolve_policy('/frontend/tickets/', 'GET')
+
+        assert (policy.name, policy.limit, policy.scope) == ('Site wide', 300, 'IP')
+
+    def test_threshold_change_reloads_policies(self, superadmin):
+        limiter = rate_limiter.get_rate_limiter()
+        assert limiter.resolve_policy('/api/', 'GET').name == 'default'
+
+        SecurityThreshold.objects.create(
+            name='API', threshold_type='RATE_LIMIT_REQUESTS', operator='GREATER_THAN',
+            value=5, unit='second', context_data={'path_prefix': '/api/'},
+            created_by=superadmin,
+        )
+
+        assert limiter.resolve_policy('/api/', 'GET').name == 'API'
+
+    def test_identity_by_scope(self):
+        user_policy = RateLimitPolicy(name='u', limit=1, window=1, scope='USER')
+        ip_policy = RateLimitPolicy(name='i', limit=1, window=1, scope='IP')
+
+        assert RateLimiter.identity(user_policy, user_id=7, ip_address='10.0.0.1') == 'user:7'
+        assert RateLimiter.identity(user_policy, ip_address='10.0.0.1') == 'ip:10.0.0.1'
+        assert RateLimiter.identity(ip_policy, user_id=7, ip_address='10.0.0.1') == 'ip:10.0.0.1'
+
+
+# ----------------------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestRateLimitingMiddleware:
+    @pytest.fixture(autouse=True)
+    def enable(self, settings):
+        settings.RATE_LIMIT_ENABLED = True
+        settings.RATE_LIMIT_REQUESTS_PER_MINUTE = 2
+
+    def test_headers_and_429(self):
+        client = Client()
+
+        first = client.get('/api/security/security-events/')
+        client.get('/api/security/security-events/')
+        third = client.get('/api/security/security-events/')
+
+        assert first['X-RateLimit-Limit'] == '2'
+        assert first['X-RateLimit-Remaining'] == '1'
+        assert third.status_code == 429
+        assert third['X-RateLimit-Remaining'] == '0'
+        assert int(third['Retry-After']) >= 1
+
+    def test_exempt_paths_are_not_counted(self):
+        client = Client()
+
+        responses = [client.get('/static/css/missing.css') for _ in range(3)]
+
+        assert all(r.status_code != 429 for r in responses)
+        assert 'X-RateLimit-Limit' not in responses[0]
@@ -0,0 +1,165 @@
+"""
+Tests for write-coalescing session activity tracking.
+"""
+
+from importlib import import_module
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.security.services.session_activity import (
+    SessionActivityTracker, session_activity_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    session_activity_metrics.reset()
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def make_request(db):
+    def factory():
+        request = RequestFactory().get('/')
+        request.session = import_module(settings.SESSION_ENGINE).SessionStore()
+        request.session.create()
+        return request
+    return factory
+
+
+def resume(request):
+    """Simulate the next request of the same session after it was saved."""
+    if request.session.modified:
+        request.session.save()
+    request.session = import_module(settings.SESSION_ENGINE).SessionStore(
+        request.session.session_key
+    )
+    return request
+
+
+# ----------------------------------------------------------------------
+# Session store
+# ----------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestSessionStore:
+    def test_writes_only_once_per_granularity(self, make_request):
+        tracker = SessionActivityTracker(timeout=3600, granularity=60, store='session')
+        request = make_request()
+
+        assert tracker.touch(request, now=1000.0)
+        assert request.session.modified
+
+        for offset in (10, 30, 59):
+            resume(request)
+            assert tracker.touch(request, now=1000.0 + offset)
+            assert not request.session.modified
+
+        resume(request)
+        assert tracker.touch(request, now=1061.0)
+        assert request.session.modified
+        assert session_activity_metrics.snapshot() == {
+            'checks': 5, 'writes': 2, 'skipped_writes': 3, 'expired': 0, 'skip_ratio': 0.6,
+        }
+
+    def test_idle_session_is_flushed(self, make_request):
+        tracker = SessionActivityTracker(timeout=3600, granularity=60, store='session')
+        request = make_request()
+        tracker.touch(request, now=1000.0)
+        resume(request)
+
+        assert not tracker.touch(request, now=1000.0 + 3601)
+        assert request.session.session_key is None
+        assert session_activity_metrics.snapshot()['expired'] == 1
+
+
+# ----------------------------------------------------------------------
+# Cache store
+# ----------------------------------------------------------------------
+
+@pytest.mark.django_db
+class TestCacheStore:
+    def test_session_is_never_modified(self, make_request):
+        tracker = SessionActivityTracker(timeout=3600, granularity=60, store='cache')
+        request = resume(make_request())
+
+        assert tracker.touch(request, now=1000.0)
+        assert not request.session.modified
+        assert cache.get(f'session_activity:{request.session.session_key}') == 1000.0
+
+        assert tracker.touch(request, now=1030.0)
+        assert cache.get(f'session_activity:{request.session.session_key}') == 1000.0
+        assert tracker.touch(request, now=1070.0)
+        assert cache.get(f'session_activity:{request.session.session_key}') == 1070.0
+
+    def test_timeout_uses_cached_timestamp(self, make_request):
+        tracker = SessionActivityTracker(timeout=100, granularity=10, store='cache')
+        request = make_request()
+        tracker.touch(request, now=1000.0)
+
+        assert not tracker.touch(request, now=1101.0)
+        assert request.session.session_key is None
+
+    def test_unknown_store_rejected(self):
+        with pytest.raises(ValueError):
+            SessionActivityTracker(store='database')
+
+
+# ----------------------------------------------------------------------
+# Middleware
+# ----------------------------------------------------------------------
+
+@pytest.mark.django_db
+def test_authenticated_requests_do_not_rewrite_session(superadmin):
+    client = Client()
+    client.force_login(superadmin)
+
+    with CaptureQueriesContext(connection) as ctx:
+        for _ in range(5):
+            client.get('/api/security/security-events/')
+
+    session_writes = [
+        q for q in ctx.captured_queries
+        if q['sql'].startswith('UPDATE') and 'django_session' in q['sql']
+    ]
+    # Login stamped the session moments ago, so none of these requests write it
+    assert session_writes == []
+    assert session_activity_metrics.snapshot()['skipped_writes'] == 5
+
+
+@pytest.mark.django_db
+class TestExpiredSessions:
+    @pytest.fixture
+    def expired_client(self, superadmin, settings):
+        settings.SESSION_TIMEOUT = 60
+        client = Client()
+        client.force_login(superadmin)
+        session = client.session
+        session['last_activity'] = 0
+        session.save()
+        return client
+
+    def test_page_navigation_redirects_to_login(self, expired_client):
+        response = expired_client.get('/')
+
+        assert response.status_code == 302
+        assert response.url == '/login/'
+        login_page = expired_client.get(response.url)
+        assert 'Your session has expired' in login_page.content.decode()
+
+    @pytest.mark.parametrize('path, headers', [
+        ('/api/security/security-events/', {}),
+        ('/', {'HTTP_X_REQUESTED_WITH': 'XMLHttpRequest'}),
+    ])
+    def test_api_and_xhr_requests_get_json(self, expired_client, path, headers):
+        response = expired_client.get(path, **headers)
+
+        assert response.status_code == 401
+        assert response.json()['error'] == 'Session expired'
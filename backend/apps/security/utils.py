@@ -27,6 +27,17 @@ def get_client_ip(request):
     return ip
 
 
+def get_security_counters():
+    """
+    Failed-login counters and lockout flags.
+    
+    Kept in the shared cache tier only, so every worker counts the same
+    attempts (900 seconds by default, see SecuritySettings.get_cache_config).
+    """
+    from apps.core.cache import get_tiered_cache
+    return get_tiered_cache('security_counters', timeout=900, local=False)
+
+
 class SecurityValidator:
     """
     Collection of security validation utilities.
@@ -8,10 +8,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
+from django.conf import settings
 from django.utils import timezone
 from django.db.models import Q, Count, Avg
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 from datetime import datetime, timedelta
+import logging
+
+from apps.core.services.timeseries import bucketed_counts, count_metrics
 
 from .models import (
     SecurityEvent, AuditLog, SecurityPolicy, SecurityThreshold,
@@ -29,8 +34,13 @@ from .permissions import (
     IsSecurityAdminOrReadOnly, IsSecurityAnalystOrReadOnly,
     CanViewSecurityData, CanManageSecurityIncidents
 )
+from .services.bulk_event_actions import BULK_EVENT_ACTIONS, apply_bulk_event_action
+from .services.session_activity import session_activity_metrics
+from .tasks import apply_bulk_event_action_task
 from .utils import SecurityLogger, SecurityValidator
 
+logger = logging.getLogger('it_management_platform.security')
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     """Standard pagination for security endpoints."""
@@ -143,41 +153,58 @@ class SecurityEventViewSet(viewsets.ModelViewSet):
         notes = serializer.validated_data.get('notes', '')
         assignee_id = serializer.validated_data.get('assignee_id')
         
-        events = SecurityEvent.objects.filter(id__in=event_ids)
-        
-        if action == 'RESOLVE':
-            for event in events:
-                if event.status != 'RESOLVED':
-                    event.resolve(request.user, notes)
-        
-        elif action == 'ESCALATE':
-            for event in events:
-                if event.status != 'RESOLVED':
-                    event.status = 'ESCALATED'
-                    event.save()
-        
-        elif action == 'MARK_FALSE_POSITIVE':
-            for event in events:
-                if event.status != 'RESOLVED':
-                    event.status = 'FALSE_POSITIVE'
-                    event.resolved_by = request.user
-                    event.resolution_notes = f"False positive - {notes}"
-                    event.resolved_at = timezone.now()
-                    event.save()
-        
-        elif action == 'ASSIGN' and assignee_id:
+        if action not in BULK_EVENT_ACTIONS:
+            return Response(
+                {'error': f'Bulk {action.lower()} is not supported'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        assignee = None
+        if action == 'ASSIGN':
+            if not assignee_id:
+                return Response(
+                    {'error': 'assignee_id is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
             try:
-                assignee = User.objects.get(id=assignee_id)
-                for event in events:
-                    event.resolved_by = assignee
-                    event.save()
-            except User.DoesNotExist:
+                assignee = get_user_model().objects.get(id=assignee_id)
+            except get_user_model().DoesNotExist:
                 return Response(
                     {'error': 'Assignee not found'},
                     status=status.HTTP_400_BAD_REQUEST
                 )
         
-        return Response({'message': f'Bulk {action.lower()} completed successfully'})
+        # Large selections are processed by a Celery worker
+        async_threshold = getattr(settings, 'SECURITY_BULK_ACTION_ASYNC_THRESHOLD', 1000)
+        if len(set(event_ids)) > async_threshold:
+            try:
+                task = apply_bulk_event_action_task.delay(
+                    request.user.id, event_ids, action, notes, assignee_id
+                )
+                return Response({
+                    'message': f'Bulk {action.lower()} queued',
+                    'action': action,
+                    'requested': len(set(event_ids)),
+                    'task_id': task.id,
+                }, status=status.HTTP_202_ACCEPTED)
+            except Exception as e:
+                # If celery is offline, process the selection inline
+                logger.warning(f"Bulk action task failed to enqueue, running inline - {str(e)}")
+        
+        result = apply_bulk_event_action(
+            request.user, event_ids, action, notes=notes, assignee=assignee
+        )
+        
+        SecurityLogger.log_security_event(
+            'BULK_EVENT_ACTION',
+            {**result, 'performed_by': request.user.username},
+            user=request.user
+        )
+        
+        return Response({
+            'message': f'Bulk {action.lower()} completed successfully',
+            **result,
+        })
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
@@ -187,16 +214,16 @@ class SecurityEventViewSet(viewsets.ModelViewSet):
         week_start = today_start - timedelta(days=7)
         month_start = today_start.replace(day=1)
         
-        stats = {
-            'total_events': SecurityEvent.objects.count(),
-            'events_today': SecurityEvent.objects.filter(created_at__gte=today_start).count(),
-            'events_this_week': SecurityEvent.objects.filter(created_at__gte=week_start).count(),
-            'events_this_month': SecurityEvent.objects.filter(created_at__gte=month_start).count(),
-            'high_severity_events': SecurityEvent.objects.filter(severity='HIGH').count(),
-            'critical_events': SecurityEvent.objects.filter(severity='CRITICAL').count(),
-            'open_events': SecurityEvent.objects.filter(status='OPEN').count(),
-            'resolved_events': SecurityEvent.objects.filter(status='RESOLVED').count(),
-        }
+        stats = count_metrics(SecurityEvent.objects.all(), {
+            'total_events': None,
+            'events_today': Q(created_at__gte=today_start),
+            'events_this_week': Q(created_at__gte=week_start),
+            'events_this_month': Q(created_at__gte=month_start),
+            'high_severity_events': Q(severity='HIGH'),
+            'critical_events': Q(severity='CRITICAL'),
+            'open_events': Q(status='OPEN'),
+            'resolved_events': Q(status='RESOLVED'),
+        })
         
         # Top event types
         top_event_types = SecurityEvent.objects.values('event_type').annotate(
@@ -226,16 +253,14 @@ class SecurityEventViewSet(viewsets.ModelViewSet):
             created_at__gte=last_7d
         ).order_by('-created_at')[:10]
         
-        # Event trends (last 7 days)
-        daily_counts = []
-        for i in range(7):
-            date = (now - timedelta(days=i)).date()
-            count = SecurityEvent.objects.filter(created_at__date=date).count()
-            daily_counts.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'count': count
-            })
-        daily_counts.reverse()
+        # Event trends (last 7 days), one GROUP BY query; closed days are cached
+        daily_counts = [
+            {'date': row['bucket'].strftime('%Y-%m-%d'), 'count': row['count']}
+            for row in bucketed_counts(
+                SecurityEvent.objects.all(), 'created_at', interval='day', periods=7,
+                end=now, cache_namespace='security_events',
+            )
+        ]
         
         # Severity distribution
         severity_dist = SecurityEvent.objects.filter(
@@ -246,13 +271,11 @@ class SecurityEventViewSet(viewsets.ModelViewSet):
             'recent_events': SecurityEventSerializer(recent_events, many=True).data,
             'daily_trends': daily_counts,
             'severity_distribution': list(severity_dist),
-            'summary': {
-                'total_24h': SecurityEvent.objects.filter(created_at__gte=last_24h).count(),
-                'critical_24h': SecurityEvent.objects.filter(
-                    created_at__gte=last_24h, severity='CRITICAL'
-                ).count(),
-                'open_issues': SecurityEvent.objects.filter(status__in=['OPEN', 'INVESTIGATING']).count()
-            }
+            'summary': count_metrics(SecurityEvent.objects.all(), {
+                'total_24h': Q(created_at__gte=last_24h),
+                'critical_24h': Q(created_at__gte=last_24h, severity='CRITICAL'),
+                'open_issues': Q(status__in=['OPEN', 'INVESTIGATING']),
+            })
         }
         
         return Response(data)
@@ -795,6 +818,9 @@ class SecurityHealthCheckViewSet(viewsets.ViewSet):
             'logging': self._check_logging(),
             'rate_limiting': self._check_rate_limiting(),
             'authentication': self._check_authentication(),
+            'session_activity': self._check_session_activity(),
+            'event_dispatcher': self._check_event_dispatcher(),
+            'notifications': self._check_notifications(),
         }
         
         # Determine overall status
@@ -856,6 +882,40 @@ class SecurityHealthCheckViewSet(viewsets.ViewSet):
         except Exception as e:
             return {'status': 'error', 'message': f'Rate limiting error: {str(e)}'}
     
+    def _check_session_activity(self):
+        """Report session activity write coalescing for this process."""
+        return {
+            'status': 'healthy',
+            'message': 'Session activity tracking OK',
+            'metrics': session_activity_metrics.snapshot(),
+        }
+    
+    def _check_event_dispatcher(self):
+        """Report async event handler queue state and handler metrics."""
+        from apps.core.events import EventDispatcher
+        metrics = EventDispatcher().metrics()
+        failing = [name for name, stats in metrics['handlers'].items() if stats['errors']]
+        return {
+            'status': 'warning' if failing else 'healthy',
+            'message': f'Failing handlers: {", ".join(failing)}' if failing else 'Event dispatcher OK',
+            'metrics': metrics,
+        }
+    
+    def _check_notifications(self):
+        """Report the ticket notification queue and delivery counters."""
+        from apps.tickets.services.notifications import notification_stats
+        stats = notification_stats()
+        max_delay = getattr(settings, 'NOTIFICATION_MAX_DELAY', 300)
+        backlog = stats['oldest_age_seconds'] > 2 * max_delay
+        return {
+            'status': 'warning' if backlog else 'healthy',
+            'message': (
+                f"{stats['queue_depth']} notifications waiting for {stats['oldest_age_seconds']:.0f}s"
+                if backlog else 'Notification pipeline OK'
+            ),
+            'metrics': stats,
+        }
+    
     def _check_authentication(self):
         """Check authentication system."""
         try:
@@ -7,7 +7,7 @@ from django.utils.html import format_html
 from .models import (
     TicketCategory, TicketType, Ticket, TicketComment, TicketAttachment, 
     TicketHistory, TicketTemplate, SLA, TicketEscalation, TicketSatisfaction, 
-    TicketReport
+    TicketReport, TicketNotification
 )
 
 @admin.register(TicketCategory)
@@ -148,3 +148,13 @@ class TicketReportAdmin(admin.ModelAdmin):
     list_display = ['title', 'report_type', 'generated_by', 'generated_at', 'is_scheduled']
     list_filter = ['report_type', 'is_scheduled', 'schedule_frequency', 'generated_at']
     search_fields = ['title', 'description']
+
+@admin.register(TicketNotification)
+class TicketNotificationAdmin(admin.ModelAdmin):
+    """
+    Admin interface for TicketNotification model.
+    """
+    list_display = ['recipient', 'ticket', 'event_type', 'message', 'created_at', 'sent_at']
+    list_filter = ['event_type', 'sent_at', 'created_at']
+    search_fields = ['recipient__username', 'ticket__title', 'message']
+    readonly_fields = ['created_at', 'sent_at']
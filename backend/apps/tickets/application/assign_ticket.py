@@ -13,6 +13,7 @@ from apps.tickets.domain.services.ticket_authority import (
     assert_can_assign,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -62,11 +63,13 @@ class AssignTicket:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('tickets.assign')
     def execute(
         self,
         user: Any,
         ticket_id: str,
         assignee_id: int,
+        idempotency_key: Optional[str] = None,
     ) -> AssignTicketResult:
         """
         Execute ticket assignment use case.
@@ -75,6 +78,7 @@ class AssignTicket:
             user: User performing the assignment
             ticket_id: UUID string of ticket to assign
             assignee_id: User ID of the assignee
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignTicketResult with assignment confirmation or error
@@ -162,10 +166,12 @@ class UnassignTicket:
         AssignTicketResult with unassignment confirmation or error
     """
 
+    @idempotent('tickets.unassign')
     def execute(
         self,
         user: Any,
         ticket_id: str,
+        idempotency_key: Optional[str] = None,
     ) -> AssignTicketResult:
         """
         Execute ticket unassignment use case.
@@ -173,6 +179,7 @@ class UnassignTicket:
         Args:
             user: User performing the unassignment
             ticket_id: UUID string of ticket to unassign
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignTicketResult with unassignment confirmation or error
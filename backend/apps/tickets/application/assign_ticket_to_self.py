@@ -14,6 +14,7 @@ from apps.tickets.domain.services.ticket_authority import (
     assert_can_self_assign,
 )
 from apps.core.domain.authorization import AuthorizationError
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -61,10 +62,12 @@ class AssignTicketToSelf:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('tickets.assign_to_self')
     def execute(
         self,
         user: Any,
         ticket_id: str,
+        idempotency_key: Optional[str] = None,
     ) -> AssignTicketToSelfResult:
         """
         Execute ticket self-assignment use case.
@@ -72,6 +75,7 @@ class AssignTicketToSelf:
         Args:
             user: User performing the self-assignment
             ticket_id: UUID string of ticket to self-assign
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignTicketToSelfResult with assignment confirmation or error
@@ -147,11 +151,13 @@ class ReassignTicket:
         AssignTicketToSelfResult with reassignment confirmation or error
     """
 
+    @idempotent('tickets.reassign')
     def execute(
         self,
         user: Any,
         ticket_id: str,
         new_assignee_id: int,
+        idempotency_key: Optional[str] = None,
     ) -> AssignTicketToSelfResult:
         """
         Execute ticket reassignment use case.
@@ -160,6 +166,7 @@ class ReassignTicket:
             user: User performing the reassignment
             ticket_id: UUID string of ticket to reassign
             new_assignee_id: User ID of new assignee
+            idempotency_key: Optional key to prevent duplicate execution
 
         Returns:
             AssignTicketToSelfResult with reassignment confirmation or error
@@ -9,6 +9,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 from apps.tickets.domain.services.ticket_authority import assert_can_close_ticket
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -56,6 +57,7 @@ class CloseTicket:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('tickets.close')
     def execute(
         self,
         user: Any,
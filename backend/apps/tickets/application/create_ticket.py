@@ -12,6 +12,7 @@ from django.db import transaction
 
 from apps.core.domain.authorization import AuthorizationError
 from apps.tickets.domain.services.ticket_authority import can_create_ticket
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -59,6 +60,7 @@ class CreateTicket:
             print(f"Error: {result.error}")
     """
     
+    @idempotent('tickets.create')
     @transaction.atomic
     def execute(
         self,
@@ -134,16 +136,12 @@ class CreateTicket:
         )
     
     def _log_ticket_created(self, ticket, actor):
-        """Log ticket creation activity and kick off background async tasks."""
+        """Log ticket creation activity and emit the creation event."""
         try:
             from apps.logs.services.activity_service import ActivityService
             ActivityService().log_ticket_created(ticket, actor, None)
         except Exception:
             pass  # Logging must never break the command
-            
-        try:
-            from apps.tickets.tasks import send_ticket_creation_notification
-            send_ticket_creation_notification.delay(ticket.id, actor.id)
-        except Exception as e:
-            # If celery is offline, do not break the transaction
-            print(f"Warning: Celery task failed to enqueue - {str(e)}")
+        
+        from apps.tickets.domain.events import emit_ticket_created
+        emit_ticket_created(ticket, actor)
@@ -15,6 +15,7 @@ from apps.tickets.domain.services.ticket_authority import (
     assert_can_delete,
     can_delete,
 )
+from apps.core.idempotency import idempotent
 
 
 @dataclass
@@ -63,6 +64,7 @@ class DeleteTicket:
             print(f"Error: {result.error}")
     """
 
+    @idempotent('tickets.delete')
     @transaction.atomic
     def execute(
         self,
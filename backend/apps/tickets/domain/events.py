@@ -8,7 +8,7 @@ Event handlers write ActivityLog and StatusHistory.
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 from apps.core.events import DomainEvent, EventDispatcher
 
 
@@ -18,22 +18,26 @@ from apps.core.events import DomainEvent, EventDispatcher
 
 class TicketEventType:
     """Ticket event type constants as strings."""
+    TICKET_CREATED = "ticket.created"
     TICKET_ASSIGNED = "ticket.assigned"
     TICKET_UNASSIGNED = "ticket.unassigned"
     TICKET_UPDATED = "ticket.updated"
     TICKET_RESOLVED = "ticket.resolved"
     TICKET_REOPENED = "ticket.reopened"
     TICKET_STATUS_CHANGED = "ticket.status_changed"
+    TICKETS_BULK_UPDATED = "ticket.bulk_updated"
     
     @classmethod
     def values(cls):
         return [
+            cls.TICKET_CREATED,
             cls.TICKET_ASSIGNED,
             cls.TICKET_UNASSIGNED,
             cls.TICKET_UPDATED,
             cls.TICKET_RESOLVED,
             cls.TICKET_REOPENED,
             cls.TICKET_STATUS_CHANGED,
+            cls.TICKETS_BULK_UPDATED,
         ]
 
 
@@ -52,6 +56,23 @@ class TicketEvent(DomainEvent):
         self.entity_id = self.ticket_id
 
 
+@dataclass
+class TicketCreated(TicketEvent):
+    """Event fired when a ticket is created."""
+    event_type: str = TicketEventType.TICKET_CREATED
+    priority: str = ""
+    requester_id: Optional[int] = None
+    assignee_id: Optional[int] = None
+    
+    def __post_init__(self):
+        super().__post_init__()
+        self.metadata = {
+            'priority': self.priority,
+            'requester_id': self.requester_id,
+            'assignee_id': self.assignee_id,
+        }
+
+
 @dataclass
 class TicketAssigned(TicketEvent):
     """Event fired when a ticket is assigned."""
@@ -148,6 +169,28 @@ class TicketUnassigned(TicketEvent):
         }
 
 
+@dataclass
+class TicketsBulkUpdated(TicketEvent):
+    """
+    Event fired once for a bulk operation on many tickets.
+    
+    ``changes`` holds the new values set on every ticket in ``ticket_ids``
+    (the tickets that actually changed).
+    """
+    event_type: str = TicketEventType.TICKETS_BULK_UPDATED
+    ticket_ids: List[int] = field(default_factory=list)
+    operation: str = ""
+    changes: Dict[str, Any] = field(default_factory=dict)
+    
+    def __post_init__(self):
+        self.entity_id = None
+        self.metadata = {
+            'operation': self.operation,
+            'ticket_ids': self.ticket_ids,
+            'changes': self.changes,
+        }
+
+
 # =============================================================================
 # Event Handlers
 # =============================================================================
@@ -234,16 +277,13 @@ class TicketEventHandlers:
     
     @staticmethod
     def handle_ticket_status_changed(event: TicketStatusChanged) -> None:
-        """Handle ticket status change event."""
-        from apps.tickets.models import TicketStatusHistory
+        """
+        Handle ticket status change event.
         
-        # Write StatusHistory (immutable record)
-        TicketStatusHistory.objects.create(
-            ticket_id=event.ticket_id,
-            from_status=event.from_status,
-            to_status=event.to_status,
-            changed_by=event.actor,
-        )
+        The StatusHistory row is written by the Ticket post_save signal for
+        every status change (apps.tickets.signals.record_ticket_transition),
+        so nothing is recorded here.
+        """
     
     @staticmethod
     def handle_ticket_unassigned(event: TicketUnassigned) -> None:
@@ -282,12 +322,30 @@ def setup_ticket_event_handlers() -> None:
     dispatcher.register(TicketEventType.TICKET_RESOLVED, TicketEventHandlers.handle_ticket_resolved)
     dispatcher.register(TicketEventType.TICKET_REOPENED, TicketEventHandlers.handle_ticket_reopened)
     dispatcher.register(TicketEventType.TICKET_STATUS_CHANGED, TicketEventHandlers.handle_ticket_status_changed)
+    
+    # Queue notifications for the digest emails
+    from apps.tickets.services.notifications import queue_ticket_event_notifications
+    for event_type in TicketEventType.values():
+        dispatcher.register(event_type, queue_ticket_event_notifications)
 
 
 # =============================================================================
 # Convenience Functions for Emitting Events
 # =============================================================================
 
+def emit_ticket_created(ticket: Any, actor: Any) -> None:
+    """Emit a ticket created event."""
+    event = TicketCreated(
+        ticket_id=ticket.id,
+        ticket_title=ticket.title,
+        actor=actor,
+        priority=ticket.priority,
+        requester_id=ticket.requester_id,
+        assignee_id=ticket.assigned_to_id,
+    )
+    EventDispatcher().dispatch(event)
+
+
 def emit_ticket_assigned(
     ticket_id: int,
     ticket_title: str,
@@ -400,3 +458,19 @@ def emit_ticket_unassigned(
         unassigned_username=unassigned_username,
     )
     EventDispatcher().dispatch(event)
+
+
+def emit_tickets_bulk_updated(
+    ticket_ids: List[int],
+    actor: Any,
+    operation: str,
+    changes: Dict[str, Any]
+) -> None:
+    """Emit one event for a bulk operation on many tickets."""
+    event = TicketsBulkUpdated(
+        actor=actor,
+        ticket_ids=list(ticket_ids),
+        operation=operation,
+        changes=changes,
+    )
+    EventDispatcher().dispatch(event)
@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+
+from apps.tickets.models import Ticket
+from apps.tickets.services.sla import ACTIVE_STATUSES, recalculate_sla
+from apps.tickets.services.ticket_statistics import SCOPE_ALL, reconcile
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored SLA deadlines and breach flags, e.g. after changing SLA policies'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--active-only', action='store_true',
+            help='Only recompute tickets that are not resolved or closed',
+        )
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        queryset = Ticket.objects.all()
+        if options['active_only']:
+            queryset = queryset.filter(status__in=ACTIVE_STATUSES)
+        updated = recalculate_sla(queryset, batch_size=options['batch_size'])
+        # bulk_update bypasses the signals keeping the statistics snapshot current
+        reconcile(SCOPE_ALL)
+        self.stdout.write(self.style.SUCCESS(f'Recalculated SLA for {updated} tickets'))
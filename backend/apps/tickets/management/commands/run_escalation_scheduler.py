@@ -0,0 +1,33 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.tickets.services.escalation import escalate_due_tickets, next_escalation_at
+
+
+class Command(BaseCommand):
+    help = 'Escalate tickets as their SLA thresholds pass, sleeping until the next one is due'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run a single pass and exit')
+        parser.add_argument(
+            '--max-sleep', type=float,
+            default=getattr(settings, 'TICKET_ESCALATION_MAX_SLEEP', 60),
+            help='Longest wait between passes, so new tickets with earlier deadlines are picked up',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            escalations = escalate_due_tickets()
+            if escalations:
+                self.stdout.write(f'Created {len(escalations)} escalations')
+            if options['once']:
+                return
+
+            wake_at = next_escalation_at()
+            delay = options['max_sleep']
+            if wake_at is not None:
+                delay = min(delay, (wake_at - timezone.now()).total_seconds())
+            time.sleep(max(delay, 0.1))
@@ -0,0 +1,43 @@
+# Generated by Django 4.2.11 on 2026-10-18 21:51
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0009_ticket_contact_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketStatisticsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=32, unique=True)),
+                ('total_tickets', models.IntegerField(default=0)),
+                ('new_tickets', models.IntegerField(default=0)),
+                ('open_tickets', models.IntegerField(default=0)),
+                ('in_progress_tickets', models.IntegerField(default=0)),
+                ('pending_tickets', models.IntegerField(default=0)),
+                ('resolved_tickets', models.IntegerField(default=0)),
+                ('closed_tickets', models.IntegerField(default=0)),
+                ('cancelled_tickets', models.IntegerField(default=0)),
+                ('resolved_with_sla', models.IntegerField(default=0)),
+                ('compliant_resolved', models.IntegerField(default=0)),
+                ('resolution_count', models.IntegerField(default=0)),
+                ('resolution_seconds', models.FloatField(default=0)),
+                ('tickets_by_priority', models.JSONField(blank=True, default=dict)),
+                ('tickets_by_category', models.JSONField(blank=True, default=dict)),
+                ('periodic', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('reconciled_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Ticket Statistics Snapshot',
+                'verbose_name_plural': 'Ticket Statistics Snapshots',
+                'db_table': 'ticket_statistics_snapshots',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.11 on 2026-10-18 22:20
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tickets', '0012_ticket_sla_escalation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(max_length=50)),
+                ('message', models.CharField(max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ticket_notifications', to=settings.AUTH_USER_MODEL)),
+                ('ticket', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='tickets.ticket')),
+            ],
+            options={
+                'verbose_name': 'Ticket Notification',
+                'verbose_name_plural': 'Ticket Notifications',
+                'db_table': 'ticket_notifications',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['sent_at', 'recipient', 'created_at'], name='ticket_noti_sent_at_b76e34_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.11 on 2026-10-19 00:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0013_ticket_notifications'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticketnotification',
+            name='attempts',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='ticketnotification',
+            name='failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.11 on 2026-10-19 00:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0014_notification_dead_letter'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TicketStatisticsDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(db_index=True, max_length=32)),
+                ('delta', models.JSONField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Ticket Statistics Delta',
+                'verbose_name_plural': 'Ticket Statistics Deltas',
+                'db_table': 'ticket_statistics_deltas',
+            },
+        ),
+    ]
@@ -3,6 +3,7 @@ Ticket models for IT Management Platform.
 IT support ticket management with comprehensive tracking and SLA management.
 """
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth import get_user_model
@@ -141,8 +142,12 @@ class Ticket(models.Model):
     
     # SLA tracking
     sla_due_at = models.DateTimeField(null=True, blank=True)
+    sla_warning_at = models.DateTimeField(null=True, blank=True)  # half of the SLA window elapsed
+    sla_critical_at = models.DateTimeField(null=True, blank=True)  # three quarters elapsed
     sla_breached = models.BooleanField(default=False)
     sla_breach_notified = models.BooleanField(default=False)
+    sla_escalation_level = models.PositiveSmallIntegerField(default=0)  # automatic escalations so far
+    sla_escalation_at = models.DateTimeField(null=True, blank=True)  # next automatic escalation
     
     # Resolution
     resolution_summary = models.TextField(blank=True)
@@ -188,18 +193,36 @@ class Ticket(models.Model):
             models.Index(fields=['requester']),
             models.Index(fields=['category', 'ticket_type']),
             models.Index(fields=['sla_due_at']),
+            models.Index(fields=['sla_warning_at']),
+            models.Index(fields=['sla_escalation_at']),
             models.Index(fields=['created_at']),
         ]
     
+    # Fields the statistics snapshot needs the previous values of on save
+    STATISTICS_FIELDS = (
+        'status', 'priority', 'category_id', 'sla_due_at', 'resolved_at', 'resolution_time',
+    )
+    # Fields whose change recomputes the SLA deadline
+    SLA_FIELDS = ('priority', 'category_id', 'ticket_type_id')
+    TRACKED_FIELDS = tuple(dict.fromkeys(STATISTICS_FIELDS + SLA_FIELDS))
+    
     def __str__(self):
         return f"#{self.ticket_id} - {self.title}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: instance.__dict__[field]
+            for field in cls.TRACKED_FIELDS if field in instance.__dict__
+        }
+        return instance
+    
     @property
     def is_overdue(self):
         """Check if ticket is overdue based on SLA."""
-        if not self.sla_due_at:
-            return False
-        return timezone.now() > self.sla_due_at and self.status not in ['RESOLVED', 'CLOSED', 'CANCELLED']
+        from apps.tickets.services.sla import is_breached
+        return is_breached(self)
     
     @property
     def hours_since_creation(self):
@@ -221,22 +244,10 @@ class Ticket(models.Model):
         return (self.resolved_at - self.created_at).total_seconds() / 3600
     
     def update_sla_due(self):
-        """Update SLA due date based on ticket type and priority."""
-        if self.ticket_type and self.ticket_type.sla_hours:
-            # Calculate SLA multiplier based on priority
-            priority_multipliers = {
-                'LOW': 4,      # 4x the base SLA
-                'MEDIUM': 2,   # 2x the base SLA
-                'HIGH': 1,     # 1x the base SLA
-                'CRITICAL': 0.5,  # 0.5x the base SLA
-                'URGENT': 0.25,   # 0.25x the base SLA
-            }
-            
-            multiplier = priority_multipliers.get(self.priority, 1)
-            sla_hours = self.ticket_type.sla_hours * multiplier
-            
-            self.sla_due_at = self.created_at + timezone.timedelta(hours=sla_hours)
-            self.save()
+        """Recompute and save the SLA deadline from the current SLA policy."""
+        from apps.tickets.services.sla import SLA_COLUMNS, recalculate
+        recalculate(self)
+        self.save(update_fields=[*SLA_COLUMNS, 'updated_at'])
     
     def mark_resolved(self, resolution_summary=None, resolved_by=None):
         """Mark ticket as resolved."""
@@ -580,7 +591,10 @@ class TicketEscalation(models.Model):
     ]
     
     ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name='escalations')
-    escalated_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ticket_escalations')
+    # Empty for escalations created by the SLA escalation scheduler
+    escalated_by = models.ForeignKey(
+        User, on_delete=models.CASCADE, null=True, blank=True, related_name='ticket_escalations'
+    )
     escalated_to = models.ForeignKey(User, on_delete=models.CASCADE, related_name='escalated_tickets')
     escalation_level = models.CharField(max_length=20, choices=LEVEL_CHOICES)
     reason = models.TextField()
@@ -657,3 +671,100 @@ class TicketReport(models.Model):
     
     def __str__(self):
         return self.title
+
+
+class TicketStatisticsSnapshot(models.Model):
+    """
+    Materialized ticket statistics, one row per visibility scope.
+    
+    Status counts, priority/category breakdowns and the SLA and resolution
+    aggregates are kept current by the TicketStatisticsDelta rows every
+    ticket save appends (see apps.tickets.services.ticket_statistics). The
+    time-dependent sections in ``periodic`` (overdue count, upcoming
+    breaches, recent activity, trend) and a full recount are refreshed by
+    ``reconcile``, which also folds the pending deltas in.
+    """
+    scope = models.CharField(max_length=32, unique=True)
+    
+    # Ticket counts per status
+    total_tickets = models.IntegerField(default=0)
+    new_tickets = models.IntegerField(default=0)
+    open_tickets = models.IntegerField(default=0)
+    in_progress_tickets = models.IntegerField(default=0)
+    pending_tickets = models.IntegerField(default=0)
+    resolved_tickets = models.IntegerField(default=0)
+    closed_tickets = models.IntegerField(default=0)
+    cancelled_tickets = models.IntegerField(default=0)
+    
+    # SLA compliance and resolution time of resolved/closed tickets
+    resolved_with_sla = models.IntegerField(default=0)
+    compliant_resolved = models.IntegerField(default=0)
+    resolution_count = models.IntegerField(default=0)
+    resolution_seconds = models.FloatField(default=0)
+    
+    tickets_by_priority = models.JSONField(default=dict, blank=True)
+    tickets_by_category = models.JSONField(default=dict, blank=True)
+    periodic = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    
+    reconciled_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'ticket_statistics_snapshots'
+        verbose_name = 'Ticket Statistics Snapshot'
+        verbose_name_plural = 'Ticket Statistics Snapshots'
+    
+    def __str__(self):
+        return f"Ticket statistics ({self.scope})"
+
+
+class TicketStatisticsDelta(models.Model):
+    """
+    A change to a TicketStatisticsSnapshot not yet folded into it.
+    
+    Ticket writes append one row instead of updating the snapshot row, so
+    concurrent writers never wait on each other. ``delta`` maps counter
+    fields to their change, plus ``priority`` and ``category`` label maps.
+    """
+    scope = models.CharField(max_length=32, db_index=True)
+    delta = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'ticket_statistics_deltas'
+        verbose_name = 'Ticket Statistics Delta'
+        verbose_name_plural = 'Ticket Statistics Deltas'
+    
+    def __str__(self):
+        return f"Ticket statistics delta ({self.scope}) #{self.pk}"
+
+
+class TicketNotification(models.Model):
+    """
+    Pending and sent notifications about ticket events, one row per recipient.
+    
+    Rows are queued by the ticket event handlers and collapsed into one
+    digest email per recipient by apps.tickets.services.notifications.
+    """
+    recipient = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ticket_notifications')
+    ticket = models.ForeignKey(
+        Ticket, on_delete=models.CASCADE, null=True, blank=True, related_name='notifications'
+    )
+    event_type = models.CharField(max_length=50)
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)  # failed deliveries so far
+    failed_at = models.DateTimeField(null=True, blank=True)  # dead-lettered, no longer sent
+    
+    class Meta:
+        db_table = 'ticket_notifications'
+        verbose_name = 'Ticket Notification'
+        verbose_name_plural = 'Ticket Notifications'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['sent_at', 'recipient', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} for {self.recipient_id}: {self.message}"
@@ -4,6 +4,7 @@ Handles serialization and validation for ticket operations.
 """
 
 from rest_framework import serializers
+from django.conf import settings
 from django.utils import timezone
 from datetime import datetime, timedelta
 
@@ -146,11 +147,9 @@ class TicketCreateSerializer(serializers.ModelSerializer):
         validated_data['requester'] = self.context['request'].user
         validated_data['created_by'] = self.context['request'].user
         
+        # The SLA deadline is set by the SLA engine on save
         ticket = Ticket.objects.create(**validated_data)
         
-        # Set SLA due date
-        ticket.update_sla_due()
-        
         # Add related tickets
         for ticket_id in related_ticket_ids:
             try:
@@ -159,6 +158,9 @@ class TicketCreateSerializer(serializers.ModelSerializer):
             except Ticket.DoesNotExist:
                 continue
         
+        from apps.tickets.domain.events import emit_ticket_created
+        emit_ticket_created(ticket, self.context['request'].user)
+        
         return ticket
 
 class TicketUpdateSerializer(serializers.ModelSerializer):
@@ -375,6 +377,33 @@ class TicketActionSerializer(serializers.Serializer):
     escalation_reason = serializers.CharField(required=False)
     comment = serializers.CharField(required=False)
 
+class BulkTicketOperationSerializer(serializers.Serializer):
+    """
+    Serializer for bulk operations on many tickets.
+    """
+    REQUIRED_FIELDS = {'assign': 'assignee_id', 'status': 'status', 'priority': 'priority'}
+
+    ticket_ids = serializers.ListField(child=serializers.IntegerField(), min_length=1)
+    operation = serializers.ChoiceField(choices=['assign', 'status', 'priority', 'close'])
+    assignee_id = serializers.IntegerField(required=False)
+    status = serializers.ChoiceField(choices=Ticket.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Ticket.PRIORITY_CHOICES, required=False)
+
+    def validate_ticket_ids(self, value):
+        limit = getattr(settings, 'TICKET_BULK_MAX_IDS', 5000)
+        if len(set(value)) > limit:
+            raise serializers.ValidationError(f"At most {limit} tickets can be updated at once")
+        return value
+
+    def validate(self, attrs):
+        operation = attrs['operation']
+        required = self.REQUIRED_FIELDS.get(operation)
+        if required and attrs.get(required) is None:
+            raise serializers.ValidationError({required: f"This field is required for {operation}."})
+        if operation == 'assign' and not User.objects.filter(id=attrs['assignee_id'], is_active=True).exists():
+            raise serializers.ValidationError({'assignee_id': "Assignee not found or inactive."})
+        return attrs
+
 class TicketTemplateUseSerializer(serializers.Serializer):
     """
     Serializer for using ticket templates.
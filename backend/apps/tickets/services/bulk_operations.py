@@ -0,0 +1,268 @@
+"""
+Set-based bulk operations on tickets.
+
+``TicketViewSet.bulk`` assigns, changes the status or priority of, or
+closes many tickets at once. Instead of saving each ticket (and running
+its post_save receivers one by one), the selection is processed in
+chunks inside one transaction:
+
+- Tickets are locked and loaded once per chunk, and permissions are
+  evaluated for the whole chunk with the permission engine
+  (``bulk_permissions``). Tickets the actor may not change are reported
+  as denied, tickets already in the requested state as unchanged.
+- The values shared by every changed ticket are written with one
+  ``UPDATE ... WHERE id IN (...)``; per-ticket columns (SLA deadline and
+  breach state, resolution time) with one ``bulk_update``.
+- What the Ticket signals would have recorded per save is written in
+  bulk: TicketStatusHistory and TicketHistory rows, ActivityLog timeline
+  entries, one statistics snapshot update and the search index refresh.
+- One ``TicketsBulkUpdated`` domain event is dispatched on commit; its
+  notification handler queues every recipient with a single insert.
+
+Selections larger than ``TICKET_BULK_ASYNC_THRESHOLD`` are processed by
+the ``bulk_update_tickets`` Celery task.
+
+Usage:
+    from apps.tickets.services.bulk_operations import bulk_update_tickets
+
+    result = bulk_update_tickets(request.user, [1, 2, 3], 'priority', priority='HIGH')
+    # {'operation': 'priority', 'requested': 3, 'updated': 2, 'unchanged': 0,
+    #  'denied': [3], 'not_found': []}
+"""
+
+from typing import Dict, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.services.permission_engine import bulk_permissions
+from apps.logs.models import ActivityLog
+from apps.search.indexer import schedule_refresh
+from apps.tickets.domain.events import emit_tickets_bulk_updated
+from apps.tickets.models import Ticket, TicketHistory, TicketStatusHistory
+from apps.tickets.services.sla import SLA_COLUMNS, SLAPolicies, apply_sla
+from apps.tickets.services.ticket_statistics import apply_ticket_changes, ticket_state
+
+User = get_user_model()
+
+# Maximum tickets locked and updated per chunk
+BULK_CHUNK_SIZE = 500
+
+# Operation -> permission flag required on each ticket
+BULK_TICKET_OPERATIONS = {
+    'assign': 'can_assign',
+    'status': 'can_edit',
+    'priority': 'can_edit',
+    'close': 'can_close',
+}
+
+# Columns that may differ between the changed tickets, besides the SLA columns
+PER_TICKET_FIELDS = {
+    'assign': ('status',),
+    'status': ('resolved_at', 'resolution_time', 'closed_at'),
+    'priority': (),
+    'close': ('closed_at',),
+}
+
+STATUS_LABELS = dict(Ticket.STATUS_CHOICES)
+PRIORITY_LABELS = dict(Ticket.PRIORITY_CHOICES)
+
+# Timeline entries per changed field: (ActivityLog event type, field label, title)
+ACTIVITY_EVENTS = {
+    'status': ('TICKET_STATUS_CHANGED', 'Status', 'Ticket status changed to {}'),
+    'assigned_to': ('TICKET_ASSIGNED', 'Assigned To', 'Ticket assigned to {}'),
+    'priority': ('TICKET_PRIORITY_CHANGED', 'Priority', 'Ticket priority changed to {}'),
+}
+
+
+def _chunks(items, size=BULK_CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _target_values(operation, assignee, status, priority) -> Dict[str, object]:
+    """Values every ticket of the operation ends up with."""
+    if operation == 'assign':
+        return {'assigned_to_id': assignee.id, 'assignment_status': 'ASSIGNED'}
+    if operation == 'status':
+        return {'status': status}
+    if operation == 'priority':
+        return {'priority': priority}
+    if operation == 'close':
+        return {'status': 'CLOSED'}
+    raise ValueError(f"Unsupported bulk operation: {operation}")
+
+
+def _apply(ticket, operation, values, now) -> Dict[str, tuple]:
+    """
+    Apply the operation to a loaded ticket; returns ``{field: (old, new)}``
+    of the history-worthy fields it changed.
+    """
+    changes = {}
+    if operation == 'assign':
+        if ticket.assigned_to_id != values['assigned_to_id']:
+            changes['assigned_to'] = (ticket.assigned_to_id, values['assigned_to_id'])
+        ticket.assigned_to_id = values['assigned_to_id']
+        ticket.assignment_status = values['assignment_status']
+        # Assigning a new ticket opens it (AssignTicket)
+        if changes and ticket.status == 'NEW':
+            changes['status'] = ('NEW', 'OPEN')
+            ticket.status = 'OPEN'
+    elif operation == 'priority':
+        if ticket.priority != values['priority']:
+            changes['priority'] = (ticket.priority, values['priority'])
+            ticket.priority = values['priority']
+    elif ticket.status != values['status']:
+        changes['status'] = (ticket.status, values['status'])
+        ticket.status = values['status']
+        if ticket.status == 'RESOLVED' and ticket.resolved_at is None:
+            ticket.resolved_at = now
+            ticket.resolution_time = now - ticket.created_at
+        elif ticket.status == 'CLOSED':
+            ticket.closed_at = now
+    return changes
+
+
+def _history_rows(ticket, changes, actor, usernames) -> List[TicketHistory]:
+    rows = []
+    for field_name, (old, new) in changes.items():
+        if field_name == 'assigned_to':
+            old, new = usernames.get(old), usernames.get(new)
+        rows.append(TicketHistory(
+            ticket=ticket, user=actor, field_name=field_name, old_value=old or '', new_value=new or '',
+        ))
+    return rows
+
+
+def _activity_rows(ticket, changes, actor, operation, usernames) -> List[ActivityLog]:
+    rows = []
+    for field_name, (old, new) in changes.items():
+        event_type, label, title = ACTIVITY_EVENTS[field_name]
+        if field_name == 'assigned_to':
+            old_display, new_display = usernames.get(old) or '-', usernames.get(new) or '-'
+        elif field_name == 'status':
+            old_display, new_display = STATUS_LABELS[old], STATUS_LABELS[new]
+        else:
+            old_display, new_display = PRIORITY_LABELS[old], PRIORITY_LABELS[new]
+        rows.append(ActivityLog(
+            event_type=event_type,
+            action='UPDATE',
+            level='INFO',
+            severity='INFO',
+            intent='workflow',
+            entity_type='ticket',
+            entity_id=ticket.id,
+            user=actor,
+            actor_type='user',
+            actor_id=str(actor.id),
+            actor_name=actor.username,
+            actor_role=actor.role,
+            title=title.format(new_display),
+            description=f'Bulk {operation}: changed {label.lower()} from {old_display} to {new_display}',
+            model_name='Ticket',
+            object_id=ticket.id,
+            object_repr=str(ticket.title)[:255],
+            extra_data={
+                'bulk_operation': operation,
+                'field_name': field_name,
+                'field_display': label,
+                'old_value': old,
+                'new_value': new,
+                'old_display': old_display,
+                'new_display': new_display,
+                'ticket_id': str(ticket.ticket_id),
+            },
+        ))
+    return rows
+
+
+def bulk_update_tickets(actor, ticket_ids, operation: str, assignee=None,
+                        status: Optional[str] = None, priority: Optional[str] = None) -> Dict[str, object]:
+    """
+    Apply one operation to many tickets with set-based writes.
+
+    Args:
+        actor: User performing the operation (permissions are checked per ticket)
+        ticket_ids: Iterable of Ticket ids
+        operation: One of BULK_TICKET_OPERATIONS
+        assignee: User to assign the tickets to ('assign')
+        status: New status ('status')
+        priority: New priority ('priority')
+
+    Returns:
+        Dict with the operation, requested/updated/unchanged counts and the
+        ids of denied and missing tickets
+    """
+    flag = BULK_TICKET_OPERATIONS.get(operation)
+    if flag is None:
+        raise ValueError(f"Unsupported bulk operation: {operation}")
+    values = _target_values(operation, assignee, status, priority)
+    now = timezone.now()
+    ticket_ids = sorted(set(ticket_ids))
+
+    changed_ids, denied, found, transitions = [], [], set(), []
+    unchanged = 0
+    with transaction.atomic():
+        for chunk in _chunks(ticket_ids):
+            tickets = list(Ticket.objects.select_for_update().filter(id__in=chunk).order_by('id'))
+            found.update(ticket.id for ticket in tickets)
+            permissions = bulk_permissions(actor, tickets, 'ticket')
+            policies = usernames = None
+            if operation == 'priority':
+                policies = SLAPolicies.load(ticket.ticket_type_id for ticket in tickets)
+            if operation == 'assign':
+                usernames = dict(User.objects.filter(
+                    pk__in={ticket.assigned_to_id for ticket in tickets} | {assignee.id}
+                ).values_list('id', 'username'))
+
+            changed, reindex, status_rows, history_rows, activity_rows = [], [], [], [], []
+            for ticket in tickets:
+                if not permissions[ticket.id].get(flag):
+                    denied.append(ticket.id)
+                    continue
+                previous = ticket_state(ticket)
+                changes = _apply(ticket, operation, values, now)
+                if not changes:
+                    unchanged += 1
+                    continue
+                apply_sla(ticket, policies)
+                changed.append(ticket)
+                transitions.append((previous, ticket_state(ticket)))
+                if 'status' in changes:
+                    status_rows.append(TicketStatusHistory(
+                        ticket=ticket, from_status=changes['status'][0],
+                        to_status=changes['status'][1], changed_by=actor,
+                    ))
+                history_rows.extend(_history_rows(ticket, changes, actor, usernames))
+                activity_rows.extend(_activity_rows(ticket, changes, actor, operation, usernames))
+                if 'status' in changes or 'priority' in changes:
+                    # Both are part of the ticket's search document
+                    reindex.append(ticket)
+
+            if not changed:
+                continue
+            ids = [ticket.id for ticket in changed]
+            # QuerySet.update() bypasses auto_now and the Ticket signals
+            Ticket.objects.filter(id__in=ids).update(**values, updated_by=actor, updated_at=now)
+            Ticket.objects.bulk_update(changed, [*SLA_COLUMNS, *PER_TICKET_FIELDS[operation]])
+
+            TicketStatusHistory.objects.bulk_create(status_rows)
+            TicketHistory.objects.bulk_create(history_rows)
+            ActivityLog.objects.bulk_create(activity_rows)
+            for ticket in reindex:
+                schedule_refresh('ticket', ticket.id, instance=ticket)
+            changed_ids.extend(ids)
+
+        apply_ticket_changes(transitions)
+        if changed_ids:
+            emit_tickets_bulk_updated(changed_ids, actor, operation, values)
+
+    return {
+        'operation': operation,
+        'requested': len(ticket_ids),
+        'updated': len(changed_ids),
+        'unchanged': unchanged,
+        'denied': denied,
+        'not_found': [pk for pk in ticket_ids if pk not in found],
+    }
@@ -0,0 +1,169 @@
+"""
+SLA escalation scheduler for IT Management Platform.
+
+Every active ticket carries the time of its next automatic escalation in
+the indexed ``sla_escalation_at`` column (kept by the SLA engine), which
+turns the tickets table into a time-ordered queue: the scheduler reads
+only the tickets whose escalation is due, oldest first, and never scans
+open tickets.
+
+- A due ticket is escalated to the highest ``ESCALATION_STAGES`` level it
+  has reached (``L2`` once three quarters of the SLA window elapsed,
+  ``MANAGEMENT`` on breach). Stages missed while the scheduler was down
+  are not escalated one by one.
+- Each batch locks its tickets (``FOR UPDATE SKIP LOCKED``), so the beat
+  task and the scheduler command never escalate a ticket twice when they
+  overlap. It bulk-creates its TicketEscalation rows, bulk-updates the
+  tickets' next escalation and queues the assignees' notifications for
+  the digest emails (apps.tickets.services.notifications).
+- Escalations are assigned round-robin to active users of the role
+  configured per level in ``TICKET_ESCALATION_ROLES``, falling back to
+  superadmins. Automatic escalations have no ``escalated_by``.
+
+Celery beat runs ``escalate_due_tickets`` every ``TICKET_ESCALATION_INTERVAL``
+seconds; ``manage.py run_escalation_scheduler`` instead sleeps until the
+next escalation is due.
+"""
+
+import logging
+from itertools import cycle
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from apps.tickets.models import Ticket, TicketEscalation
+from apps.tickets.services.notifications import queue_notifications
+from apps.tickets.services.sla import ACTIVE_STATUSES, ESCALATION_STAGES, schedule_escalation
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+DEFAULT_ESCALATION_ROLES = {
+    'L2': 'IT_ADMIN',
+    'MANAGEMENT': 'MANAGER',
+}
+
+ESCALATION_REASONS = {
+    'L2': 'SLA at risk: {percent}% of the resolution window elapsed (due {due:%Y-%m-%d %H:%M})',
+    'MANAGEMENT': 'SLA breached: resolution was due {due:%Y-%m-%d %H:%M}',
+}
+
+
+class EscalationRecipients:
+    """
+    Round-robin assignees per escalation level, loaded in one query.
+    """
+
+    def __init__(self, users_by_role: Dict[str, List[int]]):
+        roles = getattr(settings, 'TICKET_ESCALATION_ROLES', DEFAULT_ESCALATION_ROLES)
+        fallback = users_by_role.get('SUPERADMIN', [])
+        self._cycles = {}
+        for _, level in ESCALATION_STAGES:
+            user_ids = users_by_role.get(roles.get(level), []) or fallback
+            self._cycles[level] = cycle(user_ids) if user_ids else None
+
+    @classmethod
+    def load(cls) -> 'EscalationRecipients':
+        roles = set(getattr(settings, 'TICKET_ESCALATION_ROLES', DEFAULT_ESCALATION_ROLES).values())
+        users_by_role: Dict[str, List[int]] = {}
+        users = User.objects.filter(is_active=True, role__in=roles | {'SUPERADMIN'}).order_by('pk')
+        for pk, role in users.values_list('pk', 'role'):
+            users_by_role.setdefault(role, []).append(pk)
+        return cls(users_by_role)
+
+    def next(self, level: str) -> Optional[int]:
+        users = self._cycles.get(level)
+        return next(users) if users is not None else None
+
+
+def _reached_stage(ticket, now) -> int:
+    """Index of the highest escalation stage whose threshold has passed."""
+    reached = ticket.sla_escalation_level
+    while reached < len(ESCALATION_STAGES):
+        threshold = getattr(ticket, ESCALATION_STAGES[reached][0])
+        if threshold is None or threshold > now:
+            break
+        reached += 1
+    return reached - 1
+
+
+def _reason(ticket, level, now) -> str:
+    window = (ticket.sla_due_at - ticket.created_at).total_seconds()
+    elapsed = (now - ticket.created_at).total_seconds()
+    percent = min(100, round(elapsed / window * 100)) if window > 0 else 100
+    return ESCALATION_REASONS[level].format(percent=percent, due=ticket.sla_due_at)
+
+
+def _escalate_batch(tickets, now, recipients) -> List[TicketEscalation]:
+    already_escalated = set(
+        TicketEscalation.objects.filter(
+            ticket_id__in=[ticket.pk for ticket in tickets], escalated_by__isnull=True
+        ).values_list('ticket_id', 'escalation_level')
+    )
+    escalations = []
+    for ticket in tickets:
+        stage = _reached_stage(ticket, now)
+        # Tickets resolved through bulk updates still have a schedule to drop
+        if ticket.status in ACTIVE_STATUSES and stage >= ticket.sla_escalation_level:
+            level = ESCALATION_STAGES[stage][1]
+            recipient_id = recipients.next(level)
+            if recipient_id is None:
+                logger.warning(f'No {level} escalation recipient for ticket {ticket.ticket_id}')
+            elif (ticket.pk, level) not in already_escalated:
+                escalations.append(TicketEscalation(
+                    ticket=ticket,
+                    escalated_to_id=recipient_id,
+                    escalation_level=level,
+                    reason=_reason(ticket, level, now),
+                ))
+                ticket.sla_breach_notified = ticket.sla_breach_notified or level == 'MANAGEMENT'
+            ticket.sla_escalation_level = stage + 1
+        schedule_escalation(ticket)
+
+    Ticket.objects.bulk_update(tickets, ['sla_escalation_level', 'sla_escalation_at', 'sla_breach_notified'])
+    escalations = TicketEscalation.objects.bulk_create(escalations)
+    queue_notifications(
+        (e.escalated_to_id, e.ticket_id, 'ticket.escalated', f'Escalated to you ({e.escalation_level}): {e.reason}')
+        for e in escalations
+    )
+    return escalations
+
+
+def escalate_due_tickets(now=None, batch_size: int = None) -> List[TicketEscalation]:
+    """
+    Escalate every ticket whose next escalation is due; returns the new escalations.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'TICKET_ESCALATION_BATCH_SIZE', 200)
+    # Rows locked by a concurrent run (beat and run_escalation_scheduler)
+    # are skipped, so a ticket is escalated by one run only
+    due = Ticket.objects.select_for_update(skip_locked=True).filter(
+        sla_escalation_at__lte=now
+    ).order_by('sla_escalation_at').only(
+        'pk', 'ticket_id', 'status', 'created_at', 'sla_escalation_level',
+        'sla_escalation_at', 'sla_due_at', 'sla_critical_at', 'sla_breach_notified',
+    )
+    recipients = None
+    created = []
+    while True:
+        with transaction.atomic():
+            tickets = list(due[:batch_size])
+            if not tickets:
+                break
+            recipients = recipients or EscalationRecipients.load()
+            escalations = _escalate_batch(tickets, now, recipients)
+        created.extend(escalations)
+    if created:
+        logger.warning(f'Escalated {len(created)} tickets approaching or past their SLA')
+    return created
+
+
+def next_escalation_at():
+    """Time of the earliest scheduled escalation, or None."""
+    return Ticket.objects.filter(sla_escalation_at__isnull=False).order_by(
+        'sla_escalation_at'
+    ).values_list('sla_escalation_at', flat=True).first()
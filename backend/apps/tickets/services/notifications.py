@@ -0,0 +1,296 @@
+"""
+Batched ticket notifications for IT Management Platform.
+
+Ticket domain events do not send email. Their handlers queue one
+TicketNotification row per recipient (a single INSERT per event), and a
+Celery beat task (``flush_ticket_notifications``) collapses each
+recipient's queued rows into one digest email. A bulk import or an
+incident storm therefore costs each recipient one email per flush instead
+of one Celery task and one SMTP session per ticket.
+
+- Debouncing: a recipient's digest goes out once their queue has been
+  quiet for ``NOTIFICATION_DEBOUNCE`` seconds, or when its oldest entry
+  has waited ``NOTIFICATION_MAX_DELAY`` seconds during a continuous storm.
+- Every flush sends the ready digests one by one through the transport
+  (apps.core.mail), which reuses pooled SMTP connections. Each recipient's
+  rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED`` while their
+  digest is sent, so overlapping flushes never email the same rows twice.
+  A digest's rows are marked sent as soon as it is accepted, so a refused address never
+  causes other recipients' digests to be sent twice. A failed digest
+  stays queued for the next flush; after ``NOTIFICATION_MAX_ATTEMPTS``
+  failures its rows are dead-lettered (``failed_at``) and no longer sent.
+- Users are not notified of their own actions.
+- ``notification_stats`` reports queue depth, the age of the oldest
+  queued row and this process's throughput counters.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.utils import timezone
+
+from apps.core.mail import get_notification_transport
+from apps.tickets.models import Ticket, TicketNotification
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationMetrics:
+    """Process-wide throughput counters of the notification pipeline."""
+
+    FIELDS = (
+        'queued', 'flushes', 'digests_sent', 'notifications_sent', 'skipped', 'send_failures',
+        'dead_lettered',
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def increment(self, name: str, count: int = 1):
+        with self._lock:
+            self._counts[name] += count
+
+    def record_flush(self, elapsed: float):
+        with self._lock:
+            self._counts['flushes'] += 1
+            self._flush_seconds += elapsed
+
+    def reset(self):
+        with self._lock:
+            self._counts = dict.fromkeys(self.FIELDS, 0)
+            self._flush_seconds = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            counts = dict(self._counts)
+            flush_seconds = self._flush_seconds
+        counts['flush_ms_total'] = round(flush_seconds * 1000, 3)
+        counts['notifications_per_second'] = (
+            round(counts['notifications_sent'] / flush_seconds, 2) if flush_seconds else 0.0
+        )
+        return counts
+
+
+notification_metrics = NotificationMetrics()
+
+
+# =============================================================================
+# Queueing
+# =============================================================================
+
+def queue_notifications(items: Iterable[Tuple[int, Optional[int], str, str]]) -> int:
+    """
+    Queue ``(recipient_id, ticket_id, event_type, message)`` notifications.
+    """
+    rows = [
+        TicketNotification(
+            recipient_id=recipient_id, ticket_id=ticket_id, event_type=event_type, message=message[:255]
+        )
+        for recipient_id, ticket_id, event_type, message in items
+        if recipient_id is not None
+    ]
+    TicketNotification.objects.bulk_create(rows)
+    notification_metrics.increment('queued', len(rows))
+    return len(rows)
+
+
+def _ticket_people(ticket_id) -> Dict[str, Optional[int]]:
+    people = Ticket.objects.filter(pk=ticket_id).values('requester_id', 'assigned_to_id').first()
+    return people or {'requester_id': None, 'assigned_to_id': None}
+
+
+def _event_recipients(event) -> Tuple[List[Optional[int]], str]:
+    """Who to notify of a ticket event, and the digest line."""
+    from apps.tickets.domain.events import TicketEventType
+
+    event_type = event.event_type
+    if event_type == TicketEventType.TICKET_CREATED:
+        return [event.assignee_id], f'New {event.priority.lower()} priority ticket assigned to you'
+    if event_type == TicketEventType.TICKET_ASSIGNED:
+        return [event.assignee_id], f'Assigned to you by {event.assigner_username or "the system"}'
+    if event_type == TicketEventType.TICKET_UNASSIGNED:
+        return [event.unassigned_user_id], 'No longer assigned to you'
+    people = _ticket_people(event.ticket_id)
+    if event_type == TicketEventType.TICKET_RESOLVED:
+        return [people['requester_id']], f'Resolved: {event.resolution_summary or "no summary"}'
+    if event_type == TicketEventType.TICKET_REOPENED:
+        return [people['assigned_to_id']], f'Reopened: {event.reason}'
+    if event_type == TicketEventType.TICKET_STATUS_CHANGED:
+        return (
+            [people['requester_id'], people['assigned_to_id']],
+            f'Status changed from {event.from_status} to {event.to_status}',
+        )
+    if event_type == TicketEventType.TICKET_UPDATED:
+        return [people['assigned_to_id']], f'Updated: {", ".join(sorted(event.changes)) or "details"}'
+    return [], ''
+
+
+def _bulk_event_notifications(event) -> Iterable[Tuple[int, int, str, str]]:
+    """Notifications for a bulk operation, with one query per chunk of tickets."""
+    changes = event.changes
+    if event.operation == 'assign':
+        message = f'Assigned to you by {getattr(event.actor, "username", None) or "the system"}'
+        roles = ('assigned_to_id',)
+    elif event.operation == 'priority':
+        message = f'Priority changed to {changes.get("priority")}'
+        roles = ('assigned_to_id',)
+    else:
+        message = f'Status changed to {changes.get("status")}'
+        roles = ('requester_id', 'assigned_to_id')
+    ticket_ids = list(event.ticket_ids)
+    for start in range(0, len(ticket_ids), 1000):
+        people = Ticket.objects.filter(pk__in=ticket_ids[start:start + 1000]).values('id', *roles)
+        for row in people:
+            for recipient_id in dict.fromkeys(row[role] for role in roles):
+                yield recipient_id, row['id'], event.event_type, message
+
+
+def queue_ticket_event_notifications(event) -> None:
+    """Event handler queueing the notifications for a ticket domain event."""
+    from apps.tickets.domain.events import TicketEventType
+
+    actor_id = getattr(event.actor, 'id', None)
+    if event.event_type == TicketEventType.TICKETS_BULK_UPDATED:
+        queue_notifications(
+            item for item in _bulk_event_notifications(event) if item[0] != actor_id
+        )
+        return
+    recipients, message = _event_recipients(event)
+    unique = [pk for pk in dict.fromkeys(recipients) if pk is not None and pk != actor_id]
+    if unique:
+        queue_notifications(
+            (recipient_id, event.ticket_id, event.event_type, message) for recipient_id in unique
+        )
+
+
+# =============================================================================
+# Digests
+# =============================================================================
+
+def _ready_recipients(now, limit, exclude) -> List[int]:
+    quiet_since = now - timedelta(seconds=getattr(settings, 'NOTIFICATION_DEBOUNCE', 60))
+    overdue_since = now - timedelta(seconds=getattr(settings, 'NOTIFICATION_MAX_DELAY', 300))
+    return list(
+        TicketNotification.objects.filter(sent_at__isnull=True, failed_at__isnull=True, created_at__lte=now)
+        .values('recipient_id')
+        .annotate(oldest=Min('created_at'), newest=Max('created_at'))
+        .filter(Q(newest__lte=quiet_since) | Q(oldest__lte=overdue_since))
+        .exclude(recipient_id__in=exclude)
+        .order_by('oldest')
+        .values_list('recipient_id', flat=True)[:limit]
+    )
+
+
+def build_digest(recipient, notifications) -> EmailMessage:
+    """One email listing a recipient's notifications, grouped by ticket."""
+    by_ticket = OrderedDict()
+    for notification in notifications:
+        by_ticket.setdefault(notification.ticket_id, []).append(notification)
+
+    lines = []
+    for items in by_ticket.values():
+        ticket = items[0].ticket
+        if ticket is not None:
+            lines.append(f'#{ticket.ticket_id} {ticket.title}')
+        lines.extend(f'  - {item.message}' for item in items)
+        lines.append('')
+
+    if len(notifications) == 1 and notifications[0].ticket is not None:
+        subject = f'{notifications[0].ticket.title}: {notifications[0].message}'
+    else:
+        subject = f'{len(notifications)} updates on {len(by_ticket)} ticket(s)'
+    return EmailMessage(
+        subject=subject[:200],
+        body='\n'.join(lines).rstrip() + '\n',
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient.email],
+    )
+
+
+def flush_notifications(now=None, batch_size: int = None) -> int:
+    """
+    Send the digests of every recipient whose queue is ready; returns the
+    number of emails sent.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'NOTIFICATION_FLUSH_BATCH_SIZE', 100)
+    transport = get_notification_transport()
+    start = time.perf_counter()
+    sent = 0
+    attempted = set()  # failed recipients stay queued until the next flush
+    while True:
+        recipients = _ready_recipients(now, batch_size, attempted)
+        if not recipients:
+            break
+        attempted.update(recipients)
+        for recipient_id in recipients:
+            with transaction.atomic():
+                # Concurrent flushes skip the rows another one has claimed
+                notifications = list(
+                    TicketNotification.objects.select_for_update(skip_locked=True, of=('self',))
+                    .filter(sent_at__isnull=True, failed_at__isnull=True,
+                            recipient_id=recipient_id, created_at__lte=now)
+                    .select_related('recipient', 'ticket').order_by('created_at')
+                )
+                if notifications and _send_digest(transport, notifications, now):
+                    sent += 1
+    notification_metrics.record_flush(time.perf_counter() - start)
+    return sent
+
+
+def _send_digest(transport, notifications, now) -> bool:
+    """Send one recipient's claimed rows; returns whether a digest went out."""
+    recipient = notifications[0].recipient
+    ids = [notification.pk for notification in notifications]
+    if not (recipient.email and recipient.is_active):
+        TicketNotification.objects.filter(pk__in=ids).update(sent_at=now)
+        notification_metrics.increment('skipped', len(ids))
+        return False
+    try:
+        delivered = transport.send_messages([build_digest(recipient, notifications)])
+    except Exception:
+        logger.exception(f'Could not send the notification digest of user {recipient.pk}')
+        delivered = 0
+    if not delivered:
+        _record_failure(ids, now)
+        return False
+    TicketNotification.objects.filter(pk__in=ids).update(sent_at=now)
+    notification_metrics.increment('digests_sent')
+    notification_metrics.increment('notifications_sent', len(ids))
+    return True
+
+
+def _record_failure(ids: List[int], now):
+    """Count a failed delivery; dead-letter the rows after NOTIFICATION_MAX_ATTEMPTS."""
+    notification_metrics.increment('send_failures')
+    max_attempts = getattr(settings, 'NOTIFICATION_MAX_ATTEMPTS', 5)
+    rows = TicketNotification.objects.filter(pk__in=ids)
+    rows.update(attempts=F('attempts') + 1)
+    dead = rows.filter(attempts__gte=max_attempts).update(failed_at=now)
+    if dead:
+        logger.warning(f'Dead-lettered {dead} notifications after {max_attempts} failed deliveries')
+        notification_metrics.increment('dead_lettered', dead)
+
+
+def notification_stats(now=None) -> Dict[str, object]:
+    """Queue depth and throughput of the notification pipeline."""
+    now = now or timezone.now()
+    queue = TicketNotification.objects.filter(sent_at__isnull=True, failed_at__isnull=True).aggregate(
+        depth=Count('id'), recipients=Count('recipient', distinct=True), oldest=Min('created_at'),
+    )
+    return {
+        'queue_depth': queue['depth'],
+        'dead_lettered': TicketNotification.objects.filter(failed_at__isnull=False).count(),
+        'queued_recipients': queue['recipients'],
+        'oldest_age_seconds': round((now - queue['oldest']).total_seconds(), 1) if queue['oldest'] else 0.0,
+        'counters': notification_metrics.snapshot(),
+    }
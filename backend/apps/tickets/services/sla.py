@@ -0,0 +1,241 @@
+"""
+SLA engine for IT Management Platform.
+
+The single place where a ticket's SLA deadline and breach state are
+decided. Both are stored on the ticket, so lists, the dashboard and the
+statistics filter on indexed columns instead of evaluating SLA rules per
+row in Python.
+
+- ``sla_due_at`` is computed when a ticket is created without an explicit
+  due date and again whenever its priority, category or ticket type
+  changes. The target comes from the active ``SLA`` policy for the
+  ticket's category and type (``SLA.get_sla_hours``); without one,
+  ``TicketType.sla_hours`` (or ``TICKET_SLA_DEFAULT_HOURS``) is scaled by
+  the same default priority multipliers.
+- ``sla_warning_at`` and ``sla_critical_at`` mark the points where half
+  and three quarters of the SLA window have elapsed; the dashboard's risk
+  levels are range filters on them.
+- ``sla_breached`` is re-evaluated on every save and set in bulk by
+  ``sweep_sla_breaches`` for active tickets whose deadline passed since.
+- ``sla_escalation_at`` is the time of the ticket's next automatic
+  escalation (``ESCALATION_STAGES``), or empty when there is none left;
+  the escalation scheduler reads tickets off its index.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.tickets.models import SLA, Ticket, TicketType
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ('NEW', 'OPEN', 'IN_PROGRESS', 'PENDING')
+
+# Defaults of the SLA model's priority multipliers
+DEFAULT_PRIORITY_MULTIPLIERS = {
+    'LOW': 4.0,
+    'MEDIUM': 2.0,
+    'HIGH': 1.0,
+    'CRITICAL': 0.5,
+    'URGENT': 0.25,
+}
+
+# Share of the SLA window elapsed at each risk level
+WARNING_FRACTION = 0.5
+CRITICAL_FRACTION = 0.75
+
+# Automatic escalations: the threshold column that triggers each and its level
+ESCALATION_STAGES = (
+    ('sla_critical_at', 'L2'),
+    ('sla_due_at', 'MANAGEMENT'),
+)
+
+SLA_COLUMNS = ('sla_due_at', 'sla_warning_at', 'sla_critical_at', 'sla_breached', 'sla_escalation_at')
+
+
+class SLAPolicies:
+    """
+    Resolution targets for a set of ticket types, loaded in two queries.
+    """
+
+    def __init__(self, policies: Dict[Tuple[int, int], SLA], type_hours: Dict[int, int]):
+        self.policies = policies
+        self.type_hours = type_hours
+
+    @classmethod
+    def load(cls, ticket_type_ids: Optional[Iterable[int]] = None) -> 'SLAPolicies':
+        slas = SLA.objects.filter(is_active=True).order_by('updated_at')
+        types = TicketType.objects.all()
+        if ticket_type_ids is not None:
+            ticket_type_ids = [pk for pk in set(ticket_type_ids) if pk is not None]
+            if not ticket_type_ids:
+                return cls({}, {})
+            slas = slas.filter(ticket_type_id__in=ticket_type_ids)
+            types = types.filter(pk__in=ticket_type_ids)
+        # The most recently updated active policy wins
+        policies = {(sla.category_id, sla.ticket_type_id): sla for sla in slas}
+        return cls(policies, dict(types.values_list('pk', 'sla_hours')))
+
+    def resolution_hours(self, category_id, ticket_type_id, priority) -> float:
+        policy = self.policies.get((category_id, ticket_type_id))
+        if policy is not None:
+            return float(policy.get_sla_hours(priority))
+        base = self.type_hours.get(ticket_type_id) or getattr(settings, 'TICKET_SLA_DEFAULT_HOURS', 24)
+        return base * DEFAULT_PRIORITY_MULTIPLIERS.get(priority, 1.0)
+
+
+def is_breached(ticket, now=None) -> bool:
+    """Whether the ticket missed (or, while active, is past) its deadline."""
+    if ticket.sla_due_at is None:
+        return False
+    if ticket.status in ACTIVE_STATUSES:
+        return (now or timezone.now()) > ticket.sla_due_at
+    finished_at = ticket.resolved_at or ticket.closed_at
+    if finished_at is None:
+        return ticket.sla_breached
+    return finished_at > ticket.sla_due_at
+
+
+def set_deadline(ticket, hours: float, start=None):
+    """Set the deadline and risk thresholds ``hours`` after ``start``."""
+    start = start or ticket.created_at or timezone.now()
+    ticket.sla_due_at = start + timedelta(hours=hours)
+    _set_thresholds(ticket, start)
+
+
+def _set_thresholds(ticket, start):
+    if ticket.sla_due_at is None:
+        ticket.sla_warning_at = ticket.sla_critical_at = None
+        return
+    window = max(ticket.sla_due_at - start, timedelta(0))
+    ticket.sla_warning_at = start + window * WARNING_FRACTION
+    ticket.sla_critical_at = start + window * CRITICAL_FRACTION
+
+
+def recalculate(ticket, policies: SLAPolicies = None):
+    """Recompute the ticket's SLA columns from the current policies."""
+    policies = policies or SLAPolicies.load([ticket.ticket_type_id])
+    set_deadline(
+        ticket, policies.resolution_hours(ticket.category_id, ticket.ticket_type_id, ticket.priority)
+    )
+    ticket.sla_breached = is_breached(ticket)
+    schedule_escalation(ticket)
+
+
+def schedule_escalation(ticket):
+    """Set ``sla_escalation_at`` to the threshold of the next escalation stage."""
+    level = ticket.sla_escalation_level
+    if ticket.status not in ACTIVE_STATUSES or level >= len(ESCALATION_STAGES):
+        ticket.sla_escalation_at = None
+    else:
+        ticket.sla_escalation_at = getattr(ticket, ESCALATION_STAGES[level][0])
+
+
+def apply_sla(ticket, policies: SLAPolicies = None):
+    """
+    Keep the SLA columns of a ticket about to be saved consistent.
+
+    Called from the Ticket pre_save signal; bulk updates pass the
+    ``policies`` of all their tickets instead of loading them per ticket.
+    """
+    if ticket._state.adding:
+        if ticket.sla_due_at is None:
+            recalculate(ticket, policies)
+            return
+    else:
+        loaded = getattr(ticket, '_loaded_values', {})
+        changed = [
+            field for field in Ticket.SLA_FIELDS
+            if field in loaded and loaded[field] != getattr(ticket, field)
+        ]
+        if changed:
+            recalculate(ticket, policies)
+            return
+        if loaded.get('sla_due_at', ticket.sla_due_at) != ticket.sla_due_at:
+            # Deadline edited by hand
+            _set_thresholds(ticket, ticket.created_at or timezone.now())
+    if ticket.sla_due_at is not None and ticket.sla_warning_at is None:
+        _set_thresholds(ticket, ticket.created_at or timezone.now())
+    ticket.sla_breached = is_breached(ticket)
+    schedule_escalation(ticket)
+
+
+# =============================================================================
+# Query helpers
+# =============================================================================
+
+def breached_q(now=None) -> Q:
+    """Active tickets past their deadline."""
+    return Q(status__in=ACTIVE_STATUSES, sla_due_at__lt=now or timezone.now())
+
+
+def at_risk_q(now=None) -> Q:
+    """Active tickets with at least half of their SLA window elapsed."""
+    return Q(status__in=ACTIVE_STATUSES, sla_warning_at__lte=now or timezone.now())
+
+
+def risk_level(ticket, now=None) -> str:
+    """``breached``, ``critical``, ``warning`` or ``safe`` from the stored thresholds."""
+    now = now or timezone.now()
+    if ticket.sla_due_at is None:
+        return 'safe'
+    if ticket.sla_due_at <= now:
+        return 'breached'
+    if ticket.sla_critical_at is not None and ticket.sla_critical_at <= now:
+        return 'critical'
+    if ticket.sla_warning_at is not None and ticket.sla_warning_at <= now:
+        return 'warning'
+    return 'safe'
+
+
+# =============================================================================
+# Bulk operations
+# =============================================================================
+
+def sweep_sla_breaches(now=None, batch_size: int = None) -> List[int]:
+    """
+    Flag active tickets whose deadline has passed; returns their ids.
+
+    Walks the ``sla_due_at`` index in batches with one UPDATE each.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or getattr(settings, 'TICKET_SLA_SWEEP_BATCH_SIZE', 500)
+    pending = Ticket.objects.filter(breached_q(now), sla_breached=False).order_by('sla_due_at')
+    breached = []
+    while True:
+        ids = list(pending.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        Ticket.objects.filter(pk__in=ids, sla_breached=False).update(sla_breached=True)
+        breached.extend(ids)
+    if breached:
+        logger.warning(f'SLA breach detected on {len(breached)} tickets')
+    return breached
+
+
+def recalculate_sla(queryset=None, batch_size: int = 500) -> int:
+    """
+    Recompute the SLA columns of ``queryset`` (default: all tickets) in
+    bulk, e.g. after changing SLA policies. Returns the number of tickets.
+    """
+    queryset = (queryset if queryset is not None else Ticket.objects.all()).order_by('pk').only(
+        'pk', 'status', 'priority', 'category_id', 'ticket_type_id', 'created_at',
+        'resolved_at', 'closed_at', 'sla_escalation_level', *SLA_COLUMNS,
+    )
+    policies = SLAPolicies.load()
+    updated = last_pk = 0
+    while True:
+        tickets = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+        if not tickets:
+            break
+        for ticket in tickets:
+            recalculate(ticket, policies)
+        Ticket.objects.bulk_update(tickets, SLA_COLUMNS)
+        updated += len(tickets)
+        last_pk = tickets[-1].pk
+    return updated
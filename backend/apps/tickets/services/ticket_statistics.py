@@ -0,0 +1,387 @@
+"""
+Materialized ticket statistics for IT Management Platform.
+
+TicketStatisticsSnapshot holds the statistics payload of
+TicketViewSet.statistics for one visibility scope, so the endpoint reads a
+single row instead of running a dozen aggregate queries per user.
+
+- Every ticket save appends the difference between the ticket's previous
+  and new contribution (status, priority, category, SLA and resolution
+  aggregates) as a TicketStatisticsDelta row. Writers never lock the
+  snapshot row, so they do not queue behind each other; reads add the
+  pending deltas to the snapshot. Status changes are recorded in
+  TicketStatusHistory at the same point.
+- ``reconcile`` recounts everything from the tickets table, refreshes the
+  time-dependent sections (overdue count, upcoming SLA breaches, recent
+  activity, creation trend) and deletes the deltas the recount covers. It
+  runs periodically and whenever a snapshot is older than
+  ``TICKET_STATISTICS_MAX_AGE`` seconds.
+- Roles with the same ticket visibility share one snapshot: today every
+  role that may view tickets sees all of them (``SCOPE_ALL``) and VIEWER
+  sees none (``SCOPE_NONE``). A role whose visibility depended on the
+  user would be computed live.
+"""
+
+import logging
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.utils import timezone
+
+from apps.core.cache import LockTimeout, get_tiered_cache
+from apps.core.services.permission_engine import get_permission_table, queryset_filter
+from apps.core.services.timeseries import bucketed_counts, count_metrics
+from apps.tickets.models import (
+    Ticket, TicketCategory, TicketStatisticsDelta, TicketStatisticsSnapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+SCOPE_ALL = 'all'
+SCOPE_NONE = 'none'
+
+STATUS_FIELDS = {
+    'NEW': 'new_tickets',
+    'OPEN': 'open_tickets',
+    'IN_PROGRESS': 'in_progress_tickets',
+    'PENDING': 'pending_tickets',
+    'RESOLVED': 'resolved_tickets',
+    'CLOSED': 'closed_tickets',
+    'CANCELLED': 'cancelled_tickets',
+}
+ACTIVE_STATUSES = ('NEW', 'OPEN', 'IN_PROGRESS', 'PENDING')
+RESOLVED_STATUSES = ('RESOLVED', 'CLOSED')
+
+COUNTER_FIELDS = (
+    'total_tickets', *STATUS_FIELDS.values(),
+    'resolved_with_sla', 'compliant_resolved', 'resolution_count', 'resolution_seconds',
+)
+# Delta dimension -> snapshot field holding its label counts
+BUCKET_FIELDS = {
+    'priority': 'tickets_by_priority',
+    'category': 'tickets_by_category',
+}
+
+
+def statistics_scope(user) -> Optional[str]:
+    """
+    Snapshot scope for ``user``.
+
+    Returns SCOPE_ALL or SCOPE_NONE, or None when the user's ticket
+    visibility depends on the user rather than on the role.
+    """
+    table = get_permission_table('ticket')
+    relations = table.allowed_relations(user, 'can_view')
+    if not relations:
+        return SCOPE_NONE
+    if len(relations) == len(table.spec.relations):
+        return SCOPE_ALL
+    return None
+
+
+# =============================================================================
+# Incremental updates
+# =============================================================================
+
+def ticket_state(ticket) -> dict:
+    """Values of the fields the snapshot is derived from."""
+    return {field: getattr(ticket, field) for field in Ticket.STATISTICS_FIELDS}
+
+
+def _contribution(state: Optional[dict]) -> Counter:
+    """What one ticket in ``state`` adds to the snapshot counters."""
+    counts = Counter()
+    if state is None:
+        return counts
+    status = state['status']
+    counts['total_tickets'] += 1
+    if status in STATUS_FIELDS:
+        counts[STATUS_FIELDS[status]] += 1
+    counts[('priority', state['priority'])] += 1
+    counts[('category', state['category_id'])] += 1
+    if status in RESOLVED_STATUSES:
+        sla_due_at, resolved_at = state['sla_due_at'], state['resolved_at']
+        if sla_due_at is not None:
+            counts['resolved_with_sla'] += 1
+            if resolved_at is not None and resolved_at <= sla_due_at:
+                counts['compliant_resolved'] += 1
+        if resolved_at is not None and state['resolution_time'] is not None:
+            counts['resolution_count'] += 1
+            counts['resolution_seconds'] += state['resolution_time'].total_seconds()
+    return counts
+
+
+def ticket_change_delta(previous: Optional[dict], current: Optional[dict]) -> Dict[object, float]:
+    """Non-zero snapshot changes when a ticket goes from ``previous`` to ``current``."""
+    delta = _contribution(current)
+    delta.subtract(_contribution(previous))
+    return {key: value for key, value in delta.items() if value}
+
+
+def apply_ticket_change(previous: Optional[dict], current: Optional[dict]):
+    """
+    Record a ticket creation (``previous`` None), update, or deletion
+    (``current`` None) as a snapshot delta.
+
+    Runs inside the caller's transaction, so the delta becomes visible
+    together with the ticket change.
+    """
+    apply_ticket_changes([(previous, current)])
+
+
+def apply_ticket_changes(changes: Iterable[Tuple[Optional[dict], Optional[dict]]]):
+    """
+    Record many ``(previous, current)`` ticket changes as one summed delta
+    row (bulk updates).
+    """
+    total = Counter()
+    for previous, current in changes:
+        total.update(ticket_change_delta(previous, current))
+    delta = {key: value for key, value in total.items() if value}
+    if not delta:
+        return
+
+    category_ids = {key[1] for key in delta if isinstance(key, tuple) and key[0] == 'category'}
+    category_names = dict(
+        TicketCategory.objects.filter(id__in=category_ids).values_list('id', 'name')
+    ) if category_ids else {}
+
+    row = {}
+    for key, value in delta.items():
+        if isinstance(key, tuple):
+            dimension, name = key
+            label = category_names.get(name, str(name)) if dimension == 'category' else name
+            bucket = row.setdefault(dimension, {})
+            bucket[label] = bucket.get(label, 0) + value
+        else:
+            row[key] = value
+    TicketStatisticsDelta.objects.bulk_create([TicketStatisticsDelta(scope=SCOPE_ALL, delta=row)])
+
+
+def _apply_delta(snapshot, delta: dict):
+    """Add one delta row to ``snapshot`` in memory."""
+    for key, value in delta.items():
+        if key in BUCKET_FIELDS:
+            bucket = getattr(snapshot, BUCKET_FIELDS[key])
+            for label, count in value.items():
+                _add_to_bucket(bucket, label, count)
+        else:
+            setattr(snapshot, key, getattr(snapshot, key) + value)
+
+
+def _add_to_bucket(bucket: dict, label, value):
+    count = bucket.get(label, 0) + value
+    if count:
+        bucket[label] = count
+    else:
+        bucket.pop(label, None)
+
+
+def _pending_deltas(scope: str, up_to: Optional[int] = None, limit: Optional[int] = None) -> list:
+    deltas = TicketStatisticsDelta.objects.filter(scope=scope).order_by('id')
+    if up_to is not None:
+        deltas = deltas.filter(id__lte=up_to)
+    return list(deltas.values_list('id', 'delta')[:limit])
+
+
+# =============================================================================
+# Reconcile
+# =============================================================================
+
+def compute_statistics(queryset, now=None) -> dict:
+    """Snapshot field values computed from scratch over ``queryset``."""
+    from apps.tickets.models import TicketHistory
+    from apps.tickets.serializers import TicketHistorySerializer, TicketListSerializer
+
+    now = now or timezone.now()
+    resolved = Q(status__in=RESOLVED_STATUSES)
+    resolved_with_time = resolved & Q(resolved_at__isnull=False, resolution_time__isnull=False)
+
+    values = count_metrics(queryset, {
+        'total_tickets': None,
+        **{field: Q(status=status) for status, field in STATUS_FIELDS.items()},
+        'resolved_with_sla': resolved & Q(sla_due_at__isnull=False),
+        'compliant_resolved': resolved & Q(sla_due_at__isnull=False, resolved_at__lte=F('sla_due_at')),
+        'resolution_count': resolved_with_time,
+        'overdue_tickets': Q(
+            sla_due_at__isnull=False, sla_due_at__lt=now, status__in=ACTIVE_STATUSES
+        ),
+    })
+    overdue_tickets = values.pop('overdue_tickets')
+
+    total_resolution = queryset.order_by().aggregate(
+        total=Sum('resolution_time', filter=resolved_with_time)
+    )['total']
+    values['resolution_seconds'] = total_resolution.total_seconds() if total_resolution else 0
+    values['tickets_by_priority'] = _grouped_counts(queryset, 'priority')
+    values['tickets_by_category'] = _grouped_counts(queryset, 'category__name')
+
+    upcoming_sla_breaches = queryset.filter(
+        sla_due_at__isnull=False,
+        sla_due_at__lte=now + timedelta(hours=24),
+        sla_due_at__gt=now,
+        status__in=ACTIVE_STATUSES
+    ).select_related('category', 'requester', 'assigned_to')[:10]
+    recent_activities = TicketHistory.objects.filter(
+        ticket__in=queryset
+    ).select_related('ticket', 'user')[:10]
+    created_trend = bucketed_counts(
+        queryset, 'created_at', interval='day', periods=7,
+        end=now, cache_namespace='tickets_created',
+    )
+
+    values['periodic'] = {
+        'overdue_tickets': overdue_tickets,
+        'upcoming_sla_breaches': TicketListSerializer(upcoming_sla_breaches, many=True).data,
+        'recent_activities': TicketHistorySerializer(recent_activities, many=True).data,
+        'created_trend': [
+            {'date': row['bucket'].strftime('%Y-%m-%d'), 'count': row['count']}
+            for row in created_trend
+        ],
+    }
+    return values
+
+
+def _grouped_counts(queryset, field: str) -> dict:
+    rows = queryset.order_by().values(field).annotate(count=Count('id')).values_list(field, 'count')
+    return {key: count for key, count in rows if count}
+
+
+def reconcile(scope: str = SCOPE_ALL) -> Dict[str, object]:
+    """
+    Recount the snapshot of ``scope`` and refresh its time-dependent
+    sections.
+
+    Returns the corrections made to the incrementally maintained values;
+    non-empty drift is also logged.
+    """
+    if scope != SCOPE_ALL:
+        raise ValueError(f"Unknown ticket statistics scope: {scope}")
+
+    with transaction.atomic():
+        snapshot, created = TicketStatisticsSnapshot.objects.select_for_update().get_or_create(scope=scope)
+        # Deltas up to the watermark are replaced by the recount; later ones
+        # stay pending for the next run.
+        watermark = TicketStatisticsDelta.objects.filter(scope=scope).aggregate(top=Max('id'))['top'] or 0
+        pending = _pending_deltas(scope, up_to=watermark)
+        values = compute_statistics(Ticket.objects.all())
+
+        for _, delta in pending:
+            _apply_delta(snapshot, delta)
+        drift = {}
+        for field in COUNTER_FIELDS + ('tickets_by_priority', 'tickets_by_category'):
+            old, new = getattr(snapshot, field), values[field]
+            if field == 'resolution_seconds' and abs(old - new) < 1:
+                continue
+            if old != new:
+                drift[field] = {'snapshot': old, 'actual': new}
+
+        for field, value in values.items():
+            setattr(snapshot, field, value)
+        snapshot.reconciled_at = timezone.now()
+        snapshot.save()
+        TicketStatisticsDelta.objects.filter(scope=scope, id__lte=watermark).delete()
+
+    if drift and not created:
+        logger.warning(f"Ticket statistics ({scope}) drifted: {sorted(drift)}")
+    return {} if created else drift
+
+
+# =============================================================================
+# Reads
+# =============================================================================
+
+def _is_stale(snapshot) -> bool:
+    max_age = getattr(settings, 'TICKET_STATISTICS_MAX_AGE', 300)
+    return snapshot.reconciled_at is None or (
+        timezone.now() - snapshot.reconciled_at > timedelta(seconds=max_age)
+    )
+
+
+def _refresh(scope: str, snapshot, force: bool = False) -> Optional[TicketStatisticsSnapshot]:
+    """
+    Reconcile a missing or stale snapshot (any snapshot with ``force``) in
+    one worker at a time.
+
+    Stale snapshots are served as they are while another worker refreshes
+    them; a missing one is waited for.
+    """
+    lock = get_tiered_cache('ticket_statistics', local=False).lock(
+        scope, wait=0 if snapshot is not None else None
+    )
+    try:
+        with lock:
+            current = TicketStatisticsSnapshot.objects.filter(scope=scope).first()
+            if force or current is None or _is_stale(current):
+                reconcile(scope)
+                current = TicketStatisticsSnapshot.objects.get(scope=scope)
+            return current
+    except LockTimeout:
+        return snapshot
+
+
+def snapshot_payload(snapshot: TicketStatisticsSnapshot, pending=()) -> dict:
+    """The statistics endpoint payload for ``snapshot`` plus the ``pending`` deltas."""
+    for _, delta in pending:
+        _apply_delta(snapshot, delta)
+    periodic = snapshot.periodic or {}
+    compliance = (
+        snapshot.compliant_resolved / snapshot.resolved_with_sla * 100
+        if snapshot.resolved_with_sla else 0
+    )
+    average_hours = (
+        snapshot.resolution_seconds / snapshot.resolution_count / 3600
+        if snapshot.resolution_count else 0
+    )
+    return {
+        'total_tickets': snapshot.total_tickets,
+        'open_tickets': snapshot.new_tickets + snapshot.open_tickets,
+        'in_progress_tickets': snapshot.in_progress_tickets,
+        'resolved_tickets': snapshot.resolved_tickets,
+        'closed_tickets': snapshot.closed_tickets,
+        'overdue_tickets': periodic.get('overdue_tickets', 0),
+        'tickets_by_status': {
+            status: getattr(snapshot, field)
+            for status, field in STATUS_FIELDS.items() if getattr(snapshot, field)
+        },
+        'tickets_by_priority': dict(snapshot.tickets_by_priority),
+        'tickets_by_category': dict(snapshot.tickets_by_category),
+        'sla_compliance_rate': round(compliance, 2),
+        'average_resolution_time': round(average_hours, 2),
+        'created_trend': periodic.get('created_trend', []),
+        'recent_activities': periodic.get('recent_activities', []),
+        'upcoming_sla_breaches': periodic.get('upcoming_sla_breaches', []),
+        'updated_at': snapshot.updated_at,
+        'reconciled_at': snapshot.reconciled_at,
+    }
+
+
+def get_ticket_statistics(user) -> dict:
+    """
+    Statistics payload for ``user``: the snapshot row plus its pending deltas.
+
+    Reconcile normally folds the deltas every
+    ``TICKET_STATISTICS_RECONCILE_INTERVAL`` seconds. A read that finds more
+    than ``TICKET_STATISTICS_MAX_PENDING`` of them reconciles first, so the
+    read cost stays bounded when writes spike or beat is not running.
+    """
+    scope = statistics_scope(user)
+    if scope == SCOPE_NONE:
+        return snapshot_payload(TicketStatisticsSnapshot(scope=SCOPE_NONE))
+    if scope is None:
+        visible = Ticket.objects.filter(queryset_filter(user, 'can_view', 'ticket'))
+        return snapshot_payload(TicketStatisticsSnapshot(scope='user', **compute_statistics(visible)))
+
+    snapshot = TicketStatisticsSnapshot.objects.filter(scope=scope).first()
+    if snapshot is None or _is_stale(snapshot):
+        snapshot = _refresh(scope, snapshot)
+    limit = getattr(settings, 'TICKET_STATISTICS_MAX_PENDING', 500)
+    pending = _pending_deltas(scope, limit=limit + 1)
+    if len(pending) > limit:
+        snapshot = _refresh(scope, snapshot, force=True)
+        pending = _pending_deltas(scope)
+    return snapshot_payload(snapshot, pending)
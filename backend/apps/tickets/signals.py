@@ -3,11 +3,15 @@ Ticket signals for IT Management Platform.
 Handles ticket creation, updates, assignments, and audit logging.
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from django.contrib.auth import get_user_model
-from .models import Ticket, TicketComment, TicketAttachment, TicketHistory, TicketEscalation
+from .models import (
+    Ticket, TicketComment, TicketAttachment, TicketHistory, TicketEscalation, TicketStatusHistory
+)
+from .services.sla import apply_sla, sweep_sla_breaches
+from .services.ticket_statistics import apply_ticket_change, ticket_state
 import logging
 
 User = get_user_model()
@@ -118,7 +122,7 @@ def create_escalation_history(sender, instance, created, **kwargs):
     """
     Create history record when ticket is escalated.
     """
-    if created:
+    if created and instance.escalated_by_id:
         TicketHistory.objects.create(
             ticket=instance.ticket,
             user=instance.escalated_by,
@@ -127,6 +131,64 @@ def create_escalation_history(sender, instance, created, **kwargs):
         )
         logger.info(f"Ticket {instance.ticket.ticket_id} escalated to {instance.escalation_level} by {instance.escalated_by.username}")
 
+@receiver(pre_save, sender=Ticket)
+def apply_ticket_sla(sender, instance, raw=False, **kwargs):
+    """
+    Compute the SLA deadline on creation and priority changes, and the breach state.
+    """
+    if not raw:
+        apply_sla(instance)
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_state(sender, instance, raw=False, **kwargs):
+    """
+    Remember the stored values the statistics snapshot is derived from.
+    """
+    if raw or instance._state.adding:
+        instance._previous_state = None
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    if all(field in loaded for field in Ticket.STATISTICS_FIELDS):
+        instance._previous_state = {field: loaded[field] for field in Ticket.STATISTICS_FIELDS}
+    else:
+        instance._previous_state = Ticket.objects.filter(pk=instance.pk).values(
+            *Ticket.STATISTICS_FIELDS
+        ).first()
+
+
+@receiver(post_save, sender=Ticket)
+def record_ticket_transition(sender, instance, created, raw=False, **kwargs):
+    """
+    Record status transitions and keep the statistics snapshot current.
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_previous_state', None)
+    current = ticket_state(instance)
+    if previous is not None and previous['status'] != current['status']:
+        TicketStatusHistory.objects.create(
+            ticket=instance,
+            from_status=previous['status'],
+            to_status=current['status'],
+            changed_by_id=instance.updated_by_id,
+        )
+    apply_ticket_change(previous, current)
+    instance._loaded_values = {field: getattr(instance, field) for field in Ticket.TRACKED_FIELDS}
+    instance._previous_state = None
+
+
+@receiver(post_delete, sender=Ticket)
+def remove_ticket_from_statistics(sender, instance, **kwargs):
+    """
+    Remove a deleted ticket from the statistics snapshot.
+    """
+    loaded = getattr(instance, '_loaded_values', {})
+    if all(field in loaded for field in Ticket.STATISTICS_FIELDS):
+        apply_ticket_change({field: loaded[field] for field in Ticket.STATISTICS_FIELDS}, None)
+    else:
+        apply_ticket_change(ticket_state(instance), None)
+
 @receiver(post_save, sender=Ticket)
 def check_ticket_workflow(sender, instance, **kwargs):
     """
@@ -231,17 +293,7 @@ def check_overdue_tickets():
     """
     Check for overdue tickets and take appropriate action.
     """
-    overdue_tickets = Ticket.objects.filter(
-        sla_due_at__isnull=False,
-        sla_due_at__lt=timezone.now(),
-        status__in=['NEW', 'OPEN', 'IN_PROGRESS', 'PENDING']
-    )
-    
-    for ticket in overdue_tickets:
-        if not ticket.sla_breached:
-            ticket.sla_breached = True
-            ticket.save()
-            logger.warning(f"SLA breach detected and marked: {ticket.ticket_id}")
+    return sweep_sla_breaches()
 
 def send_sla_breach_notifications():
     """
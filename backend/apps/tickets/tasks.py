@@ -1,12 +1,62 @@
-import time
 import logging
 from celery import shared_task
 
 logger = logging.getLogger(__name__)
 
 @shared_task
-def send_ticket_creation_notification(ticket_id, actor_id):
-    logger.info(f'[Celery] Preparing email notification for Ticket #{ticket_id} triggered by User={actor_id}...')
-    time.sleep(3)
-    logger.info(f'[Celery] Email sent successfully for Ticket #{ticket_id}!')
-    return f'Ticket {ticket_id} email processed'
+def reconcile_ticket_statistics():
+    """Recount the ticket statistics snapshots and refresh their time-dependent sections."""
+    from apps.tickets.services.ticket_statistics import SCOPE_ALL, reconcile
+
+    drift = reconcile(SCOPE_ALL)
+    logger.info(f'[Celery] Ticket statistics reconciled ({len(drift)} fields corrected)')
+    return drift
+
+
+@shared_task
+def sweep_sla_breaches():
+    """Flag active tickets that passed their SLA deadline since the last sweep."""
+    from apps.tickets.services.sla import sweep_sla_breaches as sweep
+
+    breached = sweep()
+    logger.info(f'[Celery] SLA sweep flagged {len(breached)} breached tickets')
+    return breached
+
+
+@shared_task
+def escalate_due_tickets():
+    """Escalate tickets whose next SLA escalation is due."""
+    from apps.tickets.services.escalation import escalate_due_tickets as escalate
+
+    escalations = escalate()
+    logger.info(f'[Celery] SLA escalation run created {len(escalations)} escalations')
+    return len(escalations)
+
+
+
+@shared_task
+def flush_ticket_notifications():
+    """Send the digest emails of recipients whose notification queue is ready."""
+    from apps.tickets.services.notifications import flush_notifications
+
+    sent = flush_notifications()
+    logger.info(f'[Celery] Sent {sent} ticket notification digests')
+    return sent
+
+
+@shared_task
+def bulk_update_tickets(actor_id, ticket_ids, operation, assignee_id=None, status=None, priority=None):
+    """Run a large TicketViewSet.bulk selection in a worker."""
+    from django.contrib.auth import get_user_model
+    from apps.tickets.services.bulk_operations import bulk_update_tickets as apply
+
+    User = get_user_model()
+    actor = User.objects.filter(pk=actor_id).first()
+    assignee = User.objects.filter(pk=assignee_id).first() if assignee_id else None
+    if actor is None or (operation == 'assign' and assignee is None):
+        logger.warning(f'[Celery] Bulk ticket {operation} skipped: user no longer exists')
+        return None
+
+    result = apply(actor, ticket_ids, operation, assignee=assignee, status=status, priority=priority)
+    logger.info(f'[Celery] Bulk ticket {operation}: {result["updated"]} of {result["requested"]} tickets updated')
+    return result
@@ -0,0 +1,28 @@
+"""
+Shared fixtures for the ticket tests.
+"""
+
+import pytest
+
+from apps.tickets.models import Ticket
+
+
+@pytest.fixture
+def make_ticket(ticket_category, ticket_type, manager):
+    """Create a ticket raised by ``manager``; keyword arguments override the defaults."""
+    def make(**kwargs):
+        fields = dict(
+            title='Printer jam', description='Ticket test', category=ticket_category,
+            ticket_type=ticket_type, created_by=manager, updated_by=manager, requester=manager,
+        )
+        fields.update(kwargs)
+        return Ticket.objects.create(**fields)
+    return make
+
+
+@pytest.fixture
+def make_tickets(make_ticket):
+    """Create ``count`` tickets with the same fields."""
+    def make(count, **kwargs):
+        return [make_ticket(**kwargs) for _ in range(count)]
+    return make
@@ -0,0 +1,158 @@
+"""
+Tests for set-based bulk ticket operations.
+"""
+
+from unittest import mock
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.logs.models import ActivityLog
+from apps.tickets.models import (
+    Ticket, TicketHistory, TicketNotification, TicketStatisticsDelta, TicketStatusHistory,
+)
+from apps.tickets.services.bulk_operations import bulk_update_tickets
+from apps.tickets.services.ticket_statistics import SCOPE_ALL, get_ticket_statistics, reconcile
+
+URL = '/api/tickets/tickets/bulk/'
+
+
+def ids(tickets):
+    return [ticket.id for ticket in tickets]
+
+
+def writes(queries):
+    return [q['sql'] for q in queries.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))]
+
+
+@pytest.mark.django_db
+class TestBulkUpdateTickets:
+    def test_closes_tickets_with_set_based_writes(self, make_tickets, it_admin):
+        tickets = make_tickets(20)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = bulk_update_tickets(it_admin, ids(tickets), 'close')
+
+        assert (result['updated'], result['denied'], result['not_found']) == (20, [], [])
+        assert set(Ticket.objects.values_list('status', flat=True)) == {'CLOSED'}
+        assert not Ticket.objects.filter(closed_at__isnull=True).exists()
+        assert Ticket.objects.filter(updated_by=it_admin).count() == 20
+        # Ticket UPDATE, per-ticket UPDATE, three history INSERTs, statistics delta INSERT,
+        # notifications INSERT
+        assert len(writes(queries)) == 7
+
+    def test_records_history_and_timeline(self, make_tickets, it_admin, manager):
+        tickets = make_tickets(3, assigned_to=manager)
+
+        bulk_update_tickets(it_admin, ids(tickets), 'status', status='RESOLVED')
+
+        history = TicketStatusHistory.objects.filter(ticket__in=tickets)
+        assert {(row.from_status, row.to_status, row.changed_by) for row in history} == {
+            ('NEW', 'RESOLVED', it_admin)
+        }
+        assert TicketHistory.objects.filter(field_name='status', new_value='RESOLVED').count() == 3
+        entry = ActivityLog.objects.get(entity_type='ticket', entity_id=tickets[0].id)
+        assert entry.event_type == 'TICKET_STATUS_CHANGED' and entry.user == it_admin
+        assert (entry.extra_data['old_display'], entry.extra_data['new_display']) == ('New', 'Resolved')
+        assert all(ticket.resolution_time is not None for ticket in Ticket.objects.all())
+
+    def test_assignment_opens_new_tickets(self, make_tickets, manager, technician):
+        new, in_progress = make_tickets(1)[0], make_tickets(1, status='IN_PROGRESS')[0]
+
+        bulk_update_tickets(manager, [new.id, in_progress.id], 'assign', assignee=technician)
+
+        statuses = dict(Ticket.objects.values_list('id', 'status'))
+        assert statuses == {new.id: 'OPEN', in_progress.id: 'IN_PROGRESS'}
+        assert Ticket.objects.filter(assigned_to=technician, assignment_status='ASSIGNED').count() == 2
+        assert TicketHistory.objects.get(ticket=new, field_name='assigned_to').new_value == technician.username
+
+    def test_priority_change_recomputes_sla_deadlines(self, make_tickets, it_admin):
+        tickets = make_tickets(2, priority='LOW')
+
+        bulk_update_tickets(it_admin, ids(tickets), 'priority', priority='URGENT')
+
+        for before in tickets:
+            after = Ticket.objects.get(pk=before.pk)
+            assert after.priority == 'URGENT'
+            assert after.sla_due_at < before.sla_due_at
+
+    def test_reports_denied_missing_and_unchanged_tickets(self, make_tickets, technician, manager):
+        mine = make_tickets(2, assigned_to=technician)
+        others = make_tickets(2, assigned_to=manager)
+        mine[1].priority = 'HIGH'
+        mine[1].save()
+
+        result = bulk_update_tickets(technician, ids(mine + others) + [999999], 'priority', priority='HIGH')
+
+        assert (result['requested'], result['updated'], result['unchanged']) == (5, 1, 1)
+        assert result['denied'] == ids(others)
+        assert result['not_found'] == [999999]
+        assert not Ticket.objects.filter(pk__in=ids(others), priority='HIGH').exists()
+
+    def test_statistics_snapshot_follows_bulk_changes(self, make_tickets, it_admin):
+        tickets = make_tickets(4)
+        reconcile(SCOPE_ALL)
+
+        bulk_update_tickets(it_admin, ids(tickets[:3]), 'close')
+
+        assert TicketStatisticsDelta.objects.count() == 1
+        assert get_ticket_statistics(it_admin)['tickets_by_status'] == {'NEW': 1, 'CLOSED': 3}
+        assert reconcile(SCOPE_ALL) == {}
+
+    def test_one_event_queues_notifications(self, make_tickets, it_admin, technician,
+                                            django_capture_on_commit_callbacks):
+        tickets = make_tickets(3)
+
+        with django_capture_on_commit_callbacks(execute=True), transaction.atomic():
+            bulk_update_tickets(it_admin, ids(tickets), 'assign', assignee=technician)
+
+        notified = TicketNotification.objects.filter(event_type='ticket.bulk_updated')
+        assert sorted(notified.values_list('ticket_id', flat=True)) == ids(tickets)
+        assert set(notified.values_list('recipient_id', flat=True)) == {technician.id}
+
+
+@pytest.mark.django_db
+class TestBulkEndpoint:
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+    def test_applies_small_selections_inline(self, make_tickets, manager):
+        tickets = make_tickets(3)
+
+        response = self.client_for(manager).post(
+            URL, {'ticket_ids': ids(tickets), 'operation': 'priority', 'priority': 'HIGH'}, format='json',
+        )
+
+        assert response.status_code == 200
+        assert response.data['updated'] == 3
+        assert Ticket.objects.filter(priority='HIGH').count() == 3
+
+    def test_validates_operation_arguments(self, make_tickets, manager, settings):
+        settings.TICKET_BULK_MAX_IDS = 2
+        client = self.client_for(manager)
+
+        missing = client.post(URL, {'ticket_ids': [1], 'operation': 'status'}, format='json')
+        too_many = client.post(URL, {'ticket_ids': [1, 2, 3], 'operation': 'close'}, format='json')
+        inactive = client.post(URL, {'ticket_ids': [1], 'operation': 'assign', 'assignee_id': 999999}, format='json')
+
+        assert missing.status_code == too_many.status_code == inactive.status_code == 400
+        assert 'status' in missing.data and 'ticket_ids' in too_many.data and 'assignee_id' in inactive.data
+
+    def test_queues_large_selections(self, make_tickets, manager, settings):
+        settings.TICKET_BULK_ASYNC_THRESHOLD = 2
+        tickets = make_tickets(3)
+
+        with mock.patch('apps.tickets.views.bulk_update_tickets_task.delay') as delay:
+            delay.return_value.id = 'task-1'
+            response = self.client_for(manager).post(
+                URL, {'ticket_ids': ids(tickets), 'operation': 'close'}, format='json',
+            )
+
+        assert response.status_code == 202
+        assert response.data['task_id'] == 'task-1'
+        delay.assert_called_once_with(manager.id, ids(tickets), 'close', None, None, None)
+        assert not Ticket.objects.filter(status='CLOSED').exists()
@@ -0,0 +1,108 @@
+"""
+Tests for the SLA escalation scheduler.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.tickets.models import Ticket, TicketNotification
+from apps.tickets.services.escalation import escalate_due_tickets, next_escalation_at
+from apps.tickets.services.notifications import flush_notifications
+
+
+@pytest.mark.django_db
+class TestSchedule:
+    def test_next_escalation_is_the_critical_threshold(self, make_ticket):
+        ticket = make_ticket(priority='HIGH')
+
+        assert ticket.sla_escalation_at == ticket.sla_critical_at
+        assert next_escalation_at() == ticket.sla_critical_at
+
+    def test_resolving_cancels_the_escalation(self, make_ticket, manager):
+        ticket = make_ticket(priority='HIGH')
+
+        ticket.mark_resolved('Restarted the job', manager)
+
+        assert Ticket.objects.get(pk=ticket.pk).sla_escalation_at is None
+        assert next_escalation_at() is None
+
+
+@pytest.mark.django_db
+class TestEscalateDueTickets:
+    def test_escalates_to_l2_then_management(self, make_ticket, it_admin, manager):
+        ticket = make_ticket(priority='HIGH')
+
+        [escalation] = escalate_due_tickets(ticket.sla_critical_at + timedelta(minutes=1))
+
+        assert escalation.escalation_level == 'L2'
+        assert escalation.escalated_to == it_admin
+        assert escalation.escalated_by is None
+        assert list(TicketNotification.objects.values_list('recipient_id', 'event_type')) == [
+            (it_admin.id, 'ticket.escalated'),
+        ]
+        ticket.refresh_from_db()
+        assert ticket.sla_escalation_level == 1
+        assert ticket.sla_escalation_at == ticket.sla_due_at
+        assert escalate_due_tickets(ticket.sla_critical_at + timedelta(minutes=2)) == []
+
+        [escalation] = escalate_due_tickets(ticket.sla_due_at + timedelta(minutes=1))
+
+        assert escalation.escalation_level == 'MANAGEMENT'
+        assert escalation.escalated_to == manager
+        ticket.refresh_from_db()
+        assert ticket.sla_escalation_at is None
+        assert ticket.sla_breach_notified
+
+    def test_missed_stages_escalate_once_to_the_highest(self, make_ticket, it_admin, manager):
+        ticket = make_ticket(priority='HIGH')
+
+        escalations = escalate_due_tickets(ticket.sla_due_at + timedelta(hours=1))
+
+        assert [e.escalation_level for e in escalations] == ['MANAGEMENT']
+
+    def test_stale_schedule_of_resolved_ticket_is_dropped(self, make_ticket, it_admin):
+        ticket = make_ticket(priority='HIGH')
+        Ticket.objects.filter(pk=ticket.pk).update(status='RESOLVED')
+
+        assert escalate_due_tickets(ticket.sla_due_at + timedelta(hours=1)) == []
+        assert Ticket.objects.get(pk=ticket.pk).sla_escalation_at is None
+
+    def test_cost_does_not_depend_on_open_tickets(self, make_ticket, it_admin):
+        def escalate_three_due_tickets():
+            due = [make_ticket(priority='HIGH') for _ in range(3)]
+            with CaptureQueriesContext(connection) as queries:
+                escalations = escalate_due_tickets(due[0].sla_critical_at + timedelta(seconds=5))
+            assert len(escalations) == 3
+            Ticket.objects.filter(pk__in=[t.pk for t in due]).update(status='CLOSED', sla_escalation_at=None)
+            return len(queries)
+
+        baseline = escalate_three_due_tickets()
+        for _ in range(20):
+            make_ticket(priority='LOW')
+
+        assert escalate_three_due_tickets() == baseline
+
+    def test_without_recipients_the_stage_still_advances(self, make_ticket):
+        ticket = make_ticket(priority='HIGH')
+
+        assert escalate_due_tickets(ticket.sla_critical_at + timedelta(minutes=1)) == []
+        assert Ticket.objects.get(pk=ticket.pk).sla_escalation_level == 1
+
+
+@pytest.mark.django_db
+class TestNotifications:
+    def test_batch_is_one_digest_per_recipient(self, make_ticket, manager):
+        manager.email = 'manager@example.com'
+        manager.save(update_fields=['email'])
+        tickets = [make_ticket(priority='HIGH') for _ in range(3)]
+        now = tickets[-1].sla_due_at + timedelta(minutes=1)
+        escalate_due_tickets(now)
+
+        assert flush_notifications(now + timedelta(hours=1)) == 1
+        assert mail.outbox[0].to == ['manager@example.com']
+        assert mail.outbox[0].subject == '3 updates on 3 ticket(s)'
+        assert Ticket.objects.filter(sla_breach_notified=True).count() == 3
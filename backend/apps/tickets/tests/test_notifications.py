@@ -0,0 +1,203 @@
+"""
+Tests for the batched ticket notification pipeline.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.utils import timezone
+
+from apps.core.mail import EmailTransport, NotificationTransport
+from apps.tickets.application import CreateTicket
+from apps.tickets.domain.events import emit_ticket_assigned
+from apps.tickets.models import TicketNotification
+from apps.tickets.services import notifications
+from apps.tickets.services.notifications import (
+    flush_notifications, notification_metrics, notification_stats, queue_notifications,
+)
+
+
+@pytest.fixture(autouse=True)
+def transport(monkeypatch):
+    transport = EmailTransport(backend='django.core.mail.backends.locmem.EmailBackend')
+    monkeypatch.setattr(notifications, 'get_notification_transport', lambda: transport)
+    notification_metrics.reset()
+    return transport
+
+
+@pytest.fixture
+def recipient(technician):
+    technician.email = 'tech@example.com'
+    technician.save(update_fields=['email'])
+    return technician
+
+
+def queue_for(recipient, tickets, message='Assigned to you by manager'):
+    queue_notifications((recipient.id, ticket.id, 'ticket.assigned', message) for ticket in tickets)
+
+
+@pytest.mark.django_db
+class TestQueueing:
+    def test_assignment_event_notifies_the_assignee(self, make_ticket, manager, recipient,
+                                                   django_capture_on_commit_callbacks):
+        ticket = make_ticket()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            emit_ticket_assigned(ticket.id, ticket.title, manager, recipient.id, recipient.username)
+
+        [notification] = TicketNotification.objects.all()
+        assert (notification.recipient, notification.ticket) == (recipient, ticket)
+        assert notification.message == f'Assigned to you by {manager.username}'
+
+    def test_own_actions_are_not_notified(self, make_ticket, recipient,
+                                          django_capture_on_commit_callbacks):
+        ticket = make_ticket()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            emit_ticket_assigned(ticket.id, ticket.title, recipient, recipient.id, recipient.username)
+
+        assert not TicketNotification.objects.exists()
+
+    def test_created_ticket_notifies_its_assignee(self, manager, recipient, ticket_category, ticket_type,
+                                                  django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            CreateTicket().execute(actor=manager, ticket_data={
+                'title': 'Disk full', 'description': 'Server at 100%', 'category_id': ticket_category.id,
+                'ticket_type_id': ticket_type.id, 'priority': 'HIGH', 'assigned_to_id': recipient.id,
+            })
+
+        assert list(TicketNotification.objects.values_list('recipient_id', 'message')) == [
+            (recipient.id, 'New high priority ticket assigned to you'),
+        ]
+
+
+@pytest.mark.django_db
+class TestDigests:
+    def test_storm_collapses_into_one_digest_after_the_quiet_period(self, make_ticket, recipient, settings):
+        settings.NOTIFICATION_DEBOUNCE = 60
+        tickets = [make_ticket(title=f'Outage {i}') for i in range(25)]
+        queue_for(recipient, tickets)
+        now = timezone.now()
+
+        assert flush_notifications(now) == 0
+
+        assert flush_notifications(now + timedelta(seconds=61)) == 1
+        [digest] = mail.outbox
+        assert digest.to == ['tech@example.com']
+        assert digest.subject == '25 updates on 25 ticket(s)'
+        assert 'Outage 24' in digest.body
+        assert not TicketNotification.objects.filter(sent_at__isnull=True).exists()
+
+    def test_continuous_storm_is_flushed_after_the_max_delay(self, make_ticket, recipient, settings):
+        settings.NOTIFICATION_DEBOUNCE = 60
+        settings.NOTIFICATION_MAX_DELAY = 300
+        queue_for(recipient, [make_ticket()])
+        TicketNotification.objects.update(created_at=timezone.now() - timedelta(seconds=301))
+        queue_for(recipient, [make_ticket()])
+
+        assert flush_notifications(timezone.now()) == 1
+        assert mail.outbox[0].subject == '2 updates on 2 ticket(s)'
+
+    def test_single_notification_subject(self, make_ticket, recipient):
+        queue_for(recipient, [make_ticket(title='VPN down')])
+
+        flush_notifications(timezone.now() + timedelta(hours=1))
+
+        assert mail.outbox[0].subject == 'VPN down: Assigned to you by manager'
+
+    def test_inactive_recipients_are_skipped(self, make_ticket, recipient):
+        recipient.is_active = False
+        recipient.save(update_fields=['is_active'])
+        queue_for(recipient, [make_ticket()])
+
+        assert flush_notifications(timezone.now() + timedelta(hours=1)) == 0
+        assert notification_metrics.snapshot()['skipped'] == 1
+        assert not TicketNotification.objects.filter(sent_at__isnull=True).exists()
+
+    def test_rows_claimed_by_an_overlapping_flush_are_not_resent(self, make_ticket, recipient, monkeypatch):
+        queue_for(recipient, [make_ticket()])
+        ready = notifications._ready_recipients
+
+        def other_flush_wins(*args):
+            recipients = ready(*args)
+            TicketNotification.objects.update(sent_at=timezone.now())
+            return recipients
+
+        monkeypatch.setattr(notifications, '_ready_recipients', other_flush_wins)
+
+        assert flush_notifications(timezone.now() + timedelta(hours=1)) == 0
+        assert len(mail.outbox) == 0
+
+    def test_failed_send_stays_queued(self, make_ticket, recipient, monkeypatch):
+        class Down(NotificationTransport):
+            def send_messages(self, messages):
+                raise ConnectionRefusedError('smtp down')
+
+        monkeypatch.setattr(notifications, 'get_notification_transport', Down)
+        queue_for(recipient, [make_ticket()])
+        later = timezone.now() + timedelta(hours=1)
+
+        assert flush_notifications(later) == 0
+        assert notification_stats(later)['queue_depth'] == 1
+        assert notification_metrics.snapshot()['send_failures'] == 1
+
+    def test_refused_digest_does_not_resend_the_others(self, make_ticket, recipient, manager, monkeypatch):
+        class RefusesManager(NotificationTransport):
+            outbox = []
+
+            def send_messages(self, messages):
+                if messages[0].to == [manager.email]:
+                    raise ConnectionRefusedError('recipient refused')
+                self.outbox.extend(messages)
+                return len(messages)
+
+        monkeypatch.setattr(notifications, 'get_notification_transport', RefusesManager)
+        queue_for(manager, [make_ticket()])
+        queue_for(recipient, [make_ticket()])
+        later = timezone.now() + timedelta(hours=1)
+
+        assert flush_notifications(later) == 1
+        assert flush_notifications(later) == 0
+        assert [message.to for message in RefusesManager.outbox] == [['tech@example.com']]
+        assert list(TicketNotification.objects.filter(sent_at__isnull=True).values_list(
+            'recipient_id', 'attempts')) == [(manager.id, 2)]
+
+    def test_repeated_failures_are_dead_lettered(self, make_ticket, recipient, monkeypatch, settings):
+        settings.NOTIFICATION_MAX_ATTEMPTS = 2
+
+        class Down(NotificationTransport):
+            def send_messages(self, messages):
+                raise ConnectionRefusedError('smtp down')
+
+        monkeypatch.setattr(notifications, 'get_notification_transport', Down)
+        queue_for(recipient, [make_ticket()])
+        later = timezone.now() + timedelta(hours=1)
+
+        for _ in range(3):
+            flush_notifications(later)
+
+        stats = notification_stats(later)
+        assert (stats['queue_depth'], stats['dead_lettered']) == (0, 1)
+        assert notification_metrics.snapshot()['send_failures'] == 2
+
+    def test_connections_are_reused_across_flushes(self, make_ticket, recipient, transport):
+        for _ in range(3):
+            queue_for(recipient, [make_ticket()])
+            flush_notifications(timezone.now() + timedelta(hours=1))
+
+        assert len(mail.outbox) == 3
+        assert transport.opened == 1
+
+
+@pytest.mark.django_db
+def test_stats_report_queue_depth_and_throughput(make_ticket, recipient, technician, manager):
+    queue_for(recipient, [make_ticket(), make_ticket()])
+    queue_for(manager, [make_ticket()])
+    now = timezone.now() + timedelta(seconds=30)
+
+    stats = notification_stats(now)
+
+    assert (stats['queue_depth'], stats['queued_recipients']) == (3, 2)
+    assert stats['oldest_age_seconds'] >= 30
+    assert stats['counters']['queued'] == 3
@@ -0,0 +1,151 @@
+"""
+Tests for the stored SLA deadlines, risk thresholds and the breach sweeper.
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.frontend.views.dashboard import DashboardView
+from apps.tickets.models import SLA, Ticket
+from apps.tickets.services.sla import recalculate_sla, risk_level, sweep_sla_breaches
+
+
+def hours_until_due(ticket):
+    return round((ticket.sla_due_at - ticket.created_at).total_seconds() / 3600, 2)
+
+
+@pytest.mark.django_db
+class TestDeadlines:
+    def test_ticket_type_hours_scaled_by_priority(self, make_ticket):
+        ticket = make_ticket(priority='HIGH')
+
+        assert hours_until_due(ticket) == 24
+        assert ticket.sla_warning_at == ticket.sla_due_at - timedelta(hours=12)
+        assert ticket.sla_critical_at == ticket.sla_due_at - timedelta(hours=6)
+        assert not ticket.sla_breached
+
+    def test_active_sla_policy_wins(self, make_ticket, ticket_category, ticket_type):
+        SLA.objects.create(
+            name='Service desk', category=ticket_category, ticket_type=ticket_type,
+            resolution_time_hours=8,
+        )
+
+        assert hours_until_due(make_ticket(priority='CRITICAL')) == 4
+
+    def test_explicit_due_date_is_kept(self, make_ticket):
+        due = timezone.now() + timedelta(hours=2)
+
+        ticket = make_ticket(sla_due_at=due)
+
+        assert ticket.sla_due_at == due
+        assert ticket.sla_critical_at < due
+
+    def test_priority_change_recomputes_the_deadline(self, make_ticket):
+        ticket = make_ticket(priority='MEDIUM')
+        assert hours_until_due(ticket) == 48
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        ticket.priority = 'URGENT'
+        ticket.save()
+
+        ticket.refresh_from_db()
+        assert hours_until_due(ticket) == 6
+
+    def test_other_changes_keep_the_deadline(self, make_ticket):
+        ticket = make_ticket()
+        due = ticket.sla_due_at
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        ticket.title = 'Mail bounces for everyone'
+        ticket.save()
+
+        ticket.refresh_from_db()
+        assert ticket.sla_due_at == due
+
+    def test_resolving_after_the_deadline_is_a_breach(self, make_ticket, manager):
+        late = make_ticket(sla_due_at=timezone.now() - timedelta(minutes=5))
+        on_time = make_ticket()
+
+        late.mark_resolved('Fixed DNS', manager)
+        on_time.mark_resolved('Fixed DNS', manager)
+
+        assert Ticket.objects.get(pk=late.pk).sla_breached
+        assert not Ticket.objects.get(pk=on_time.pk).sla_breached
+
+
+@pytest.mark.django_db
+class TestSweeper:
+    def test_flags_overdue_active_tickets_in_bulk(self, make_ticket, manager):
+        now = timezone.now()
+        overdue = [make_ticket() for _ in range(5)]
+        Ticket.objects.filter(pk__in=[t.pk for t in overdue]).update(sla_due_at=now - timedelta(hours=1))
+        resolved = make_ticket()
+        resolved.mark_resolved('Done', manager)
+        Ticket.objects.filter(pk=resolved.pk).update(sla_due_at=now - timedelta(hours=1))
+        upcoming = make_ticket()
+
+        with CaptureQueriesContext(connection) as queries:
+            breached = sweep_sla_breaches(now, batch_size=2)
+
+        assert sorted(breached) == sorted(t.pk for t in overdue)
+        # Three batches of one SELECT and one UPDATE, plus the empty SELECT
+        assert len(queries) == 7
+        assert set(Ticket.objects.filter(sla_breached=True).values_list('pk', flat=True)) == set(breached)
+        assert not Ticket.objects.get(pk=upcoming.pk).sla_breached
+        assert sweep_sla_breaches(now) == []
+
+    def test_recalculate_after_policy_change(self, make_ticket, ticket_category, ticket_type):
+        tickets = [make_ticket(priority='HIGH') for _ in range(3)]
+        SLA.objects.create(
+            name='Service desk', category=ticket_category, ticket_type=ticket_type,
+            resolution_time_hours=2,
+        )
+
+        assert recalculate_sla(batch_size=2) == 3
+        assert {hours_until_due(Ticket.objects.get(pk=t.pk)) for t in tickets} == {2}
+
+    def test_recalculate_command(self, make_ticket):
+        ticket = make_ticket()
+        Ticket.objects.filter(pk=ticket.pk).update(sla_warning_at=None, sla_critical_at=None)
+
+        call_command('recalculate_sla', '--active-only')
+
+        ticket.refresh_from_db()
+        assert ticket.sla_warning_at == ticket.created_at + timedelta(hours=24)
+
+
+@pytest.mark.django_db
+class TestRiskLevels:
+    def test_levels_from_stored_thresholds(self, make_ticket):
+        ticket = make_ticket(priority='HIGH')
+        start = ticket.created_at
+
+        assert risk_level(ticket, start + timedelta(hours=1)) == 'safe'
+        assert risk_level(ticket, start + timedelta(hours=13)) == 'warning'
+        assert risk_level(ticket, start + timedelta(hours=19)) == 'critical'
+        assert risk_level(ticket, start + timedelta(hours=25)) == 'breached'
+
+    def test_dashboard_lists_tickets_past_their_warning_threshold(self, make_ticket, manager):
+        now = timezone.now()
+        safe = make_ticket()
+        warning = make_ticket()
+        critical = make_ticket()
+        for ticket, elapsed in ((warning, 0.6), (critical, 0.8)):
+            Ticket.objects.filter(pk=ticket.pk).update(
+                sla_warning_at=now - timedelta(hours=24 * (elapsed - 0.5)),
+                sla_critical_at=now + timedelta(hours=24 * (0.75 - elapsed)),
+            )
+
+        risks = DashboardView()._get_sla_risks(manager, manager.role)
+
+        assert risks['risk_count'] == 2
+        assert risks['critical_count'] == 1
+        assert {row['id']: row['risk_level'] for row in risks['risky_tickets']} == {
+            warning.id: 'warning', critical.id: 'critical',
+        }
+        assert safe.id not in {row['id'] for row in risks['risky_tickets']}
@@ -0,0 +1,163 @@
+"""
+Tests for the materialized ticket statistics snapshot.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.tickets.models import (
+    Ticket, TicketCategory, TicketStatisticsDelta, TicketStatisticsSnapshot, TicketStatusHistory,
+)
+from apps.tickets.services.ticket_statistics import (
+    SCOPE_ALL, get_ticket_statistics, reconcile,
+)
+
+
+@pytest.fixture
+def snapshot(db):
+    reconcile(SCOPE_ALL)
+    return TicketStatisticsSnapshot.objects.get(scope=SCOPE_ALL)
+
+
+def counters(payload):
+    """The parts of the payload maintained incrementally."""
+    return {
+        key: value for key, value in payload.items()
+        if key not in ('updated_at', 'reconciled_at', 'created_trend', 'recent_activities',
+                       'upcoming_sla_breaches', 'overdue_tickets')
+    }
+
+
+@pytest.mark.django_db
+class TestIncrementalUpdates:
+    def test_ticket_lifecycle_matches_a_full_recount(self, snapshot, make_ticket, manager):
+        network = TicketCategory.objects.create(name='Network')
+        now = timezone.now()
+        tickets = [
+            make_ticket(priority='HIGH', sla_due_at=now + timedelta(hours=4)),
+            make_ticket(priority='LOW', sla_due_at=now - timedelta(hours=1)),
+            make_ticket(category=network),
+            make_ticket(priority='CRITICAL'),
+        ]
+
+        tickets[0].mark_resolved('Replaced toner', manager)
+        tickets[1].mark_resolved('Rebooted', manager)
+        tickets[1].mark_closed(manager)
+        tickets[2].status = 'IN_PROGRESS'
+        tickets[2].priority = 'URGENT'
+        tickets[2].save()
+        tickets[0].status = 'OPEN'  # reopened
+        tickets[0].resolved_at = None
+        tickets[0].save()
+        Ticket.objects.get(pk=tickets[3].pk).delete()
+        Ticket.objects.get(pk=tickets[2].pk).mark_resolved('Cable swapped', manager)
+
+        incremental = get_ticket_statistics(manager)
+        assert reconcile(SCOPE_ALL) == {}
+        assert counters(get_ticket_statistics(manager)) == counters(incremental)
+        assert incremental['total_tickets'] == 3
+        assert incremental['tickets_by_status'] == {'OPEN': 1, 'RESOLVED': 1, 'CLOSED': 1}
+        assert incremental['tickets_by_category'] == {'General': 2, 'Network': 1}
+        # The Network ticket met the deadline the SLA engine gave it, the second one did not
+        assert incremental['sla_compliance_rate'] == 50.0
+
+    def test_status_changes_are_recorded(self, snapshot, make_ticket, manager):
+        ticket = make_ticket()
+        ticket.mark_resolved('Done', manager)
+
+        history = TicketStatusHistory.objects.get(ticket=ticket)
+        assert (history.from_status, history.to_status) == ('NEW', 'RESOLVED')
+        assert history.changed_by == manager
+
+    def test_ticket_writes_append_deltas_instead_of_locking_the_snapshot(self, snapshot, make_ticket, manager):
+        with CaptureQueriesContext(connection) as queries:
+            make_ticket().mark_resolved('Done', manager)
+
+        assert not [q for q in queries.captured_queries if 'ticket_statistics_snapshots' in q['sql']]
+        assert TicketStatisticsDelta.objects.count() == 2
+        assert reconcile(SCOPE_ALL) == {}
+        assert not TicketStatisticsDelta.objects.exists()
+        assert TicketStatisticsSnapshot.objects.get(scope=SCOPE_ALL).resolved_tickets == 1
+
+    def test_reconcile_keeps_deltas_written_after_its_watermark(self, snapshot, make_ticket):
+        from apps.tickets.services import ticket_statistics
+
+        make_ticket()
+        recount = ticket_statistics.compute_statistics
+
+        def recount_during_a_write(queryset, now=None):
+            values = recount(queryset, now)
+            TicketStatisticsDelta.objects.create(scope=SCOPE_ALL, delta={'total_tickets': 1})
+            return values
+
+        with mock.patch.object(ticket_statistics, 'compute_statistics', recount_during_a_write):
+            assert reconcile(SCOPE_ALL) == {}
+
+        assert list(TicketStatisticsDelta.objects.values_list('delta', flat=True)) == [{'total_tickets': 1}]
+
+    def test_changes_outside_the_model_are_corrected_by_reconcile(self, snapshot, ticket_category, ticket_type):
+        Ticket.objects.bulk_create([
+            Ticket(title='Imported', description='Bulk', category=ticket_category, ticket_type=ticket_type)
+        ])
+
+        drift = reconcile(SCOPE_ALL)
+
+        assert drift['total_tickets'] == {'snapshot': 0, 'actual': 1}
+        assert reconcile(SCOPE_ALL) == {}
+
+
+@pytest.mark.django_db
+class TestReads:
+    def test_reads_snapshot_and_pending_deltas(self, snapshot, make_ticket, manager, django_assert_num_queries):
+        make_ticket()
+
+        with django_assert_num_queries(2):
+            payload = get_ticket_statistics(manager)
+
+        assert payload['total_tickets'] == 1
+        assert payload['open_tickets'] == 1
+
+    def test_many_pending_deltas_are_folded_on_read(self, snapshot, make_ticket, manager, settings):
+        settings.TICKET_STATISTICS_MAX_PENDING = 2
+        for _ in range(3):
+            make_ticket()
+
+        assert get_ticket_statistics(manager)['total_tickets'] == 3
+        assert not TicketStatisticsDelta.objects.exists()
+
+    def test_roles_share_one_snapshot(self, snapshot, make_ticket, all_roles, django_assert_num_queries):
+        make_ticket()
+        payloads = {role: get_ticket_statistics(user) for role, user in all_roles.items()}
+
+        assert TicketStatisticsSnapshot.objects.count() == 1
+        assert payloads['TECHNICIAN'] == payloads['SUPERADMIN'] == payloads['MANAGER']
+        with django_assert_num_queries(0):
+            assert get_ticket_statistics(all_roles['VIEWER'])['total_tickets'] == 0
+
+    def test_missing_or_stale_snapshot_is_reconciled(self, make_ticket, manager, settings):
+        make_ticket()
+        assert get_ticket_statistics(manager)['total_tickets'] == 1
+
+        TicketStatisticsSnapshot.objects.update(
+            total_tickets=0, reconciled_at=timezone.now() - timedelta(hours=1)
+        )
+        assert get_ticket_statistics(manager)['total_tickets'] == 1
+
+    def test_statistics_endpoint(self, snapshot, make_ticket, manager):
+        make_ticket(sla_due_at=timezone.now() + timedelta(hours=2))
+        reconcile(SCOPE_ALL)
+        client = APIClient()
+        client.force_authenticate(user=manager)
+
+        response = client.get('/api/tickets/tickets/statistics/')
+
+        assert response.status_code == 200
+        assert response.data['total_tickets'] == 1
+        assert len(response.data['upcoming_sla_breaches']) == 1
+        assert len(response.data['created_trend']) == 7
@@ -4,14 +4,16 @@ API endpoints for IT support ticket management with role-based access control.
 All permission checks are enforced server-side using domain authority services.
 """
 
-from django.db.models import Count, Q, Avg, F
+import logging
+
+from django.conf import settings
+from django.db.models import Q
 from django.utils import timezone
-from django.core.cache import cache
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from apps.tickets.models import (
     TicketCategory, TicketType, Ticket, TicketComment, TicketAttachment,
@@ -24,7 +26,8 @@ from apps.tickets.serializers import (
     TicketCommentSerializer, TicketAttachmentSerializer, TicketHistorySerializer,
     TicketTemplateSerializer, SLASerializer, TicketEscalationSerializer,
     TicketSatisfactionSerializer, TicketReportSerializer, TicketStatisticsSerializer,
-    TicketSearchSerializer, TicketActionSerializer, TicketTemplateUseSerializer
+    TicketSearchSerializer, TicketActionSerializer, TicketTemplateUseSerializer,
+    BulkTicketOperationSerializer
 )
 from apps.tickets.permissions import (
     CanViewTickets, CanCreateTickets, CanEditTicket, CanDeleteTicket,
@@ -34,6 +37,13 @@ from apps.tickets.permissions import (
 )
 
 from apps.users.models import User
+from apps.tickets.services.bulk_operations import bulk_update_tickets
+from apps.tickets.services.sla import breached_q
+from apps.tickets.services.ticket_statistics import get_ticket_statistics
+from apps.tickets.tasks import bulk_update_tickets as bulk_update_tickets_task
+from apps.core.idempotency import IdempotentAPIMixin
+
+logger = logging.getLogger(__name__)
 
 
 class TicketCategoryViewSet(viewsets.ModelViewSet):
@@ -81,7 +91,7 @@ class TicketTypeViewSet(viewsets.ModelViewSet):
         return queryset.order_by('category__name', 'name')
 
 
-class TicketViewSet(viewsets.ModelViewSet):
+class TicketViewSet(IdempotentAPIMixin, viewsets.ModelViewSet):
     """
     Ticket management viewset with comprehensive filtering and actions.
     All permission checks use domain authority services for strict RBAC.
@@ -153,11 +163,7 @@ class TicketViewSet(viewsets.ModelViewSet):
         # Filter by overdue tickets
         overdue = self.request.query_params.get('overdue')
         if overdue and overdue.lower() == 'true':
-            queryset = queryset.filter(
-                sla_due_at__isnull=False,
-                sla_due_at__lt=timezone.now(),
-                status__in=['NEW', 'OPEN', 'IN_PROGRESS', 'PENDING']
-            )
+            queryset = queryset.filter(breached_q())
         
         # Filter by assigned team
         team = self.request.query_params.get('team')
@@ -597,87 +603,51 @@ class TicketViewSet(viewsets.ModelViewSet):
         message = 'Satisfaction rating created' if created else 'Satisfaction rating updated'
         return Response({'message': message})
     
-    @action(detail=False, methods=['get'])
-    def statistics(self, request):
-        """Get ticket statistics."""
-        # Cache statistics for 5 minutes
-        cache_key = f'ticket_statistics_{request.user.id}'
-        cached_stats = cache.get(cache_key)
-        
-        if cached_stats:
-            return Response(cached_stats)
-        
-        total_tickets = Ticket.objects.count()
-        open_tickets = Ticket.objects.filter(status__in=['NEW', 'OPEN']).count()
-        in_progress_tickets = Ticket.objects.filter(status='IN_PROGRESS').count()
-        resolved_tickets = Ticket.objects.filter(status='RESOLVED').count()
-        closed_tickets = Ticket.objects.filter(status='CLOSED').count()
-        overdue_tickets = Ticket.objects.filter(
-            sla_due_at__isnull=False,
-            sla_due_at__lt=timezone.now(),
-            status__in=['NEW', 'OPEN', 'IN_PROGRESS', 'PENDING']
-        ).count()
-        
-        tickets_by_status = dict(
-            Ticket.objects.values('status').annotate(count=Count('id')).values_list('status', 'count')
-        )
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Assign, change the status or priority of, or close many tickets at once.
+        Authorization: checked per ticket (assign, edit or close permission);
+        tickets the user may not change are reported as denied.
+        """
+        serializer = BulkTicketOperationSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        tickets_by_priority = dict(
-            Ticket.objects.values('priority').annotate(count=Count('id')).values_list('priority', 'count')
-        )
+        data = serializer.validated_data
+        ticket_ids = data['ticket_ids']
+        operation = data['operation']
         
-        tickets_by_category = dict(
-            Ticket.objects.values('category__name').annotate(count=Count('id')).values_list('category__name', 'count')
+        # Large selections are processed by a Celery worker
+        async_threshold = getattr(settings, 'TICKET_BULK_ASYNC_THRESHOLD', 500)
+        if len(set(ticket_ids)) > async_threshold:
+            try:
+                task = bulk_update_tickets_task.delay(
+                    request.user.id, ticket_ids, operation,
+                    data.get('assignee_id'), data.get('status'), data.get('priority')
+                )
+                return Response({
+                    'message': f'Bulk {operation} queued',
+                    'operation': operation,
+                    'requested': len(set(ticket_ids)),
+                    'task_id': task.id,
+                }, status=status.HTTP_202_ACCEPTED)
+            except Exception as e:
+                # If celery is offline, process the selection inline
+                logger.warning(f"Bulk ticket task failed to enqueue, running inline - {str(e)}")
+        
+        assignee = User.objects.get(id=data['assignee_id']) if operation == 'assign' else None
+        result = bulk_update_tickets(
+            request.user, ticket_ids, operation, assignee=assignee,
+            status=data.get('status'), priority=data.get('priority')
         )
         
-        # Calculate SLA compliance rate
-        resolved_tickets_with_sla = Ticket.objects.filter(
-            status__in=['RESOLVED', 'CLOSED'],
-            sla_due_at__isnull=False
-        )
-        total_resolved = resolved_tickets_with_sla.count()
-        compliant_resolved = resolved_tickets_with_sla.filter(
-            resolved_at__lte=F('sla_due_at')
-        ).count()
-        sla_compliance_rate = (compliant_resolved / total_resolved * 100) if total_resolved > 0 else 0
-        
-        # Calculate average resolution time
-        avg_resolution_time = Ticket.objects.filter(
-            status__in=['RESOLVED', 'CLOSED'],
-            resolved_at__isnull=False
-        ).aggregate(
-            avg_time=Avg('resolution_time')
-        )['avg_time']
-        
-        avg_resolution_hours = avg_resolution_time.total_seconds() / 3600 if avg_resolution_time else 0
-        
-        recent_activities = TicketHistory.objects.select_related('ticket', 'user')[:10]
-        
-        upcoming_sla_breaches = Ticket.objects.filter(
-            sla_due_at__isnull=False,
-            sla_due_at__lte=timezone.now() + timedelta(hours=24),
-            sla_due_at__gt=timezone.now(),
-            status__in=['NEW', 'OPEN', 'IN_PROGRESS', 'PENDING']
-        ).select_related('category', 'requester', 'assigned_to')[:10]
-        
-        stats = {
-            'total_tickets': total_tickets,
-            'open_tickets': open_tickets,
-            'in_progress_tickets': in_progress_tickets,
-            'resolved_tickets': resolved_tickets,
-            'closed_tickets': closed_tickets,
-            'overdue_tickets': overdue_tickets,
-            'tickets_by_status': tickets_by_status,
-            'tickets_by_priority': tickets_by_priority,
-            'tickets_by_category': tickets_by_category,
-            'sla_compliance_rate': round(sla_compliance_rate, 2),
-            'average_resolution_time': round(avg_resolution_hours, 2),
-            'recent_activities': TicketHistorySerializer(recent_activities, many=True).data,
-            'upcoming_sla_breaches': TicketListSerializer(upcoming_sla_breaches, many=True).data
-        }
-        
-        cache.set(cache_key, stats, 300)  # Cache for 5 minutes
-        return Response(stats)
+        return Response({'message': f'Bulk {operation} completed', **result})
+    
+    @action(detail=False, methods=['get'])
+    def statistics(self, request):
+        """Get ticket statistics from the materialized snapshot of the user's scope."""
+        return Response(get_ticket_statistics(request.user))
 
 
 class TicketCommentViewSet(viewsets.ModelViewSet):
@@ -782,7 +752,6 @@ class TicketTemplateViewSet(viewsets.ModelViewSet):
             }
             
             ticket = Ticket.objects.create(**ticket_data)
-            ticket.update_sla_due()
             
             return Response({'message': 'Ticket created from template', 'ticket_id': ticket.ticket_id})
         
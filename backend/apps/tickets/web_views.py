@@ -5,16 +5,17 @@ Separate from API viewsets - these render HTML pages for authenticated users.
 
 from django.views.generic import DetailView, ListView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, redirect
 from django.core.exceptions import PermissionDenied
 from django.utils import timezone
-from django.db.models import Prefetch, Q
+from django.db.models import Prefetch
 from django.http import HttpResponse
 from django.contrib.auth import get_user_model
 
 from apps.tickets.models import Ticket, TicketCategory, TicketType
 from apps.logs.models import ActivityLog
+from apps.logs.services.timeline import TIMELINE_ORDERING, timeline_queryset
+from apps.core.pagination import InvalidCursor, keyset_paginate
 from apps.tickets.domain.services.ticket_authority import (
     can_view,
     can_assign,
@@ -492,8 +493,6 @@ class TicketDetailView(LoginRequiredMixin, TicketDetailLoggingMixin, DetailView)
         Returns:
             dict: Mapping of note.id -> note_type
         """
-        from apps.logs.models import ActivityLog
-        
         note_types = {}
         note_ids = [note.id for note in notes]
         
@@ -501,12 +500,8 @@ class TicketDetailView(LoginRequiredMixin, TicketDetailLoggingMixin, DetailView)
             return note_types
         
         # Query ActivityLog for all TICKET_NOTE_ADDED events for these notes
-        # Use case-insensitive matching for entity_type
-        log_entries = ActivityLog.objects.filter(
+        log_entries = timeline_queryset('ticket', ticket.id).filter(
             event_type='TICKET_NOTE_ADDED',
-        ).filter(
-            Q(entity_type__iexact='ticket', entity_id=ticket.id) |
-            Q(model_name__iexact='ticket', object_id=ticket.id)
         ).values('object_id', 'extra_data')
         
         # Build mapping from extra_data which contains note_id and note_type
@@ -633,23 +628,23 @@ class TicketDetailView(LoginRequiredMixin, TicketDetailLoggingMixin, DetailView)
         # =====================================================================
         # ACTIVITY LOG - Source of truth for all ticket events
         # =====================================================================
-        # Query ActivityLog filtered by this ticket
-        # Use case-insensitive matching for entity_type to catch both 'ticket' and 'Ticket'
-        activity_entries = ActivityLog.objects.filter(
-            Q(entity_type__iexact='ticket', entity_id=ticket.id) |
-            Q(model_name__iexact='ticket', object_id=ticket.id)
-        ).select_related(
+        # Query ActivityLog filtered by this ticket (entity timeline index)
+        activity_entries = timeline_queryset('ticket', ticket.id).select_related(
             'user'  # Optional: if you have user FK for legacy data
-        ).order_by('-timestamp')  # Newest first
+        )
         
-        # Paginate activity log (10 entries per page)
-        paginator = Paginator(activity_entries, per_page=10)
-        page_number = self.request.GET.get('activity_page', 1)
-        activities_page = paginator.get_page(page_number)
+        # Paginate activity log (10 entries per page, newest first)
+        cursor = self.request.GET.get('activity_cursor')
+        try:
+            activities_page = keyset_paginate(
+                activity_entries, ordering=TIMELINE_ORDERING, cursor=cursor, page_size=10
+            )
+        except InvalidCursor:
+            activities_page = keyset_paginate(activity_entries, ordering=TIMELINE_ORDERING, page_size=10)
         
         # Format activities for template compatibility
         formatted_activities = []
-        for activity in activities_page:
+        for activity in activities_page.items:
             # Build formatted activity dict that template expects
             formatted = {
                 'actor_name': activity.actor_name or activity.user.username if activity.user else 'System',
@@ -662,11 +657,9 @@ class TicketDetailView(LoginRequiredMixin, TicketDetailLoggingMixin, DetailView)
             }
             formatted_activities.append(formatted)
         
-        # Replace the paginator page with formatted activities
-        activities_page.object_list = formatted_activities
-        
-        context['activities'] = activities_page
-        context['activities_count'] = activity_entries.count()
+        context['activities'] = formatted_activities
+        context['activities_count'] = len(formatted_activities)
+        context['activity_page'] = activities_page
         
         # =====================================================================
         # METADATA FOR DISPLAY
@@ -0,0 +1,95 @@
+"""
+API login pipeline for IT Management Platform.
+
+A login verifies the password hash exactly once (UserLoginSerializer) and
+issues the JWT pair from the validated user. Everything else is written in
+one transaction:
+
+- the user's login bookkeeping with ``save(update_fields=...)``, which
+  skips the password change lookup of ``User.save``;
+- the LoginAttempt, UserSession, SecurityEvent and AuditLog rows, queued
+  with ``queue_audit_records`` and bulk inserted once the transaction
+  commits.
+
+``manage.py benchmark_logins`` replays a morning login storm against it.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.security.audit import queue_audit_records
+from apps.security.signals import successful_login_records
+from apps.security.utils import SecurityLogger, get_client_ip, get_security_counters
+from apps.users.models import LoginAttempt, UserSession
+
+# User fields written by a successful login
+LOGIN_UPDATE_FIELDS = ['last_login', 'last_login_ip', 'last_active', 'failed_login_attempts']
+
+SESSION_LIFETIME = timedelta(days=7)
+
+
+def _session_key(request):
+    session = getattr(request, 'session', None)
+    return getattr(session, 'session_key', None)
+
+
+def complete_login(user, request):
+    """
+    Record a successful login of an authenticated user; returns the token pair.
+    """
+    ip_address = get_client_ip(request)
+    user_agent = request.META.get('HTTP_USER_AGENT', '')
+    now = timezone.now()
+    refresh = RefreshToken.for_user(user)
+    # Token logins have no Django session; the refresh token id is unique
+    session_key = _session_key(request) or refresh['jti']
+
+    with transaction.atomic():
+        user.last_login = now
+        user.last_login_ip = ip_address
+        user.last_active = now
+        user.failed_login_attempts = 0
+        user.save(update_fields=LOGIN_UPDATE_FIELDS)
+
+        queue_audit_records(
+            LoginAttempt(
+                username=user.username,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                successful=True,
+            ),
+            UserSession(
+                user=user,
+                session_key=session_key,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                expires_at=now + SESSION_LIFETIME,
+            ),
+            *successful_login_records(user, request, ip_address, session_key),
+        )
+
+    get_security_counters().delete(f'failed_login_{ip_address}')
+    SecurityLogger.log_successful_login(user.username, ip_address)
+    return {
+        'refresh': str(refresh),
+        'access': str(refresh.access_token),
+    }
+
+
+def record_failed_login(request, username, reason):
+    """
+    Record a rejected login. The SecurityEvent and AuditLog of bad
+    credentials come from the ``user_login_failed`` signal.
+    """
+    queue_audit_records(
+        LoginAttempt(
+            username=(username or '')[:150],
+            ip_address=get_client_ip(request),
+            user_agent=request.META.get('HTTP_USER_AGENT', ''),
+            successful=False,
+            failure_reason=reason[:100],
+        )
+    )
@@ -0,0 +1,204 @@
+"""
+Prefix lookup of users for autocomplete fields.
+
+User pickers (log filters, ticket assignment) used to render every user
+as a ``<select>`` option. They now query ``user_autocomplete`` as the
+user types, which answers from a per-process index instead of the
+database:
+
+- The index holds one compact entry per user and a sorted list of
+  lowercase search keys (username, first name, last name, email), so a
+  prefix lookup is a ``bisect`` plus a scan over the matching keys.
+- The index is stamped with a version kept in the shared cache. Saves and
+  deletions of indexed user fields bump it (``invalidate_directory``), and
+  every worker rebuilds its index, with one query, on its next lookup.
+  Queryset ``update()`` and ``bulk_update`` callers must call
+  ``bump_directory_version`` themselves.
+- ``AUTOCOMPLETE_SCOPES`` decide which users an actor may look up for a
+  given field, mirroring the choices the pickers used to offer.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from apps.core.cache import get_tiered_cache
+from apps.core.domain.roles import is_admin_role
+from apps.users.models import User
+
+# Saves touching these fields invalidate the index
+INDEXED_FIELDS = frozenset({
+    'username', 'email', 'first_name', 'last_name', 'role', 'status', 'is_active',
+})
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+
+_VERSION_KEY = 'version'
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    """A user as shown in autocomplete results."""
+    id: int
+    username: str
+    full_name: str
+    role: str
+    is_active: bool
+
+    def as_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'username': self.username,
+            'full_name': self.full_name,
+            'role': self.role,
+        }
+
+
+class _DirectoryIndex:
+    """Sorted search keys of all users, with the entry id of each key."""
+
+    def __init__(self, version: int, using: str = DEFAULT_DB_ALIAS):
+        self.version = version
+        self.entries: Dict[int, DirectoryEntry] = {}
+        pairs = []
+        rows = User.objects.using(using).values_list(
+            'id', 'username', 'first_name', 'last_name', 'email', 'role', 'is_active',
+        )
+        for user_id, username, first_name, last_name, email, role, is_active in rows.iterator(chunk_size=5000):
+            full_name = f'{first_name} {last_name}'.strip()
+            self.entries[user_id] = DirectoryEntry(user_id, username, full_name, role, is_active)
+            for key in {username, first_name, last_name, email}:
+                if key:
+                    pairs.append((key.lower(), user_id))
+        pairs.sort()
+        self.keys = [key for key, _ in pairs]
+        self.ids = [user_id for _, user_id in pairs]
+        self.by_username = sorted(self.entries.values(), key=lambda entry: entry.username.lower())
+
+    def _candidates(self, prefix: str):
+        if not prefix:
+            yield from self.by_username
+            return
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            yield self.entries[self.ids[position]]
+            position += 1
+
+    def search(self, prefix: str, roles: Optional[FrozenSet[str]] = None,
+               user_ids: Optional[FrozenSet[int]] = None, active_only: bool = True,
+               limit: int = DEFAULT_LIMIT) -> List[DirectoryEntry]:
+        prefix = prefix.strip().lower()
+        matched: Dict[int, DirectoryEntry] = {}
+        for entry in self._candidates(prefix):
+            if entry.id in matched:
+                continue
+            if active_only and not entry.is_active:
+                continue
+            if roles is not None and entry.role not in roles:
+                continue
+            if user_ids is not None and entry.id not in user_ids:
+                continue
+            matched[entry.id] = entry
+            if not prefix and len(matched) >= limit:
+                # Listed in username order already
+                break
+        return sorted(matched.values(), key=lambda entry: entry.username.lower())[:limit]
+
+
+_index: Optional[_DirectoryIndex] = None
+_index_lock = threading.Lock()
+
+
+def _version_cache():
+    return get_tiered_cache('user_directory', timeout=None, local=False)
+
+
+def directory_version() -> int:
+    """Current version stamp of the user index."""
+    versions = _version_cache()
+    version = versions.get(_VERSION_KEY)
+    if version is None:
+        # Start from the clock so an evicted counter never reuses a version
+        versions.add(_VERSION_KEY, time.time_ns())
+        version = versions.get(_VERSION_KEY)
+    return version
+
+
+def bump_directory_version() -> None:
+    """Make every worker rebuild its user index on its next lookup."""
+    versions = _version_cache()
+    if not versions.add(_VERSION_KEY, time.time_ns()):
+        versions.incr(_VERSION_KEY)
+
+
+def get_index(using: str = DEFAULT_DB_ALIAS) -> _DirectoryIndex:
+    """The process's user index, rebuilt if the shared version moved."""
+    global _index
+    version = directory_version()
+    index = _index
+    if index is None or index.version != version:
+        with _index_lock:
+            if _index is None or _index.version != version:
+                _index = _DirectoryIndex(version, using)
+            index = _index
+    return index
+
+
+def invalidate_directory(sender, instance, update_fields=None, using=DEFAULT_DB_ALIAS, **kwargs):
+    """post_save/post_delete receiver bumping the index version on user changes."""
+    if update_fields is not None and not INDEXED_FIELDS.intersection(update_fields):
+        return
+    bump_directory_version()
+    transaction.on_commit(bump_directory_version, using=using)
+
+
+# =============================================================================
+# Autocomplete scopes
+# =============================================================================
+
+def _assignee_scope(actor) -> Optional[Dict]:
+    # Admins assign technicians; technicians can only pick themselves
+    if is_admin_role(actor.role):
+        return {'roles': frozenset({'TECHNICIAN'})}
+    if actor.role == 'TECHNICIAN':
+        return {'user_ids': frozenset({actor.id})}
+    return None
+
+
+def _active_scope(actor) -> Optional[Dict]:
+    if actor.role == 'TECHNICIAN':
+        return {'user_ids': frozenset({actor.id})}
+    return {}
+
+
+def _log_actor_scope(actor) -> Optional[Dict]:
+    # Users whose activity the actor may filter logs by, former ones included
+    if actor.can_view_logs:
+        return {'active_only': False}
+    return {'user_ids': frozenset({actor.id}), 'active_only': False}
+
+
+AUTOCOMPLETE_SCOPES = {
+    'assignee': _assignee_scope,
+    'active': _active_scope,
+    'log_actor': _log_actor_scope,
+}
+
+
+def user_autocomplete(actor, query: str, scope: str = 'active', limit: int = DEFAULT_LIMIT) -> List[DirectoryEntry]:
+    """
+    Users of ``scope`` whose username, name or email starts with ``query``.
+
+    Raises:
+        KeyError: If ``scope`` is not one of AUTOCOMPLETE_SCOPES
+    """
+    filters = AUTOCOMPLETE_SCOPES[scope](actor)
+    if filters is None:
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    return get_index().search(query, limit=limit, **filters)
@@ -0,0 +1,70 @@
+import time
+import uuid
+from unittest import mock
+
+from django.contrib.auth import base_user
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from apps.security.audit import AuditBatch
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the API login pipeline with a morning login storm. '
+        'Runs inside a transaction that is rolled back, so no data is kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=500, help='Number of logins to replay')
+        parser.add_argument('--users', type=int, default=50, help='Number of distinct users logging in')
+        parser.add_argument(
+            '--target', type=int, default=500, help='Logins per minute the deployment must sustain'
+        )
+
+    def handle(self, *args, **options):
+        logins, user_count, target = options['logins'], options['users'], options['target']
+        password = uuid.uuid4().hex
+        prefix = f'bench-{uuid.uuid4().hex[:6]}'
+        client = APIClient(SERVER_NAME='localhost')
+
+        with transaction.atomic():
+            usernames = [f'{prefix}-{i}' for i in range(user_count)]
+            for username in usernames:
+                User.objects.create_user(username=username, password=password)
+            self.stdout.write(f'Created {user_count} users, replaying {logins} logins...')
+
+            hash_checks = mock.Mock(wraps=base_user.check_password)
+            start = time.perf_counter()
+            with mock.patch.object(base_user, 'check_password', hash_checks):
+                # The transaction is rolled back, so write each login's audit
+                # batch, flushed on commit in production, inside the measured block
+                with CaptureQueriesContext(connection) as queries:
+                    for i in range(logins):
+                        response = client.post(
+                            '/api/auth/login/',
+                            {'username': usernames[i % user_count], 'password': password},
+                            format='json',
+                        )
+                        if response.status_code != 200:
+                            raise RuntimeError(f'Login failed with HTTP {response.status_code}')
+                        AuditBatch.flush_current()
+            elapsed = time.perf_counter() - start
+
+            inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+            per_minute = logins / elapsed * 60
+
+            self.stdout.write(f'Elapsed: {elapsed:.2f}s ({per_minute:.0f} logins/min on one worker)')
+            self.stdout.write(f'Password hash checks per login: {hash_checks.call_count / logins:.2f}')
+            self.stdout.write(f'Queries per login: {len(queries.captured_queries) / logins:.1f}')
+            self.stdout.write(f'INSERT statements per login: {len(inserts) / logins:.1f}')
+            self.stdout.write(
+                f'Workers needed for {target} logins/min: {max(1, -(-target // int(per_minute or 1)))}'
+            )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Benchmark finished, changes rolled back'))
@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.users.services import read_export, sync_users
+
+
+class Command(BaseCommand):
+    help = 'Sync user accounts with a directory export (CSV or NDJSON, one account per row)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Export file')
+        parser.add_argument('--format', choices=['csv', 'ndjson'], help='Defaults to the file suffix')
+        parser.add_argument(
+            '--no-deactivate', action='store_true',
+            help='Keep active accounts that are missing from the export',
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Deactivate missing accounts even if rows were rejected or the export looks truncated',
+        )
+        parser.add_argument('--batch-size', type=int, help='Defaults to USER_SYNC_BATCH_SIZE')
+        parser.add_argument('--workers', type=int, help='Password hashing processes')
+        parser.add_argument('--dry-run', action='store_true', help='Report the changes without applying them')
+
+    def handle(self, *args, **options):
+        try:
+            rows = read_export(options['path'], options['format'])
+            result = sync_users(
+                rows,
+                batch_size=options['batch_size'],
+                workers=options['workers'],
+                deactivate_missing=not options['no_deactivate'],
+                dry_run=options['dry_run'],
+                force=options['force'],
+            )
+        except OSError as exc:
+            raise CommandError(f'Cannot read {options["path"]}: {exc}')
+
+        for error in result.errors:
+            self.stderr.write(error)
+        if result.deactivation_skipped:
+            self.stderr.write(
+                f'Missing accounts were not deactivated: {result.deactivation_skipped} (use --force to override)'
+            )
+        prefix = 'Dry run: ' if options['dry_run'] else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'{prefix}{result.created} created, {result.updated} updated, '
+            f'{result.deactivated} deactivated, {result.unchanged} unchanged, '
+            f'{len(result.errors)} rejected rows'
+        ))
@@ -4,9 +4,11 @@ Custom user model with role-based access control.
 """
 
 from django.contrib.auth.models import AbstractUser
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.core.validators import RegexValidator
 from django.utils import timezone
+import secrets
+import string
 import uuid
 
 
@@ -33,6 +35,28 @@ ROLE_LEVEL = {
 }
 
 
+# Random characters in generated employee ids (36**8 combinations per prefix)
+EMPLOYEE_ID_RANDOM_LENGTH = 8
+EMPLOYEE_ID_ATTEMPTS = 5
+
+
+def generate_employee_id(username=''):
+    """
+    Draw a random employee id such as ``EMP-JDOE-4K7Q2ZXA``.
+    
+    The random space makes collisions unlikely enough that callers insert
+    directly and retry on a unique constraint violation instead of
+    checking for existing ids first.
+    """
+    suffix = ''.join(
+        secrets.choice(string.ascii_uppercase + string.digits)
+        for _ in range(EMPLOYEE_ID_RANDOM_LENGTH)
+    )
+    if username:
+        return f"EMP-{username.upper()[:4]}-{suffix}"
+    return f"EMP-{suffix}"
+
+
 class User(AbstractUser):
     """
     Custom user model with extended fields and role-based access control.
@@ -90,6 +114,9 @@ class User(AbstractUser):
         verbose_name_plural = 'Users'
         ordering = ['-created_at']
         
+    # Fields whose loaded values are kept for change detection on save
+    TRACKED_FIELDS = ('password', 'role', 'status', 'is_active', 'is_superuser')
+    
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
     
@@ -249,39 +276,64 @@ class User(AbstractUser):
         return self.role == UserRole.SUPERADMIN
 
     
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {
+            field: instance.__dict__[field]
+            for field in cls.TRACKED_FIELDS if field in instance.__dict__
+        }
+        return instance
+    
+    def fill_defaults(self):
+        """Derive the email and employee_id of a new user if missing."""
+        deferred = self.get_deferred_fields()
         # Set email from username if not provided
-        if not self.email and self.username:
+        if 'email' not in deferred and not self.email and self.username:
             self.email = f"{self.username}@company.com"
         
         # Auto-generate employee_id if not provided
-        if not self.employee_id:
-            import random
-            import string
-            # Generate a unique employee ID
-            random_suffix = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            if self.username:
-                self.employee_id = f"EMP-{self.username.upper()[:4]}-{random_suffix}"
+        if 'employee_id' not in deferred and not self.employee_id:
+            self.employee_id = generate_employee_id(self.username)
+            return True
+        return False
+    
+    def save(self, *args, **kwargs):
+        generated_employee_id = self.fill_defaults()
+        
+        # Update password_changed_at when password changes, comparing with
+        # the password loaded from the database (no lookup needed)
+        update_fields = kwargs.get('update_fields')
+        if (not self._state.adding and 'password' in self.__dict__
+                and (update_fields is None or 'password' in update_fields)):
+            loaded = getattr(self, '_loaded_values', {})
+            if 'password' in loaded:
+                old_password = loaded['password']
             else:
-                self.employee_id = f"EMP-{random_suffix}"
-            
-            # Ensure uniqueness
-            counter = 1
-            original_employee_id = self.employee_id
-            while User.objects.filter(employee_id=self.employee_id).exclude(pk=self.pk).exists():
-                self.employee_id = f"{original_employee_id}-{counter}"
-                counter += 1
+                old_password = User.objects.filter(pk=self.pk).values_list('password', flat=True).first()
+            if old_password is not None and old_password != self.password:
+                self.password_changed_at = timezone.now()
+                if update_fields is not None:
+                    kwargs['update_fields'] = {*update_fields, 'password_changed_at'}
         
-        # Update password_changed_at when password changes
-        if self.pk:
+        if not generated_employee_id:
+            super().save(*args, **kwargs)
+        else:
+            self._save_with_new_employee_id(*args, **kwargs)
+        self._loaded_values = {
+            field: self.__dict__[field] for field in self.TRACKED_FIELDS if field in self.__dict__
+        }
+    
+    def _save_with_new_employee_id(self, *args, **kwargs):
+        # Generated ids are random; on the rare collision draw a new one
+        for attempt in range(EMPLOYEE_ID_ATTEMPTS):
             try:
-                old_user = User.objects.get(pk=self.pk)
-                if old_user.password != self.password:
-                    self.password_changed_at = timezone.now()
-            except User.DoesNotExist:
-                pass
-        
-        super().save(*args, **kwargs)
+                with transaction.atomic(using=kwargs.get('using')):
+                    return super().save(*args, **kwargs)
+            except IntegrityError as e:
+                if 'employee_id' not in str(e) or attempt == EMPLOYEE_ID_ATTEMPTS - 1:
+                    raise
+                self.employee_id = generate_employee_id(self.username)
     
     def get_user_info(self):
         """Get basic user information for API responses"""
@@ -0,0 +1,155 @@
+"""
+Cached principals for JWT-authenticated API requests.
+
+Resolving the user of a JWT would otherwise cost one SELECT per API
+request. Instead, the authentication class (apps.users.authentication)
+reads a compact, immutable Principal from the tiered cache: the user's
+id, role, status, superuser flag, a bitset of the User ``can_*``
+permission properties and the handful of columns views read from
+``request.user``.
+
+- Principals are cached per user under a version stamp kept in the shared
+  cache. Any save of a principal field (role changes through
+  ChangeUserRole, activation and deactivation, status and password
+  changes) bumps the version, so every worker stops using the old
+  principal on its next request. Older versions are never read again
+  and expire after ``PRINCIPAL_CACHE_TIMEOUT`` seconds.
+- ``Principal.to_user`` builds the ``request.user`` instance without a
+  query. Columns outside ``PRINCIPAL_FIELDS`` are deferred, so reading
+  one loads it and ``save()`` only writes the loaded columns.
+- Queryset ``update()`` calls bypass signals; callers changing principal
+  fields that way must call ``bump_principal_version`` themselves.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.core.cache import get_tiered_cache
+from apps.users.models import ROLE_LEVEL, User
+
+# User columns carried by a principal
+PRINCIPAL_FIELDS = (
+    'id', 'username', 'email', 'first_name', 'last_name', 'role', 'status',
+    'is_active', 'is_staff', 'is_superuser', 'department', 'job_title',
+)
+
+# PRINCIPAL_FIELDS in model field order, as Model.from_db expects them
+ROW_FIELDS = tuple(f.attname for f in User._meta.concrete_fields if f.attname in PRINCIPAL_FIELDS)
+
+# Saves touching these fields invalidate the cached principal
+VERSIONED_FIELDS = frozenset(PRINCIPAL_FIELDS) | {'password'}
+
+# User permission properties stored in the principal bitset, one bit each
+PERMISSION_FLAGS = (
+    'is_admin', 'is_manager', 'is_technician',
+    'can_view_dashboard', 'can_access_assets', 'can_access_projects',
+    'can_access_tickets', 'can_access_users', 'can_access_logs',
+    'can_access_reports', 'can_manage_users', 'can_manage_assets',
+    'can_manage_projects', 'can_manage_tickets', 'can_view_logs',
+    'can_view_reports', 'can_manage_settings', 'can_view_audit_logs',
+    'can_manage_security', 'can_manage_workflows', 'can_create_reports',
+    'can_export_data', 'can_change_user_role',
+)
+PERMISSION_BITS = {flag: 1 << index for index, flag in enumerate(PERMISSION_FLAGS)}
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of an authenticated user's identity and permissions."""
+    id: int
+    role: str
+    status: str
+    is_active: bool
+    is_superuser: bool
+    permissions: int
+    version: int
+    row: Tuple  # values of ROW_FIELDS
+    password_stamp: str  # for simplejwt's CHECK_REVOKE_TOKEN
+
+    @classmethod
+    def from_user(cls, user, version: int) -> 'Principal':
+        permissions = 0
+        for flag, bit in PERMISSION_BITS.items():
+            if getattr(user, flag):
+                permissions |= bit
+        return cls(
+            id=user.id,
+            role=user.role,
+            status=user.status,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+            permissions=permissions,
+            version=version,
+            row=tuple(getattr(user, field) for field in ROW_FIELDS),
+            password_stamp=get_md5_hash_password(user.password),
+        )
+
+    @property
+    def role_level(self) -> int:
+        return ROLE_LEVEL.get(self.role, 1)
+
+    def has(self, flag: str) -> bool:
+        """Check a PERMISSION_FLAGS property, e.g. ``principal.has('can_manage_users')``."""
+        return bool(self.permissions & PERMISSION_BITS[flag])
+
+    def to_user(self, using: str = DEFAULT_DB_ALIAS) -> User:
+        """A User instance for ``request.user``; other columns are deferred."""
+        user = User.from_db(using, ROW_FIELDS, self.row)
+        user.principal = self
+        return user
+
+
+def _version_cache():
+    return get_tiered_cache('principal_versions', timeout=None, local=False)
+
+
+def _principal_cache():
+    return get_tiered_cache('principals', timeout=getattr(settings, 'PRINCIPAL_CACHE_TIMEOUT', 3600))
+
+
+def principal_version(user_id) -> int:
+    """Current version stamp of a user's principal."""
+    versions = _version_cache()
+    version = versions.get(str(user_id))
+    if version is None:
+        # Start from the clock so an evicted counter never reuses a version
+        versions.add(str(user_id), time.time_ns())
+        version = versions.get(str(user_id))
+    return version
+
+
+def bump_principal_version(user_id) -> None:
+    """Invalidate every cached principal of a user."""
+    versions = _version_cache()
+    if not versions.add(str(user_id), time.time_ns()):
+        versions.incr(str(user_id))
+
+
+def get_principal(user_id, using: str = DEFAULT_DB_ALIAS) -> Optional[Principal]:
+    """The user's principal, loaded from the database on a cache miss; None if there is no such user."""
+    version = principal_version(user_id)
+
+    def load():
+        user = User.objects.using(using).filter(pk=user_id).only(*PRINCIPAL_FIELDS, 'password').first()
+        return Principal.from_user(user, version) if user is not None else None
+
+    return _principal_cache().get_or_set(f'{user_id}:{version}', load)
+
+
+def invalidate_principal(sender, instance, update_fields=None, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    post_save/post_delete receiver bumping the principal version of users.
+
+    The version is bumped immediately, for later requests in the same
+    transaction, and again on commit, so a principal another worker
+    cached from the old row in between is not kept.
+    """
+    if update_fields is not None and not VERSIONED_FIELDS.intersection(update_fields):
+        return
+    bump_principal_version(instance.pk)
+    transaction.on_commit(lambda: bump_principal_version(instance.pk), using=using)
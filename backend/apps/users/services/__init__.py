@@ -0,0 +1,6 @@
+# Users Services Package
+
+from .provisioning import bulk_provision_users
+from .sync import SyncResult, read_export, sync_users
+
+__all__ = ['bulk_provision_users', 'SyncResult', 'read_export', 'sync_users']
@@ -0,0 +1,158 @@
+"""
+Bulk user provisioning for IT Management Platform.
+
+Creating users one by one through ``create_user`` costs an INSERT for the
+user, another for the profile (post_save signal) and a few receiver
+queries each. ``bulk_provision_users`` creates HR feed accounts in chunks
+of ``USER_PROVISIONING_BATCH_SIZE``: one ``bulk_create`` for the users and
+one for their profiles per chunk.
+
+- Missing emails and employee ids are derived like ``User.save`` does.
+  Generated employee ids are checked against the database with one query
+  per chunk and redrawn on collision.
+- Records without a password get an unusable one (SSO or password reset).
+  Given passwords are hashed in a pool of ``USER_PROVISIONING_HASH_WORKERS``
+  processes, since hashing dominates the cost of a large import.
+- Per-row model signals do not fire; one summary line is logged per chunk
+  and the autocomplete index is invalidated on commit.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from apps.users.lookup import bump_directory_version
+from apps.users.models import User, UserProfile, generate_employee_id
+
+logger = logging.getLogger(__name__)
+
+# Below this many passwords per worker, hashing inline beats the pool overhead
+MIN_PASSWORDS_PER_WORKER = 4
+
+
+def chunked(records: Iterable, size: int) -> Iterator[List]:
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class PasswordHasherPool:
+    """
+    Hashes batches of raw passwords, in a process pool when ``workers`` > 1.
+
+        with PasswordHasherPool(workers=8) as hasher:
+            hashes = hasher.hash(passwords)
+    """
+
+    def __init__(self, workers: int = None):
+        if workers is None:
+            workers = getattr(settings, 'USER_PROVISIONING_HASH_WORKERS', None) or os.cpu_count() or 1
+        self.workers = workers
+        self._executor = None
+
+    def __enter__(self) -> 'PasswordHasherPool':
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def hash(self, passwords: Sequence[Optional[str]]) -> List[str]:
+        """Hash raw passwords, keeping their order; missing ones become unusable."""
+        hashed = [make_password(None) for _ in passwords]
+        given = [(index, password) for index, password in enumerate(passwords) if password]
+        if self.workers <= 1 or len(given) < self.workers * MIN_PASSWORDS_PER_WORKER:
+            for index, password in given:
+                hashed[index] = make_password(password)
+            return hashed
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        chunksize = max(1, len(given) // (self.workers * 4))
+        results = self._executor.map(make_password, [password for _, password in given], chunksize=chunksize)
+        for (index, _), password_hash in zip(given, results):
+            hashed[index] = password_hash
+        return hashed
+
+
+def _build_user(record: Dict, password_hash: str, created_by) -> User:
+    fields = {key: value for key, value in record.items() if key not in ('password', 'profile')}
+    user = User(created_by=created_by, **fields)
+    user.password = password_hash
+    return user
+
+
+def _assign_employee_ids(users: List[User]) -> None:
+    """Fill missing employee ids, redrawing generated ones that are taken."""
+    generated, taken = [], set()
+    for user in users:
+        if user.fill_defaults():
+            generated.append(user)
+        else:
+            taken.add(user.employee_id)
+    while generated:
+        candidates = [user.employee_id for user in generated]
+        taken |= set(User.objects.filter(employee_id__in=candidates).values_list('employee_id', flat=True))
+        collided = []
+        for user in generated:
+            if user.employee_id in taken:
+                user.employee_id = generate_employee_id(user.username)
+                collided.append(user)
+            else:
+                taken.add(user.employee_id)
+        generated = collided
+
+
+def provision_chunk(records: List[Dict], hasher: PasswordHasherPool, created_by=None) -> List[User]:
+    """Create one chunk of users and their profiles; call inside a transaction."""
+    hashes = hasher.hash([record.get('password') for record in records])
+    users = [
+        _build_user(record, password_hash, created_by)
+        for record, password_hash in zip(records, hashes)
+    ]
+    _assign_employee_ids(users)
+    users = User.objects.bulk_create(users)
+    UserProfile.objects.bulk_create([
+        UserProfile(user=user, **record.get('profile', {}))
+        for user, record in zip(users, records)
+    ])
+    for user in users:
+        user._loaded_values = {field: getattr(user, field) for field in User.TRACKED_FIELDS}
+    # bulk_create bypasses the receiver keeping the autocomplete index current
+    transaction.on_commit(bump_directory_version)
+    return users
+
+
+def bulk_provision_users(
+    records: Iterable[Dict], created_by=None, batch_size: int = None, workers: int = None,
+) -> List[User]:
+    """
+    Create users and their profiles in bulk; returns the created users.
+
+    Args:
+        records: Dicts of User field values, optionally with a raw
+            ``password`` and a ``profile`` dict of UserProfile fields
+        created_by: User recorded as creator of the accounts
+        batch_size: Users per chunk (default ``USER_PROVISIONING_BATCH_SIZE``)
+        workers: Password hashing processes (default ``USER_PROVISIONING_HASH_WORKERS``)
+    """
+    batch_size = batch_size or getattr(settings, 'USER_PROVISIONING_BATCH_SIZE', 1000)
+    created = []
+    with PasswordHasherPool(workers) as hasher:
+        for chunk in chunked(records, batch_size):
+            with transaction.atomic():
+                users = provision_chunk(chunk, hasher, created_by)
+            created.extend(users)
+            logger.info(f"Provisioned {len(users)} users ({len(created)} total)")
+    return created
@@ -0,0 +1,325 @@
+"""
+Directory sync for IT Management Platform user accounts.
+
+The nightly directory export (CSV or NDJSON, one account per row) is
+streamed and diffed in memory against an index of the existing users,
+matched by ``employee_id`` and then by ``username``. Changes are applied
+in chunks of ``USER_SYNC_BATCH_SIZE``:
+
+- new accounts are created with ``provision_chunk`` (users and profiles
+  in one ``bulk_create`` each, passwords hashed in a process pool);
+- changed accounts are written with one ``bulk_update`` per chunk;
+- active accounts missing from the export are deactivated at the end,
+  except superusers and the acting user, unless ``deactivate_missing``
+  is off. Rejected rows still count as present for their account. The
+  deactivation pass is refused when any row was rejected or when the
+  export has fewer rows than ``USER_SYNC_MIN_COVERAGE`` of the accounts
+  it could deactivate (a truncated or empty file), unless ``force`` is
+  set.
+
+Each applied chunk writes one summarizing ActivityLog and AuditLog record
+in its transaction. Bulk writes bypass the User signals, so the cached
+principals of updated and deactivated users and the autocomplete index
+are invalidated explicitly.
+
+Recognized columns are ``SYNC_FIELDS`` plus ``active`` (true/false) and
+``password``; other columns are ignored.
+"""
+
+import csv
+import json
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.domain.roles import VALID_ROLES
+from apps.core.services.activity_logger import log_activity
+from apps.logs.models import AuditLog
+from apps.users.lookup import bump_directory_version
+from apps.users.models import User
+from apps.users.principal import bump_principal_version
+from apps.users.services.provisioning import PasswordHasherPool, chunked, provision_chunk
+
+logger = logging.getLogger(__name__)
+
+# User columns taken from the directory export
+SYNC_FIELDS = (
+    'employee_id', 'username', 'email', 'first_name', 'last_name',
+    'phone_number', 'department', 'job_title', 'role',
+)
+# Identity columns, never overwritten with a blank value
+IDENTITY_FIELDS = ('employee_id', 'username', 'email')
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'active'}
+
+
+@dataclass
+class SyncResult:
+    """Counts of a directory sync."""
+    created: int = 0
+    updated: int = 0
+    deactivated: int = 0
+    unchanged: int = 0
+    batches: int = 0
+    errors: List[str] = field(default_factory=list)
+    # Why the deactivation pass was refused, if it was
+    deactivation_skipped: str = ''
+
+
+# =============================================================================
+# Reading exports
+# =============================================================================
+
+def read_export(source, fmt: str = None) -> Iterator[Dict]:
+    """
+    Stream the rows of a CSV or NDJSON export.
+
+    Args:
+        source: Path or text file object
+        fmt: ``'csv'`` or ``'ndjson'``; guessed from the file suffix if omitted
+    """
+    if isinstance(source, (str, Path)):
+        fmt = fmt or ('ndjson' if Path(source).suffix.lower() in ('.ndjson', '.jsonl') else 'csv')
+        with open(source, newline='', encoding='utf-8') as handle:
+            yield from read_export(handle, fmt)
+        return
+
+    if (fmt or 'csv') == 'csv':
+        yield from csv.DictReader(source)
+    else:
+        for line in source:
+            if line.strip():
+                yield json.loads(line)
+
+
+def normalize(row: Dict) -> Dict:
+    """Keep the recognized columns of an export row, stripped."""
+    record = {}
+    for name in SYNC_FIELDS:
+        value = row.get(name)
+        if value is None:
+            continue
+        value = str(value).strip()
+        if value or name not in IDENTITY_FIELDS:
+            record[name] = value.upper() if name == 'role' else value
+    if row.get('active') not in (None, ''):
+        record['is_active'] = str(row['active']).strip().lower() in TRUE_VALUES
+    if row.get('password'):
+        record['password'] = row['password']
+    return record
+
+
+# =============================================================================
+# Sync
+# =============================================================================
+
+class _UserIndex:
+    """Existing users by employee_id and username, as dicts of the synced columns."""
+
+    COLUMNS = ('id', 'is_active', 'status', 'is_superuser') + SYNC_FIELDS
+
+    def __init__(self):
+        self.by_employee_id: Dict[str, Dict] = {}
+        self.by_username: Dict[str, Dict] = {}
+        for row in User.objects.values(*self.COLUMNS).iterator(chunk_size=5000):
+            self.add(row)
+
+    def add(self, row: Dict):
+        if row.get('employee_id'):
+            self.by_employee_id[row['employee_id']] = row
+        self.by_username[row['username']] = row
+
+    def match(self, record: Dict) -> Optional[Dict]:
+        if record.get('employee_id') in self.by_employee_id:
+            return self.by_employee_id[record['employee_id']]
+        return self.by_username.get(record.get('username'))
+
+
+def _diff(existing: Dict, record: Dict) -> Dict:
+    changes = {
+        name: value for name, value in record.items()
+        if name in SYNC_FIELDS and existing[name] != value
+    }
+    if 'is_active' in record and record['is_active'] != existing['is_active']:
+        changes['is_active'] = record['is_active']
+        changes['status'] = 'ACTIVE' if record['is_active'] else 'INACTIVE'
+    return changes
+
+
+class UserSync:
+    """One directory sync run; see the module docstring."""
+
+    def __init__(self, actor=None, batch_size: int = None, workers: int = None,
+                 deactivate_missing: bool = True, dry_run: bool = False, force: bool = False):
+        self.actor = actor
+        self.batch_size = batch_size or getattr(settings, 'USER_SYNC_BATCH_SIZE', 1000)
+        self.workers = workers
+        self.deactivate_missing = deactivate_missing
+        self.dry_run = dry_run
+        self.force = force
+        self.result = SyncResult()
+
+    def run(self, rows: Iterable[Dict]) -> SyncResult:
+        index = _UserIndex()
+        seen: Set[int] = set()
+        creates: List[Dict] = []
+        updates: List[Dict] = []
+        line = 0
+
+        with PasswordHasherPool(self.workers) as hasher:
+            for line, row in enumerate(rows, start=1):
+                record = normalize(row)
+                error = self._validate(record)
+                if error:
+                    self.result.errors.append(f'Row {line}: {error}')
+                    # The account is in the export, only this row is unusable
+                    existing = index.match(record)
+                    if existing is not None and existing['id'] is not None:
+                        seen.add(existing['id'])
+                    continue
+
+                existing = index.match(record)
+                if existing is None:
+                    record.setdefault('status', 'ACTIVE' if record.get('is_active', True) else 'INACTIVE')
+                    creates.append(record)
+                    # Later rows for the same account are duplicates
+                    index.add({'id': None, **record})
+                elif existing['id'] is None or existing['id'] in seen:
+                    self.result.errors.append(f'Row {line}: duplicate account {record.get("username")}')
+                else:
+                    seen.add(existing['id'])
+                    changes = _diff(existing, record)
+                    if changes:
+                        updates.append({**existing, **changes, 'changed': set(changes)})
+                    else:
+                        self.result.unchanged += 1
+
+                if len(creates) >= self.batch_size:
+                    self._apply_creates(creates, hasher)
+                    creates = []
+                if len(updates) >= self.batch_size:
+                    self._apply_updates(updates)
+                    updates = []
+
+            if creates:
+                self._apply_creates(creates, hasher)
+            if updates:
+                self._apply_updates(updates)
+
+        if self.deactivate_missing:
+            candidates = [
+                row['id'] for row in index.by_username.values()
+                if row['id'] is not None and row['is_active'] and not row['is_superuser']
+                and row['id'] != getattr(self.actor, 'pk', None)
+            ]
+            self.result.deactivation_skipped = '' if self.force else self._refuse_deactivation(
+                line, len(candidates)
+            )
+            if self.result.deactivation_skipped:
+                logger.warning(f"Directory sync: deactivation skipped, {self.result.deactivation_skipped}")
+            else:
+                missing = [user_id for user_id in candidates if user_id not in seen]
+                for chunk in chunked(missing, self.batch_size):
+                    self._apply_deactivations(chunk)
+
+        logger.info(
+            f"Directory sync: {self.result.created} created, {self.result.updated} updated, "
+            f"{self.result.deactivated} deactivated, {self.result.unchanged} unchanged, "
+            f"{len(self.result.errors)} rejected rows"
+        )
+        return self.result
+
+    def _refuse_deactivation(self, rows: int, candidates: int) -> str:
+        """Why deactivating missing accounts is unsafe for this export, or ''."""
+        if self.result.errors:
+            return f'{len(self.result.errors)} rows were rejected'
+        coverage = getattr(settings, 'USER_SYNC_MIN_COVERAGE', 0.5)
+        if rows < candidates * coverage:
+            return f'the export has {rows} rows for {candidates} active accounts'
+        return ''
+
+    @staticmethod
+    def _validate(record: Dict) -> Optional[str]:
+        if not record.get('username'):
+            return 'missing username'
+        if 'role' in record and record['role'] not in VALID_ROLES:
+            return f'unknown role {record["role"]}'
+        return None
+
+    # ------------------------------------------------------------------
+    # Applying chunks
+    # ------------------------------------------------------------------
+
+    def _apply_creates(self, records: List[Dict], hasher: PasswordHasherPool):
+        if not self.dry_run:
+            with transaction.atomic():
+                provision_chunk(records, hasher, created_by=self.actor)
+                self._log_batch('created', [record['username'] for record in records])
+        self.result.created += len(records)
+
+    def _apply_updates(self, rows: List[Dict]):
+        fields = sorted(set().union(*(row['changed'] for row in rows)))
+        now = timezone.now()
+        users = [
+            User(id=row['id'], updated_by=self.actor, updated_at=now, **{name: row[name] for name in fields})
+            for row in rows
+        ]
+        if not self.dry_run:
+            with transaction.atomic():
+                User.objects.bulk_update(users, fields + ['updated_by', 'updated_at'])
+                self._log_batch('updated', [row['username'] for row in rows], fields)
+                self._invalidate([row['id'] for row in rows])
+        self.result.updated += len(rows)
+
+    def _apply_deactivations(self, user_ids: List[int]):
+        if not self.dry_run:
+            with transaction.atomic():
+                usernames = list(User.objects.filter(pk__in=user_ids).values_list('username', flat=True))
+                User.objects.filter(pk__in=user_ids).update(
+                    is_active=False, status='INACTIVE', updated_by=self.actor, updated_at=timezone.now()
+                )
+                self._log_batch('deactivated', usernames)
+                self._invalidate(user_ids)
+        self.result.deactivated += len(user_ids)
+
+    @staticmethod
+    def _invalidate(user_ids: List[int]):
+        def bump():
+            for user_id in user_ids:
+                bump_principal_version(user_id)
+            bump_directory_version()
+        transaction.on_commit(bump)
+
+    def _log_batch(self, operation: str, usernames: List[str], fields: List[str] = ()):
+        self.result.batches += 1
+        summary = f'Directory sync batch {self.result.batches}: {len(usernames)} users {operation}'
+        if fields:
+            summary += f' ({", ".join(fields)})'
+        log_activity(
+            actor=self.actor,
+            action='IMPORT',
+            target_type='user',
+            title=summary,
+            description=summary,
+            metadata={'operation': operation, 'count': len(usernames), 'fields': list(fields)},
+        )
+        AuditLog.objects.create(
+            user=self.actor,
+            action='DATA_IMPORT',
+            risk_level='HIGH' if operation == 'deactivated' else 'MEDIUM',
+            model_name='User',
+            object_id=0,
+            object_repr=f'Directory sync batch {self.result.batches}',
+            changes_summary=summary,
+            extra_data={'operation': operation, 'fields': list(fields), 'usernames': usernames},
+        )
+
+
+def sync_users(rows: Iterable[Dict], actor=None, **options) -> SyncResult:
+    """Sync user accounts with directory export rows (see ``read_export``)."""
+    return UserSync(actor=actor, **options).run(rows)
@@ -8,6 +8,8 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 from .models import UserProfile, UserSession, LoginAttempt
+from .lookup import invalidate_directory
+from .principal import invalidate_principal
 import logging
 
 User = get_user_model()
@@ -30,6 +32,9 @@ def save_user_profile(sender, instance, **kwargs):
     """
     Save user profile when user is updated.
     """
+    if kwargs.get('update_fields') is not None:
+        # Partial saves (e.g. login bookkeeping) leave the profile alone
+        return
     try:
         if hasattr(instance, 'profile'):
             instance.profile.save()
@@ -44,25 +49,27 @@ def log_user_changes(sender, instance, created, **kwargs):
     """
     Log user creation and updates.
     """
+    update_fields = kwargs.get('update_fields')
     if created:
         logger.info(f"New user created: {instance.username} ({instance.email})")
-    else:
-        # Log significant changes
-        try:
-            old_instance = User.objects.get(pk=instance.pk)
-            changes = []
-            
-            if old_instance.role != instance.role:
-                changes.append(f"role: {old_instance.role} -> {instance.role}")
-            if old_instance.status != instance.status:
-                changes.append(f"status: {old_instance.status} -> {instance.status}")
-            if old_instance.is_active != instance.is_active:
-                changes.append(f"is_active: {old_instance.is_active} -> {instance.is_active}")
-            
-            if changes:
-                logger.info(f"User {instance.username} updated: {', '.join(changes)}")
-        except User.DoesNotExist:
-            pass
+    elif update_fields is None or set(update_fields) & {'role', 'status', 'is_active'}:
+        # Log significant changes against the values loaded before the save
+        loaded = getattr(instance, '_loaded_values', {})
+        changes = [
+            f"{field}: {loaded[field]} -> {getattr(instance, field)}"
+            for field in ('role', 'status', 'is_active')
+            if field in loaded and loaded[field] != getattr(instance, field)
+        ]
+        if changes:
+            logger.info(f"User {instance.username} updated: {', '.join(changes)}")
+
+# Cached principals of JWT requests follow saves and deletions of users
+post_save.connect(invalidate_principal, sender=User, dispatch_uid='invalidate_user_principal')
+post_delete.connect(invalidate_principal, sender=User, dispatch_uid='invalidate_deleted_user_principal')
+
+# The autocomplete index follows saves and deletions of users
+post_save.connect(invalidate_directory, sender=User, dispatch_uid='invalidate_user_directory')
+post_delete.connect(invalidate_directory, sender=User, dispatch_uid='invalidate_deleted_user_directory')
 
 @receiver(post_delete, sender=User)
 def log_user_deletion(sender, instance, **kwargs):
@@ -97,6 +104,9 @@ def update_last_activity(sender, instance, **kwargs):
     """
     Update user's last activity timestamp.
     """
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'last_active' in update_fields:
+        return
     instance.last_active = timezone.now()
     # Don't save here to avoid infinite recursion - just update the timestamp field
     User.objects.filter(pk=instance.pk).update(last_active=timezone.now())
@@ -0,0 +1,107 @@
+"""
+Tests for the API login pipeline.
+"""
+
+import pytest
+from django.contrib.auth import base_user
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.security.models import AuditLog, SecurityEvent
+from apps.users.models import LoginAttempt, User, UserSession
+
+LOGIN_URL = '/api/auth/login/'
+
+
+@pytest.fixture
+def hash_checks(monkeypatch):
+    calls = []
+    check_password = base_user.check_password
+
+    def counting_check_password(*args, **kwargs):
+        calls.append(args)
+        return check_password(*args, **kwargs)
+
+    monkeypatch.setattr(base_user, 'check_password', counting_check_password)
+    return calls
+
+
+def login(username, password='testpass123'):
+    return APIClient().post(LOGIN_URL, {'username': username, 'password': password}, format='json')
+
+
+@pytest.mark.django_db
+class TestSuccessfulLogin:
+    def test_issues_tokens_after_one_hash_check(self, technician, hash_checks):
+        response = login(technician.username)
+
+        assert response.status_code == 200
+        assert AccessToken(response.data['access'])['user_id'] == technician.id
+        assert len(hash_checks) == 1
+
+    def test_records_the_login_in_one_batch_after_commit(self, technician,
+                                                         django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            with CaptureQueriesContext(connection) as queries:
+                login(technician.username)
+        assert not any(q['sql'].startswith('INSERT') for q in queries.captured_queries)
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT')]
+        assert len(inserts) == 4
+        assert LoginAttempt.objects.get().successful
+        assert SecurityEvent.objects.get().event_type == 'LOGIN_SUCCESS'
+        assert AuditLog.objects.get().action == 'LOGIN'
+        session = UserSession.objects.get()
+        assert session.user == technician
+        assert len(session.session_key) == 32  # refresh token id
+
+    def test_bookkeeping_save_skips_the_password_lookup(self, technician):
+        User.objects.filter(pk=technician.pk).update(failed_login_attempts=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            login(technician.username)
+
+        user_selects = [
+            q['sql'] for q in queries.captured_queries
+            if q['sql'].startswith('SELECT') and 'FROM "users"' in q['sql']
+        ]
+        assert len(user_selects) == 1  # authentication
+        technician.refresh_from_db()
+        assert technician.failed_login_attempts == 0
+        assert technician.last_login_ip == '127.0.0.1'
+
+    def test_repeated_token_logins_get_their_own_sessions(self, technician,
+                                                          django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            assert login(technician.username).status_code == 200
+            assert login(technician.username).status_code == 200
+
+        assert UserSession.objects.filter(user=technician).count() == 2
+
+
+@pytest.mark.django_db
+def test_failed_login_is_recorded(technician, hash_checks, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        response = login(technician.username, password='wrong')
+
+    assert response.status_code == 400
+    attempt = LoginAttempt.objects.get()
+    assert (attempt.successful, attempt.failure_reason) == (False, 'Invalid credentials')
+    assert SecurityEvent.objects.get().event_type == 'LOGIN_FAILURE'
+    assert len(hash_checks) == 1
+
+
+@pytest.mark.django_db
+def test_password_change_still_stamps_password_changed_at(technician):
+    stamp = technician.password_changed_at
+    technician.set_password('n3w-Passw0rd!')
+    technician.save(update_fields=['password'])
+
+    technician.refresh_from_db()
+    assert technician.password_changed_at > stamp
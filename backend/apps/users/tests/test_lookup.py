@@ -0,0 +1,93 @@
+"""
+Tests for the user autocomplete index and endpoint.
+"""
+
+import pytest
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.users.lookup import get_index, user_autocomplete
+from apps.users.models import User
+
+
+def usernames(entries):
+    return [entry.username for entry in entries]
+
+
+@pytest.mark.django_db
+class TestUserAutocomplete:
+    def test_matches_username_name_and_email_prefixes(self, it_admin):
+        User.objects.create_user(username='jdoe', email='jane@test.local', first_name='Jane', last_name='Doe')
+
+        assert usernames(user_autocomplete(it_admin, 'jd')) == ['jdoe']
+        assert usernames(user_autocomplete(it_admin, 'JAN')) == ['jdoe']
+        assert usernames(user_autocomplete(it_admin, 'doe')) == ['jdoe']
+        assert user_autocomplete(it_admin, 'oe') == []
+
+    def test_lookups_reuse_the_index(self, it_admin):
+        user_autocomplete(it_admin, 'it')
+
+        with CaptureQueriesContext(connection) as queries:
+            user_autocomplete(it_admin, 'tech')
+
+        assert not [q for q in queries.captured_queries if 'FROM "users"' in q['sql']]
+
+    def test_user_changes_refresh_the_index(self, it_admin, technician):
+        index = get_index()
+
+        technician.username = 'renamed'
+        technician.save()
+
+        assert get_index() is not index
+        assert usernames(user_autocomplete(it_admin, 'ren', scope='assignee')) == ['renamed']
+
+    def test_login_saves_keep_the_index(self, technician):
+        index = get_index()
+
+        technician.save(update_fields=['last_login'])
+
+        assert get_index() is index
+
+    def test_assignee_scope_follows_role(self, all_roles, technician):
+        User.objects.create_user(username='tech-retired', role='TECHNICIAN', is_active=False)
+
+        assert usernames(user_autocomplete(all_roles['IT_ADMIN'], '', scope='assignee')) == ['technician']
+        assert usernames(user_autocomplete(technician, '', scope='assignee')) == ['technician']
+        assert user_autocomplete(all_roles['VIEWER'], '', scope='assignee') == []
+
+    def test_log_actor_scope_includes_inactive_users(self, it_admin, viewer):
+        User.objects.create_user(username='former', is_active=False)
+
+        assert 'former' in usernames(user_autocomplete(it_admin, 'for', scope='log_actor'))
+        assert usernames(user_autocomplete(viewer, '', scope='log_actor')) == ['viewer']
+
+
+@pytest.mark.django_db
+class TestUserAutocompleteApi:
+    @pytest.fixture
+    def client(self, it_admin):
+        client = Client()
+        client.force_login(it_admin)
+        return client
+
+    def test_returns_matching_users(self, client, technician):
+        response = client.get(reverse('frontend:user-autocomplete-api'), {'q': 'tec', 'scope': 'assignee'})
+
+        assert response.status_code == 200
+        assert response.json()['results'] == [
+            {'id': technician.id, 'username': 'technician', 'full_name': '', 'role': 'TECHNICIAN'}
+        ]
+
+    def test_rejects_unknown_scope(self, client):
+        response = client.get(reverse('frontend:user-autocomplete-api'), {'scope': 'everyone'})
+
+        assert response.status_code == 400
+
+    def test_create_ticket_form_does_not_list_users(self, client, all_roles):
+        response = client.get(reverse('frontend:create-ticket'))
+
+        assert response.status_code == 200
+        assert b'data-user-autocomplete' in response.content
+        assert b'<option value="%d"' % all_roles['VIEWER'].id not in response.content
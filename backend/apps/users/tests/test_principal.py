@@ -0,0 +1,83 @@
+"""
+Tests for cached JWT principals.
+"""
+
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.users.application import ChangeUserRole
+from apps.users.authentication import CachedJWTAuthentication
+from apps.users.principal import PERMISSION_FLAGS, get_principal, principal_version
+
+
+def authenticate(user):
+    request = RequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    authenticated, _ = CachedJWTAuthentication().authenticate(request)
+    return authenticated
+
+
+@pytest.mark.django_db
+class TestAuthentication:
+    def test_repeated_requests_do_not_query_the_user(self, technician):
+        authenticate(technician)
+
+        with CaptureQueriesContext(connection) as queries:
+            user = authenticate(technician)
+
+        assert len(queries) == 0
+        assert (user.pk, user.username, user.role) == (technician.pk, 'technician', 'TECHNICIAN')
+        assert user.principal.has('can_manage_assets')
+        assert not user.principal.has('can_manage_users')
+
+    def test_deferred_columns_load_on_access(self, technician):
+        user = authenticate(technician)
+
+        assert user.employee_id == technician.employee_id
+
+    def test_role_change_replaces_the_principal(self, technician, superadmin):
+        assert authenticate(technician).role == 'TECHNICIAN'
+
+        result = ChangeUserRole().execute(actor=superadmin, target_user=technician, new_role='MANAGER')
+
+        assert result.success
+        user = authenticate(technician)
+        assert user.role == 'MANAGER'
+        assert user.principal.has('can_access_users')
+
+    def test_deactivated_user_is_rejected(self, technician):
+        authenticate(technician)
+
+        technician.is_active = False
+        technician.save()
+
+        with pytest.raises(AuthenticationFailed):
+            authenticate(technician)
+
+    def test_password_change_bumps_the_version(self, technician):
+        version = principal_version(technician.pk)
+
+        technician.set_password('n3w-Passw0rd!')
+        technician.save(update_fields=['password'])
+
+        assert principal_version(technician.pk) != version
+
+    def test_login_bookkeeping_keeps_the_version(self, technician):
+        version = principal_version(technician.pk)
+
+        technician.failed_login_attempts = 0
+        technician.save(update_fields=['failed_login_attempts', 'last_active'])
+
+        assert principal_version(technician.pk) == version
+
+
+@pytest.mark.django_db
+def test_permission_bits_match_the_user_properties(all_roles):
+    for user in all_roles.values():
+        principal = get_principal(user.pk)
+        assert {flag: principal.has(flag) for flag in PERMISSION_FLAGS} == {
+            flag: getattr(user, flag) for flag in PERMISSION_FLAGS
+        }
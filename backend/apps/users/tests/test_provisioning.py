@@ -0,0 +1,75 @@
+"""
+Tests for user change detection and bulk provisioning.
+"""
+
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.users import models as user_models
+from apps.users.models import User, UserProfile
+from apps.users.services import bulk_provision_users
+
+
+@pytest.mark.django_db
+class TestUserSave:
+    def test_loaded_user_saves_without_a_lookup(self, technician):
+        user = User.objects.get(pk=technician.pk)
+
+        with CaptureQueriesContext(connection) as queries:
+            user.department = 'Networking'
+            user.save()
+
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('SELECT')]
+        assert not [sql for sql in selects if 'FROM "users"' in sql]
+
+    def test_password_change_is_detected_from_loaded_values(self, technician):
+        user = User.objects.get(pk=technician.pk)
+        stamp = user.password_changed_at
+
+        user.set_password('n3w-Passw0rd!')
+        user.save()
+        user.save()  # nothing changed since
+
+        user.refresh_from_db()
+        assert user.password_changed_at > stamp
+
+    def test_generated_employee_id_is_redrawn_on_collision(self, technician, monkeypatch):
+        ids = iter([technician.employee_id, 'EMP-FRES-00000001'])
+        monkeypatch.setattr(user_models, 'generate_employee_id', lambda username='': next(ids))
+
+        user = User.objects.create_user(username='fresh', password='testpass123')
+
+        assert user.employee_id == 'EMP-FRES-00000001'
+
+
+@pytest.mark.django_db
+class TestBulkProvisioning:
+    def test_creates_users_and_profiles_in_bulk(self, manager):
+        records = [
+            {'username': f'hr{i}', 'first_name': f'Hire {i}', 'department': 'Finance', 'profile': {'city': 'Oslo'}}
+            for i in range(50)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            users = bulk_provision_users(records, created_by=manager, batch_size=20)
+
+        assert len(users) == 50
+        assert len(queries) <= 3 * 5  # employee id check and two INSERTs per chunk, plus savepoints
+        assert UserProfile.objects.filter(user__in=users, city='Oslo').count() == 50
+        stored = User.objects.get(username='hr7')
+        assert (stored.email, stored.created_by) == ('hr7@company.com', manager)
+        assert stored.employee_id.startswith('EMP-HR7-')
+        assert not stored.has_usable_password()
+
+    def test_colliding_generated_ids_are_redrawn(self, technician):
+        with mock.patch('apps.users.services.provisioning.generate_employee_id',
+                        side_effect=['EMP-NEW-1']):
+            with mock.patch.object(user_models, 'generate_employee_id',
+                                   side_effect=[technician.employee_id]):
+                [user] = bulk_provision_users([{'username': 'new', 'password': 'testpass123'}])
+
+        assert user.employee_id == 'EMP-NEW-1'
+        assert User.objects.get(username='new').check_password('testpass123')
@@ -0,0 +1,140 @@
+"""
+Tests for the directory sync service.
+"""
+
+import io
+import json
+
+import pytest
+from django.contrib.auth.hashers import check_password
+
+from apps.logs.models import ActivityLog, AuditLog
+from apps.users.models import User, UserProfile
+from apps.users.principal import principal_version
+from apps.users.services import read_export, sync_users
+from apps.users.services.provisioning import PasswordHasherPool
+
+
+def _row(username, **fields):
+    return {'username': username, 'employee_id': f'EMP-{username.upper()}', **fields}
+
+
+class TestReadExport:
+    def test_reads_csv(self):
+        source = io.StringIO('username,role,active\nalice,technician,true\nbob,viewer,no\n')
+
+        rows = list(read_export(source, 'csv'))
+
+        assert [row['username'] for row in rows] == ['alice', 'bob']
+        assert rows[1]['active'] == 'no'
+
+    def test_reads_ndjson_skipping_blank_lines(self):
+        source = io.StringIO(json.dumps({'username': 'alice'}) + '\n\n' + json.dumps({'username': 'bob'}) + '\n')
+
+        assert [row['username'] for row in read_export(source, 'ndjson')] == ['alice', 'bob']
+
+
+@pytest.mark.django_db
+class TestSyncUsers:
+    def test_creates_updates_and_deactivates(self, technician, manager, superadmin):
+        technician.employee_id = 'EMP-TECH'
+        technician.save()
+        rows = [
+            _row('newcomer', role='technician', password='S3cret-pass!', department='IT'),
+            {'username': technician.username, 'employee_id': 'EMP-TECH', 'job_title': 'Lead', 'role': 'technician'},
+        ]
+
+        result = sync_users(rows, actor=superadmin, batch_size=10, workers=1)
+
+        assert (result.created, result.updated, result.deactivated) == (1, 1, 1)
+        newcomer = User.objects.get(username='newcomer')
+        assert newcomer.role == 'TECHNICIAN' and newcomer.created_by == superadmin
+        assert check_password('S3cret-pass!', newcomer.password)
+        assert UserProfile.objects.filter(user=newcomer).exists()
+        technician.refresh_from_db()
+        assert technician.job_title == 'Lead' and technician.updated_by == superadmin
+        manager.refresh_from_db()
+        assert not manager.is_active and manager.status == 'INACTIVE'
+        # The acting user is never deactivated by their own sync
+        superadmin.refresh_from_db()
+        assert superadmin.is_active
+
+    def test_unchanged_rows_are_not_written(self, technician):
+        row = {'username': technician.username, 'email': technician.email, 'role': technician.role}
+
+        result = sync_users([row], deactivate_missing=False)
+
+        assert (result.updated, result.unchanged) == (0, 1)
+        assert not AuditLog.objects.filter(action='DATA_IMPORT').exists()
+
+    def test_one_summary_log_per_batch(self):
+        rows = [_row(f'user{i}') for i in range(5)]
+
+        result = sync_users(rows, batch_size=2, workers=1)
+
+        assert result.created == 5 and result.batches == 3
+        assert AuditLog.objects.filter(action='DATA_IMPORT').count() == 3
+        assert ActivityLog.objects.filter(action='IMPORT').count() == 3
+
+    def test_invalid_and_duplicate_rows_are_rejected(self):
+        rows = [_row('alice'), {'role': 'VIEWER'}, _row('bob', role='OWNER'), _row('alice')]
+
+        result = sync_users(rows, workers=1)
+
+        assert result.created == 1
+        assert len(result.errors) == 3
+
+    def test_rejected_row_keeps_its_account_active(self, technician, manager):
+        rows = [
+            {'username': technician.username, 'role': 'TECHNICIAN'},
+            {'username': manager.username, 'role': 'MANGER'},
+        ]
+
+        result = sync_users(rows, workers=1, force=True)
+
+        assert result.deactivated == 0 and len(result.errors) == 1
+        manager.refresh_from_db()
+        assert manager.is_active
+
+    def test_rejected_rows_refuse_deactivation(self, technician, manager):
+        rows = [{'username': technician.username}, {'username': 'ghost', 'role': 'OWNER'}]
+
+        result = sync_users(rows, workers=1)
+
+        assert result.deactivated == 0 and 'rejected' in result.deactivation_skipped
+        manager.refresh_from_db()
+        assert manager.is_active
+
+    def test_truncated_export_refuses_deactivation(self, all_roles):
+        result = sync_users([])
+
+        assert result.deactivated == 0 and result.deactivation_skipped
+        assert User.objects.filter(is_active=False).count() == 0
+        assert sync_users([], force=True).deactivated > 0
+
+    def test_deactivation_invalidates_principal(self, technician, django_capture_on_commit_callbacks):
+        version = principal_version(technician.pk)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sync_users([], force=True)
+
+        assert principal_version(technician.pk) != version
+
+    def test_dry_run_changes_nothing(self, technician):
+        result = sync_users([_row('newcomer')], dry_run=True)
+
+        assert (result.created, result.deactivated) == (1, 1)
+        assert not User.objects.filter(username='newcomer').exists()
+        technician.refresh_from_db()
+        assert technician.is_active
+
+
+class TestPasswordHasherPool:
+    def test_pool_hashes_in_order(self):
+        passwords = [f'pass-{i}' for i in range(8)] + [None]
+
+        with PasswordHasherPool(workers=2) as hasher:
+            hashes = hasher.hash(passwords)
+
+        assert all(check_password(password, hashed) for password, hashed in zip(passwords[:8], hashes))
+        assert not hashes[-1].startswith('pbkdf2') and len(hashes) == 9
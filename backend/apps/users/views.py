@@ -18,8 +18,10 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from django.utils import timezone
-from django.core.cache import cache
+from apps.core.cache import get_tiered_cache
+from apps.core.idempotency import IdempotentAPIMixin
 
+from apps.users.login import complete_login, record_failed_login
 from apps.users.models import User, UserProfile, UserSession, LoginAttempt
 from apps.users.serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserListSerializer,
@@ -58,64 +60,32 @@ class UserRegistrationView(APIView):
 class UserLoginView(TokenObtainPairView):
     """
     Custom login view with session tracking.
+
+    The credentials are verified once by UserLoginSerializer; the token
+    pair is issued from the validated user (see apps.users.login).
     """
     serializer_class = UserLoginSerializer
     
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         
-        try:
-            serializer.is_valid(raise_exception=True)
-        except Exception as e:
+        if not serializer.is_valid():
             # Log failed login attempt
-            LoginAttempt.objects.create(
-                username=request.data.get('username'),
-                ip_address=self.get_client_ip(request),
-                user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                successful=False,
-                failure_reason=str(e)
-            )
-            raise
-        
-        user = serializer.validated_data['user']
-        
-        # Log successful login
-        LoginAttempt.objects.create(
-            username=user.username,
-            ip_address=self.get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            successful=True
-        )
-        
-        # Update user session data
-        user.last_login_ip = self.get_client_ip(request)
-        user.last_login = timezone.now()
-        user.last_active = timezone.now()
-        user.failed_login_attempts = 0
-        user.save()
+            record_failed_login(request, request.data.get('username'), self._failure_reason(serializer))
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create user session
-        UserSession.objects.create(
-            user=user,
-            session_key=request.session.session_key or 'temp_key',
-            ip_address=self.get_client_ip(request),
-            user_agent=request.META.get('HTTP_USER_AGENT', ''),
-            expires_at=timezone.now() + timezone.timedelta(days=7)
-        )
-        
-        return super().post(request, *args, **kwargs)
+        tokens = complete_login(serializer.validated_data['user'], request)
+        return Response(tokens, status=status.HTTP_200_OK)
     
-    def get_client_ip(self, request):
-        """Get client IP address."""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+    @staticmethod
+    def _failure_reason(serializer):
+        for messages in serializer.errors.values():
+            if messages:
+                return str(messages[0])
+        return 'Invalid request'
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(IdempotentAPIMixin, viewsets.ModelViewSet):
     """
     User management viewset with role-based permissions.
     All permission checks use domain authority services for strict RBAC.
@@ -347,13 +317,14 @@ class UserViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Cache statistics for 5 minutes
-        cache_key = f'user_statistics_{request.user.id}'
-        cached_stats = cache.get(cache_key)
-        
-        if cached_stats:
-            return Response(cached_stats)
-        
+        # Cache statistics for 5 minutes; computed once for all workers
+        stats = get_tiered_cache('user_statistics', timeout=300).get_or_set(
+            str(request.user.id), lambda: self._compute_statistics(request)
+        )
+        return Response(stats)
+    
+    def _compute_statistics(self, request):
+        """Compute the payload of the statistics action."""
         total_users = User.objects.count()
         active_users = User.objects.filter(status='ACTIVE').count()
         
@@ -377,8 +348,7 @@ class UserViewSet(viewsets.ModelViewSet):
             'recent_logins': UserListSerializer(recent_logins, many=True).data
         }
         
-        cache.set(cache_key, stats, 300)  # Cache for 5 minutes
-        return Response(stats)
+        return stats
 
 
 class UserSessionViewSet(viewsets.ReadOnlyModelViewSet):
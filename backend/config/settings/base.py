@@ -42,6 +42,7 @@ LOCAL_APPS = [
     'apps.logs',
     'apps.frontend',
     'apps.security',
+    'apps.search',
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
@@ -49,15 +50,16 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.query_budget.QueryBudgetMiddleware',  # Before sessions: counts every query
     'django.contrib.sessions.middleware.SessionMiddleware',
     'apps.security.middleware.SecurityHeadersMiddleware',
-    # 'apps.security.middleware.RateLimitingMiddleware',  # Disabled - causing 429 errors
     'apps.security.middleware.InputValidationMiddleware',
-    'apps.security.middleware.AuthenticationTrackingMiddleware',
     'apps.security.middleware.APILoggingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'apps.security.middleware.RateLimitingMiddleware',  # After auth: limits per user
+    'apps.security.middleware.AuthenticationTrackingMiddleware',  # After auth: needs request.user
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -137,7 +139,7 @@ MESSAGE_STORAGE = 'django.contrib.messages.storage.session.SessionStorage'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -294,6 +296,12 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # Per-request query summaries (N+1, budget overruns) - file only
+        'it_management_platform.queries': {
+            'handlers': ['file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
         # =====================================================================
         # Activity/Logs Service Logger
         # =====================================================================
@@ -329,6 +337,221 @@ LOGS_DIR.mkdir(exist_ok=True)
 # ALWAYS False in production for security and performance.
 LOGS_DEBUG = False  # Set to True only for debugging
 
+# =============================================================================
+# Rate Limiting
+# =============================================================================
+# Default budget for requests not covered by a RATE_LIMIT_REQUESTS /
+# API_REQUEST_FREQUENCY SecurityThreshold. Counters live in the cache named
+# by RATE_LIMIT_CACHE_ALIAS; use a shared cache (Redis) when running more
+# than one process, otherwise every process keeps its own budget.
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+RATE_LIMIT_REQUESTS_PER_MINUTE = config('RATE_LIMIT_REQUESTS_PER_MINUTE', default=120, cast=int)
+RATE_LIMIT_CACHE_ALIAS = 'default'
+RATE_LIMIT_POLICY_REFRESH = 60  # Seconds between SecurityThreshold reloads
+
+# =============================================================================
+# Session Activity
+# =============================================================================
+# Idle sessions are flushed after SESSION_TIMEOUT seconds. The last-activity
+# timestamp is persisted at most once per SESSION_ACTIVITY_GRANULARITY
+# seconds; SESSION_ACTIVITY_STORE = 'cache' keeps it out of the session so
+# database-backed sessions are not rewritten at all.
+SESSION_TIMEOUT = 3600
+SESSION_ACTIVITY_GRANULARITY = config('SESSION_ACTIVITY_GRANULARITY', default=60, cast=int)
+SESSION_ACTIVITY_STORE = 'session'
+
+# =============================================================================
+# Tiered Cache
+# =============================================================================
+# apps.core.cache keeps a small per-process LRU in front of the shared cache
+# alias. Local entries live at most TIERED_CACHE_LOCAL_TTL seconds; misses are
+# recomputed by one caller while others wait up to TIERED_CACHE_LOCK_TIMEOUT.
+SHARED_CACHE_ALIAS = 'default'
+TIERED_CACHE_LOCAL_SIZE = 1024
+TIERED_CACHE_LOCAL_TTL = config('TIERED_CACHE_LOCAL_TTL', default=5, cast=int)
+TIERED_CACHE_LOCK_TIMEOUT = 30
+
+# =============================================================================
+# Query Budgets
+# =============================================================================
+# apps.core.query_budget.QueryBudgetMiddleware counts the queries of every
+# request. In DEBUG the totals are sent as X-Query-* headers; N+1 patterns
+# (a statement repeated QUERY_BUDGET_DUPLICATE_THRESHOLD times or more) and
+# budget overruns are logged as JSON. QUERY_BUDGET_STRICT turns overruns into
+# errors and is enabled for the test suite.
+QUERY_BUDGET_ENABLED = config('QUERY_BUDGET_ENABLED', default=True, cast=bool)
+QUERY_BUDGET_STRICT = False
+QUERY_BUDGET_DUPLICATE_THRESHOLD = 3
+QUERY_BUDGETS = {
+    'frontend:dashboard': 25,
+    'frontend:dashboard-api': 10,
+    'frontend:tickets': {'max_queries': 10, 'max_duplicates': 2},
+    'frontend:ticket-detail': 14,
+    'frontend:assets': {'max_queries': 10, 'max_duplicates': 2},
+    'frontend:projects': {'max_queries': 12, 'max_duplicates': 2},
+    'frontend:project-detail': 16,
+    'frontend:users': {'max_queries': 12, 'max_duplicates': 2},
+    'frontend:logs': {'max_queries': 15, 'max_duplicates': 2},
+    'frontend:reports': 8,
+    'frontend:search-api': 6,
+    'frontend:command-palette-api': 4,
+}
+
+# =============================================================================
+# Event Dispatcher
+# =============================================================================
+# Executor for async domain event handlers: 'thread', 'celery' or 'immediate'.
+# The thread executor bounds its queue; when full the overflow policy
+# ('block', 'drop_newest', 'drop_oldest' or 'caller_runs') applies. The
+# celery executor sends handler runs in batches of up to BATCH_SIZE, at most
+# BATCH_DELAY seconds after the first one was buffered.
+EVENT_DISPATCHER_EXECUTOR = config('EVENT_DISPATCHER_EXECUTOR', default='thread')
+EVENT_DISPATCHER_MAX_WORKERS = 5
+EVENT_DISPATCHER_QUEUE_SIZE = 1000
+EVENT_DISPATCHER_OVERFLOW_POLICY = 'block'
+EVENT_DISPATCHER_CELERY_BATCH_SIZE = 50
+EVENT_DISPATCHER_CELERY_BATCH_DELAY = 0.5
+
+# =============================================================================
+# Ticket Statistics
+# =============================================================================
+# TicketViewSet.statistics reads a materialized snapshot plus the delta rows
+# ticket saves append to it. Celery beat reconciles it (folding the deltas in)
+# every TICKET_STATISTICS_RECONCILE_INTERVAL seconds; a snapshot older than
+# TICKET_STATISTICS_MAX_AGE is reconciled on read. Reads sum the pending deltas
+# and reconcile first when more than TICKET_STATISTICS_MAX_PENDING are waiting.
+TICKET_STATISTICS_MAX_AGE = 300
+TICKET_STATISTICS_RECONCILE_INTERVAL = 60
+TICKET_STATISTICS_MAX_PENDING = 500
+
+# =============================================================================
+# Idempotency Keys
+# =============================================================================
+# Application commands and the Ticket/Asset/Project/User APIs accept an
+# idempotency key (``Idempotency-Key`` header or ``idempotency_key`` form field).
+# Results are replayed to retries for IDEMPOTENCY_TTL seconds; a retry arriving
+# while the first attempt runs waits up to IDEMPOTENCY_WAIT seconds. Claims of
+# attempts that died expire after IDEMPOTENCY_LOCK_TTL seconds.
+IDEMPOTENCY_TTL = 24 * 60 * 60
+IDEMPOTENCY_LOCK_TTL = 60
+IDEMPOTENCY_WAIT = 5
+
+# =============================================================================
+# Principal Cache
+# =============================================================================
+# JWT-authenticated API requests resolve their user from a cached principal
+# (apps.users.principal) instead of the users table. Principals are versioned
+# per user and replaced on any save of a role, status or password; stale
+# versions expire after PRINCIPAL_CACHE_TIMEOUT seconds.
+PRINCIPAL_CACHE_TIMEOUT = 60 * 60
+
+# =============================================================================
+# User Provisioning
+# =============================================================================
+# apps.users.services.bulk_provision_users creates accounts and profiles with one
+# bulk INSERT each per USER_PROVISIONING_BATCH_SIZE users.
+USER_PROVISIONING_BATCH_SIZE = 1000
+# Processes hashing the passwords of new accounts (default: one per CPU).
+USER_PROVISIONING_HASH_WORKERS = None
+
+# =============================================================================
+# User Directory Sync
+# =============================================================================
+# apps.users.services.sync_users (manage.py sync_users) applies a directory
+# export in chunks of USER_SYNC_BATCH_SIZE creates, updates or deactivations,
+# each with one summary ActivityLog and AuditLog record. Missing accounts are not
+# deactivated when rows were rejected or the export has fewer rows than
+# USER_SYNC_MIN_COVERAGE of the active accounts (override with --force).
+USER_SYNC_BATCH_SIZE = 1000
+USER_SYNC_MIN_COVERAGE = 0.5
+
+# =============================================================================
+# Search Index
+# =============================================================================
+# apps.search indexes tickets, assets, projects and users for the global search
+# and the command palette. Documents keep at most SEARCH_MAX_TERMS_PER_DOCUMENT
+# distinct words; only the first SEARCH_FREE_TEXT_CHARS characters of
+# descriptions are indexed. Rebuild with manage.py rebuild_search_index.
+SEARCH_MAX_TERMS_PER_DOCUMENT = 64
+SEARCH_FREE_TEXT_CHARS = 500
+
+# =============================================================================
+# Security Event Hash Chain
+# =============================================================================
+# Security events are hash chained into ActivityLog by apps.logs.services.hash_chain.
+# Each transaction's events are appended after commit under one row lock on the
+# chain head, inserting at most SECURITY_CHAIN_BATCH_SIZE rows per statement.
+SECURITY_CHAIN_BATCH_SIZE = 500
+# apps.logs.services.chain_verification (manage.py verify_security_chain and the
+# verify-security-chain beat task) verifies the events appended since the last
+# checkpoint, streaming SECURITY_CHAIN_VERIFY_CHUNK_SIZE rows per round trip
+# across SECURITY_CHAIN_VERIFY_WORKERS processes (None: one per CPU).
+SECURITY_CHAIN_VERIFY_CHUNK_SIZE = 2000
+SECURITY_CHAIN_VERIFY_WORKERS = 1
+SECURITY_CHAIN_VERIFY_INTERVAL = 60 * 60
+
+# =============================================================================
+# Activity Timelines
+# =============================================================================
+# Ticket, asset and project detail pages show the entity's history newest first,
+# ACTIVITY_TIMELINE_PAGE_SIZE entries per page (apps.logs.services.timeline).
+ACTIVITY_TIMELINE_PAGE_SIZE = 50
+
+# =============================================================================
+# Ticket SLA
+# =============================================================================
+# SLA deadlines and risk thresholds are stored on each ticket (apps.tickets.services.sla).
+# Ticket types without sla_hours fall back to TICKET_SLA_DEFAULT_HOURS. Celery beat
+# flags breached tickets every TICKET_SLA_SWEEP_INTERVAL seconds, updating at most
+# TICKET_SLA_SWEEP_BATCH_SIZE rows per statement.
+TICKET_SLA_DEFAULT_HOURS = 24
+TICKET_SLA_SWEEP_INTERVAL = 60
+TICKET_SLA_SWEEP_BATCH_SIZE = 500
+
+# Tickets are escalated automatically when their SLA thresholds pass
+# (apps.tickets.services.escalation): to L2 at three quarters of the window, to
+# MANAGEMENT on breach. Escalations go round-robin to active users of the role
+# mapped to each level. Celery beat runs the scheduler every
+# TICKET_ESCALATION_INTERVAL seconds; `manage.py run_escalation_scheduler` sleeps
+# until the next escalation instead (at most TICKET_ESCALATION_MAX_SLEEP seconds).
+TICKET_ESCALATION_ROLES = {
+    'L2': 'IT_ADMIN',
+    'MANAGEMENT': 'MANAGER',
+}
+TICKET_ESCALATION_INTERVAL = 60
+TICKET_ESCALATION_MAX_SLEEP = 60
+TICKET_ESCALATION_BATCH_SIZE = 200
+
+# =============================================================================
+# Ticket Notifications
+# =============================================================================
+# Ticket events queue TicketNotification rows; Celery beat sends one digest email
+# per recipient every NOTIFICATION_FLUSH_INTERVAL seconds once the recipient's
+# queue has been quiet for NOTIFICATION_DEBOUNCE seconds (or its oldest entry
+# waited NOTIFICATION_MAX_DELAY). NOTIFICATION_TRANSPORT delivers the digests;
+# the email transport keeps up to NOTIFICATION_SMTP_POOL_SIZE connections of
+# NOTIFICATION_EMAIL_BACKEND (default: EMAIL_BACKEND) open between flushes.
+NOTIFICATION_TRANSPORT = 'apps.core.mail.EmailTransport'
+NOTIFICATION_EMAIL_BACKEND = None
+NOTIFICATION_SMTP_POOL_SIZE = 2
+NOTIFICATION_SMTP_MAX_IDLE = 30
+NOTIFICATION_DEBOUNCE = 60
+NOTIFICATION_MAX_DELAY = 300
+NOTIFICATION_FLUSH_INTERVAL = 30
+NOTIFICATION_FLUSH_BATCH_SIZE = 100
+# Digests are sent one by one; a recipient's notifications are dead-lettered
+# after NOTIFICATION_MAX_ATTEMPTS failed deliveries.
+NOTIFICATION_MAX_ATTEMPTS = 5
+
+# =============================================================================
+# Bulk Ticket Operations
+# =============================================================================
+# TicketViewSet.bulk assigns, re-prioritizes, changes the status of or closes up
+# to TICKET_BULK_MAX_IDS tickets per request with set-based writes. Selections of
+# more than TICKET_BULK_ASYNC_THRESHOLD tickets run in a Celery worker.
+TICKET_BULK_MAX_IDS = 5000
+TICKET_BULK_ASYNC_THRESHOLD = 500
+
 # =============================================================================
 # Email Configuration
 # =============================================================================
@@ -364,3 +587,27 @@ CELERY_RESULT_SERIALIZER = 'json'
 
 # Timzone settings match Django
 CELERY_TIMEZONE = TIME_ZONE
+
+# Periodic tasks (celery beat)
+CELERY_BEAT_SCHEDULE = {
+    'reconcile-ticket-statistics': {
+        'task': 'apps.tickets.tasks.reconcile_ticket_statistics',
+        'schedule': TICKET_STATISTICS_RECONCILE_INTERVAL,
+    },
+    'sweep-sla-breaches': {
+        'task': 'apps.tickets.tasks.sweep_sla_breaches',
+        'schedule': TICKET_SLA_SWEEP_INTERVAL,
+    },
+    'escalate-due-tickets': {
+        'task': 'apps.tickets.tasks.escalate_due_tickets',
+        'schedule': TICKET_ESCALATION_INTERVAL,
+    },
+    'flush-ticket-notifications': {
+        'task': 'apps.tickets.tasks.flush_ticket_notifications',
+        'schedule': NOTIFICATION_FLUSH_INTERVAL,
+    },
+    'verify-security-chain': {
+        'task': 'apps.logs.tasks.verify_security_chain',
+        'schedule': SECURITY_CHAIN_VERIFY_INTERVAL,
+    },
+}
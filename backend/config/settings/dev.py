@@ -19,6 +19,10 @@ DATABASES = {
     }
 }
 
+# The dev server and the test suite share one in-memory cache; opt in to
+# rate limiting with RATE_LIMIT_ENABLED=True when working on it
+RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=False, cast=bool)
+
 # Email backend for development
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
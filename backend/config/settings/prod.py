@@ -5,6 +5,7 @@ Production-ready settings for PythonAnywhere deployment.
 
 from .base import *
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import os
 
 # SECURITY WARNING: don't run with debug turned on in production!
@@ -43,14 +44,43 @@ DATABASES = {
 }
 
 # Cache configuration for production
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'KEY_PREFIX': 'it_mgmt',
-        'VERSION': 1,
+# The default cache is the shared tier of apps.core.cache. Its locks,
+# failed-login counters, idempotency claims and version bumps rely on atomic
+# add()/incr() across every worker process, which only Redis provides here.
+# A deployment running a single process may set CACHE_SINGLE_PROCESS instead
+# and use the (process-local, internally locked) LocMemCache.
+REDIS_URL = config('REDIS_URL', default='')
+CACHE_SINGLE_PROCESS = config('CACHE_SINGLE_PROCESS', default=False, cast=bool)
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                'CONNECTION_POOL_KWARGS': {'max_connections': 50},
+                'SOCKET_CONNECT_TIMEOUT': 5,
+                'SOCKET_TIMEOUT': 5,
+            },
+            'KEY_PREFIX': 'it_mgmt',
+            'VERSION': 1,
+        }
     }
-}
+elif CACHE_SINGLE_PROCESS:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'KEY_PREFIX': 'it_mgmt',
+            'VERSION': 1,
+        }
+    }
+else:
+    raise ImproperlyConfigured(
+        'REDIS_URL must be set in production: the shared cache needs atomic add/incr '
+        'across workers. Set CACHE_SINGLE_PROCESS=True only when running one process.'
+    )
+SHARED_CACHE_ALIAS = 'default'
 
 # Session configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
@@ -143,6 +173,8 @@ CSRF_TRUSTED_ORIGINS = [
 
 # Rate limiting (if using django-ratelimit)
 RATELIMIT_USE_CACHE = 'default'
+# RateLimitingMiddleware counters use RATE_LIMIT_CACHE_ALIAS ('default'), which
+# is the shared Redis cache above (process-local only with CACHE_SINGLE_PROCESS)
 
 # Admin configuration
 ADMIN_URL = 'admin/'
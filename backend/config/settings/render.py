@@ -5,6 +5,7 @@ Optimized for Render deployment with Python 3.13.
 
 from .base import *
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 import os
 
 # =============================================================================
@@ -74,14 +75,21 @@ if RENDER:
                 'KEY_PREFIX': 'it_mgmt',
             }
         }
-    else:
-        # Fallback to local memory cache
+    elif config('CACHE_SINGLE_PROCESS', default=False, cast=bool):
+        # Only safe with one worker: locks and counters live in this process
         CACHES = {
             'default': {
                 'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
                 'LOCATION': 'unique-snowflake',
+                'KEY_PREFIX': 'it_mgmt',
             }
         }
+    else:
+        # The shared cache locks and counters need atomic add/incr across workers
+        raise ImproperlyConfigured(
+            'REDIS_URL must be set on Render: the shared cache needs atomic add/incr '
+            'across workers. Set CACHE_SINGLE_PROCESS=True only when running one process.'
+        )
 else:
     # Local development cache
     CACHES = {
@@ -204,6 +212,10 @@ LOGGING = {
 SESSION_ENGINE = 'django.contrib.sessions.backends.db'
 SESSION_COOKIE_AGE = 86400  # 24 hours
 
+# Track session activity in Redis so requests don't rewrite the session row
+if RENDER and REDIS_URL:
+    SESSION_ACTIVITY_STORE = 'cache'
+
 # =============================================================================
 # FILE UPLOAD SETTINGS
 # =============================================================================
@@ -9,6 +9,23 @@ from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_local_cache_tiers():
+    """Cache tiers (apps.core.cache) must not leak between tests."""
+    from django.core.cache import cache
+    from apps.core.cache import clear_local_caches
+    clear_local_caches()
+    # Row ids are reused across tests, so cached principals would be too
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """Fail any test whose requests exceed the budgets in QUERY_BUDGETS."""
+    settings.QUERY_BUDGET_STRICT = True
+
+
 def _make_user(username, role, n):
     return User.objects.create_user(
         username=username,
@@ -110,10 +110,14 @@ document.addEventListener('DOMContentLoaded', () => {
     const searchModalResults = document.getElementById('search-modal-results');
 
     if (searchInput && searchModalResults) {
+        let searchController = null;
         searchInput.addEventListener('input', function() {
             const query = this.value;
             if (query.length > 2) {
-                fetch(`/api/search/?q=${encodeURIComponent(query)}`)
+                // Only the latest keystroke's results are rendered
+                searchController?.abort();
+                searchController = new AbortController();
+                fetch(`/api/search/?q=${encodeURIComponent(query)}`, { signal: searchController.signal })
                     .then(r => r.json())
                     .then(data => {
                         if (data.count > 0) {
@@ -122,13 +126,16 @@ document.addEventListener('DOMContentLoaded', () => {
                                 if (data.results[type] && data.results[type].length > 0) {
                                     html += `<div class="text-xs font-semibold text-gray-400 uppercase tracking-wide px-2 mt-3 mb-1">${type}</div>`;
                                     data.results[type].forEach(item => {
-                                        let link = '#';
-                                        const display = item.name || item.title || item.username;
-                                        if (type === 'users') link = `/edit-user/${item.id}/`;
-                                        if (type === 'tickets') link = `/tickets/${item.id}/`;
-                                        if (type === 'assets') link = `/assets/${item.id}/`;
-                                        if (type === 'projects') link = `/project/${item.id}/`;
-                                        html += `<a href="${link}" onclick="closeSearchModal()" class="flex items-center p-2 rounded-lg hover:bg-gray-100 dark:hover:bg-gray-700 text-gray-900 dark:text-white text-sm transition-colors">${display}</a>`;
+                                        const link = document.createElement('a');
+                                        link.href = item.url;
+                                        link.setAttribute('onclick', 'closeSearchModal()');
+                                        link.className = 'flex items-center justify-between p-2 rounded-lg hover:bg-gray-100 dark:hover:bg-gray-700 text-gray-900 dark:text-white text-sm transition-colors';
+                                        link.textContent = item.title;
+                                        const subtitle = document.createElement('span');
+                                        subtitle.className = 'ml-3 text-xs text-gray-400 truncate';
+                                        subtitle.textContent = item.subtitle;
+                                        link.appendChild(subtitle);
+                                        html += link.outerHTML;
                                     });
                                 }
                             });
@@ -137,7 +144,8 @@ document.addEventListener('DOMContentLoaded', () => {
                         } else {
                             searchModalResults.innerHTML = '<p class="p-4 text-center text-sm text-gray-400">No results found</p>';
                         }
-                    }).catch(() => {
+                    }).catch((error) => {
+                        if (error.name === 'AbortError') return;
                         searchModalResults.innerHTML = '<p class="p-4 text-center text-sm text-red-500">Search failed.</p>';
                     });
             } else {
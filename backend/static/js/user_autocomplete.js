@@ -0,0 +1,65 @@
+// user_autocomplete.js - User picker fields backed by /api/users/autocomplete/
+//
+// Markup: templates/frontend/partials/_user_autocomplete.html. The visible
+// input searches by prefix; the hidden input carries the submitted value
+// (the user id, or the username when data-value-field="username").
+
+document.addEventListener('DOMContentLoaded', () => {
+    const DEBOUNCE_MS = 200;
+
+    document.querySelectorAll('[data-user-autocomplete]').forEach((container) => {
+        const search = container.querySelector('[data-role="search"]');
+        const value = container.querySelector('[data-role="value"]');
+        const results = container.querySelector('[data-role="results"]');
+        const valueField = container.dataset.valueField || 'id';
+        let timer = null;
+        let controller = null;
+
+        const hideResults = () => results.classList.add('hidden');
+
+        const choose = (user) => {
+            search.value = user.username;
+            value.value = user[valueField];
+            hideResults();
+        };
+
+        const render = (users) => {
+            results.innerHTML = '';
+            users.forEach((user) => {
+                const item = document.createElement('li');
+                item.className = 'px-3 py-2 cursor-pointer hover:bg-blue-50';
+                item.textContent = user.full_name ? `${user.username} (${user.full_name})` : user.username;
+                item.addEventListener('mousedown', (event) => {
+                    event.preventDefault();
+                    choose(user);
+                });
+                results.appendChild(item);
+            });
+            results.classList.toggle('hidden', users.length === 0);
+        };
+
+        const lookup = () => {
+            controller?.abort();
+            controller = new AbortController();
+            const params = new URLSearchParams({ q: search.value.trim(), scope: container.dataset.scope });
+            fetch(`${container.dataset.url}?${params}`, { signal: controller.signal, credentials: 'same-origin' })
+                .then((response) => (response.ok ? response.json() : { results: [] }))
+                .then((data) => render(data.results))
+                .catch((error) => {
+                    if (error.name !== 'AbortError') console.error('User lookup failed', error);
+                });
+        };
+
+        search.addEventListener('input', () => {
+            // Typed text only counts once a user is picked, except for username filters
+            value.value = valueField === 'username' ? search.value.trim() : '';
+            clearTimeout(timer);
+            timer = setTimeout(lookup, DEBOUNCE_MS);
+        });
+        search.addEventListener('focus', lookup);
+        search.addEventListener('blur', hideResults);
+        search.addEventListener('keydown', (event) => {
+            if (event.key === 'Escape') hideResults();
+        });
+    });
+});